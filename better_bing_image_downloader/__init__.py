@@ -1,37 +1,100 @@
 import logging
 
+from .adaptive import AdaptiveLimit, LimitChange
+from .async_engine import AsyncImageEngine
+from .async_transport import AsyncTransport
 from .base import (
     BelowMinDimension,
     DuplicateImageError,
     ImageEngine,
     ImageSaveError,
+    ImageSkipped,
     InvalidImageError,
+    NearDuplicateImage,
     NetworkError,
+    OutsideByteLimits,
     WriteError,
 )
-from .bing import Bing
+from .batch import QueryCheckpoint
+from .bing import AsyncBing, Bing
+from .bloom import ScalableBloomFilter
+from .catalog import CatalogEntry, RunCatalog
+from .columnar import ParquetManifestWriter
 from .download import downloader
 from .downloader import CancelToken, Downloader
-from .manifest import DEFAULT_MANIFEST_FIELDS, ManifestFieldError, ManifestWriter
-from .results import ImageResult, Result
+from .hashindex import HashIndex
+from .hosts import HostStats, HostTracker
+from .httpcache import HTTPCache
+from .manifest import (
+    DEFAULT_MANIFEST_FIELDS,
+    BackgroundManifestWriter,
+    ManifestFieldError,
+    ManifestSink,
+    ManifestWriter,
+)
+from .manifestindex import ManifestIndex, ManifestMatch
+from .pagecache import PageCache
+from .perceptual import NearDuplicateIndex
+from .results import FailedImage, ImageResult, Result, SkippedImage
+from .scheduler import DownloadScheduler, DownloadShare, SchedulerStats
+from .seenurls import SeenURLStore
+from .stream import SearchStream
+from .transport import PooledTransport, PoolStats, Transport, UrllibTransport
+from .urls import CDNRule, URLCanonicalizer
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 __all__ = [
+    "AdaptiveLimit",
+    "AsyncBing",
+    "AsyncImageEngine",
+    "AsyncTransport",
+    "BackgroundManifestWriter",
     "BelowMinDimension",
     "Bing",
+    "CDNRule",
     "CancelToken",
+    "CatalogEntry",
     "DEFAULT_MANIFEST_FIELDS",
+    "DownloadScheduler",
+    "DownloadShare",
     "Downloader",
     "DuplicateImageError",
+    "FailedImage",
+    "HashIndex",
+    "HostStats",
+    "HostTracker",
+    "HTTPCache",
     "ImageEngine",
     "ImageResult",
     "ImageSaveError",
+    "ImageSkipped",
     "InvalidImageError",
+    "LimitChange",
     "ManifestFieldError",
+    "ManifestIndex",
+    "ManifestMatch",
+    "ManifestSink",
     "ManifestWriter",
+    "NearDuplicateImage",
+    "NearDuplicateIndex",
     "NetworkError",
+    "OutsideByteLimits",
+    "PageCache",
+    "ParquetManifestWriter",
+    "PoolStats",
+    "PooledTransport",
+    "QueryCheckpoint",
     "Result",
+    "RunCatalog",
+    "ScalableBloomFilter",
+    "SchedulerStats",
+    "SearchStream",
+    "SeenURLStore",
+    "SkippedImage",
+    "Transport",
+    "URLCanonicalizer",
+    "UrllibTransport",
     "WriteError",
     "downloader",
 ]
@@ -41,8 +104,8 @@ __all__ = [
 # for compatibility with users on older Python builds where the
 # conditional import might still apply.
 try:
-    from .duckduckgo import DuckDuckGo  # noqa: F401
+    from .duckduckgo import AsyncDuckDuckGo, DuckDuckGo, VQDCache  # noqa: F401
 
-    __all__.append("DuckDuckGo")
+    __all__ += ["AsyncDuckDuckGo", "DuckDuckGo", "VQDCache"]
 except ImportError:  # pragma: no cover
     pass
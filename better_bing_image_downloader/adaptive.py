@@ -0,0 +1,180 @@
+"""Adaptive download concurrency (v3.7.0+).
+
+A fixed ``max_workers`` is either too low for a fast link or high
+enough to trigger timeouts and ``429`` responses on a slow one. With
+``adaptive=True`` an engine instead sizes its concurrency while it
+runs, using an :class:`AdaptiveLimit`: an AIMD (additive increase,
+multiplicative decrease) controller gated on latency.
+
+Every finished image fetch is reported to :meth:`AdaptiveLimit.observe`.
+Samples are grouped into windows of about ``limit`` fetches:
+
+- a congestion signal (a ``429``/``503``, another ``5xx``, or a
+  timeout) halves the limit at once, at most once per window;
+- otherwise, when a window closes, its median latency is compared with
+  the best window median seen so far. If it has more than doubled, the
+  limit drops by one (requests are queueing somewhere); if latency is
+  stable and throughput did not fall compared with the previous
+  window, the limit grows by one.
+
+The limit stays between ``minimum`` and ``maximum``; every change is
+recorded in :attr:`AdaptiveLimit.history` and surfaced on
+:attr:`Result.concurrency_history`.
+"""
+
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+import urllib.error
+from typing import Callable, NamedTuple
+
+from .hosts import _throttle_hint
+
+__all__ = ["AdaptiveLimit", "LimitChange"]
+
+# Fraction of the limit kept after a congestion signal.
+_BACKOFF_RATIO = 0.5
+
+# Window median latency above this multiple of the baseline counts as
+# queueing and shrinks the limit.
+_LATENCY_TOLERANCE = 2.0
+
+# The baseline (best window median) is allowed to creep up by this
+# factor per window, so a permanently slower network is eventually
+# accepted as the new normal instead of shrinking the limit forever.
+_BASELINE_DRIFT = 1.05
+
+# A window with a lower throughput than this fraction of the previous
+# one does not grow the limit.
+_THROUGHPUT_TOLERANCE = 0.9
+
+# Smallest number of samples per window, so low limits still average
+# over a few requests.
+_MIN_WINDOW = 4
+
+
+class LimitChange(NamedTuple):
+    """One entry of :attr:`AdaptiveLimit.history`.
+
+    Attributes
+    ----------
+    elapsed : float
+        Seconds since the controller was created (roughly, since the
+        run started).
+    limit : int
+        The new concurrency limit.
+    reason : str
+        ``"start"``, ``"increase"``, ``"latency"`` (median latency rose
+        well above the baseline), or ``"congestion"`` (throttling,
+        server errors, or timeouts).
+    """
+
+    elapsed: float
+    limit: int
+    reason: str
+
+
+class AdaptiveLimit:
+    """Thread-safe AIMD concurrency limit driven by latency and errors.
+
+    Parameters
+    ----------
+    initial : int
+        Starting limit.
+    minimum, maximum : int
+        Bounds for the limit.
+    clock : Callable[[], float]
+        Monotonic time source (tests substitute a fake one).
+
+    Raises
+    ------
+    ValueError
+        If the bounds are inconsistent (``1 <= minimum <= maximum``).
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = 16,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 1 <= minimum <= maximum:
+            raise ValueError(f"need 1 <= minimum <= maximum, got {minimum}, {maximum}")
+        self.minimum = minimum
+        self.maximum = maximum
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._started = clock()
+        self._limit = max(minimum, min(initial, maximum))
+        self.history: list[LimitChange] = [LimitChange(0.0, self._limit, "start")]
+        self._baseline: float | None = None
+        self._last_throughput: float | None = None
+        self._reset_window()
+
+    @property
+    def limit(self) -> int:
+        """The current concurrency limit."""
+        return self._limit
+
+    def observe(self, elapsed: float, error: BaseException | None = None) -> None:
+        """Report one finished fetch: its duration and the network error, if any."""
+        with self._lock:
+            self._count += 1
+            if error is not None and _is_congestion(error):
+                if not self._backed_off:
+                    self._backed_off = True
+                    self._set(int(self._limit * _BACKOFF_RATIO), "congestion")
+            elif error is None:
+                self._latencies.append(elapsed)
+            if self._count >= max(self._limit, _MIN_WINDOW):
+                self._close_window()
+
+    def _close_window(self) -> None:
+        now = self._clock()
+        backed_off = self._backed_off
+        latencies = self._latencies
+        duration = now - self._window_started
+        self._reset_window()
+        if backed_off or not latencies:
+            self._last_throughput = None
+            return
+        median = statistics.median(latencies)
+        throughput = len(latencies) / duration if duration > 0 else None
+        if self._baseline is None:
+            self._baseline = median
+        else:
+            self._baseline = min(median, self._baseline * _BASELINE_DRIFT)
+        previous, self._last_throughput = self._last_throughput, throughput
+        if median > _LATENCY_TOLERANCE * self._baseline:
+            self._set(self._limit - 1, "latency")
+        elif (
+            previous is None or throughput is None or throughput >= _THROUGHPUT_TOLERANCE * previous
+        ):
+            self._set(self._limit + 1, "increase")
+
+    def _reset_window(self) -> None:
+        self._window_started = self._clock()
+        self._count = 0
+        self._latencies: list[float] = []
+        self._backed_off = False
+
+    def _set(self, limit: int, reason: str) -> None:
+        limit = max(self.minimum, min(limit, self.maximum))
+        if limit != self._limit:
+            self._limit = limit
+            self.history.append(LimitChange(self._clock() - self._started, limit, reason))
+
+
+def _is_congestion(error: BaseException) -> bool:
+    """``True`` for throttling, timeouts, and any ``5xx`` in ``error``'s cause chain."""
+    if _throttle_hint(error) is not None:
+        return True
+    exc: BaseException | None = error
+    while exc is not None:
+        if isinstance(exc, urllib.error.HTTPError):
+            return exc.code >= 500
+        exc = exc.__cause__
+    return False
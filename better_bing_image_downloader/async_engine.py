@@ -0,0 +1,455 @@
+"""Native asyncio engine API (v3.7.0+).
+
+:class:`AsyncImageEngine` is the event-loop counterpart of
+:class:`~better_bing_image_downloader.base.ImageEngine`. Page fetches and
+image downloads are coroutines on an
+:class:`~better_bing_image_downloader.async_transport.AsyncTransport`,
+and an ``asyncio.Semaphore`` caps how many downloads are in flight at
+once (``concurrency``), so a single thread can drive hundreds of
+downloads. Everything else — validation, the byte and dimension
+filters, MD5 deduplication, atomic writes, resume, and file numbering —
+is the same code the threaded engines run.
+
+:class:`~better_bing_image_downloader.bing.AsyncBing` and
+:class:`~better_bing_image_downloader.duckduckgo.AsyncDuckDuckGo` are
+the built-in implementations; :meth:`Downloader.search_async` uses them
+automatically.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import logging
+import time
+import urllib.error
+from abc import abstractmethod
+from typing import Any, AsyncIterator
+
+from .adaptive import AdaptiveLimit
+from .async_transport import AsyncTransport
+from .base import (
+    _BASE_HTTP_GET,
+    DEFAULT_HEADERS,
+    ImageEngine,
+    ImageSaveError,
+    NetworkError,
+    WriteError,
+    _content_length,
+    _unlink_quietly,
+)
+from .hosts import HostQueue, host_of
+from .httpcache import HTTPCacheEntry
+from .pipeline import IndexAllocator
+
+__all__ = ["AsyncImageEngine", "DEFAULT_ASYNC_CONCURRENCY"]
+
+# Default cap on simultaneous downloads per async engine. Much higher
+# than the threaded engines' ``max_workers`` because an in-flight
+# download costs a coroutine and a socket, not an OS thread.
+DEFAULT_ASYNC_CONCURRENCY = 32
+
+# How often the dispatcher re-checks stop conditions and throttled
+# hosts while it has nothing to start.
+_POLL_INTERVAL = 0.05  # seconds
+
+
+class AsyncImageEngine(ImageEngine):
+    """Base class for engines with a native asyncio path.
+
+    Subclasses implement :meth:`run_async`, typically by passing an
+    async generator of link pages to :meth:`_run_pipeline_async`. The
+    blocking :meth:`run` drives :meth:`run_async` on a fresh event loop,
+    so an async engine also works anywhere a threaded one does.
+
+    Parameters
+    ----------
+    *args, **kwargs
+        Forwarded to the threaded engine's ``__init__``.
+    concurrency : int
+        Maximum number of downloads in flight at once. With
+        ``adaptive=True`` this is the ceiling the adaptive limit may
+        grow to, starting from ``max_workers``.
+    async_transport : AsyncTransport | None
+        Non-blocking HTTP client for page fetches and downloads.
+        :class:`Downloader` passes its shared one; by default the
+        engine builds its own, sharing :attr:`transport`'s cookie jar.
+
+    Raises
+    ------
+    ValueError
+        If ``concurrency`` is smaller than 1.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        concurrency: int = DEFAULT_ASYNC_CONCURRENCY,
+        async_transport: AsyncTransport | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be >= 1, got {concurrency}")
+        self.concurrency = concurrency
+        if self.limiter is not None:
+            # Adaptive mode: grow from ``max_workers`` up to ``concurrency``.
+            self.limiter = AdaptiveLimit(
+                initial=min(self.max_workers, concurrency), maximum=concurrency
+            )
+        self.async_transport: AsyncTransport = (
+            async_transport
+            if async_transport is not None
+            else AsyncTransport(cookie_jar=self.transport.cookie_jar)
+        )
+
+    def _concurrency_limit(self) -> int:
+        return self.limiter.limit if self.limiter is not None else self.concurrency
+
+    def run(self) -> None:
+        """Blocking entry point: run :meth:`run_async` to completion."""
+        asyncio.run(self._run_on_private_loop())
+
+    async def _run_on_private_loop(self) -> None:
+        try:
+            await self.run_async()
+        finally:
+            # The loop dies with this call, and so would any idle
+            # connection it owns; close them now.
+            await self.async_transport.aclose()
+
+    @abstractmethod
+    async def run_async(self) -> None:
+        """Fetch image URLs from the engine and download them, without blocking."""
+        raise NotImplementedError
+
+    # --- Pipelined runs ---
+
+    async def _run_pipeline_async(self, pages: AsyncIterator[list[str]]) -> None:
+        """Download links from ``pages`` concurrently, at most ``concurrency`` at a time.
+
+        The asyncio version of :meth:`ImageEngine._run_pipeline`: pages
+        are read by a background task at most :meth:`_read_ahead` links
+        ahead of the downloads, links are dispatched round-robin
+        across hosts within the limits of :attr:`hosts`, image indices
+        are handed out the same way, and the run ends once ``limit`` is
+        reached, the pages run out, the run is cancelled, or
+        ``MAX_CONSECUTIVE_FAILURES`` downloads in a row have failed.
+        ``self.last_page_url`` must name the page each list came from
+        when it is yielded.
+        """
+        # The resume index and the hash index are loaded from disk on
+        # first use; do that on a worker thread, not the event loop.
+        if not self.force_replace:
+            await asyncio.to_thread(self._existing_index)
+        if self.hash_index is not None:
+            await asyncio.to_thread(len, self.hash_index)
+        indices = IndexAllocator(self.download_count + 1, self.MAX_CONSECUTIVE_FAILURES)
+        pending = HostQueue(self.hosts)
+        # Notified (and ``version`` bumped) whenever a link is queued,
+        # a download settles, or the pages run out.
+        changed = asyncio.Condition()
+        version = 0
+        tasks: set[asyncio.Future] = set()
+        in_flight = 0
+        stopped = False
+        pages_done = False
+
+        def finished() -> bool:
+            return stopped or self.is_cancelled() or self._slots_used >= self.limit
+
+        def may_start() -> bool:
+            # Don't start more downloads than could still be needed.
+            return finished() or (
+                in_flight < self._concurrency_limit()
+                and (in_flight == 0 or self._slots_used + in_flight < self.limit)
+            )
+
+        def room() -> bool:
+            return len(pending) + in_flight < self._read_ahead()
+
+        async def wait(predicate, timeout: float = _POLL_INTERVAL) -> None:
+            async with changed:
+                try:
+                    await asyncio.wait_for(changed.wait_for(predicate), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+        async def notify() -> None:
+            nonlocal version
+            async with changed:
+                version += 1
+                changed.notify_all()
+
+        async def read_pages() -> None:
+            nonlocal pages_done, stopped
+            try:
+                async for links in pages:
+                    page_url = self.last_page_url
+                    for link in links:
+                        self._record_source_page(link, page_url)
+                        while not room() and not finished():
+                            await wait(room)
+                        if finished():
+                            return
+                        pending.put(link)
+                        await notify()
+                    if finished():
+                        return
+            except BaseException:
+                stopped = True  # re-raised below, once downloads wind down
+                raise
+            finally:
+                pages_done = True
+                await notify()
+
+        async def download(link: str, host: str, index: int) -> None:
+            nonlocal in_flight, stopped
+            outcome = None
+            try:
+                outcome = await self.download_image_async(link, index)
+            except Exception as e:
+                logging.error("Error processing download: %s", e)
+            finally:
+                self.hosts.end(host)
+                in_flight -= 1
+                if indices.settle(index, outcome):
+                    stopped = True
+                await notify()
+
+        reader = asyncio.ensure_future(read_pages())
+        try:
+            while not finished():
+                if not may_start():
+                    await wait(may_start)
+                    continue
+                if self._dispatch_gate is not None:
+                    await asyncio.to_thread(self._dispatch_gate)
+                taken = pending.pop()
+                if not isinstance(taken, tuple):
+                    if pages_done and not len(pending):
+                        break
+                    await wait(lambda seen=version: version != seen, min(taken, _POLL_INTERVAL))
+                    continue
+                link, host = taken
+                in_flight += 1
+                task = asyncio.ensure_future(download(link, host, indices.claim()))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if reader.done():
+                reader.result()  # re-raise a page-fetch error
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        finally:
+            if not reader.done():
+                reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+            aclose = getattr(pages, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    # --- HTTP helpers ---
+
+    async def _http_open_async(self, url: str, headers: dict | None = None):
+        """Open ``url`` with the default headers merged with overrides; body unread."""
+        merged = dict(DEFAULT_HEADERS)
+        if headers:
+            merged.update(headers)
+        return await self.async_transport.open(url, merged, timeout=self.timeout)
+
+    async def _http_get_async(self, url: str, headers: dict | None = None) -> bytes:
+        """GET ``url`` and return the whole body."""
+        async with await self._http_open_async(url, headers) as response:
+            data: bytes = await response.read()
+            return data
+
+    # --- Download pipeline ---
+
+    async def download_image_async(self, link: str, index: int):
+        """Download and save a single image; see :meth:`ImageEngine.download_image`."""
+        try:
+            file_path = self._image_target(link, index)
+            if file_path is None:
+                return 0
+            if await self.save_image_async(link, file_path):
+                return self._record_download(link, index, file_path)
+            return None
+        except Exception as e:
+            logging.error("Issue getting image %s: %s", link, e)
+            return None
+
+    async def save_image_async(self, link: str, file_path) -> bool:
+        """Download an image to ``file_path``; ``False`` on any ``ImageSaveError``."""
+        try:
+            await self._save_image_raising_async(link, file_path)
+            return True
+        except ImageSaveError as e:
+            logging.info("Image save skipped: %s", e)
+            return False
+
+    async def _save_image_raising_async(self, link: str, file_path) -> str:
+        """Async :meth:`ImageEngine._save_image_raising`: same checks, same exceptions.
+
+        The body is read without blocking the loop; the temp-file
+        writes, cache lookups, moving the file into place and the
+        :attr:`seen_urls` update run in worker threads.
+        """
+        async with self._recording_seen_url_async(link):
+            async with self._download_slot_async(link):
+                tmp_path, file_hash = await self._fetch_to_temp_async(link, file_path)
+            phash = None
+            near = self.near_duplicates
+            if near is not None and self._wants_perceptual_hash(file_hash):
+                # Decoding runs on the index's executor (a process pool
+                # under ``Downloader``), never on the event loop's thread
+                # unless the index has no executor.
+                future = near.submit(tmp_path)
+                try:
+                    await asyncio.wrap_future(future)
+                except asyncio.CancelledError:
+                    _unlink_quietly(tmp_path)
+                    raise
+                except Exception:
+                    pass  # logged by ``_perceptual_hash``
+                phash = self._perceptual_hash(link, future)
+            return await asyncio.to_thread(
+                self._commit_saved_file, link, tmp_path, file_path, file_hash, phash
+            )
+
+    @contextlib.asynccontextmanager
+    async def _recording_seen_url_async(self, link: str) -> AsyncIterator[None]:
+        """Async :meth:`ImageEngine._recording_seen_url`; the store is written in a thread."""
+        store = self.seen_urls
+        if store is None:
+            yield
+            return
+        try:
+            yield
+        except (NetworkError, WriteError):
+            raise
+        except ImageSaveError:
+            await asyncio.to_thread(store.add, self.url_key(link))
+            raise
+        await asyncio.to_thread(store.add, self.url_key(link))
+
+    @contextlib.asynccontextmanager
+    async def _download_slot_async(self, link: str) -> AsyncIterator[None]:
+        """Async :meth:`ImageEngine._download_slot`."""
+        async with contextlib.AsyncExitStack() as stack:
+            if self.download_share is not None:
+                await stack.enter_async_context(self.download_share.slot_async())
+            started = time.monotonic()
+            error: NetworkError | None = None
+            try:
+                yield
+            except NetworkError as e:
+                error = e
+                raise
+            finally:
+                elapsed = time.monotonic() - started
+                self.hosts.observe(host_of(link), elapsed, error)
+                if self.limiter is not None:
+                    self.limiter.observe(elapsed, error)
+
+    async def _fetch_to_temp_async(self, link: str, file_path) -> tuple[str, str]:
+        """Async :meth:`ImageEngine._fetch_to_temp`."""
+        cached = (
+            await asyncio.to_thread(self._http_cache_entry, link)
+            if self.http_cache is not None
+            else None
+        )
+        try:
+            response = await self._open_image_stream_async(
+                link, cached.validators() if cached else None
+            )
+        except urllib.error.HTTPError as e:
+            if cached is not None and e.code == 304:
+                return await self._revalidated_async(link, file_path, cached)
+            raise NetworkError(url=link, message=f"network error: {e}") from e
+        except urllib.error.URLError as e:
+            raise NetworkError(url=link, message=f"network error: {e}") from e
+        except Exception as e:
+            raise NetworkError(url=link, message=f"unexpected error: {e}") from e
+
+        # ``AsyncTransport`` returns a 304 as a normal, empty response.
+        if cached is not None and getattr(response, "status", None) == 304:
+            await response.aclose()
+            return await self._revalidated_async(link, file_path, cached)
+
+        try:
+            # ``_save_steps`` creates and writes the temp file, so each
+            # step runs in a worker thread; only the reads stay here.
+            steps = self._save_steps(link, file_path, _content_length(response))
+            finished, value = await asyncio.to_thread(_advance, steps.send, None)
+            while not finished:
+                try:
+                    chunk = await self._read_body_chunk_async(response, value, link)
+                except BaseException as e:
+                    finished, value = await asyncio.to_thread(_advance, steps.throw, e)
+                else:
+                    finished, value = await asyncio.to_thread(_advance, steps.send, chunk)
+            result: tuple[str, str] = value
+        finally:
+            await response.aclose()
+        if self.http_cache is not None:
+            await asyncio.to_thread(self._store_in_http_cache, link, response, *result)
+        return result
+
+    async def _revalidated_async(
+        self, link: str, file_path, entry: HTTPCacheEntry
+    ) -> tuple[str, str]:
+        """Reuse the cached body after a 304, or fetch ``link`` in full if it is unusable."""
+        reused = await asyncio.to_thread(self._reuse_cached_body, link, file_path, entry)
+        if reused is not None:
+            return reused
+        return await self._fetch_to_temp_async(link, file_path)
+
+    async def _open_image_stream_async(self, url: str, headers: dict | None = None):
+        # An overridden ``_http_get`` is honoured here too (see
+        # ``ImageEngine._open_image_stream``).
+        if type(self)._http_get is not _BASE_HTTP_GET:
+            if headers:
+                return _MemoryResponse(self._http_get(url, headers))
+            return _MemoryResponse(self._http_get(url))
+        if headers:
+            return await self._http_open_async(url, headers)
+        return await self._http_open_async(url)
+
+    async def _read_body_chunk_async(self, response, size: int, link: str) -> bytes:
+        try:
+            chunk: bytes = await response.read(size)
+        except Exception as e:
+            raise NetworkError(url=link, message=f"network error: {e}") from e
+        return chunk
+
+
+def _advance(step: Any, arg: Any) -> tuple[bool, Any]:
+    """Run one step of a generator: ``(False, yielded)`` or ``(True, returned)``.
+
+    ``StopIteration`` can't cross ``asyncio.to_thread``, so the
+    generator's return value is passed back as a flag instead.
+    """
+    try:
+        return False, step(arg)
+    except StopIteration as done:
+        return True, done.value
+
+
+class _MemoryResponse:
+    """Serve in-memory bytes through the async response interface."""
+
+    headers = None
+
+    def __init__(self, data: bytes) -> None:
+        self._body = io.BytesIO(data)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self._body.read(size)
+
+    async def aclose(self) -> None:
+        self._body.close()
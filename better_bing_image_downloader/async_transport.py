@@ -0,0 +1,496 @@
+"""Non-blocking HTTP/1.1 transport for the asyncio engines (v3.7.0+).
+
+:class:`AsyncTransport` is the event-loop counterpart of
+:class:`~better_bing_image_downloader.transport.PooledTransport`: a
+small HTTP/1.1 client on top of ``asyncio.open_connection`` that keeps
+idle keep-alive connections per ``(scheme, host, port)``, so hundreds
+of downloads can be in flight from one thread without an OS thread
+each. It deliberately stays stdlib-only, like the rest of the package.
+
+What it supports: ``GET`` over HTTP and HTTPS, ``Content-Length``,
+chunked, and read-until-close bodies, redirects, cookies (through an
+``http.cookiejar.CookieJar``, typically the ``Downloader``'s), and
+per-operation timeouts. Errors surface as ``urllib.error.HTTPError`` /
+``urllib.error.URLError`` so engine code handles both transports the
+same way. Proxies are not supported: with ``HTTP(S)_PROXY`` set,
+:meth:`Downloader.search_async` runs the built-in engines on the
+threaded transports instead.
+
+Idle connections belong to the event loop that opened them. One
+transport can serve several loops (e.g. successive ``asyncio.run``
+calls); each gets its own pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.parser
+import http.client
+import http.cookiejar
+import ssl
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import weakref
+from typing import Any
+
+from .transport import DEFAULT_IDLE_TIMEOUT, DEFAULT_MAX_IDLE_PER_HOST, PoolStats
+
+__all__ = ["AsyncResponse", "AsyncTransport"]
+
+# Redirect hops followed before giving up, same as urllib's
+# ``HTTPRedirectHandler.max_redirections``.
+MAX_REDIRECTS = 10
+
+_REDIRECT_CODES = {301, 302, 303, 307, 308}
+_MAX_LINE = 64 * 1024
+_MAX_HEADERS = 100
+
+
+class _Connection:
+    __slots__ = ("key", "reader", "writer", "idle_since")
+
+    def __init__(self, key: tuple, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.key = key
+        self.reader = reader
+        self.writer = writer
+        self.idle_since = 0.0
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except RuntimeError:  # the owning loop is already closed
+            pass
+
+
+class _LoopPool:
+    """Idle connections for one event loop, LIFO per key."""
+
+    def __init__(self) -> None:
+        self.idle: dict[tuple, list[_Connection]] = {}
+
+    def pop(self, key: tuple, idle_timeout: float) -> tuple[_Connection | None, int]:
+        """Return a live idle connection for ``key`` and how many stale ones were dropped."""
+        conns = self.idle.get(key)
+        dropped = 0
+        now = time.monotonic()
+        while conns:
+            conn = conns.pop()
+            if now - conn.idle_since > idle_timeout or conn.reader.at_eof():
+                conn.close()
+                dropped += 1
+                continue
+            return conn, dropped
+        return None, dropped
+
+    def close(self) -> None:
+        for conns in self.idle.values():
+            for conn in conns:
+                conn.close()
+        self.idle.clear()
+
+
+class AsyncResponse:
+    """A streamed response from :meth:`AsyncTransport.open`.
+
+    Read the body with ``await response.read(n)`` (``b""`` at the end)
+    and release it with ``await response.aclose()`` or ``async with``.
+    A fully-read body returns its connection to the pool; closing
+    early discards the connection.
+
+    Attributes
+    ----------
+    url : str
+        Final URL after redirects.
+    status : int
+        HTTP status code.
+    reason : str
+        HTTP reason phrase.
+    headers : http.client.HTTPMessage
+        Response headers (case-insensitive ``get``).
+    """
+
+    def __init__(
+        self,
+        transport: AsyncTransport,
+        conn: _Connection,
+        url: str,
+        status: int,
+        reason: str,
+        headers: http.client.HTTPMessage,
+        will_close: bool,
+        timeout: float,
+    ) -> None:
+        self._transport = transport
+        self._conn: _Connection | None = conn
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self._will_close = will_close
+        self._timeout = timeout
+        self._chunked = False
+        self._remaining: int | None = None  # bytes left; None = until close
+        self._chunk_left = 0
+        self._done = False
+        encoding = headers.get("Transfer-Encoding", "").lower()
+        if status in (204, 304) or 100 <= status < 200:
+            self._remaining = 0
+        elif "chunked" in encoding:
+            self._chunked = True
+        else:
+            length = headers.get("Content-Length")
+            if length is not None and length.strip().isdigit():
+                self._remaining = int(length)
+            else:
+                self._will_close = True
+        if self._remaining == 0:
+            self._finish()
+
+    # --- Body ---
+
+    async def read(self, size: int = -1) -> bytes:
+        """Read up to ``size`` body bytes (all remaining if negative)."""
+        if self._done or self._conn is None:
+            return b""
+        if size is None or size < 0:
+            parts = []
+            while True:
+                chunk = await self.read(64 * 1024)
+                if not chunk:
+                    return b"".join(parts)
+                parts.append(chunk)
+        try:
+            if self._chunked:
+                data = await self._read_chunked(size)
+            elif self._remaining is not None:
+                data = await self._recv(min(size, self._remaining))
+                if not data:
+                    raise http.client.IncompleteRead(b"", self._remaining)
+                self._remaining -= len(data)
+                if self._remaining == 0:
+                    self._finish()
+            else:
+                data = await self._recv(size)
+                if not data:
+                    self._finish()
+        except BaseException:
+            self._discard()
+            raise
+        return data
+
+    async def _read_chunked(self, size: int) -> bytes:
+        if self._chunk_left == 0:
+            line = await self._readline()
+            try:
+                self._chunk_left = int(line.split(b";", 1)[0].strip(), 16)
+            except ValueError:
+                raise http.client.IncompleteRead(b"") from None
+            if self._chunk_left == 0:
+                # Trailer section, ends with an empty line.
+                while (await self._readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                self._finish()
+                return b""
+        data = await self._recv(min(size, self._chunk_left))
+        if not data:
+            raise http.client.IncompleteRead(b"", self._chunk_left)
+        self._chunk_left -= len(data)
+        if self._chunk_left == 0:
+            await self._readline()  # CRLF after the chunk data
+        return data
+
+    async def _recv(self, size: int) -> bytes:
+        assert self._conn is not None
+        return await asyncio.wait_for(self._conn.reader.read(size), self._timeout)
+
+    async def _readline(self) -> bytes:
+        assert self._conn is not None
+        line = await asyncio.wait_for(self._conn.reader.readline(), self._timeout)
+        if len(line) > _MAX_LINE:
+            raise http.client.LineTooLong("chunk size")
+        return line
+
+    # --- Lifecycle ---
+
+    def _finish(self) -> None:
+        """The body has been fully read: hand the connection back."""
+        self._done = True
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._transport._release(conn, reusable=not self._will_close)
+
+    def _discard(self) -> None:
+        conn, self._conn = self._conn, None
+        self._done = True
+        if conn is not None:
+            self._transport._release(conn, reusable=False)
+
+    async def aclose(self) -> None:
+        """Release the response; an unread body closes the connection."""
+        self._discard()
+
+    async def __aenter__(self) -> AsyncResponse:
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+
+class AsyncTransport:
+    """Keep-alive HTTP/1.1 client for asyncio code.
+
+    Parameters
+    ----------
+    cookie_jar : http.cookiejar.CookieJar | None
+        Jar to send cookies from and store ``Set-Cookie`` headers in.
+        ``Downloader`` passes its session jar so the threaded and the
+        asyncio engines share one session.
+    max_idle_per_host : int
+        Idle connections kept per ``(scheme, host, port)``; ``0``
+        disables reuse.
+    idle_timeout : float
+        Seconds an idle connection may sit in the pool before it is
+        closed instead of reused.
+    ssl_context : ssl.SSLContext | None
+        Context for HTTPS connections. Defaults to
+        ``ssl.create_default_context()``.
+
+    Raises
+    ------
+    ValueError
+        If ``max_idle_per_host`` is negative.
+    """
+
+    def __init__(
+        self,
+        cookie_jar: http.cookiejar.CookieJar | None = None,
+        max_idle_per_host: int = DEFAULT_MAX_IDLE_PER_HOST,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        ssl_context: ssl.SSLContext | None = None,
+    ) -> None:
+        if max_idle_per_host < 0:
+            raise ValueError(f"max_idle_per_host must be >= 0, got {max_idle_per_host}")
+        self.cookie_jar = cookie_jar
+        self.max_idle_per_host = max_idle_per_host
+        self.idle_timeout = idle_timeout
+        self._ssl_context = ssl_context
+        self._pools: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._requests = 0
+        self._created = 0
+        self._reused = 0
+        self._discarded = 0
+
+    # --- Requests ---
+
+    async def open(
+        self, url: str, headers: dict | None = None, timeout: float = 60.0
+    ) -> AsyncResponse:
+        """``GET`` ``url`` and return the response with its body unread.
+
+        Follows redirects. Raises ``urllib.error.HTTPError`` for a
+        status of 400 or above and ``urllib.error.URLError`` for
+        connection failures and timeouts.
+        """
+        headers = dict(headers or {})
+        for _ in range(MAX_REDIRECTS + 1):
+            response = await self._request(url, headers, timeout)
+            location = response.headers.get("Location")
+            if response.status in _REDIRECT_CODES and location:
+                await response.aclose()
+                url = urllib.parse.urljoin(url, location)
+                continue
+            if response.status >= 400:
+                await response.aclose()
+                raise urllib.error.HTTPError(
+                    url, response.status, response.reason, response.headers, None
+                )
+            return response
+        raise urllib.error.HTTPError(
+            url, response.status, "too many redirects", response.headers, None
+        )
+
+    async def _request(self, url: str, headers: dict, timeout: float) -> AsyncResponse:
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise urllib.error.URLError(f"unsupported URL: {url!r}")
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname, port)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+
+        request_headers = {k.title(): v for k, v in headers.items()}
+        default_port = 443 if scheme == "https" else 80
+        request_headers["Host"] = (
+            parts.hostname if port == default_port else f"{parts.hostname}:{port}"
+        )
+        request_headers.setdefault("Connection", "keep-alive")
+        if self.cookie_jar is not None:
+            cookie = _cookie_header(self.cookie_jar, url, headers)
+            if cookie:
+                request_headers["Cookie"] = cookie
+        lines = [f"GET {target} HTTP/1.1"]
+        lines += [f"{k}: {v}" for k, v in request_headers.items()]
+        payload = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        self._requests += 1
+        pool = self._pool()
+        conn, stale = pool.pop(key, self.idle_timeout)
+        self._discarded += stale
+        if conn is not None:
+            self._reused += 1
+            try:
+                return await self._exchange(conn, url, payload, timeout)
+            except ConnectionError:
+                # The server closed the idle socket under us; retry
+                # once on a fresh connection.
+                self._discarded += 1
+        conn = await self._connect(key, timeout)
+        try:
+            return await self._exchange(conn, url, payload, timeout)
+        except ConnectionError as e:
+            raise urllib.error.URLError(e) from e
+
+    async def _connect(self, key: tuple, timeout: float) -> _Connection:
+        scheme, host, port = key
+        ssl_arg: Any = None
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            ssl_arg = self._ssl_context
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(
+                    host, port, ssl=ssl_arg, server_hostname=host if ssl_arg else None
+                ),
+                timeout,
+            )
+        except asyncio.TimeoutError as e:
+            raise urllib.error.URLError(f"timed out connecting to {host}:{port}") from e
+        except OSError as e:
+            raise urllib.error.URLError(e) from e
+        self._created += 1
+        return _Connection(key, reader, writer)
+
+    async def _exchange(
+        self, conn: _Connection, url: str, payload: bytes, timeout: float
+    ) -> AsyncResponse:
+        try:
+            conn.writer.write(payload)
+            await asyncio.wait_for(conn.writer.drain(), timeout)
+            status_line = await asyncio.wait_for(conn.reader.readline(), timeout)
+            if not status_line:
+                raise http.client.RemoteDisconnected("connection closed before response")
+            version, status, reason = _parse_status_line(status_line)
+            header_lines = []
+            while True:
+                line = await asyncio.wait_for(conn.reader.readline(), timeout)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                header_lines.append(line)
+                if len(header_lines) > _MAX_HEADERS:
+                    raise http.client.HTTPException("got more than 100 headers")
+        except asyncio.TimeoutError as e:
+            conn.close()
+            raise urllib.error.URLError(f"timed out reading {url}") from e
+        except ConnectionError:
+            conn.close()
+            raise
+        except OSError as e:
+            conn.close()
+            raise urllib.error.URLError(e) from e
+        except http.client.HTTPException as e:
+            conn.close()
+            raise urllib.error.URLError(e) from e
+
+        headers = email.parser.Parser(_class=http.client.HTTPMessage).parsestr(
+            b"".join(header_lines).decode("iso-8859-1")
+        )
+        if self.cookie_jar is not None:
+            self.cookie_jar.extract_cookies(
+                _CookieResponse(headers), urllib.request.Request(url)  # type: ignore[arg-type]
+            )
+        connection = headers.get("Connection", "").lower()
+        will_close = connection == "close" or (version == 10 and connection != "keep-alive")
+        return AsyncResponse(self, conn, url, status, reason, headers, will_close, timeout)
+
+    # --- Pool management ---
+
+    def _pool(self) -> _LoopPool:
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            pool = self._pools[loop] = _LoopPool()
+        return pool
+
+    def _release(self, conn: _Connection, reusable: bool) -> None:
+        pool = None
+        try:
+            pool = self._pools.get(asyncio.get_running_loop())
+        except RuntimeError:
+            pass
+        idle = pool.idle.setdefault(conn.key, []) if pool is not None else None
+        if not reusable or idle is None or len(idle) >= self.max_idle_per_host:
+            self._discarded += 1
+            conn.close()
+            return
+        conn.idle_since = time.monotonic()
+        idle.append(conn)
+
+    def stats(self) -> PoolStats:
+        """Return connection counters summed over every event loop."""
+        pools = list(self._pools.values())
+        return PoolStats(
+            requests=self._requests,
+            connections_created=self._created,
+            connections_reused=self._reused,
+            connections_discarded=self._discarded,
+            idle=sum(len(c) for p in pools for c in p.idle.values()),
+            hosts=sum(1 for p in pools for c in p.idle.values() if c),
+        )
+
+    async def aclose(self) -> None:
+        """Close the idle connections of the running loop's pool."""
+        pool = self._pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            pool.close()
+
+    def close(self) -> None:
+        """Close every idle connection on every loop. Idempotent."""
+        pools = list(self._pools.values())
+        self._pools = weakref.WeakKeyDictionary()
+        for pool in pools:
+            pool.close()
+
+
+class _CookieResponse:
+    """The one method ``CookieJar.extract_cookies`` needs from a response."""
+
+    def __init__(self, headers: http.client.HTTPMessage) -> None:
+        self._headers = headers
+
+    def info(self) -> http.client.HTTPMessage:
+        return self._headers
+
+
+def _cookie_header(jar: http.cookiejar.CookieJar, url: str, headers: dict) -> str | None:
+    request = urllib.request.Request(url, headers=headers)
+    jar.add_cookie_header(request)
+    return request.get_header("Cookie")
+
+
+def _parse_status_line(line: bytes) -> tuple[int, int, str]:
+    """Parse ``HTTP/1.1 200 OK`` into ``(11, 200, "OK")``."""
+    text = line.decode("iso-8859-1").rstrip("\r\n")
+    parts = text.split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+        raise http.client.BadStatusLine(text)
+    version = 10 if parts[0] == "HTTP/1.0" else 11
+    try:
+        status = int(parts[1])
+    except ValueError:
+        raise http.client.BadStatusLine(text) from None
+    return version, status, parts[2] if len(parts) > 2 else ""
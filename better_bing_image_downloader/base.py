@@ -7,20 +7,39 @@ identical. That logic lives here.
 
 from __future__ import annotations
 
+import contextlib
 import hashlib
+import io
 import logging
+import os
 import posixpath
 import shutil
 import tempfile
 import threading
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
 
 import filetype
 
+from .adaptive import AdaptiveLimit
+from .bloom import ScalableBloomFilter
+from .hashindex import HashIndex
+from .hosts import DEFAULT_MAX_PER_HOST, HostTracker, host_of
+from .httpcache import HTTPCache, HTTPCacheEntry
+from .pagecache import PageCache
+from .perceptual import DEFAULT_NEAR_DUPLICATE_DISTANCE, NearDuplicateIndex
+from .pipeline import DownloadPipeline, holds_dispatched_slot
+from .scheduler import DownloadShare
+from .seenurls import SeenURLStore
+from .transport import Transport, UrllibTransport
+from .urls import URLCanonicalizer, canonicalize_url
+
 __all__ = [
     "DEFAULT_VERBOSE",
     "ImageEngine",
@@ -30,6 +49,9 @@ __all__ = [
     "DuplicateImageError",
     "WriteError",
     "BelowMinDimension",
+    "ImageSkipped",
+    "OutsideByteLimits",
+    "NearDuplicateImage",
     "MAX_FUTURE_TIMEOUT",
     "VALID_IMAGE_EXTENSIONS",
 ]
@@ -37,6 +59,10 @@ __all__ = [
 # How long a single parallel download future may block before we give up.
 MAX_FUTURE_TIMEOUT = 180.0  # seconds
 
+# Upper bound on ``max_workers``, and the ceiling an adaptive run
+# (``adaptive=True``) may grow its concurrency to.
+MAX_WORKERS = 16
+
 
 class ImageSaveError(Exception):
     """Base class for save_image failures surfaced by ``Downloader.search``.
@@ -89,7 +115,11 @@ class InvalidImageError(ImageSaveError):
 
 
 class DuplicateImageError(ImageSaveError):
-    """An image with the same MD5 hash has already been saved this run."""
+    """An image with the same MD5 hash has already been saved.
+
+    Either earlier in this run or, when the engine has a ``hash_index``
+    (v3.7.0+), by any run that recorded into that index.
+    """
 
     def __init__(self, url: str, message: str = "") -> None:
         if not message:
@@ -106,7 +136,16 @@ class WriteError(ImageSaveError):
         super().__init__(reason="write_failed", url=url, message=message)
 
 
-class BelowMinDimension(ImageSaveError):
+class ImageSkipped(ImageSaveError):
+    """Base class for images rejected by a user-configured filter (v3.7.0+).
+
+    ``Downloader.search`` records subclasses of this as ``"skipped"``
+    manifest records counted in ``Result.skipped``, rather than as
+    errors: a filtered image is an intentional outcome, not a failure.
+    """
+
+
+class BelowMinDimension(ImageSkipped):
     """The fetched image's width or height is below ``min_dimension`` (v3.6.0+).
 
     Raised by ``_save_image_raising`` when ``self.min_dimension`` is set
@@ -132,6 +171,65 @@ class BelowMinDimension(ImageSaveError):
         super().__init__(reason="below_min_dimension", url=url, message=message)
 
 
+class OutsideByteLimits(ImageSkipped):
+    """The image body is smaller than ``min_bytes`` or larger than ``max_bytes`` (v3.7.0+).
+
+    Raised by ``_save_image_raising`` as soon as the size is known to
+    be out of range: from ``Content-Length`` before any body byte is
+    read when the server sends it, otherwise while streaming (the
+    download is aborted the moment ``max_bytes`` is crossed). Like
+    :class:`BelowMinDimension`, ``Downloader.search`` records it as a
+    ``"skipped"`` manifest record and counts it in ``Result.skipped``.
+
+    Attributes
+    ----------
+    size : int
+        The body size in bytes, or the number of bytes read when the
+        download was aborted for exceeding ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        size: int,
+        min_bytes: int | None = None,
+        max_bytes: int | None = None,
+        message: str = "",
+    ) -> None:
+        self.size = size
+        self.min_bytes = min_bytes
+        self.max_bytes = max_bytes
+        if not message:
+            if max_bytes is not None and size > max_bytes:
+                message = f"image larger than max_bytes at {url!r}: {size} > {max_bytes}"
+            else:
+                message = f"image smaller than min_bytes at {url!r}: {size} < {min_bytes}"
+        super().__init__(reason="byte_limit", url=url, message=message)
+
+
+class NearDuplicateImage(ImageSkipped):
+    """The image looks like one already saved (v3.7.0+).
+
+    Raised by ``_save_image_raising`` when the engine has a
+    ``near_duplicates`` index and the image's perceptual hash is within
+    ``near_duplicate_distance`` bits of a hash in it: typically the
+    same picture re-encoded at another size or quality. Recorded as a
+    ``"skipped"`` manifest record, like the other ``ImageSkipped``
+    subclasses.
+
+    Attributes
+    ----------
+    distance : int
+        Hamming distance to the closest saved image's hash.
+    """
+
+    def __init__(self, url: str, distance: int, message: str = "") -> None:
+        self.distance = distance
+        if not message:
+            message = f"near-duplicate image at {url!r} (hash distance {distance})"
+        super().__init__(reason="near_duplicate", url=url, message=message)
+
+
 # Extensions we accept when renaming downloaded images. Bing sometimes
 # returns URLs without an extension, so we use this set for the fallback.
 VALID_IMAGE_EXTENSIONS = {
@@ -164,6 +262,15 @@ DEFAULT_HEADERS = {
 
 DEFAULT_VERBOSE = False
 
+# Streaming image saves read this much of the body up front: enough
+# for ``filetype`` and for the size fields of every format
+# ``_read_image_dimensions`` understands, except JPEG, whose SOF marker
+# may follow a large EXIF block. For JPEG we keep reading (in stream
+# chunks) until the SOF shows up or ``IMAGE_SNIFF_MAX_BYTES`` is hit.
+IMAGE_SNIFF_BYTES = 8 * 1024
+IMAGE_SNIFF_MAX_BYTES = 256 * 1024
+IMAGE_STREAM_CHUNK_SIZE = 64 * 1024
+
 
 def _read_jpeg_dimensions(data: bytes) -> tuple[int, int] | None:
     """Walk JPEG markers looking for a Start-Of-Frame (SOFn) segment."""
@@ -297,6 +404,22 @@ class ImageEngine(ABC):
         force_replace: bool = False,
         cancel=None,
         min_dimension: int | None = None,
+        transport: Transport | None = None,
+        min_bytes: int | None = None,
+        max_bytes: int | None = None,
+        executor: Executor | None = None,
+        download_share: DownloadShare | None = None,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+        min_host_delay: float = 0.0,
+        adaptive: bool = False,
+        hash_index: HashIndex | str | os.PathLike | None = None,
+        near_duplicates: NearDuplicateIndex | None = None,
+        near_duplicate_distance: int = DEFAULT_NEAR_DUPLICATE_DISTANCE,
+        canonicalize_urls: URLCanonicalizer | bool = True,
+        seen_urls: SeenURLStore | str | os.PathLike | None = None,
+        seen_error_rate: float | None = None,
+        page_cache: PageCache | None = None,
+        http_cache: HTTPCache | str | os.PathLike | None = None,
     ):
         # Abstract base class — subclasses MUST override ``run()``.
         # The abstractmethod below is what makes
@@ -314,7 +437,7 @@ class ImageEngine(ABC):
         self.verbose = verbose
         self.badsites = set(badsites) if badsites is not None else set()
         self.image_name = name
-        self.max_workers = max(1, min(max_workers, 16))
+        self.max_workers = max(1, min(max_workers, MAX_WORKERS))
         self.force_replace = force_replace
         # ``cancel`` is an optional ``CancelToken`` (from
         # ``downloader.py``). The base class stores it; concrete
@@ -328,21 +451,137 @@ class ImageEngine(ABC):
         # in their own constructors and forward via ``super().__init__()``;
         # ``Downloader.search`` routes it through ``engine_kwargs``.
         self.min_dimension: int | None = min_dimension
-
-        self.seen: set[str] = set()
+        # ``min_bytes`` / ``max_bytes`` (v3.7.0+): allowed range for the
+        # image body size. ``None`` disables either bound. Enforced
+        # from ``Content-Length`` when present and by counting bytes
+        # while streaming otherwise; see ``OutsideByteLimits``.
+        for label, bound in (("min_bytes", min_bytes), ("max_bytes", max_bytes)):
+            if bound is not None and bound < 0:
+                raise ValueError(f"{label} must be >= 0, got {bound}")
+        if min_bytes is not None and max_bytes is not None and min_bytes > max_bytes:
+            raise ValueError(f"min_bytes ({min_bytes}) must not exceed max_bytes ({max_bytes})")
+        self.min_bytes: int | None = min_bytes
+        self.max_bytes: int | None = max_bytes
+        # ``transport`` is the HTTP layer every request goes through:
+        # image bodies here, and search pages in the subclasses.
+        # ``Downloader`` injects a shared keep-alive ``PooledTransport``;
+        # engines constructed directly fall back to
+        # :meth:`_default_transport` (one connection per request).
+        self.transport: Transport = (
+            transport if transport is not None else self._default_transport()
+        )
+        # ``executor`` (v3.7.0+) is a long-lived worker pool to run
+        # downloads on, normally the one owned by ``Downloader``. The
+        # engine never shuts it down. ``None`` means each run creates
+        # (and joins) its own ``max_workers``-thread executor.
+        self.executor: Executor | None = executor
+        # ``download_share`` (v3.7.0+) is this run's claim on the
+        # ``Downloader``'s global download budget; a slot is held only
+        # while an image body is being fetched. ``None`` means no
+        # limit beyond ``max_workers``.
+        self.download_share: DownloadShare | None = download_share
+        # ``hosts`` (v3.7.0+) tracks per-host concurrency, latency, and
+        # throttling; the download pipelines dispatch links through it
+        # so no single CDN gets more than ``max_per_host`` requests at
+        # once or less than ``min_host_delay`` seconds between them.
+        self.hosts = HostTracker(max_per_host, min_host_delay)
+        # ``limiter`` (v3.7.0+, ``adaptive=True``) resizes the run's
+        # concurrency from observed latency and errors, starting at
+        # ``max_workers`` and growing up to ``MAX_WORKERS``. ``None``
+        # keeps the fixed ``max_workers``.
+        self.limiter: AdaptiveLimit | None = (
+            AdaptiveLimit(initial=self.max_workers, maximum=MAX_WORKERS) if adaptive else None
+        )
+
+        # ``seen_error_rate`` (v3.7.0+) keeps the per-run sets of
+        # links, link keys, and image digests in a
+        # ``ScalableBloomFilter`` with that false-positive bound
+        # instead of a ``set``: a few bytes per entry in place of the
+        # string itself, at the cost of skipping that fraction of new
+        # links or images as already seen (see ``bloom.py``).
+        if seen_error_rate is not None and not 0 < seen_error_rate < 1:
+            raise ValueError(f"seen_error_rate must be between 0 and 1, got {seen_error_rate}")
+        self.seen_error_rate = seen_error_rate
+        self.seen: set[str] | ScalableBloomFilter = self._seen_set()
+        # ``url_key`` (v3.7.0+) maps a link to the key links are
+        # compared by: its canonical form (see ``urls.py``) unless
+        # ``canonicalize_urls=False``, in which case the raw string.
+        # ``_seen_keys`` holds the keys of every link handed out by
+        # ``_filter_new_links`` this run.
+        if canonicalize_urls is True:
+            canonicalize_urls = canonicalize_url
+        self.url_key: Callable[[str], str] = canonicalize_urls or str
+        self._seen_keys: set[str] | ScalableBloomFilter = self._seen_set()
+        # ``seen_urls`` (v3.7.0+) remembers fetched links across runs:
+        # links in it are dropped from results pages before anything
+        # is requested (see ``seenurls.py``).
+        self.seen_urls: SeenURLStore | None = (
+            seen_urls
+            if seen_urls is None or isinstance(seen_urls, SeenURLStore)
+            else SeenURLStore(seen_urls)
+        )
+        # ``page_cache`` (v3.7.0+) holds the links extracted from
+        # results pages fetched earlier, keyed by
+        # :meth:`_page_cache_key`; engines only request pages it
+        # doesn't have (see ``pagecache.py``).
+        self.page_cache: PageCache | None = page_cache
+        # ``http_cache`` (v3.7.0+) keeps the validators and bodies of
+        # downloaded images; later fetches of the same URL are
+        # conditional and a ``304`` reuses the stored body (see
+        # ``httpcache.py``).
+        self.http_cache: HTTPCache | None = (
+            http_cache
+            if http_cache is None or isinstance(http_cache, HTTPCache)
+            else HTTPCache(http_cache)
+        )
         self.download_count = 0  # newly downloaded this run
         self._slots_used = 0  # slots consumed (downloaded + skipped existing)
         self.download_callback = None
         self._count_lock = threading.Lock()
         self.manifest: dict = {}  # filename -> source URL
-        self._file_hashes: set = set()
+        # ``_file_hashes`` holds the MD5 of every image saved this run;
+        # ``_pending_hashes`` those of saves still in progress, which
+        # must be dropped again if the save fails (a Bloom filter
+        # can't remove keys).
+        self._file_hashes: set[str] | ScalableBloomFilter = self._seen_set()
+        self._pending_hashes: set[str] = set()
         self._hash_lock = threading.Lock()
+        # ``hash_index`` (v3.7.0+) extends MD5 deduplication across
+        # runs: images whose digest it already holds are rejected as
+        # duplicates, and every saved image's digest is appended to
+        # it. A path is opened as a private ``HashIndex``; pass an
+        # instance to share one between engines.
+        self.hash_index: HashIndex | None = (
+            hash_index
+            if hash_index is None or isinstance(hash_index, HashIndex)
+            else HashIndex(hash_index)
+        )
+        # ``near_duplicates`` (v3.7.0+) adds a perceptual-hash stage:
+        # an image whose dHash is within ``near_duplicate_distance``
+        # bits of one already in the index is skipped as a
+        # ``NearDuplicateImage``. See ``perceptual.py``.
+        if near_duplicate_distance < 0:
+            raise ValueError(f"near_duplicate_distance must be >= 0, got {near_duplicate_distance}")
+        self.near_duplicates: NearDuplicateIndex | None = near_duplicates
+        self.near_duplicate_distance = near_duplicate_distance
         # ``last_page_url`` (v3.5.0+) is the URL of the most recently
         # fetched search-results page. Set by each engine's ``run()``
         # method after a page fetch; read by the manifest writer to
         # capture per-image provenance. ``None`` until the first page
         # fetch; remains ``None`` for engines that don't track it.
         self.last_page_url: str | None = None
+        # ``_source_pages`` (v3.7.0+) maps each link handed to the
+        # download pipeline to the page it came from. With page fetches
+        # running ahead of downloads, ``last_page_url`` may already
+        # point at a later page by the time an image is saved; see
+        # :meth:`source_page_for`.
+        self._source_pages: dict[str, str | None] = {}
+        # ``_existing`` (v3.7.0+) indexes the ``{name}_{N}.*`` files in
+        # ``output_dir`` by image number, for O(1) resume checks. Built
+        # by one directory scan the first time it is needed (see
+        # :meth:`_existing_index`) and kept current as images are saved.
+        self._existing: dict[int, str] | None = None
+        self._existing_lock = threading.Lock()
 
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -368,19 +607,230 @@ class ImageEngine(ABC):
     image_name: str
     max_workers: int
     force_replace: bool
+    transport: Transport
+    executor: Executor | None
+    download_share: DownloadShare | None
+    hosts: HostTracker
+    limiter: AdaptiveLimit | None
+
+    # Pipelined runs (v3.7.0+): how many links the page fetcher may read
+    # ahead of the downloads (at most, and per unit of concurrency), and
+    # how many failed downloads in a row end the run early.
+    PIPELINE_QUEUE_SIZE = 128
+    PIPELINE_READ_AHEAD_PER_WORKER = 4
+    # Called by the pipelines before each download is dispatched; may
+    # block to pause the run. ``Downloader.iter_search`` sets it to
+    # wait while the stream's consumer is behind.
+    _dispatch_gate: Callable[[], None] | None = None
+    MAX_CONSECUTIVE_FAILURES = 100
+
+    # --- Pipelined runs ---
+
+    def _run_pipeline(self, pages: Iterable[list[str]]) -> None:
+        """Download links from ``pages`` while later pages are still being fetched.
+
+        ``pages`` is a generator of filtered link lists, one per results
+        page. It runs on a background thread, so page requests overlap
+        with image downloads instead of alternating with them. Returns
+        once ``limit`` is reached, the pages run out, or the run is
+        cancelled. See :class:`~better_bing_image_downloader.pipeline.DownloadPipeline`.
+        """
+        DownloadPipeline(
+            self,
+            pages,
+            queue_size=self.PIPELINE_QUEUE_SIZE,
+            max_consecutive_failures=self.MAX_CONSECUTIVE_FAILURES,
+        ).run()
+
+    def _concurrency_limit(self) -> int:
+        """Number of downloads this run may have in flight right now."""
+        return self.limiter.limit if self.limiter is not None else self.max_workers
+
+    def _read_ahead(self) -> int:
+        """Number of links a pipelined run may hold queued or in flight right now.
+
+        Never more than the run can still save (``limit`` minus the
+        images saved so far), so a small ``limit`` does not fetch
+        results pages it will not use; failed downloads free room for
+        more candidates.
+        """
+        wanted = self.limit - self._slots_used
+        per_worker = self.PIPELINE_READ_AHEAD_PER_WORKER * self._concurrency_limit()
+        return max(1, min(self.PIPELINE_QUEUE_SIZE, wanted, per_worker))
+
+    def _pipeline_workers(self) -> int:
+        """Number of download workers a pipelined run starts."""
+        return self.limiter.maximum if self.limiter is not None else self.max_workers
+
+    @contextlib.contextmanager
+    def _download_executor(self) -> Iterator[Executor]:
+        """Yield the executor downloads should be submitted to.
+
+        The injected :attr:`executor` is shared and outlives this
+        engine, so it is yielded as-is; otherwise a private
+        pool sized for :meth:`_pipeline_workers` is created and joined
+        on exit.
+        """
+        if self.executor is not None:
+            yield self.executor
+            return
+        with ThreadPoolExecutor(
+            max_workers=self._pipeline_workers(), thread_name_prefix="bbid-download"
+        ) as executor:
+            yield executor
+
+    @contextlib.contextmanager
+    def _download_slot(self, link: str) -> Iterator[None]:
+        """Hold a slot of the global download budget while fetching ``link``.
+
+        Pipelined downloads already hold one, taken when they were
+        dispatched to the pool, and do not take another.
+        Also times the request and reports it (and any ``NetworkError``)
+        to :attr:`hosts` and, in adaptive mode, to :attr:`limiter`.
+        """
+        with contextlib.ExitStack() as stack:
+            if self.download_share is not None and not holds_dispatched_slot():
+                stack.enter_context(self.download_share.slot())
+            started = time.monotonic()
+            error: NetworkError | None = None
+            try:
+                yield
+            except NetworkError as e:
+                error = e
+                raise
+            finally:
+                elapsed = time.monotonic() - started
+                self.hosts.observe(host_of(link), elapsed, error)
+                if self.limiter is not None:
+                    self.limiter.observe(elapsed, error)
+
+    def _record_source_page(self, link: str, page_url: str | None) -> None:
+        with self._count_lock:
+            self._source_pages[link] = page_url
+
+    def source_page_for(self, link: str) -> str | None:
+        """Return the results page ``link`` was found on.
+
+        Falls back to ``last_page_url`` for links that did not come
+        through :meth:`_run_pipeline` (e.g. custom engines).
+        """
+        with self._count_lock:
+            return self._source_pages.get(link, self.last_page_url)
 
     # --- HTTP helpers ---
 
-    def _http_get(self, url: str, headers: dict | None = None) -> bytes:
-        """GET ``url`` with the engine's default headers merged with overrides."""
+    def _default_transport(self) -> Transport:
+        """Build the transport used when none is passed to ``__init__``.
+
+        Subclasses override this when they need a different default
+        (e.g. DuckDuckGo needs a cookie jar).
+        """
+        return UrllibTransport()
+
+    def _http_open(self, url: str, headers: dict | None = None):
+        """Open ``url`` with the engine's default headers merged with overrides.
+
+        Returns the unread response so callers can stream the body.
+        """
         merged = dict(DEFAULT_HEADERS)
         if headers:
             merged.update(headers)
         request = urllib.request.Request(url, None, headers=merged)
-        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+        return self.transport.open(request, timeout=self.timeout)
+
+    def _http_get(self, url: str, headers: dict | None = None) -> bytes:
+        """GET ``url`` with the engine's default headers merged with overrides."""
+        with self._http_open(url, headers) as response:
             data: bytes = response.read()
             return data
 
+    def _page_cache_key(self, page: int) -> str | None:
+        """Key of results page ``page`` in :attr:`page_cache` (v3.7.0+).
+
+        ``None`` (the default) means the engine's pages are not cached;
+        engines that support caching return a key naming the engine,
+        the page, and every option that changes its results.
+        """
+        return None
+
+    def _cached_page(self, page: int) -> list[str] | None:
+        """Links of results page ``page`` from :attr:`page_cache`, if it holds them."""
+        key = self._page_cache_key(page) if self.page_cache is not None else None
+        if key is None:
+            return None
+        return self.page_cache.get(key)  # type: ignore[union-attr]
+
+    def _cache_page(self, page: int, links: list[str]) -> None:
+        """Store the links extracted from results page ``page`` in :attr:`page_cache`.
+
+        Empty pages are not stored: engines also get them when they
+        are throttled, and the next run should ask again.
+        """
+        key = self._page_cache_key(page) if self.page_cache is not None and links else None
+        if key is not None:
+            self.page_cache.put(key, links)  # type: ignore[union-attr]
+
+    def _seen_set(self) -> set[str] | ScalableBloomFilter:
+        """An empty per-run membership set, compact if ``seen_error_rate`` is set."""
+        if self.seen_error_rate is None:
+            return set()
+        return ScalableBloomFilter(self.seen_error_rate)
+
+    def _filter_new_links(self, links: list[str]) -> list[str]:
+        """Drop links already seen this run or matching a ``badsites`` entry.
+
+        Links are compared by :attr:`url_key` (v3.7.0+), so two URLs
+        for one image count as one; the first is kept.
+        """
+        new = []
+        for link in links:
+            if link in self.seen or any(badsite in link for badsite in self.badsites):
+                continue
+            key = self.url_key(link)
+            if key in self._seen_keys:
+                continue
+            self._seen_keys.add(key)
+            new.append(link)
+        return new
+
+    def _skip_known_urls(self, links: list[str]) -> list[str]:
+        """Drop links that :attr:`seen_urls` says an earlier run already fetched.
+
+        Applied after :meth:`_filter_new_links`, whose result the
+        engines use to decide that the results have run out; a page
+        of links fetched by earlier runs must not end the search.
+        """
+        store = self.seen_urls
+        if store is None or not links:
+            return links
+        keys = [self.url_key(link) for link in links]
+        known = store.known(keys)
+        if not known:
+            return links
+        if self.verbose:
+            logging.info("Skipping %d links fetched by an earlier run", len(known))
+        return [link for link, key in zip(links, keys) if key not in known]
+
+    @contextlib.contextmanager
+    def _recording_seen_url(self, link: str) -> Iterator[None]:
+        """Add ``link`` to :attr:`seen_urls` once its save reached a definite outcome.
+
+        Saved, duplicate, invalid, and filtered images count; network
+        and local write failures don't, so a later run retries them.
+        """
+        store = self.seen_urls
+        if store is None:
+            yield
+            return
+        try:
+            yield
+        except (NetworkError, WriteError):
+            raise
+        except ImageSaveError:
+            store.add(self.url_key(link))
+            raise
+        store.add(self.url_key(link))
+
     def is_cancelled(self) -> bool:
         """Return ``True`` if the user has called ``cancel_token.cancel()``.
 
@@ -415,6 +865,12 @@ class ImageEngine(ABC):
     def _save_image_raising(self, link: str, file_path) -> str:
         """Download an image to ``file_path`` atomically, raising on failure.
 
+        The body is streamed (v3.7.0+): the first few KB are checked
+        for a valid image type and, if ``min_dimension`` is set, for
+        the image size, and the connection is closed right there if
+        either check fails. Accepted bodies are written to a temp file
+        chunk by chunk while the MD5 is computed incrementally.
+
         Returns
         -------
         str
@@ -431,25 +887,156 @@ class ImageEngine(ABC):
         BelowMinDimension
             ``self.min_dimension`` is set and the image's width or
             height is smaller than it (v3.6.0+).
+        OutsideByteLimits
+            The body is smaller than ``self.min_bytes`` or larger than
+            ``self.max_bytes`` (v3.7.0+).
+        NearDuplicateImage
+            ``self.near_duplicates`` is set and holds a perceptual hash
+            close to this image's (v3.7.0+).
         DuplicateImageError
             An image with the same MD5 hash has already been saved
-            this run.
+            this run, or is in ``self.hash_index`` (v3.7.0+).
         WriteError
             Failed to create the temp file or write the image bytes.
         """
+        with self._recording_seen_url(link):
+            with self._download_slot(link):
+                tmp_path, file_hash = self._fetch_to_temp(link, file_path)
+            phash = None
+            near = self.near_duplicates
+            if near is not None and self._wants_perceptual_hash(file_hash):
+                phash = self._perceptual_hash(link, near.submit(tmp_path))
+            return self._commit_saved_file(link, tmp_path, file_path, file_hash, phash)
+
+    def _fetch_to_temp(self, link: str, file_path) -> tuple[str, str]:
+        """Stream ``link`` into a validated temp file; return ``(tmp_path, md5)``."""
+        cached = self._http_cache_entry(link)
         try:
-            image = self._http_get(link)
-        except (urllib.error.HTTPError, urllib.error.URLError) as e:
+            response = self._open_image_stream(link, cached.validators() if cached else None)
+        except urllib.error.HTTPError as e:
+            if cached is not None and e.code == 304:
+                e.close()
+                reused = self._reuse_cached_body(link, file_path, cached)
+                if reused is not None:
+                    return reused
+                return self._fetch_to_temp(link, file_path)
+            raise NetworkError(url=link, message=f"network error: {e}") from e
+        except urllib.error.URLError as e:
             raise NetworkError(url=link, message=f"network error: {e}") from e
         except Exception as e:
             raise NetworkError(url=link, message=f"unexpected error: {e}") from e
 
-        kind = filetype.guess(image)
+        # Leaving this block closes the response. On the early-reject
+        # paths that happens before the body has been read, so the
+        # connection is dropped instead of draining the rest.
+        with response:
+            result = self._spool_body(link, file_path, response, _content_length(response))
+        self._store_in_http_cache(link, response, *result)
+        return result
+
+    def _spool_body(self, link: str, file_path, body, declared: int | None) -> tuple[str, str]:
+        """Drive :meth:`_save_steps` with chunks read from ``body``."""
+        steps = self._save_steps(link, file_path, declared)
+        size = next(steps)
+        try:
+            while True:
+                try:
+                    chunk = self._read_body_chunk(body, size, link)
+                except BaseException as e:
+                    size = steps.throw(e)
+                else:
+                    size = steps.send(chunk)
+        except StopIteration as done:
+            result: tuple[str, str] = done.value
+        return result
+
+    # --- HTTP cache (v3.7.0+) ---
+
+    def _http_cache_entry(self, link: str) -> HTTPCacheEntry | None:
+        """The :attr:`http_cache` entry to revalidate ``link`` against, if any."""
+        if self.http_cache is None:
+            return None
+        try:
+            return self.http_cache.lookup(link)
+        except Exception as e:
+            # The cache only saves bandwidth; a broken one must not
+            # fail the download.
+            logging.warning("HTTP cache lookup failed for %s: %s", link, e)
+            return None
+
+    def _reuse_cached_body(
+        self, link: str, file_path, entry: HTTPCacheEntry
+    ) -> tuple[str, str] | None:
+        """Spool the stored body after a ``304 Not Modified`` for ``link``.
+
+        The body goes through :meth:`_save_steps` like a download, so
+        every filter still applies. Returns ``None``, after dropping
+        the entry, if the body can't be read or no longer matches its
+        MD5; the caller then fetches ``link`` in full.
+        """
+        try:
+            body = open(entry.path, "rb")  # noqa: SIM115 - closed below
+        except OSError:
+            body = None
+        if body is not None:
+            with body:
+                tmp_path, file_hash = self._spool_body(
+                    link, file_path, body, os.fstat(body.fileno()).st_size
+                )
+            if file_hash == entry.md5:
+                logging.debug("Not modified, reusing cached body: %s", link)
+                return tmp_path, file_hash
+            _unlink_quietly(tmp_path)
+        self.http_cache.forget(link)  # type: ignore[union-attr]
+        return None
+
+    def _store_in_http_cache(self, link: str, response, tmp_path: str, file_hash: str) -> None:
+        """Remember ``response``'s validators and the body in :attr:`http_cache`."""
+        if self.http_cache is None:
+            return
+        etag, last_modified = _validators(response)
+        try:
+            self.http_cache.store(link, etag, last_modified, tmp_path, file_hash)
+        except Exception as e:
+            logging.warning("Could not cache %s: %s", link, e)
+
+    def _save_steps(self, link: str, file_path, declared: int | None):
+        """Validate and spool an image body; the I/O-free core of a save (v3.7.0+).
+
+        A generator shared by the blocking save path and the asyncio one
+        (:class:`~better_bing_image_downloader.async_engine.AsyncImageEngine`):
+        it yields the number of body bytes it wants next and is sent
+        each chunk read (``b""`` at end of body). Read failures are
+        thrown into it so the temp file is cleaned up. Returns
+        ``(tmp_path, md5)`` once the whole body is on disk.
+
+        ``declared`` is the response's ``Content-Length``, if any.
+        """
+        if declared is not None:
+            self._check_byte_limits(link, declared, complete=True)
+        head, eof = yield from self._read_image_head(link)
+        self._check_byte_limits(link, len(head), complete=eof)
+
+        kind = filetype.guess(head)
         if not kind or not kind.mime.startswith("image/"):
             raise InvalidImageError(url=link)
 
         if self.min_dimension is not None:
-            dimensions = _read_image_dimensions(image)
+            dimensions = _read_image_dimensions(head)
+            # JPEG's SOF marker can sit behind a large EXIF/ICC
+            # block, so keep reading (up to a bound) until it shows
+            # up. Every other format we parse has its size in the
+            # first few dozen bytes.
+            while dimensions is None and not eof and head[:2] == b"\xff\xd8":
+                if len(head) >= IMAGE_SNIFF_MAX_BYTES:
+                    break
+                chunk = yield self._next_chunk_size(len(head))
+                if not chunk:
+                    eof = True
+                    break
+                head += chunk
+                self._check_byte_limits(link, len(head), complete=False)
+                dimensions = _read_image_dimensions(head)
             if dimensions is not None:
                 width, height = dimensions
                 if width < self.min_dimension or height < self.min_dimension:
@@ -460,15 +1047,9 @@ class ImageEngine(ABC):
                         min_dimension=self.min_dimension,
                     )
 
-        file_hash = hashlib.md5(image).hexdigest()
-        with self._hash_lock:
-            if file_hash in self._file_hashes:
-                raise DuplicateImageError(url=link)
-            self._file_hashes.add(file_hash)
-
-        # Atomic write: write to a temp file in the same directory, then
-        # rename. This prevents partially-written files from being picked
-        # up by a subsequent resume run.
+        # Atomic write: stream to a temp file in the same directory,
+        # then rename. This prevents partially-written files from
+        # being picked up by a subsequent resume run.
         file_path = Path(file_path)
         try:
             fd, tmp_path = tempfile.mkstemp(
@@ -478,17 +1059,192 @@ class ImageEngine(ABC):
         except OSError as e:
             raise WriteError(url=link, message=f"mkstemp: {e}") from e
         try:
-            with open(fd, "wb") as f:
-                f.write(image)
-            shutil.move(tmp_path, file_path)
-        except Exception as e:
+            file_hash = yield from self._stream_body_to_file(fd, head, eof, link)
+        except BaseException:
+            _unlink_quietly(tmp_path)
+            raise
+        return tmp_path, file_hash
+
+    def _commit_saved_file(
+        self, link: str, tmp_path: str, file_path, file_hash: str, phash: int | None = None
+    ) -> str:
+        """Dedupe a fully-spooled temp file and move it into place.
+
+        Checks the MD5 against this run and the ``hash_index``, then
+        ``phash`` (if computed) against ``near_duplicates``.
+        """
+        # The MD5 is only known once the whole body has been streamed,
+        # so duplicates are detected after the write and their temp
+        # file discarded.
+        with self._hash_lock:
+            duplicate = file_hash in self._file_hashes or file_hash in self._pending_hashes
+            if not duplicate:
+                self._pending_hashes.add(file_hash)
+        if duplicate:
+            _unlink_quietly(tmp_path)
+            raise DuplicateImageError(url=link)
+
+        # The persistent indexes (v3.7.0+) also know earlier runs'
+        # images. ``force_replace`` re-downloads those on purpose, so
+        # it never rejects against what they loaded from disk.
+        index = self.hash_index
+        near = self.near_duplicates if phash is not None else None
+        claimed = index is not None and index.claim(file_hash)
+        near_claimed = False
+        try:
+            if index is not None and not claimed and not self.force_replace:
+                raise DuplicateImageError(
+                    url=link, message=f"duplicate image (MD5 in {index.path}) at {link!r}"
+                )
+            if near is not None:
+                distance = near.claim(
+                    phash, self.near_duplicate_distance, include_stored=not self.force_replace
+                )
+                if distance is not None:
+                    raise NearDuplicateImage(url=link, distance=distance)
+                near_claimed = True
             try:
-                Path(tmp_path).unlink()
-            except OSError:
-                pass
-            raise WriteError(url=link, message=f"write: {e}") from e
+                shutil.move(tmp_path, file_path)
+            except Exception as e:
+                raise WriteError(url=link, message=f"write: {e}") from e
+        except ImageSaveError:
+            _unlink_quietly(tmp_path)
+            with self._hash_lock:
+                self._pending_hashes.discard(file_hash)
+            if index is not None and claimed:
+                index.release(file_hash)
+            if near is not None and near_claimed:
+                near.release(phash)
+            raise
+        with self._hash_lock:
+            self._pending_hashes.discard(file_hash)
+            self._file_hashes.add(file_hash)
+        if index is not None:
+            index.commit(file_hash)
+        if near is not None and near_claimed:
+            near.commit(phash)
+        self._note_existing(Path(file_path))
         return file_hash
 
+    def _wants_perceptual_hash(self, file_hash: str) -> bool:
+        """Whether the near-duplicate stage should hash this image.
+
+        Not for exact duplicates, which the MD5 check rejects anyway.
+        """
+        with self._hash_lock:
+            return file_hash not in self._file_hashes and file_hash not in self._pending_hashes
+
+    def _perceptual_hash(self, link: str, future: Future) -> int | None:
+        """Wait for a :meth:`NearDuplicateIndex.submit` result; ``None`` if undecodable."""
+        try:
+            phash: int = future.result()
+        except Exception as e:
+            # Pillow can't read every format ``filetype`` accepts; such
+            # images are only deduplicated by MD5.
+            logging.info("No perceptual hash for %s: %s", link, e)
+            return None
+        return phash
+
+    def _open_image_stream(self, url: str, headers: dict | None = None):
+        """Open ``url`` for streaming and return a readable response.
+
+        ``_http_get`` predates streaming and remains a supported
+        override point (custom engines and tests replace it to serve
+        canned bytes). If it has been overridden, its return value is
+        served from memory through the same streaming path.
+        ``headers`` (v3.7.0+) are extra request headers; without them
+        both hooks are called with the URL alone, as before.
+        """
+        if type(self)._http_get is not _BASE_HTTP_GET:
+            if headers:
+                return io.BytesIO(self._http_get(url, headers))
+            return io.BytesIO(self._http_get(url))
+        if headers:
+            return self._http_open(url, headers)
+        return self._http_open(url)
+
+    def _read_body_chunk(self, response, size: int, link: str) -> bytes:
+        """Read up to ``size`` body bytes, mapping failures to ``NetworkError``."""
+        try:
+            chunk: bytes = response.read(size)
+        except Exception as e:
+            raise NetworkError(url=link, message=f"network error: {e}") from e
+        return chunk
+
+    def _read_image_head(self, link: str):
+        """Read the first ``IMAGE_SNIFF_BYTES`` of the body (a :meth:`_save_steps` step).
+
+        Returns ``(head, eof)``; ``eof`` is ``True`` if the whole body
+        fit in the head.
+        """
+        parts: list[bytes] = []
+        size = 0
+        while size < IMAGE_SNIFF_BYTES:
+            chunk = yield min(IMAGE_SNIFF_BYTES - size, self._next_chunk_size(size))
+            if not chunk:
+                return b"".join(parts), True
+            parts.append(chunk)
+            size += len(chunk)
+            if self.max_bytes is not None and size > self.max_bytes:
+                break
+        return b"".join(parts), False
+
+    def _stream_body_to_file(self, fd: int, head: bytes, eof: bool, link: str):
+        """Write ``head`` plus the rest of the body to ``fd``; return the MD5.
+
+        A :meth:`_save_steps` step: the body arrives in
+        ``IMAGE_STREAM_CHUNK_SIZE`` pieces and is hashed incrementally,
+        so memory use doesn't grow with image size.
+        """
+        md5 = hashlib.md5()
+        total = 0
+        try:
+            f = open(fd, "wb")  # noqa: SIM115 - closed in the finally below
+        except OSError as e:
+            raise WriteError(url=link, message=f"write: {e}") from e
+        try:
+            chunk = head
+            while chunk:
+                total += len(chunk)
+                self._check_byte_limits(link, total, complete=False)
+                md5.update(chunk)
+                try:
+                    f.write(chunk)
+                except OSError as e:
+                    raise WriteError(url=link, message=f"write: {e}") from e
+                if eof:
+                    break
+                chunk = yield self._next_chunk_size(total)
+        finally:
+            f.close()
+        self._check_byte_limits(link, total, complete=True)
+        return md5.hexdigest()
+
+    def _next_chunk_size(self, read_so_far: int) -> int:
+        """Size of the next body read.
+
+        Capped at one byte past ``max_bytes`` so an oversized body is
+        detected without reading further than necessary.
+        """
+        if self.max_bytes is None:
+            return IMAGE_STREAM_CHUNK_SIZE
+        return max(1, min(IMAGE_STREAM_CHUNK_SIZE, self.max_bytes - read_so_far + 1))
+
+    def _check_byte_limits(self, link: str, size: int, complete: bool) -> None:
+        """Raise ``OutsideByteLimits`` if ``size`` is out of range.
+
+        ``complete`` says whether ``size`` is the final body size; the
+        ``min_bytes`` bound can only be judged once it is.
+        """
+        if self.max_bytes is not None and size > self.max_bytes:
+            raise OutsideByteLimits(
+                url=link, size=size, min_bytes=self.min_bytes, max_bytes=self.max_bytes
+            )
+        if complete and self.min_bytes is not None and size < self.min_bytes:
+            raise OutsideByteLimits(
+                url=link, size=size, min_bytes=self.min_bytes, max_bytes=self.max_bytes
+            )
+
     def download_image(self, link: str, index: int):
         """Download and save a single image.
 
@@ -499,41 +1255,133 @@ class ImageEngine(ABC):
             skip), or ``None`` on any error.
         """
         try:
-            path = urllib.parse.urlsplit(link).path
-            filename = posixpath.basename(path).split("?")[0]
-            file_type = filename.split(".")[-1].lower()
-
-            if file_type not in VALID_IMAGE_EXTENSIONS:
-                file_type = "jpg"
-
-            file_path = self.output_dir / f"{self.image_name}_{index}.{file_type}"
-
-            # Resume support: skip if a file with this base name already exists.
-            if not self.force_replace:
-                existing = list(self.output_dir.glob(f"{self.image_name}_{index}.*"))
-                if existing:
-                    if self.verbose:
-                        logging.info(
-                            "Skipping already-downloaded image #%d (file exists)",
-                            index,
-                        )
-                    return 0
-
-            if self.verbose:
-                logging.info("Downloading Image #%d from %s", index, link)
-
+            file_path = self._image_target(link, index)
+            if file_path is None:
+                return 0
             if self.save_image(link, file_path):
-                with self._count_lock:
-                    self.manifest[file_path.name] = link
-                if self.verbose:
-                    logging.info("Downloaded File #%d", index)
-                with self._count_lock:
-                    self.download_count += 1
-                    self._slots_used += 1
-                if self.download_callback:
-                    self.download_callback(self.download_count)
-                return index
+                return self._record_download(link, index, file_path)
             return None
         except Exception as e:
             logging.error("Issue getting image %s: %s", link, e)
             return None
+
+    def _image_target(self, link: str, index: int) -> Path | None:
+        """Return the path image ``index`` should be saved to.
+
+        ``None`` means a file with this index already exists and should
+        be kept (resume support).
+        """
+        path = urllib.parse.urlsplit(link).path
+        filename = posixpath.basename(path).split("?")[0]
+        file_type = filename.split(".")[-1].lower()
+
+        if file_type not in VALID_IMAGE_EXTENSIONS:
+            file_type = "jpg"
+
+        file_path = self.output_dir / f"{self.image_name}_{index}.{file_type}"
+
+        # Resume support: skip if a file with this base name already exists.
+        if not self.force_replace and index in self._existing_index():
+            if self.verbose:
+                logging.info(
+                    "Skipping already-downloaded image #%d (file exists)",
+                    index,
+                )
+            return None
+
+        if self.verbose:
+            logging.info("Downloading Image #%d from %s", index, link)
+        return file_path
+
+    def _existing_index(self) -> dict[int, str]:
+        """Return the image number -> file name index of ``output_dir``.
+
+        The directory is scanned once per engine, on first use; after
+        that the index only changes through :meth:`_note_existing`.
+        Files added or removed by another process mid-run are not seen.
+        """
+        with self._existing_lock:
+            if self._existing is None:
+                index: dict[int, str] = {}
+                try:
+                    with os.scandir(self.output_dir) as entries:
+                        for entry in entries:
+                            number = self._image_number(entry.name)
+                            if number is not None:
+                                index.setdefault(number, entry.name)
+                except OSError as e:
+                    logging.warning("Could not scan %s for resume: %s", self.output_dir, e)
+                self._existing = index
+            return self._existing
+
+    def _note_existing(self, file_path: Path) -> None:
+        """Add a newly written file to the resume index, if it is indexed."""
+        if file_path.parent != self.output_dir:
+            return
+        number = self._image_number(file_path.name)
+        if number is not None:
+            index = self._existing_index()
+            with self._existing_lock:
+                index[number] = file_path.name
+
+    def _image_number(self, filename: str) -> int | None:
+        """Parse ``N`` out of ``{image_name}_{N}.{ext}``; ``None`` for other names."""
+        prefix = f"{self.image_name}_"
+        if not filename.startswith(prefix):
+            return None
+        stem, dot, _ = filename[len(prefix) :].partition(".")
+        # Only canonical numbers: ``Image_03.jpg`` is not image #3.
+        if not dot or not (stem.isascii() and stem.isdigit()) or str(int(stem)) != stem:
+            return None
+        return int(stem)
+
+    def _record_download(self, link: str, index: int, file_path: Path) -> int:
+        """Update the manifest and counters after a successful save."""
+        with self._count_lock:
+            self.manifest[file_path.name] = link
+        if self.verbose:
+            logging.info("Downloaded File #%d", index)
+        with self._count_lock:
+            self.download_count += 1
+            self._slots_used += 1
+        if self.download_callback:
+            self.download_callback(self.download_count)
+        return index
+
+
+# The stock ``_http_get``, used by ``_open_image_stream`` to detect
+# subclasses (or tests) that override it.
+_BASE_HTTP_GET = ImageEngine._http_get
+
+
+def _content_length(response) -> int | None:
+    """Return the response's ``Content-Length`` as an int, if it has a usable one."""
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None
+    try:
+        value = headers.get("Content-Length")
+    except Exception:
+        return None
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+
+def _validators(response) -> tuple[str | None, str | None]:
+    """Return the response's ``(ETag, Last-Modified)`` headers, either may be ``None``."""
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None, None
+    try:
+        return headers.get("ETag"), headers.get("Last-Modified")
+    except Exception:
+        return None, None
+
+
+def _unlink_quietly(path: str) -> None:
+    """Remove a temp file, ignoring errors (it may already be gone)."""
+    try:
+        Path(path).unlink()
+    except OSError:
+        pass
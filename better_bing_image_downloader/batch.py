@@ -0,0 +1,148 @@
+"""Helpers for running many queries in one process (v3.7.0+).
+
+Ingest jobs used to start ``bbid`` once per query, paying interpreter
+start-up, imports, and a cold connection pool and worker pool every
+time. :meth:`Downloader.search_many` runs a whole list of queries on
+one :class:`~better_bing_image_downloader.downloader.Downloader`, so
+every search shares its transport, page cache, download worker pool,
+and download budget; ``bbid --queries-file`` is the CLI form.
+
+A :class:`QueryCheckpoint` makes such a batch resumable: each query
+that finishes with at least one candidate URL is appended to a JSON
+Lines file, and a re-run skips the queries listed there. Appending one short line per query keeps
+the file valid across crashes; a torn last line is ignored on load.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .results import Result
+
+__all__ = [
+    "CHECKPOINT_FILENAME",
+    "DEFAULT_QUERY_PARALLELISM",
+    "QueryCheckpoint",
+    "read_queries",
+]
+
+# Queries searched at once by ``search_many``. Each search mostly
+# waits on its results pages; the downloads of all of them share the
+# Downloader's worker pool, so a few are enough to keep it busy.
+DEFAULT_QUERY_PARALLELISM = 4
+
+# File name ``bbid --queries-file`` uses inside the output directory.
+CHECKPOINT_FILENAME = ".bbid-checkpoint.jsonl"
+
+
+def read_queries(path: str | os.PathLike) -> list[str]:
+    """Read one query per line from ``path``.
+
+    Leading and trailing whitespace is stripped; blank lines and lines
+    starting with ``#`` are skipped.
+
+    Raises
+    ------
+    OSError
+        If the file can't be read.
+    """
+    with open(path, encoding="utf-8") as f:
+        lines = (line.strip() for line in f)
+        return [line for line in lines if line and not line.startswith("#")]
+
+
+class QueryCheckpoint:
+    """Append-only record of the queries a batch has finished.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        JSON Lines file; created (with its parent directories) on the
+        first :meth:`record`. Records already in it are loaded, so
+        ``query in checkpoint`` is true for queries finished by an
+        earlier run.
+
+    Attributes
+    ----------
+    completed : set[str]
+        Queries finished so far, by this run or an earlier one.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = Path(path)
+        self.completed: set[str] = set()
+        self._lock = threading.Lock()
+        self._file = None
+        self._load()
+
+    def __repr__(self) -> str:
+        return f"QueryCheckpoint({str(self.path)!r}, completed={len(self.completed)})"
+
+    def __contains__(self, query: object) -> bool:
+        return query in self.completed
+
+    def __len__(self) -> int:
+        return len(self.completed)
+
+    def __enter__(self) -> QueryCheckpoint:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def record(self, result: Result) -> None:
+        """Mark ``result.query`` as finished and append it to the file."""
+        line = json.dumps(
+            {
+                "query": result.query,
+                "engine": result.engine,
+                "count": result.count,
+                "skipped": result.skipped,
+                "errors": len(result.errors),
+                "finished_at": datetime.now(timezone.utc).isoformat(),
+            },
+            ensure_ascii=False,
+        )
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")  # noqa: SIM115 - kept open
+                if self._file.tell() and not self._ends_with_newline():
+                    self._file.write("\n")  # after a torn last line
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.completed.add(result.query)
+
+    def close(self) -> None:
+        """Close the file. Idempotent; a later :meth:`record` reopens it."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _load(self) -> None:
+        try:
+            f = open(self.path, encoding="utf-8")  # noqa: SIM115 - closed below
+        except FileNotFoundError:
+            return
+        with f:
+            for number, line in enumerate(f, 1):
+                try:
+                    query = json.loads(line)["query"]
+                except (ValueError, KeyError, TypeError):
+                    if line.strip():
+                        logging.warning("Ignoring bad checkpoint line %s:%d", self.path, number)
+                    continue
+                self.completed.add(query)
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
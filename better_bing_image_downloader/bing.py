@@ -6,18 +6,31 @@ Improved Author: Krishnatejaswi S (shentharkrishnatejaswi@gmail.com)
 
 from __future__ import annotations
 
+import asyncio
 import gzip
 import logging
+import os
 import re
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import Executor, as_completed
 
+from .async_engine import AsyncImageEngine
 from .base import DEFAULT_VERBOSE, MAX_FUTURE_TIMEOUT, ImageEngine
+from .hashindex import HashIndex
+from .hosts import DEFAULT_MAX_PER_HOST
+from .httpcache import HTTPCache
+from .pagecache import PageCache
+from .perceptual import DEFAULT_NEAR_DUPLICATE_DISTANCE, NearDuplicateIndex
+from .pipeline import submit_download
+from .scheduler import DownloadShare
+from .seenurls import SeenURLStore
+from .transport import Transport
+from .urls import URLCanonicalizer
 
-__all__ = ["Bing"]
+__all__ = ["AsyncBing", "Bing"]
 
 
 class Bing(ImageEngine):
@@ -51,6 +64,66 @@ class Bing(ImageEngine):
         If ``True``, re-download images even if they already exist.
     mkt : str
         Bing market code (e.g. ``"en-US"``).
+    transport : Transport | None
+        HTTP transport for page fetches and image downloads. Defaults
+        to a one-connection-per-request :class:`UrllibTransport`;
+        :class:`Downloader` passes its shared keep-alive pool.
+    min_bytes, max_bytes : int | None
+        Allowed image body size range in bytes; images outside it are
+        skipped (see :class:`OutsideByteLimits`). ``None`` disables
+        either bound.
+    executor : concurrent.futures.Executor | None
+        Shared worker pool to run downloads on (not shut down by the
+        engine). Defaults to a private ``max_workers`` pool per run;
+        :class:`Downloader` passes its long-lived pool.
+    download_share : DownloadShare | None
+        Claim on a global download budget shared with other searches
+        (see :mod:`~better_bing_image_downloader.scheduler`).
+        :class:`Downloader` passes one per search.
+    max_per_host : int
+        Maximum concurrent downloads from one image host; ``0`` for no
+        cap. Default :data:`~better_bing_image_downloader.hosts.DEFAULT_MAX_PER_HOST`
+        (no cap).
+    min_host_delay : float
+        Minimum seconds between the starts of two downloads from the
+        same host. Default ``0.0``.
+    adaptive : bool
+        Resize concurrency during the run from observed latency and
+        errors, starting at ``max_workers`` (see
+        :mod:`~better_bing_image_downloader.adaptive`). Default ``False``.
+    hash_index : HashIndex | str | os.PathLike | None
+        Persistent MD5 index for deduplication across runs (see
+        :mod:`~better_bing_image_downloader.hashindex`). Default
+        ``None`` (deduplicate within this run only).
+    near_duplicates : NearDuplicateIndex | None
+        Perceptual-hash index for skipping near-duplicate images (see
+        :mod:`~better_bing_image_downloader.perceptual`). Default
+        ``None`` (MD5 deduplication only).
+    near_duplicate_distance : int
+        Maximum Hamming distance between two perceptual hashes for the
+        images to count as near-duplicates. Default
+        :data:`~better_bing_image_downloader.perceptual.DEFAULT_NEAR_DUPLICATE_DISTANCE`.
+    canonicalize_urls : URLCanonicalizer | bool
+        Compare result links by their canonical form (see
+        :mod:`~better_bing_image_downloader.urls`) rather than the raw
+        string; pass a :class:`URLCanonicalizer` for custom rules, or
+        ``False`` to compare raw strings. Default ``True``.
+    seen_urls : SeenURLStore | str | os.PathLike | None
+        Persistent store of links fetched by earlier runs, which are
+        skipped without a request (see
+        :mod:`~better_bing_image_downloader.seenurls`). Default ``None``.
+    seen_error_rate : float | None
+        Keep the run's seen links and image digests in Bloom filters
+        with this false-positive bound instead of sets (v3.7.0+).
+    page_cache : PageCache | None
+        Cache of the links found on results pages; pages it holds are
+        not requested again (v3.7.0+). ``Downloader`` passes the one
+        it keeps in its ``cache_dir``.
+    http_cache : HTTPCache | str | os.PathLike | None
+        Cache of image validators and bodies: images fetched before
+        are requested conditionally and a ``304`` reuses the stored
+        body (see :mod:`~better_bing_image_downloader.httpcache`,
+        v3.7.0+). Default ``None``.
     """
 
     PAGE_SIZE = 35  # Bing's /images/async returns 35 results per page
@@ -74,6 +147,22 @@ class Bing(ImageEngine):
         mkt: str = "en-US",
         cancel=None,
         min_dimension: int | None = None,
+        transport: Transport | None = None,
+        min_bytes: int | None = None,
+        max_bytes: int | None = None,
+        executor: Executor | None = None,
+        download_share: DownloadShare | None = None,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+        min_host_delay: float = 0.0,
+        adaptive: bool = False,
+        hash_index: HashIndex | str | os.PathLike | None = None,
+        near_duplicates: NearDuplicateIndex | None = None,
+        near_duplicate_distance: int = DEFAULT_NEAR_DUPLICATE_DISTANCE,
+        canonicalize_urls: URLCanonicalizer | bool = True,
+        seen_urls: SeenURLStore | str | os.PathLike | None = None,
+        seen_error_rate: float | None = None,
+        page_cache: PageCache | None = None,
+        http_cache: HTTPCache | str | os.PathLike | None = None,
     ):
         super().__init__(
             query=query,
@@ -87,6 +176,22 @@ class Bing(ImageEngine):
             force_replace=force_replace,
             cancel=cancel,
             min_dimension=min_dimension,
+            transport=transport,
+            min_bytes=min_bytes,
+            max_bytes=max_bytes,
+            executor=executor,
+            download_share=download_share,
+            max_per_host=max_per_host,
+            min_host_delay=min_host_delay,
+            adaptive=adaptive,
+            hash_index=hash_index,
+            near_duplicates=near_duplicates,
+            near_duplicate_distance=near_duplicate_distance,
+            canonicalize_urls=canonicalize_urls,
+            seen_urls=seen_urls,
+            seen_error_rate=seen_error_rate,
+            page_cache=page_cache,
+            http_cache=http_cache,
         )
         self.adult = adult
         self.filter = filter
@@ -153,21 +258,44 @@ class Bing(ImageEngine):
         """
         request_url = self._build_page_url(page_counter)
         request = urllib.request.Request(request_url, None, headers=self.headers)
-        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+        with self.transport.open(request, timeout=self.timeout) as response:
             raw: bytes = response.read()
             content_encoding = response.headers.get("Content-Encoding", "")
+        return self._decode_page(raw, content_encoding)
+
+    @staticmethod
+    def _decode_page(raw: bytes, content_encoding: str) -> str:
+        """Decode a results page body according to its ``Content-Encoding``."""
         if content_encoding == "gzip":
             decompressed: bytes = gzip.decompress(raw)
             return decompressed.decode("utf8")
         return raw.decode("utf8", errors="replace")
 
+    def _page_cache_key(self, page: int) -> str | None:
+        """Cache key of a results page: the page URL carries every filter (v3.7.0+)."""
+        return "bing " + self._build_page_url(page)
+
     @staticmethod
     def _extract_links(html: str) -> list[str]:
         """Extract ``murl`` image URLs from a Bing result page."""
         return re.findall(r"murl&quot;:&quot;(.*?)&quot;", html)
 
     def run(self) -> None:
-        """Download images until ``self.limit`` is reached or pages are exhausted."""
+        """Download images until ``self.limit`` is reached or pages are exhausted.
+
+        Since v3.7.0 the next results page is fetched while images from
+        the previous ones are still downloading (see
+        :meth:`ImageEngine._run_pipeline`).
+        """
+        self._run_pipeline(self._iter_page_links())
+        logging.info("\n\n[%%] Done. Downloaded %d images.", self.download_count)
+
+    def _iter_page_links(self):
+        """Yield the new, non-blacklisted links from each results page in turn.
+
+        Runs on the pipeline's page-fetcher thread. Stops when Bing
+        returns an empty page or a page with no unseen links.
+        """
         page_counter = 0
         while self._slots_used < self.limit:
             # Check the cancel token (v3.3.0+). Returns immediately if
@@ -184,7 +312,10 @@ class Bing(ImageEngine):
                 # writer (v3.5.0+) can record provenance for every
                 # image sourced from this page.
                 self.last_page_url = self._build_page_url(page_counter)
-                html = self._fetch_page(page_counter)
+                links = self._cached_page(page_counter)
+                if links is None:
+                    links = self._extract_links(self._fetch_page(page_counter))
+                    self._cache_page(page_counter, links)
             except (urllib.error.HTTPError, urllib.error.URLError) as e:
                 wait = self._consume_backoff()
                 logging.error(
@@ -196,13 +327,12 @@ class Bing(ImageEngine):
                 continue
             except Exception as e:  # pragma: no cover - defensive
                 logging.error("Unexpected error while requesting from Bing: %s", e)
-                break
+                return
 
-            if not html:
+            if not links:
                 logging.info("[%%] No more images are available")
-                break
+                return
 
-            links = self._extract_links(html)
             if self.verbose:
                 logging.info(
                     "[%%] Indexed %d Images on Page %d.",
@@ -211,33 +341,18 @@ class Bing(ImageEngine):
                 )
                 logging.info("\n===============================================\n")
 
-            filtered_links = [
-                link
-                for link in links
-                if link not in self.seen and not any(badsite in link for badsite in self.badsites)
-            ]
+            filtered_links = self._filter_new_links(links)
             if not filtered_links:
                 logging.info("[%%] No new images are available")
-                break
+                return
             self.seen.update(filtered_links)
+            filtered_links = self._skip_known_urls(filtered_links)
+            if filtered_links:
+                yield filtered_links
 
-            remaining = self.limit - self._slots_used
-            links_to_download = filtered_links[:remaining]
-            slots_before = self._slots_used
-            self._download_batch(links_to_download, start_index=self.download_count + 1)
-            if self._slots_used == slots_before:
-                logging.warning("No images could be downloaded from this page")
-                # If a page yielded no downloads, treat it as exhaustion so we
-                # don't loop forever against an empty result set.
-                break
-
-            if self._slots_used >= self.limit:
-                break
             page_counter += 1
             self._reset_backoff()
 
-        logging.info("\n\n[%%] Done. Downloaded %d images.", self.download_count)
-
     # --- Internal helpers used by ``run`` and the parallel executor ---
 
     def _consume_backoff(self) -> float:
@@ -258,9 +373,9 @@ class Bing(ImageEngine):
         if not links:
             return
         if self.max_workers > 1:
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            with self._download_executor() as executor:
                 futures = [
-                    executor.submit(self.download_image, link, i)
+                    submit_download(executor, self.download_share, self.download_image, link, i)
                     for i, link in enumerate(links, start_index)
                 ]
                 for future in as_completed(futures, timeout=MAX_FUTURE_TIMEOUT):
@@ -273,3 +388,73 @@ class Bing(ImageEngine):
                 if self._slots_used >= self.limit:
                     break
                 self.download_image(link, i)
+
+
+class AsyncBing(AsyncImageEngine, Bing):
+    """:class:`Bing` with a native asyncio path (v3.7.0+).
+
+    Takes every :class:`Bing` argument plus ``concurrency`` and
+    ``async_transport`` (see :class:`AsyncImageEngine`). Page parsing,
+    filtering, and backoff are shared with :class:`Bing`; only the I/O
+    is non-blocking.
+    """
+
+    async def run_async(self) -> None:
+        """Download images until ``self.limit`` is reached or pages are exhausted."""
+        await self._run_pipeline_async(self._aiter_page_links())
+        logging.info("\n\n[%%] Done. Downloaded %d images.", self.download_count)
+
+    async def _fetch_page_async(self, page_counter: int) -> str:
+        """Async :meth:`Bing._fetch_page`."""
+        url = self._build_page_url(page_counter)
+        async with await self.async_transport.open(
+            url, self.headers, timeout=self.timeout
+        ) as response:
+            raw: bytes = await response.read()
+            content_encoding = response.headers.get("Content-Encoding", "")
+        return self._decode_page(raw, content_encoding)
+
+    async def _aiter_page_links(self):
+        """Async :meth:`Bing._iter_page_links`."""
+        page_counter = 0
+        while self._slots_used < self.limit:
+            if self.is_cancelled():
+                if self.verbose:
+                    logging.info("[!] Cancellation requested; stopping.")
+                return
+            if self.verbose:
+                logging.info("\n\n[!]Indexing page: %d\n", page_counter + 1)
+            try:
+                self.last_page_url = self._build_page_url(page_counter)
+                links = await asyncio.to_thread(self._cached_page, page_counter)
+                if links is None:
+                    links = self._extract_links(await self._fetch_page_async(page_counter))
+                    await asyncio.to_thread(self._cache_page, page_counter, links)
+            except (urllib.error.HTTPError, urllib.error.URLError) as e:
+                wait = self._consume_backoff()
+                logging.error(
+                    "Network error while requesting from Bing: %s. " "Retrying in %.1fs.",
+                    e,
+                    wait,
+                )
+                await asyncio.sleep(wait)
+                continue
+            except Exception as e:  # pragma: no cover - defensive
+                logging.error("Unexpected error while requesting from Bing: %s", e)
+                return
+
+            if not links:
+                logging.info("[%%] No more images are available")
+                return
+
+            filtered_links = self._filter_new_links(links)
+            if not filtered_links:
+                logging.info("[%%] No new images are available")
+                return
+            self.seen.update(filtered_links)
+            filtered_links = await asyncio.to_thread(self._skip_known_urls, filtered_links)
+            if filtered_links:
+                yield filtered_links
+
+            page_counter += 1
+            self._reset_backoff()
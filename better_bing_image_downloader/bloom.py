@@ -0,0 +1,295 @@
+"""Compact probabilistic sets for very large crawls (v3.7.0+).
+
+An engine remembers every link and image digest it has handled in
+Python sets (``ImageEngine.seen``, the canonical link keys, and the MD5
+digests behind run-level deduplication). At around 100 bytes per URL
+string plus set overhead, a crawl over a million URLs spends hundreds
+of MB on them. A :class:`ScalableBloomFilter` answers the same
+membership questions in about 3 bytes per key at a 0.1% false-positive
+rate; ``seen_error_rate`` on the engines and ``Downloader.search``
+switches them to it.
+
+The trade-off is that a Bloom filter can report a key it has never
+seen (it never misses one it has): a new link is then skipped as
+already seen, or a new image as a duplicate. The chance of that is
+bounded by ``error_rate`` no matter how many keys are added:
+
+- Keys go into a chain of plain Bloom filters. When the newest one
+  reaches its capacity a larger one (``growth`` times the capacity) is
+  added, so memory follows the number of keys instead of being sized
+  up front.
+- Each new filter gets a tighter error rate (``tightening`` times the
+  previous one), so the rates form a geometric series whose sum, the
+  bound on the whole chain's false-positive rate, is ``error_rate``.
+  This is the construction of Almeida et al., "Scalable Bloom Filters"
+  (2007).
+
+Filters can be written to disk with :meth:`ScalableBloomFilter.save`
+and read back with :meth:`ScalableBloomFilter.load`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import math
+import os
+import struct
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterable, Union
+
+__all__ = ["DEFAULT_BLOOM_CAPACITY", "DEFAULT_BLOOM_ERROR_RATE", "ScalableBloomFilter"]
+
+# False-positive bound used when none is given (e.g. ``--compact-seen``).
+DEFAULT_BLOOM_ERROR_RATE = 0.001
+
+# Keys the first filter of the chain holds; later ones grow from there.
+DEFAULT_BLOOM_CAPACITY = 16_384
+
+_MAGIC = b"BBIDBLM\x01"
+# error_rate, tightening, growth, initial_capacity, number of filters.
+_HEADER = struct.Struct(">ddIQI")
+# capacity, hash count, size in bits, key count.
+_FILTER_HEADER = struct.Struct(">QIQQ")
+
+Key = Union[str, bytes]
+
+
+class _Filter:
+    """One fixed-capacity Bloom filter of the chain."""
+
+    __slots__ = ("capacity", "hashes", "size", "count", "bits")
+
+    def __init__(self, capacity: int, hashes: int, size: int, count: int = 0, bits=None) -> None:
+        self.capacity = capacity
+        self.hashes = hashes
+        self.size = size
+        self.count = count
+        self.bits = bits if bits is not None else bytearray((size + 7) // 8)
+
+    @classmethod
+    def sized(cls, capacity: int, error_rate: float) -> _Filter:
+        """A filter holding ``capacity`` keys at ``error_rate`` false positives."""
+        hashes = max(1, math.ceil(-math.log2(error_rate)))
+        # Solve ``(1 - exp(-k * n / m)) ** k == error_rate`` for ``m``
+        # with ``k`` rounded up, rather than the usual
+        # ``-n * ln(p) / ln(2)**2``, which undershoots it.
+        size = math.ceil(-hashes * capacity / math.log1p(-(error_rate ** (1 / hashes))))
+        return cls(capacity, hashes, size)
+
+    def positions(self, h1: int, h2: int) -> list[int]:
+        # Enhanced double hashing (Dillinger and Manolios): k indices
+        # from two hashes. Plain ``h1 + i * h2`` gives measurably
+        # more false positives than the sizing assumes.
+        size = self.size
+        a, b = h1 % size, h2 % size
+        positions = []
+        for i in range(1, self.hashes + 1):
+            positions.append(a)
+            a = (a + b) % size
+            b = (b + i) % size
+        return positions
+
+    def has(self, positions: list[int]) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in positions)
+
+    def set(self, positions: list[int]) -> None:
+        bits = self.bits
+        for p in positions:
+            bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+class ScalableBloomFilter:
+    """Thread-safe, growable Bloom filter; see the module docstring.
+
+    Supports ``in``, :meth:`add`, :meth:`update`, and ``len``, so it
+    can stand in for a ``set`` of ``str`` or ``bytes`` keys that is
+    only added to and queried. It cannot remove or list keys.
+
+    Parameters
+    ----------
+    error_rate : float
+        Upper bound on the probability that a key never added is
+        reported as present, between 0 and 1 (exclusive).
+    initial_capacity : int
+        Keys the first filter holds before a larger one is added.
+    growth : int
+        Capacity ratio between successive filters (at least 2).
+    tightening : float
+        Error-rate ratio between successive filters, between 0 and 1
+        (exclusive). Lower values spend more memory on later filters
+        in exchange for a lower rate in the first one.
+
+    Raises
+    ------
+    ValueError
+        If a parameter is out of range.
+    """
+
+    def __init__(
+        self,
+        error_rate: float = DEFAULT_BLOOM_ERROR_RATE,
+        initial_capacity: int = DEFAULT_BLOOM_CAPACITY,
+        growth: int = 2,
+        tightening: float = 0.5,
+    ) -> None:
+        if not 0 < error_rate < 1:
+            raise ValueError(f"error_rate must be between 0 and 1, got {error_rate}")
+        if initial_capacity < 1:
+            raise ValueError(f"initial_capacity must be >= 1, got {initial_capacity}")
+        if growth < 2:
+            raise ValueError(f"growth must be >= 2, got {growth}")
+        if not 0 < tightening < 1:
+            raise ValueError(f"tightening must be between 0 and 1, got {tightening}")
+        self.error_rate = error_rate
+        self.initial_capacity = initial_capacity
+        self.growth = growth
+        self.tightening = tightening
+        self._lock = threading.Lock()
+        self._filters: list[_Filter] = []
+
+    def __repr__(self) -> str:
+        return (
+            f"ScalableBloomFilter(error_rate={self.error_rate}, "
+            f"initial_capacity={self.initial_capacity}, keys={len(self)})"
+        )
+
+    def __len__(self) -> int:
+        """Number of keys added (a key reported present when added is not counted)."""
+        with self._lock:
+            return sum(f.count for f in self._filters)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, (str, bytes)):
+            return False
+        h1, h2 = _hash(key)
+        with self._lock:
+            return any(f.has(f.positions(h1, h2)) for f in self._filters)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the bit arrays."""
+        with self._lock:
+            return sum(len(f.bits) for f in self._filters)
+
+    def add(self, key: Key) -> bool:
+        """Add ``key``. Returns ``False`` if it was (reported as) already present."""
+        h1, h2 = _hash(key)
+        with self._lock:
+            if any(f.has(f.positions(h1, h2)) for f in self._filters):
+                return False
+            last = self._filters[-1] if self._filters else None
+            if last is None or last.count >= last.capacity:
+                last = self._grow()
+            last.set(last.positions(h1, h2))
+            return True
+
+    def update(self, keys: Iterable[Key]) -> None:
+        """Add every key in ``keys``."""
+        for key in keys:
+            self.add(key)
+
+    # --- Serialization ---
+
+    def to_bytes(self) -> bytes:
+        """Serialize the filter; the inverse of :meth:`from_bytes`."""
+        with self._lock:
+            parts = [
+                _MAGIC,
+                _HEADER.pack(
+                    self.error_rate,
+                    self.tightening,
+                    self.growth,
+                    self.initial_capacity,
+                    len(self._filters),
+                ),
+            ]
+            for f in self._filters:
+                parts.append(_FILTER_HEADER.pack(f.capacity, f.hashes, f.size, f.count))
+                parts.append(bytes(f.bits))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> ScalableBloomFilter:
+        """Rebuild a filter serialized by :meth:`to_bytes`.
+
+        Raises
+        ------
+        ValueError
+            If ``data`` is not a serialized filter or is truncated.
+        """
+        if not data.startswith(_MAGIC):
+            raise ValueError("not a serialized ScalableBloomFilter")
+        view = memoryview(data)
+        offset = len(_MAGIC)
+        try:
+            error_rate, tightening, growth, capacity, count = _HEADER.unpack_from(view, offset)
+            offset += _HEADER.size
+            bloom = cls(error_rate, capacity, growth, tightening)
+            for _ in range(count):
+                f_capacity, hashes, size, keys = _FILTER_HEADER.unpack_from(view, offset)
+                offset += _FILTER_HEADER.size
+                length = (size + 7) // 8
+                bits = bytearray(view[offset : offset + length])
+                if len(bits) != length:
+                    raise ValueError("truncated ScalableBloomFilter data")
+                offset += length
+                bloom._filters.append(_Filter(f_capacity, hashes, size, keys, bits))
+        except struct.error as e:
+            raise ValueError("truncated ScalableBloomFilter data") from e
+        return bloom
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Write the filter to ``path`` atomically (via a temp file and rename)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = self.to_bytes()
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".bloom-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> ScalableBloomFilter:
+        """Read a filter written by :meth:`save`.
+
+        Raises
+        ------
+        OSError
+            If ``path`` can't be read.
+        ValueError
+            If it does not hold a serialized filter.
+        """
+        return cls.from_bytes(Path(path).read_bytes())
+
+    # --- Internals ---
+
+    def _grow(self) -> _Filter:
+        # Called with ``_lock`` held. Filter i holds
+        # ``initial_capacity * growth**i`` keys at
+        # ``error_rate * (1 - tightening) * tightening**i``; the rates
+        # sum to ``error_rate``.
+        i = len(self._filters)
+        f = _Filter.sized(
+            self.initial_capacity * self.growth**i,
+            self.error_rate * (1 - self.tightening) * self.tightening**i,
+        )
+        self._filters.append(f)
+        return f
+
+
+def _hash(key: Key) -> tuple[int, int]:
+    """Two independent 64-bit hashes of ``key``."""
+    if isinstance(key, str):
+        key = key.encode("utf-8", "surrogatepass")
+    digest = hashlib.blake2b(key, digest_size=16).digest()
+    return int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big")
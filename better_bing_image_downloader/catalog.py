@@ -0,0 +1,373 @@
+"""SQLite catalog of every run under an output root (v3.7.0+).
+
+Run state used to live in three places: ``engine.manifest`` (file
+name to URL), the ``_manifest.json`` that ``downloader()`` rewrites
+in full after every run, and the optional per-query
+``manifest.jsonl``. Questions such as "was this md5 saved under any
+query?" or "which URLs failed for query X?" meant globbing directories
+and parsing every manifest.
+
+A :class:`RunCatalog` is a single SQLite database in WAL mode, one per
+output root (``<output_dir>/.bbid-catalog.sqlite``). It records every
+run (query, engine, start and finish time) and every download attempt
+(status, URL, file, md5, error, source page), indexed by md5, URL and
+query. The download workers only queue records. One writer thread
+inserts whatever has queued up in a single transaction, so a busy run
+costs one commit per batch rather than one per image.
+
+``Downloader.search(catalog=True)`` opens it, and each run records into
+it through a :class:`CatalogRun`, a
+:class:`~better_bing_image_downloader.manifest.ManifestSink` that sits
+next to the manifest. The per-directory manifests are still written
+as before.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import NamedTuple
+
+from .manifest import (
+    _CLOSE,
+    DEFAULT_MANIFEST_FLUSH_INTERVAL,
+    ManifestSink,
+    _next_batch,
+)
+
+__all__ = [
+    "CATALOG_FILENAME",
+    "CatalogEntry",
+    "CatalogRun",
+    "DEFAULT_CATALOG_BATCH",
+    "RunCatalog",
+]
+
+logger = logging.getLogger(__name__)
+
+# File name ``Downloader`` uses inside the output directory.
+CATALOG_FILENAME = ".bbid-catalog.sqlite"
+
+# Records after which the writer commits without waiting for the
+# flush interval.
+DEFAULT_CATALOG_BATCH = 512
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    query TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    query TEXT NOT NULL,
+    status TEXT NOT NULL,
+    url TEXT NOT NULL,
+    file TEXT,
+    md5 TEXT,
+    error TEXT,
+    source_page TEXT,
+    attempted_at TEXT
+);
+CREATE INDEX IF NOT EXISTS attempts_md5 ON attempts (md5) WHERE md5 IS NOT NULL;
+CREATE INDEX IF NOT EXISTS attempts_url ON attempts (url);
+CREATE INDEX IF NOT EXISTS attempts_query ON attempts (query, status);
+"""
+
+_ENTRY_COLUMNS = (
+    "a.run_id, r.engine, a.query, a.status, a.url, a.file, a.md5, a.error, "
+    "a.source_page, a.attempted_at"
+)
+
+
+class CatalogEntry(NamedTuple):
+    """One download attempt recorded in a :class:`RunCatalog`."""
+
+    run_id: int
+    engine: str
+    query: str
+    status: str
+    url: str
+    file: str | None
+    md5: str | None
+    error: str | None
+    source_page: str | None
+    attempted_at: str | None
+
+
+def _utcnow_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class RunCatalog:
+    """Thread-safe SQLite catalog of runs and download attempts.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        SQLite database file; created (with its parent directories)
+        on first use.
+    batch_size : int
+        Records after which the writer thread commits a batch.
+    flush_interval : float
+        Longest time, in seconds, a record waits to be committed.
+
+    Raises
+    ------
+    ValueError
+        If ``batch_size`` is less than 1 or ``flush_interval`` is
+        negative.
+
+    Example
+    -------
+
+    >>> catalog = RunCatalog("out/.bbid-catalog.sqlite")
+    >>> catalog.has_md5("9e107d9d372bb6826bd81d3542a419d6")
+    False
+    >>> catalog.status_counts(query="cats")
+    {}
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        batch_size: int = DEFAULT_CATALOG_BATCH,
+        flush_interval: float = DEFAULT_MANIFEST_FLUSH_INTERVAL,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+        if flush_interval < 0:
+            raise ValueError(f"flush_interval must be >= 0, got {flush_interval}")
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._queue: queue.SimpleQueue[object] = queue.SimpleQueue()
+        self._writer: threading.Thread | None = None
+        self._writer_lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"RunCatalog({str(self.path)!r})"
+
+    def __enter__(self) -> RunCatalog:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of recorded download attempts."""
+        self.flush()
+        with self._lock:
+            (count,) = self._connect().execute("SELECT COUNT(*) FROM attempts").fetchone()
+        return int(count)
+
+    # --- Writing ---
+
+    def start_run(self, query: str, engine: str) -> CatalogRun:
+        """Register a new run and return the sink its records go to."""
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                "INSERT INTO runs (query, engine, started_at) VALUES (?, ?, ?)",
+                (query, engine, _utcnow_iso()),
+            )
+            conn.commit()
+        return CatalogRun(self, int(cursor.lastrowid), query)  # type: ignore[arg-type]
+
+    def record(self, run_id: int, record: dict) -> None:
+        """Queue one manifest-style record of run ``run_id``. Never blocks on I/O."""
+        self._enqueue((run_id, record))
+
+    def finish_run(self, run_id: int) -> None:
+        """Queue the finish time of run ``run_id``, after its queued records."""
+        self._enqueue((run_id, None))
+
+    def flush(self) -> None:
+        """Block until every record queued so far is committed."""
+        with self._writer_lock:
+            if self._writer is None:
+                return
+            done = threading.Event()
+            self._queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        """Commit queued records and close the database. Idempotent; reopens on next use."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+            if writer is not None:
+                # Each writer has its own queue, so a writer started
+                # by a later record can't take this sentinel.
+                self._queue.put(_CLOSE)
+        if writer is not None:
+            writer.join()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --- Lookups ---
+
+    def find(
+        self,
+        md5: str | None = None,
+        url: str | None = None,
+        query: str | None = None,
+        status: str | None = None,
+        limit: int | None = None,
+    ) -> list[CatalogEntry]:
+        """Return the attempts matching every given filter, oldest first."""
+        clauses = []
+        params: list[object] = []
+        for column, value in (("md5", md5), ("url", url), ("query", query), ("status", status)):
+            if value is not None:
+                clauses.append(f"a.{column} = ?")
+                params.append(value)
+        sql = f"SELECT {_ENTRY_COLUMNS} FROM attempts a JOIN runs r ON r.id = a.run_id"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY a.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        self.flush()
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        return [CatalogEntry(*row) for row in rows]
+
+    def has_md5(self, md5: str) -> bool:
+        """``True`` if an image with this md5 was saved by any run."""
+        return bool(self.find(md5=md5, status="ok", limit=1))
+
+    def has_url(self, url: str) -> bool:
+        """``True`` if ``url`` was saved by any run."""
+        return bool(self.find(url=url, status="ok", limit=1))
+
+    def status_counts(self, query: str | None = None) -> dict[str, int]:
+        """Return ``{status: attempts}``, for one query or the whole catalog."""
+        sql = "SELECT status, COUNT(*) FROM attempts"
+        params: tuple[object, ...] = ()
+        if query is not None:
+            sql += " WHERE query = ?"
+            params = (query,)
+        self.flush()
+        with self._lock:
+            rows = self._connect().execute(sql + " GROUP BY status", params).fetchall()
+        return {status: int(count) for status, count in rows}
+
+    # --- Internals ---
+
+    def _enqueue(self, item: tuple[int, dict | None]) -> None:
+        # Under ``_writer_lock`` so the item can't land behind the
+        # close sentinel of a writer that is shutting down.
+        with self._writer_lock:
+            if self._writer is None:
+                self._queue = queue.SimpleQueue()
+                self._writer = threading.Thread(
+                    target=self._write_loop, args=(self._queue,), name="bbid-catalog", daemon=True
+                )
+                self._writer.start()
+            self._queue.put(item)
+
+    def _write_loop(self, items: queue.SimpleQueue[object]) -> None:
+        while True:
+            batch, marker = _next_batch(items, self.batch_size, self.flush_interval)
+            if batch:
+                self._commit(batch)
+            if isinstance(marker, threading.Event):
+                marker.set()
+            elif marker is _CLOSE:
+                return
+
+    def _commit(self, batch: list[tuple[int, dict | None]]) -> None:
+        rows = []
+        finished = []
+        for run_id, record in batch:
+            if record is None:
+                finished.append((_utcnow_iso(), run_id))
+                continue
+            rows.append(
+                (
+                    run_id,
+                    record.get("query") or "",
+                    record.get("status") or "",
+                    record.get("url") or "",
+                    record.get("file"),
+                    record.get("md5"),
+                    record.get("error"),
+                    record.get("source_page"),
+                    record.get("downloaded_at"),
+                )
+            )
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO attempts (run_id, query, status, url, file, md5, error, "
+                        "source_page, attempted_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                    conn.executemany("UPDATE runs SET finished_at = ? WHERE id = ?", finished)
+        except Exception as exc:  # noqa: BLE001 - defensive
+            logger.warning("catalog write failed: %s", exc)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Used from the writer thread and callers, serialised by ``_lock``.
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+
+class CatalogRun(ManifestSink):
+    """Sink that records one run's attempts into a :class:`RunCatalog` (v3.7.0+).
+
+    Created by :meth:`RunCatalog.start_run`. :meth:`append` queues the
+    record; :meth:`close` marks the run finished.
+
+    Attributes
+    ----------
+    catalog : RunCatalog
+        The catalog records go to.
+    run_id : int
+        Row id of the run in the ``runs`` table.
+    """
+
+    def __init__(self, catalog: RunCatalog, run_id: int, query: str) -> None:
+        super().__init__()
+        self.catalog = catalog
+        self.run_id = run_id
+        self.query = query
+        self.path = catalog.path
+        self._closed = False
+
+    def __repr__(self) -> str:
+        return f"CatalogRun({self.run_id}, query={self.query!r})"
+
+    def append(self, record: dict) -> None:
+        """Queue one record of this run."""
+        if not self._closed:
+            self.catalog.record(self.run_id, {**record, "query": self.query})
+
+    def close(self) -> None:
+        """Mark the run finished. Idempotent."""
+        if self._closed:
+            return
+        self._closed = True
+        self.catalog.finish_run(self.run_id)
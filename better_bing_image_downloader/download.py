@@ -14,18 +14,38 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import os
 import shutil
+import sys
 import warnings
 from importlib.metadata import PackageNotFoundError
 from importlib.metadata import version as pkg_version
 from pathlib import Path
+from typing import Any
 
 from tqdm import tqdm
 
+from .batch import CHECKPOINT_FILENAME, DEFAULT_QUERY_PARALLELISM, read_queries
+from .bloom import DEFAULT_BLOOM_ERROR_RATE
 from .downloader import Downloader
+from .manifest import MANIFEST_FILENAMES
+from .manifestindex import MANIFEST_INDEX_FILENAME, ManifestIndex, find_manifests
+from .perceptual import DEFAULT_NEAR_DUPLICATE_DISTANCE
 
 __all__ = ["downloader", "main"]
 
+# Bytes read from the end of ``_manifest.json`` to find where new
+# entries go (v3.7.0+).
+_LEGACY_TAIL_BYTES = 4096
+
+# Size of ``_manifest.json`` when it was last written whole, kept next
+# to it. Once appends (which repeat re-downloaded names) have grown the
+# file past ``_LEGACY_COMPACT_RATIO`` times that, it is rewritten with
+# one member per name, so the rewrites cost at most a constant factor
+# of the bytes appended.
+_LEGACY_COMPACTED_SIZE_FILENAME = ".bbid-manifest-compacted"
+_LEGACY_COMPACT_RATIO = 2
+
 
 def downloader(
     query: str,
@@ -47,7 +67,22 @@ def downloader(
     manifest_path: str | None = None,
     manifest_fields: list[str] | None = None,
     manifest_flush_every: int = 1,
+    manifest_fsync: bool = False,
+    manifest_format: str = "jsonl",
     min_dimension: int | None = None,
+    min_bytes: int | None = None,
+    max_bytes: int | None = None,
+    max_per_host: int | None = None,
+    min_host_delay: float | None = None,
+    adaptive: bool = False,
+    hash_index: bool | str | None = None,
+    near_duplicate_distance: int | None = None,
+    canonicalize_urls: bool = True,
+    seen_urls: bool | str | None = None,
+    seen_error_rate: float | None = None,
+    cache_dir: str | None = None,
+    http_cache: bool | str | None = None,
+    catalog: bool | str | None = None,
     **kwargs,
 ) -> int:
     """Download images matching ``query`` using the chosen search engine.
@@ -96,6 +131,56 @@ def downloader(
         Minimum width/height in pixels (v3.6.0+). Images smaller than
         this on either side are skipped. ``None`` (the default)
         disables the filter.
+    min_bytes, max_bytes : int | None
+        Allowed image body size range in bytes (v3.7.0+). Images
+        outside it are skipped. ``None`` (the default) disables either
+        bound.
+    max_per_host : int | None
+        Maximum concurrent downloads from one image host (v3.7.0+);
+        ``0`` removes the cap. ``None`` (the default) uses the engine
+        default (no cap).
+    min_host_delay : float | None
+        Minimum seconds between two downloads from the same host
+        (v3.7.0+). ``None`` (the default) means no delay.
+    adaptive : bool
+        Tune concurrency during the run, starting at ``max_workers``
+        (v3.7.0+). Default ``False``.
+    hash_index : bool | str | None
+        Skip images already saved by earlier runs, tracked in an
+        on-disk MD5 index (v3.7.0+): ``True`` for
+        ``<output_dir>/<query>/.bbid-hashes``, or a path to share one
+        index between queries. ``None`` (the default) deduplicates
+        within the run only.
+    near_duplicate_distance : int | None
+        Skip images whose perceptual hash is within this many bits of
+        an image already saved in the query directory (v3.7.0+; needs
+        Pillow). ``None`` (the default) disables the check.
+    canonicalize_urls : bool
+        Treat URLs that differ only in scheme, tracking parameters, or
+        CDN size variant as one image (v3.7.0+). Default ``True``.
+    seen_urls : bool | str | None
+        Skip links fetched by earlier runs (v3.7.0+): ``True`` for
+        ``<output_dir>/.bbid-seen.sqlite``, or a path to the store.
+        ``None`` (the default) disables it.
+    seen_error_rate : float | None
+        Track the links and images already handled in Bloom filters
+        with this false-positive rate instead of sets, to bound memory
+        on very large runs (v3.7.0+). ``None`` (the default) keeps
+        exact sets.
+    cache_dir : str | None
+        Directory for the search-results page cache (v3.7.0+): pages
+        fetched within the last day are not requested again. ``None``
+        (the default) disables it.
+    http_cache : bool | str | None
+        Revalidate images fetched by earlier runs with conditional
+        requests and reuse the stored body on ``304 Not Modified``
+        (v3.7.0+): ``True`` for ``<output_dir>/.bbid-http``, or a
+        cache directory. ``None`` (the default) disables it.
+    catalog : bool | str | None
+        Record the run and every download attempt in a SQLite run
+        catalog (v3.7.0+): ``True`` for
+        ``<output_dir>/.bbid-catalog.sqlite``, or a database path.
+        ``None`` (the default) disables it.
 
     Returns
     -------
@@ -129,7 +214,7 @@ def downloader(
 
     logging.info("Downloading Images to %s", image_dir)
 
-    dl = Downloader()
+    dl = Downloader(cache_dir=Path(cache_dir) if cache_dir else None)
     pbar_cm = None
     if verbose:
         pbar_cm = tqdm(
@@ -171,7 +256,21 @@ def downloader(
             manifest_path=manifest_path,
             manifest_fields=manifest_fields,
             manifest_flush_every=manifest_flush_every,
+            manifest_fsync=manifest_fsync,
+            manifest_format=manifest_format,
             min_dimension=min_dimension,
+            min_bytes=min_bytes,
+            max_bytes=max_bytes,
+            max_per_host=max_per_host,
+            min_host_delay=min_host_delay,
+            adaptive=adaptive,
+            hash_index=hash_index,
+            near_duplicate_distance=near_duplicate_distance,
+            canonicalize_urls=canonicalize_urls,
+            seen_urls=seen_urls,
+            seen_error_rate=seen_error_rate,
+            http_cache=http_cache,
+            catalog=catalog,
         )
         # Preserve the v3.1.x contract: the legacy downloader()
         # function returns the engine's ``download_count``, which the
@@ -192,22 +291,24 @@ def downloader(
     finally:
         if pbar_cm is not None:
             pbar_cm.close()
+        dl.close()
         # v3.1.x also wrote a _manifest.json file at the end. We
         # preserve that for any tooling that depends on it.
         _write_legacy_manifest(image_dir, result if "result" in locals() else None)
 
 
 def _write_legacy_manifest(image_dir: Path, result) -> None:
-    """Write the v3.1.x-style _manifest.json. Best-effort, never raises."""
+    """Write the v3.1.x-style _manifest.json. Best-effort, never raises.
+
+    Only this run's entries are written (v3.7.0+): they are appended
+    to the existing JSON object in place (see
+    :func:`_append_legacy_entries`), so the cost no longer grows with
+    the entries earlier runs left behind. Names written again by later
+    runs are merged by an occasional full rewrite (see
+    :data:`_LEGACY_COMPACT_RATIO`).
+    """
     try:
-        existing: dict = {}
-        manifest_path = image_dir / "_manifest.json"
-        if manifest_path.exists():
-            try:
-                with open(manifest_path) as f:
-                    existing = json.load(f)
-            except Exception:
-                pass
+        entries: dict = {}
         if result is not None:
             # Include both the engine's view (filename -> source_url,
             # preserved from v3.1.x) and the Result's view (from the
@@ -215,24 +316,151 @@ def _write_legacy_manifest(image_dir: Path, result) -> None:
             # but merging keeps the legacy contract intact.
             engine = getattr(result, "_engine", None)
             if engine is not None and getattr(engine, "manifest", None):
-                existing.update(engine.manifest)
+                entries.update(engine.manifest)
             for img in result.images:
-                existing[img.path.name] = img.source_url
-        with open(manifest_path, "w") as f:
-            json.dump(existing, f, indent=2)
+                entries[img.path.name] = img.source_url
+        manifest_path = image_dir / "_manifest.json"
+        size_path = image_dir / _LEGACY_COMPACTED_SIZE_FILENAME
+        compacted = _read_compacted_size(size_path)
+        if compacted is None and manifest_path.exists():
+            # Written by an older version: count from its current size.
+            compacted = manifest_path.stat().st_size
+            size_path.write_text(str(compacted))
+        if not _append_legacy_entries(
+            manifest_path, entries
+        ) or manifest_path.stat().st_size > _LEGACY_COMPACT_RATIO * (compacted or 0):
+            _rewrite_legacy_manifest(manifest_path, entries)
+            size_path.write_text(str(manifest_path.stat().st_size))
     except Exception as e:
         logging.error("Failed to write manifest: %s", e)
 
 
+def _append_legacy_entries(manifest_path: Path, entries: dict) -> bool:
+    """Add ``entries`` to an existing ``_manifest.json`` without rewriting it.
+
+    The file is a JSON object as written by ``json.dump(indent=2)``.
+    The new members are written over its closing brace, followed by a
+    new one, so only the tail of the file is read. A key that is
+    already present is written again; JSON readers keep the last
+    value, which is what the old load-update-dump did.
+
+    Returns ``False`` if the file is missing or doesn't end in a JSON
+    object, leaving it to :func:`_rewrite_legacy_manifest`.
+    """
+    try:
+        f = open(manifest_path, "r+b")  # noqa: SIM115 - closed below
+    except FileNotFoundError:
+        return False
+    with f:
+        size = f.seek(0, os.SEEK_END)
+        tail_start = max(0, size - _LEGACY_TAIL_BYTES)
+        f.seek(tail_start)
+        tail = f.read().rstrip()
+        if not tail.endswith(b"}"):
+            return False
+        if not entries:
+            return True
+        before = tail[:-1].rstrip()
+        if not before:
+            return False  # a "}" alone in the last chunk: not our layout
+        members = ",\n".join(
+            f"  {json.dumps(name)}: {json.dumps(url)}" for name, url in entries.items()
+        )
+        separator = "\n" if before.endswith(b"{") else ",\n"
+        f.seek(tail_start + len(before))
+        f.write((separator + members + "\n}").encode("ascii"))
+        f.truncate()
+    return True
+
+
+def _read_compacted_size(size_path: Path) -> int | None:
+    """The size recorded in ``size_path``, or ``None`` if it is missing or garbled."""
+    try:
+        return int(size_path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _rewrite_legacy_manifest(manifest_path: Path, entries: dict) -> None:
+    """Merge ``entries`` into ``_manifest.json`` by loading and rewriting it whole."""
+    existing: dict = {}
+    if manifest_path.exists():
+        try:
+            with open(manifest_path) as f:
+                existing = json.load(f)
+        except Exception:
+            logging.warning("Replacing unreadable %s", manifest_path)
+    existing.update(entries)
+    with open(manifest_path, "w") as f:
+        json.dump(existing, f, indent=2)
+
+
+def _manifest_main(argv: list[str]) -> None:
+    """``bbid manifest``: query JSONL manifests through an offset index (v3.7.0+)."""
+    parser = argparse.ArgumentParser(
+        prog="bbid manifest",
+        description=(
+            "Find manifest records by md5, url, status, query or error. "
+            "Prints matching records as JSON lines."
+        ),
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help="Manifest files, or directories searched for manifest.jsonl files.",
+    )
+    parser.add_argument(
+        "--index",
+        default=None,
+        help=(
+            "Sidecar index database (default: .bbid-manifest-index.sqlite in the "
+            "first directory given, or next to the first manifest)."
+        ),
+    )
+    for key in ("md5", "url", "status", "query", "error"):
+        parser.add_argument(f"--{key}", default=None, help=f"Only records with this {key}.")
+    parser.add_argument("--limit", type=int, default=None, help="Print at most N records.")
+    parser.add_argument("--count", action="store_true", help="Print the number of matches instead.")
+    args = parser.parse_args(argv)
+
+    first = Path(args.paths[0])
+    index_path = (
+        Path(args.index)
+        if args.index
+        else (first if first.is_dir() else first.parent) / MANIFEST_INDEX_FILENAME
+    )
+    manifests = [m for path in args.paths for m in find_manifests(path)]
+    if not manifests:
+        parser.error("no manifest.jsonl files found")
+    filters = {
+        key: getattr(args, key)
+        for key in ("md5", "url", "status", "query", "error")
+        if getattr(args, key) is not None
+    }
+    with ManifestIndex(index_path) as index:
+        for manifest in manifests:
+            index.add(manifest)
+        if args.count:
+            print(index.count(**filters))
+            return
+        for match in index.find(limit=args.limit, refresh=False, **filters):
+            print(json.dumps(match.record, ensure_ascii=False))
+
+
 def main() -> None:
     """Entry point for the ``bbid`` CLI command."""
+    if sys.argv[1:2] == ["manifest"]:
+        _manifest_main(sys.argv[2:])
+        return
     parser = argparse.ArgumentParser(description="Download images using Bing or DuckDuckGo.")
     try:
         _version = pkg_version("better-bing-image-downloader")
     except PackageNotFoundError:
         _version = "unknown"
     parser.add_argument("--version", action="version", version=f"%(prog)s {_version}")
-    parser.add_argument("query", type=str, help="The search query.")
+    parser.add_argument(
+        "query", type=str, nargs="?", help="The search query (omit with --queries-file)."
+    )
     parser.add_argument(
         "-l",
         "--limit",
@@ -347,14 +575,160 @@ def main() -> None:
         default=1,
         help="Flush the manifest file to disk every N records (default: 1, crash-safe).",
     )
+    parser.add_argument(
+        "--manifest-fsync",
+        action="store_true",
+        help="fsync the manifest after every batch of records it writes.",
+    )
+    parser.add_argument(
+        "--manifest-format",
+        choices=sorted(MANIFEST_FILENAMES),
+        default="jsonl",
+        help="Manifest file format (default: jsonl). parquet needs the 'parquet' extra.",
+    )
     parser.add_argument(
         "--min-dimension",
         type=int,
         default=None,
         help="Minimum width/height in pixels; smaller images are skipped (default: no filtering).",
     )
+    parser.add_argument(
+        "--min-bytes",
+        type=int,
+        default=None,
+        help="Skip images whose body is smaller than this many bytes (default: no limit).",
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=None,
+        help="Skip images whose body is larger than this many bytes (default: no limit).",
+    )
+    parser.add_argument(
+        "--max-per-host",
+        type=int,
+        default=None,
+        help="Maximum concurrent downloads from one image host, e.g. 4 (default: no cap).",
+    )
+    parser.add_argument(
+        "--min-host-delay",
+        type=float,
+        default=None,
+        help="Minimum seconds between downloads from the same host (default: 0).",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Tune concurrency during the run, starting at --workers (up to 16).",
+    )
+    parser.add_argument(
+        "--hash-index",
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Skip images saved by earlier runs, using an on-disk MD5 index "
+            "(default file: <output>/<query>/.bbid-hashes)."
+        ),
+    )
+    parser.add_argument(
+        "--near-duplicates",
+        nargs="?",
+        type=int,
+        const=DEFAULT_NEAR_DUPLICATE_DISTANCE,
+        default=None,
+        metavar="DISTANCE",
+        help=(
+            "Skip images that look like one already saved: perceptual hashes within "
+            f"DISTANCE bits (default: {DEFAULT_NEAR_DUPLICATE_DISTANCE}). Requires Pillow."
+        ),
+    )
+    parser.add_argument(
+        "--raw-urls",
+        action="store_true",
+        help="Compare result URLs as-is instead of by their canonical form.",
+    )
+    parser.add_argument(
+        "--seen-urls",
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Skip URLs fetched by earlier runs into the same output tree "
+            "(default store: <output>/.bbid-seen.sqlite)."
+        ),
+    )
+    parser.add_argument(
+        "--compact-seen",
+        nargs="?",
+        type=float,
+        const=DEFAULT_BLOOM_ERROR_RATE,
+        default=None,
+        metavar="RATE",
+        help=(
+            "Track seen URLs and images in Bloom filters to bound memory on huge runs; "
+            f"up to RATE of new images may be skipped (default: {DEFAULT_BLOOM_ERROR_RATE})."
+        ),
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        metavar="PATH",
+        help="Cache search-results pages here; re-runs within a day skip the search requests.",
+    )
+    parser.add_argument(
+        "--http-cache",
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Revalidate images fetched before with conditional requests instead of "
+            "downloading them again (default cache: <output>/.bbid-http)."
+        ),
+    )
+    parser.add_argument(
+        "--catalog",
+        nargs="?",
+        const=True,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Record every run and download attempt in a SQLite catalog "
+            "(default: <output>/.bbid-catalog.sqlite)."
+        ),
+    )
+    parser.add_argument(
+        "--queries-file",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Search every query in this file (one per line, '#' comments allowed) "
+            "in one process; re-runs skip queries that already finished."
+        ),
+    )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=DEFAULT_QUERY_PARALLELISM,
+        metavar="N",
+        help=f"Queries searched at once with --queries-file (default: {DEFAULT_QUERY_PARALLELISM}).",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        metavar="PATH",
+        help=f"Checkpoint file for --queries-file (default: <output>/{CHECKPOINT_FILENAME}).",
+    )
 
     args = parser.parse_args()
+    if (args.query is None) == (args.queries_file is None):
+        parser.error("give either a query or --queries-file")
+    if args.queries_file is not None and args.manifest_path is not None:
+        parser.error("--manifest-path can't be used with --queries-file")
     logging.basicConfig(
         level=logging.INFO if args.verbose else logging.WARNING,
         format="%(levelname)s: %(message)s",
@@ -364,28 +738,58 @@ def main() -> None:
     if args.manifest_fields:
         manifest_fields_list = [f.strip() for f in args.manifest_fields.split(",") if f.strip()]
 
-    downloader(
-        args.query,
-        args.limit,
-        args.output_dir,
-        args.adult_filter_off,
-        args.force_replace,
-        args.timeout,
-        args.image_filter,
-        args.verbose,
-        args.bad_sites,
-        args.name,
-        args.workers,
-        args.mkt,
-        engine=args.engine,
-        ddg_safe_search=args.ddg_safe_search,
-        ddg_region=args.ddg_region,
-        manifest=args.manifest,
-        manifest_path=args.manifest_path,
-        manifest_fields=manifest_fields_list,
-        manifest_flush_every=args.manifest_flush_every,
-        min_dimension=args.min_dimension,
-    )
+    # Keyword arguments of ``downloader()`` that ``Downloader.search``
+    # takes too.
+    options: dict[str, Any] = {
+        "limit": args.limit,
+        "output_dir": args.output_dir,
+        "adult_filter_off": args.adult_filter_off,
+        "force_replace": args.force_replace,
+        "timeout": args.timeout,
+        "image_filter": args.image_filter,
+        "verbose": args.verbose,
+        "badsites": args.bad_sites,
+        "name": args.name,
+        "max_workers": args.workers,
+        "mkt": args.mkt,
+        "engine": args.engine,
+        "ddg_safe_search": args.ddg_safe_search,
+        "ddg_region": args.ddg_region,
+        "manifest": args.manifest,
+        "manifest_path": args.manifest_path,
+        "manifest_fields": manifest_fields_list,
+        "manifest_flush_every": args.manifest_flush_every,
+        "manifest_fsync": args.manifest_fsync,
+        "manifest_format": args.manifest_format,
+        "min_dimension": args.min_dimension,
+        "min_bytes": args.min_bytes,
+        "max_bytes": args.max_bytes,
+        "max_per_host": args.max_per_host,
+        "min_host_delay": args.min_host_delay,
+        "adaptive": args.adaptive,
+        "hash_index": args.hash_index,
+        "near_duplicate_distance": args.near_duplicates,
+        "canonicalize_urls": not args.raw_urls,
+        "seen_urls": args.seen_urls,
+        "seen_error_rate": args.compact_seen,
+        "http_cache": args.http_cache,
+        "catalog": args.catalog,
+    }
+    if args.queries_file is None:
+        downloader(args.query, cache_dir=args.cache_dir, **options)
+        return
+
+    queries = read_queries(args.queries_file)
+    checkpoint = args.checkpoint or Path(args.output_dir) / CHECKPOINT_FILENAME
+    with Downloader(cache_dir=Path(args.cache_dir) if args.cache_dir else None) as dl:
+        for result in dl.search_many(
+            queries, parallel=args.parallel, checkpoint=checkpoint, **options
+        ):
+            print(
+                f"{result.query}: {result.count} saved, {result.skipped} skipped, "
+                f"{len(result.errors)} failed",
+                flush=True,
+            )
 
 
 if __name__ == "__main__":
@@ -6,6 +6,9 @@ It owns:
 - a session-shared ``http.cookiejar.CookieJar`` and
   ``urllib.request.OpenerDirector`` (so DuckDuckGo's vqd cookie, TLS
   handshake, and TCP connection can be reused across many search calls)
+- a keep-alive :class:`PooledTransport` (v3.7.0+) shared by every
+  engine it builds, so image downloads and page fetches reuse
+  per-host connections instead of paying a TCP/TLS handshake each
 - a public engine registry — :meth:`Downloader.register` lets downstream
   code plug in custom engines without monkey-patching
 - lifecycle hooks — ``on_image``, ``on_error``, ``on_engine_start``,
@@ -23,21 +26,56 @@ function is preserved as a thin wrapper around :class:`Downloader`.
 
 from __future__ import annotations
 
+import asyncio
 import http.cookiejar
+import inspect
 import logging
+import multiprocessing
 import os
 import threading
 import time
 import urllib.request
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Callable
+from typing import Any, Callable, Iterable, Iterator
 
+from .async_engine import AsyncImageEngine
+from .async_transport import AsyncTransport
 from .base import DEFAULT_VERBOSE, ImageEngine
-from .bing import Bing
-from .duckduckgo import DuckDuckGo
-from .manifest import DEFAULT_MANIFEST_FIELDS, ManifestWriter
-from .results import ImageResult, Result
+from .batch import DEFAULT_QUERY_PARALLELISM, QueryCheckpoint
+from .bing import AsyncBing, Bing
+from .catalog import CATALOG_FILENAME, CatalogRun, RunCatalog
+from .duckduckgo import AsyncDuckDuckGo, DuckDuckGo, VQDCache
+from .hashindex import HASH_INDEX_FILENAME, HashIndex
+from .httpcache import HTTP_CACHE_DIRNAME, HTTPCache
+from .manifest import (
+    DEFAULT_MANIFEST_FIELDS,
+    MANIFEST_FILENAMES,
+    ManifestSink,
+    ManifestWriter,
+    open_manifest_sink,
+)
+from .pagecache import (
+    DEFAULT_PAGE_CACHE_MAX_BYTES,
+    DEFAULT_PAGE_CACHE_TTL,
+    PAGE_CACHE_FILENAME,
+    PageCache,
+)
+from .perceptual import NEAR_DUPLICATE_INDEX_FILENAME, NearDuplicateIndex
+from .results import FailedImage, ImageResult, Result, SkippedImage
+from .scheduler import DEFAULT_MAX_CONCURRENT_DOWNLOADS, DownloadScheduler, DownloadShare
+from .seenurls import SEEN_URLS_FILENAME, SeenURLStore
+from .stream import DEFAULT_STREAM_BUFFER, EventChannel, SearchStream
+from .transport import DEFAULT_MAX_IDLE_PER_HOST, PooledTransport, Transport
+from .urls import URLCanonicalizer
 
 __all__ = [
     "Downloader",
@@ -49,6 +87,9 @@ __all__ = [
     "DuplicateImageError",
     "WriteError",
     "BelowMinDimension",
+    "ImageSkipped",
+    "OutsideByteLimits",
+    "NearDuplicateImage",
     "CancelToken",
     "ManifestWriter",
     "DEFAULT_MANIFEST_FIELDS",
@@ -63,8 +104,11 @@ from .base import (  # noqa: E402
     BelowMinDimension,
     DuplicateImageError,
     ImageSaveError,
+    ImageSkipped,
     InvalidImageError,
+    NearDuplicateImage,
     NetworkError,
+    OutsideByteLimits,
     WriteError,
 )
 
@@ -127,6 +171,11 @@ class CancelToken:
         return f"CancelToken(cancelled={self._cancelled})"
 
 
+# Default size of the Downloader's shared download worker pool
+# (v3.7.0+): enough for one search at the engines' 16-worker cap, or
+# four at the default ``max_workers=4``.
+DEFAULT_POOL_SIZE = 16
+
 HookOnImage = Callable[[ImageResult], None]
 HookOnError = Callable[[str, BaseException], None]
 HookOnEngineStart = Callable[[str, str], None]  # (engine, query)
@@ -140,8 +189,11 @@ HookOnProgress = Callable[[float, int, int, float | None], None]
 class Downloader:
     """Embeddable façade for image-search engines.
 
-    A ``Downloader`` owns a session (cookie jar + opener), a registry of
-    engines, and user-supplied lifecycle hooks. Use it for any
+    A ``Downloader`` owns a session (cookie jar + opener), a download
+    worker pool, a download budget shared by concurrent searches
+    (``max_concurrent_downloads``), a registry of engines, an optional
+    cache of search-results pages (``cache_dir``), and user-supplied
+    lifecycle hooks. Use it for any
     non-trivial integration: looping over many queries, embedding in a
     web service, building a custom engine, or wiring in a UI.
 
@@ -170,6 +222,14 @@ class Downloader:
         "duckduckgo": DuckDuckGo,
     }
 
+    # Native asyncio counterparts of the built-in engines (v3.7.0+),
+    # used by ``search_async`` when the registry still holds the stock
+    # class.
+    _ASYNC_COUNTERPARTS: dict[type[ImageEngine], type[AsyncImageEngine]] = {
+        Bing: AsyncBing,
+        DuckDuckGo: AsyncDuckDuckGo,
+    }
+
     def __init__(
         self,
         cache_dir: Path | None = None,
@@ -178,18 +238,115 @@ class Downloader:
         on_engine_start: HookOnEngineStart | None = None,
         on_engine_done: HookOnEngineDone | None = None,
         on_progress: HookOnProgress | None = None,
+        transport: Transport | None = None,
+        max_idle_per_host: int = DEFAULT_MAX_IDLE_PER_HOST,
+        executor: Executor | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_concurrent_downloads: int | None = DEFAULT_MAX_CONCURRENT_DOWNLOADS,
+        page_cache_ttl: float = DEFAULT_PAGE_CACHE_TTL,
+        page_cache_max_bytes: int = DEFAULT_PAGE_CACHE_MAX_BYTES,
+        native_async: bool = True,
     ) -> None:
         # --- Session: shared cookie jar + connection-pooled opener ---
         # The cookie jar is critical for DuckDuckGo: the vqd token is
         # tied to a session cookie, and reusing it across calls avoids
         # the 60+ KB /images redirect we would otherwise get on every
         # search.
-        self.cookie_jar = http.cookiejar.CookieJar()
-        self.opener = urllib.request.build_opener(
-            urllib.request.HTTPCookieProcessor(self.cookie_jar),
+        #
+        # As of v3.7.0 the jar and opener belong to ``self.transport``
+        # (keep-alive connection pools), and ``build_engine`` injects
+        # that transport into every engine, so cookies, pooled
+        # connections, and the DuckDuckGo session all carry over from
+        # one ``search()`` call to the next. A caller-supplied
+        # transport is used as-is and left open by ``close()``; the
+        # one we build ourselves is ours to close.
+        self._owns_transport = transport is None
+        if transport is None:
+            transport = PooledTransport(
+                cookie_jar=http.cookiejar.CookieJar(),
+                max_idle_per_host=max_idle_per_host,
+            )
+        self.transport: Transport = transport
+        if transport.cookie_jar is None:
+            # A cookie-less custom transport: keep a jar anyway so the
+            # public ``cookie_jar`` attribute is always usable.
+            transport.cookie_jar = http.cookiejar.CookieJar()
+        self.cookie_jar: http.cookiejar.CookieJar = transport.cookie_jar
+        opener = getattr(transport, "opener", None)
+        if not isinstance(opener, urllib.request.OpenerDirector):
+            opener = urllib.request.build_opener(
+                urllib.request.HTTPCookieProcessor(self.cookie_jar),
+            )
+        self.opener: urllib.request.OpenerDirector = opener
+
+        # --- Download worker pool (v3.7.0+) ---
+        # One long-lived pool runs the download workers of every
+        # engine this Downloader builds, across pages and across
+        # ``search()`` calls, instead of each page spawning and joining
+        # its own threads. ``pool_size`` bounds the total number of
+        # concurrent downloads; each search still uses at most its own
+        # ``max_workers`` of them. Ownership follows the transport: a
+        # caller-supplied executor is never shut down here.
+        self._owns_executor = executor is None
+        if executor is None:
+            if pool_size < 1:
+                raise ValueError(f"pool_size must be >= 1, got {pool_size}")
+            executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="bbid-worker")
+        self.executor: Executor = executor
+
+        # --- Global download budget (v3.7.0+) ---
+        # Caps image downloads in flight across every search running
+        # on this Downloader, threaded or asyncio, and shares the
+        # slots between them by ``weight`` (see ``scheduler.py``).
+        # ``None`` disables the cap; each search is then bounded only
+        # by its own ``max_workers`` / ``concurrency``. Threaded
+        # searches are also held to the worker pool's size, so its
+        # threads go to searches by weight too rather than in
+        # submission order (a caller-supplied executor is sized only
+        # if it is a ``ThreadPoolExecutor``).
+        pool_threads = pool_size if self._owns_executor else getattr(executor, "_max_workers", None)
+        self.scheduler: DownloadScheduler | None = (
+            DownloadScheduler(
+                max_concurrent_downloads,
+                max_threaded=pool_threads if isinstance(pool_threads, int) else None,
+            )
+            if max_concurrent_downloads is not None
+            else None
         )
 
+        # --- Non-blocking transport for ``search_async`` (v3.7.0+) ---
+        # Shares the session cookie jar, so the DuckDuckGo vqd cookie
+        # and any other session state carry over between the threaded
+        # and the asyncio engines.
+        self.async_transport = AsyncTransport(
+            cookie_jar=self.cookie_jar, max_idle_per_host=max_idle_per_host
+        )
+        # ``False`` runs every ``search_async`` in a worker thread, as
+        # before 3.7.0 (see ``_async_engine_class``).
+        self.native_async = native_async
+
+        # --- Search-results page cache (v3.7.0+) ---
+        # With a ``cache_dir``, the links found on every results page
+        # are kept in ``<cache_dir>/pages.sqlite`` for
+        # ``page_cache_ttl`` seconds, and engines built here skip the
+        # pages it holds (see ``pagecache.py``).
         self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.page_cache: PageCache | None = (
+            PageCache(
+                self.cache_dir / PAGE_CACHE_FILENAME,
+                ttl=page_cache_ttl,
+                max_bytes=page_cache_max_bytes,
+            )
+            if self.cache_dir is not None
+            else None
+        )
+
+        # --- DuckDuckGo vqd tokens (v3.7.0+) ---
+        # Tokens are tied to the session cookie in ``cookie_jar``, so
+        # the cache lives here with it. Searches for a query and
+        # region that already have a fresh token skip the landing-page
+        # fetch.
+        self.vqd_cache = VQDCache()
 
         # --- Hooks ---
         self.on_image = on_image
@@ -205,13 +362,58 @@ class Downloader:
         self._registry: dict[str, type[ImageEngine]] = dict(self._DEFAULT_REGISTRY)
         self._registry_lock = threading.Lock()
 
-        # --- Manifest writer (v3.5.0+). Set by ``search()``; ``None``
-        # means no manifest is being written. The success/error hooks
-        # inside ``search()`` read this attribute to decide whether to
-        # append records.
-        self._manifest_writer: ManifestWriter | None = None
-        self._manifest_engine_name: str | None = None
-        self._manifest_query: str | None = None
+        # --- Persistent indexes and stores (v3.7.0+) ---
+        # One ``HashIndex`` (and one ``SeenURLStore``) per file,
+        # shared by every search that records into it, so concurrent
+        # searches over one dataset also deduplicate against each
+        # other. Closed by ``close()``.
+        self._hash_indexes: dict[Path, HashIndex] = {}
+        self._seen_stores: dict[Path, SeenURLStore] = {}
+        self._http_caches: dict[Path, HTTPCache] = {}
+        self._catalogs: dict[Path, RunCatalog] = {}
+        self._stores_lock = threading.Lock()
+        # Likewise one ``NearDuplicateIndex`` per query directory, all
+        # decoding on one process pool started by the first search
+        # that asks for near-duplicate filtering.
+        self._near_indexes: dict[Path, NearDuplicateIndex] = {}
+        self._decode_pool: ProcessPoolExecutor | None = None
+
+    # --- Lifecycle ---
+
+    def close(self) -> None:
+        """Release pooled connections and stop the worker pool. Idempotent.
+
+        Only closes the transport and executor if this ``Downloader``
+        created them. Waits for in-flight downloads to finish; the
+        ``Downloader`` cannot run further searches afterwards.
+        """
+        if self._owns_executor:
+            self.executor.shutdown(wait=True)
+        if self._owns_transport:
+            self.transport.close()
+        self.async_transport.close()
+        if self.page_cache is not None:
+            self.page_cache.close()
+        with self._stores_lock:
+            for index in self._hash_indexes.values():
+                index.close()
+            for near in self._near_indexes.values():
+                near.close()
+            for store in self._seen_stores.values():
+                store.close()
+            for cache in self._http_caches.values():
+                cache.close()
+            for catalog in self._catalogs.values():
+                catalog.close()
+            if self._decode_pool is not None:
+                self._decode_pool.shutdown(wait=True)
+                self._decode_pool = None
+
+    def __enter__(self) -> Downloader:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
 
     # --- Engine registry ---
 
@@ -264,6 +466,12 @@ class Downloader:
         built-in engine accepts its own specific keyword arguments
         (``adult=``, ``safe_search=``, ``region=`` etc.); see the engine
         class docstrings.
+
+        Unless ``transport=`` is given explicitly, the engine receives
+        this Downloader's shared :attr:`transport` (and with it the
+        session cookie jar), provided its ``__init__`` accepts a
+        ``transport`` keyword. The worker pool (:attr:`executor`) is
+        injected the same way.
         """
         with self._registry_lock:
             try:
@@ -272,8 +480,71 @@ class Downloader:
                 raise ValueError(
                     f"Unknown engine {engine_name!r}. " f"Registered: {sorted(self._registry)}"
                 ) from None
+        return self._construct_engine(engine_cls, query, limit, output_dir, kwargs)
+
+    def _construct_engine(
+        self,
+        engine_cls: type[ImageEngine],
+        query: str,
+        limit: int,
+        output_dir: Path,
+        kwargs: dict,
+    ) -> ImageEngine:
+        """Instantiate ``engine_cls``, injecting this Downloader's shared resources."""
+        kwargs = dict(kwargs)
+        if "transport" not in kwargs and _accepts_kwarg(engine_cls, "transport"):
+            kwargs["transport"] = self.transport
+        if "executor" not in kwargs and _accepts_kwarg(engine_cls, "executor"):
+            kwargs["executor"] = self.executor
+        if (
+            self.page_cache is not None
+            and "page_cache" not in kwargs
+            and _accepts_kwarg(engine_cls, "page_cache")
+        ):
+            kwargs["page_cache"] = self.page_cache
+        if (
+            "vqd_cache" not in kwargs
+            and isinstance(engine_cls, type)
+            and issubclass(engine_cls, DuckDuckGo)
+            and _accepts_kwarg(engine_cls, "vqd_cache")
+        ):
+            kwargs["vqd_cache"] = self.vqd_cache
+        if (
+            "async_transport" not in kwargs
+            and isinstance(engine_cls, type)
+            and issubclass(engine_cls, AsyncImageEngine)
+        ):
+            kwargs["async_transport"] = self.async_transport
         return engine_cls(query=query, limit=limit, output_dir=output_dir, **kwargs)
 
+    def _async_engine_class(self, engine_name: str) -> type[AsyncImageEngine] | None:
+        """Return the asyncio engine to use for ``engine_name``, if there is one.
+
+        A registered :class:`AsyncImageEngine` subclass is used as-is;
+        the stock :class:`Bing` / :class:`DuckDuckGo` map to
+        :class:`AsyncBing` / :class:`AsyncDuckDuckGo`. Anything else
+        (custom threaded engines, subclasses of the built-ins) returns
+        ``None`` and runs in a worker thread.
+
+        The stock engines also run in a worker thread when their
+        requests must go through something :attr:`async_transport`
+        can't honour: a caller-supplied ``transport``, or an
+        ``HTTP(S)_PROXY`` from the environment. ``native_async=False``
+        turns the native path off altogether.
+        """
+        if not self.native_async:
+            return None
+        with self._registry_lock:
+            engine_cls = self._registry.get(engine_name)
+        if isinstance(engine_cls, type) and issubclass(engine_cls, AsyncImageEngine):
+            return engine_cls
+        if not self._owns_transport or _uses_proxy():
+            return None
+        try:
+            return self._ASYNC_COUNTERPARTS.get(engine_cls)  # type: ignore[arg-type]
+        except TypeError:  # unhashable registry entry (e.g. a test double)
+            return None
+
     # --- Search entry point ---
 
     def search(
@@ -298,7 +569,22 @@ class Downloader:
         manifest_path: str | os.PathLike | None = None,
         manifest_fields: list[str] | None = None,
         manifest_flush_every: int = 1,
+        manifest_fsync: bool = False,
+        manifest_format: str = "jsonl",
         min_dimension: int | None = None,
+        min_bytes: int | None = None,
+        max_bytes: int | None = None,
+        weight: float = 1.0,
+        max_per_host: int | None = None,
+        min_host_delay: float | None = None,
+        adaptive: bool = False,
+        hash_index: bool | str | os.PathLike | HashIndex | None = None,
+        near_duplicate_distance: int | None = None,
+        canonicalize_urls: bool | URLCanonicalizer = True,
+        seen_urls: bool | str | os.PathLike | SeenURLStore | None = None,
+        seen_error_rate: float | None = None,
+        http_cache: bool | str | os.PathLike | HTTPCache | None = None,
+        catalog: bool | str | os.PathLike | RunCatalog | None = None,
     ) -> Result:
         """Run a search and return a :class:`Result`.
 
@@ -339,6 +625,24 @@ class Downloader:
             default ``1`` is crash-safe; higher values trade crash
             safety for throughput on slow disks. ``close()`` always
             flushes regardless of this value. Default: ``1``.
+            Records are written by a background thread (v3.7.0+),
+            which batches whatever queued up meanwhile and never
+            holds one back longer than
+            :data:`~better_bing_image_downloader.manifest.DEFAULT_MANIFEST_FLUSH_INTERVAL`
+            seconds.
+        manifest_fsync : bool
+            ``fsync`` the manifest after every batch it writes, so
+            records survive a power loss, not only a crash of the
+            process (v3.7.0+). Default: ``False``.
+        manifest_format : str
+            ``"jsonl"`` (the default) or ``"parquet"`` (v3.7.0+).
+            ``"parquet"`` needs the ``parquet`` extra. Its manifest
+            is a directory (default
+            ``<output_dir>/<query>/manifest.parquet``) that gains one
+            part file per run; see
+            :mod:`better_bing_image_downloader.columnar`.
+            ``manifest_flush_every`` and ``manifest_fsync`` apply to
+            JSONL only.
         min_dimension : int | None
             Minimum width and height in pixels (v3.6.0+). If set, any
             downloaded image smaller than this on either side is
@@ -349,7 +653,268 @@ class Downloader:
             :attr:`Result.skipped`. Images in formats we can't
             measure (e.g. TIFF) are not filtered. Default ``None``
             (no filtering).
+        min_bytes, max_bytes : int | None
+            Allowed image body size range in bytes (v3.7.0+). An image
+            outside it is skipped exactly like a ``min_dimension``
+            skip: ``status="skipped"``, ``error="OutsideByteLimits"``
+            in the manifest, counted in :attr:`Result.skipped`.
+            ``max_bytes`` is enforced from ``Content-Length`` when the
+            server sends it and otherwise while streaming, so an
+            oversized body is never held in memory. Default ``None``
+            (no limit).
+        weight : float
+            This search's share of the Downloader-wide download budget
+            (``max_concurrent_downloads``) while other searches are
+            competing for it (v3.7.0+). A search with ``weight=2``
+            gets twice the concurrent downloads of one with the
+            default ``1.0``. Threaded searches also split the worker
+            pool (``pool_size`` threads) by weight. Must be positive.
+        max_per_host : int | None
+            Maximum concurrent downloads from one image host
+            (v3.7.0+); ``0`` removes the cap. Links are dispatched
+            round-robin across hosts, hosts that answer ``429``/``503``
+            or time out are paused for a growing cooldown, and a host
+            much slower than the others gets one request at a time.
+            ``None`` (the default) uses the engine default of
+            :data:`~better_bing_image_downloader.hosts.DEFAULT_MAX_PER_HOST`
+            (no cap).
+        min_host_delay : float | None
+            Minimum seconds between the starts of two downloads from
+            the same host (v3.7.0+). ``None`` (the default) means no
+            delay.
+        adaptive : bool
+            Let the engine tune its concurrency while it runs
+            (v3.7.0+): it starts at ``max_workers``, grows while
+            throughput improves and latency stays stable, and backs
+            off on timeouts, ``429`` and ``5xx`` responses. The
+            final limit and every change are reported in
+            :attr:`Result.concurrency_limit` and
+            :attr:`Result.concurrency_history`. Default ``False``.
+        hash_index : bool | str | os.PathLike | HashIndex | None
+            Deduplicate against images saved by earlier runs
+            (v3.7.0+). ``True`` keeps a
+            :class:`~better_bing_image_downloader.hashindex.HashIndex`
+            in ``<output_dir>/<query>/.bbid-hashes``; a path puts it
+            elsewhere, e.g. one file shared by several queries. Images
+            whose MD5 is already in it fail with
+            :class:`DuplicateImageError`, and every saved image's MD5
+            is appended. With ``force_replace=True`` the index is
+            only written to. Default ``None`` (deduplicate within the
+            run only).
+        near_duplicate_distance : int | None
+            Skip images that look like one already saved in this query
+            directory, by this run or an earlier one (v3.7.0+; needs
+            Pillow). Each image's 64-bit perceptual hash (dHash) is
+            decoded in a process pool and compared against the index
+            in ``<output_dir>/<query>/.bbid-phashes``; a match within
+            this many bits is recorded as a ``"skipped"``
+            :class:`NearDuplicateImage`. Around ``6`` catches resized
+            and re-compressed copies. Default ``None`` (off).
+        canonicalize_urls : bool | URLCanonicalizer
+            Compare result links by their canonical form (v3.7.0+):
+            scheme, tracking parameters, and known CDN size variants
+            are ignored, so one image listed under several URLs is
+            downloaded once. Pass a
+            :class:`~better_bing_image_downloader.urls.URLCanonicalizer`
+            for custom rules, or ``False`` to compare raw URLs.
+            Default ``True``.
+        seen_urls : bool | str | os.PathLike | SeenURLStore | None
+            Skip links fetched by earlier runs without requesting them
+            (v3.7.0+). ``True`` keeps a
+            :class:`~better_bing_image_downloader.seenurls.SeenURLStore`
+            in ``<output_dir>/.bbid-seen.sqlite``, shared by every query
+            under ``output_dir``; a path puts it elsewhere. Links that
+            failed with a network error are not recorded. Default
+            ``None`` (off).
+        seen_error_rate : float | None
+            Track the links and image digests already handled this run
+            in :class:`~better_bing_image_downloader.bloom.ScalableBloomFilter`
+            objects with this false-positive bound (e.g. ``0.001``)
+            instead of sets (v3.7.0+). Memory stays at a few bytes per
+            link on very large runs; in exchange, up to that fraction
+            of new links or images may be skipped as already seen.
+            Default ``None`` (exact sets).
+        http_cache : bool | str | os.PathLike | HTTPCache | None
+            Revalidate images fetched by earlier runs instead of
+            downloading them again (v3.7.0+): their ``ETag`` and
+            ``Last-Modified`` are sent back as ``If-None-Match`` /
+            ``If-Modified-Since``, and a ``304`` reuses the stored body.
+            ``True`` keeps an
+            :class:`~better_bing_image_downloader.httpcache.HTTPCache`
+            in ``<output_dir>/.bbid-http``, shared by every query under
+            ``output_dir``; a path puts it elsewhere. Most useful with
+            ``force_replace=True`` or when re-crawling. Default ``None``
+            (off).
+        catalog : bool | str | os.PathLike | RunCatalog | None
+            Record the run and every download attempt in a SQLite
+            :class:`~better_bing_image_downloader.catalog.RunCatalog`
+            (v3.7.0+). Lookups by md5, URL, query or status are then
+            indexed instead of scanning manifests. ``True`` keeps it
+            in ``<output_dir>/.bbid-catalog.sqlite``, shared by every
+            query under ``output_dir``; a path puts it elsewhere.
+            Default ``None`` (off).
+        """
+        run = self._start_run(
+            query=query,
+            limit=limit,
+            output_dir=output_dir,
+            engine=engine,
+            badsites=badsites,
+            name=name,
+            max_workers=max_workers,
+            force_replace=force_replace,
+            timeout=timeout,
+            verbose=verbose,
+            image_filter=image_filter,
+            mkt=mkt,
+            ddg_safe_search=ddg_safe_search,
+            ddg_region=ddg_region,
+            adult_filter_off=adult_filter_off,
+            cancel=cancel,
+            manifest=manifest,
+            manifest_path=manifest_path,
+            manifest_fields=manifest_fields,
+            manifest_flush_every=manifest_flush_every,
+            manifest_fsync=manifest_fsync,
+            manifest_format=manifest_format,
+            min_dimension=min_dimension,
+            min_bytes=min_bytes,
+            max_bytes=max_bytes,
+            weight=weight,
+            max_per_host=max_per_host,
+            min_host_delay=min_host_delay,
+            adaptive=adaptive,
+            hash_index=hash_index,
+            near_duplicate_distance=near_duplicate_distance,
+            canonicalize_urls=canonicalize_urls,
+            seen_urls=seen_urls,
+            seen_error_rate=seen_error_rate,
+            http_cache=http_cache,
+            catalog=catalog,
+        )
+        try:
+            run.engine_obj.run()
+        finally:
+            # Always close the manifest writer, even on exception.
+            run.close()
+        return self._finish_run(run)
+
+    def _hash_index(self, spec: str | os.PathLike | HashIndex) -> HashIndex:
+        """Return the shared :class:`HashIndex` for ``spec`` (a path or an index)."""
+        if isinstance(spec, HashIndex):
+            return spec
+        path = Path(spec).resolve()
+        with self._stores_lock:
+            index = self._hash_indexes.get(path)
+            if index is None:
+                index = self._hash_indexes[path] = HashIndex(path)
+            return index
+
+    def _seen_url_store(self, spec: str | os.PathLike | SeenURLStore) -> SeenURLStore:
+        """Return the shared :class:`SeenURLStore` for ``spec`` (a path or a store)."""
+        if isinstance(spec, SeenURLStore):
+            return spec
+        path = Path(spec).resolve()
+        with self._stores_lock:
+            store = self._seen_stores.get(path)
+            if store is None:
+                store = self._seen_stores[path] = SeenURLStore(path)
+            return store
+
+    def _http_cache(self, spec: str | os.PathLike | HTTPCache) -> HTTPCache:
+        """Return the shared :class:`HTTPCache` for ``spec`` (a directory or a cache)."""
+        if isinstance(spec, HTTPCache):
+            return spec
+        path = Path(spec).resolve()
+        with self._stores_lock:
+            cache = self._http_caches.get(path)
+            if cache is None:
+                cache = self._http_caches[path] = HTTPCache(path)
+            return cache
+
+    def _catalog(self, spec: str | os.PathLike | RunCatalog) -> RunCatalog:
+        """Return the shared :class:`RunCatalog` for ``spec`` (a path or a catalog)."""
+        if isinstance(spec, RunCatalog):
+            return spec
+        path = Path(spec).resolve()
+        with self._stores_lock:
+            catalog = self._catalogs.get(path)
+            if catalog is None:
+                catalog = self._catalogs[path] = RunCatalog(path)
+            return catalog
+
+    def _near_duplicate_index(self, path: Path) -> NearDuplicateIndex:
+        """Return the shared :class:`NearDuplicateIndex` stored at ``path``."""
+        path = path.resolve()
+        with self._stores_lock:
+            index = self._near_indexes.get(path)
+            if index is None:
+                if self._decode_pool is None:
+                    # ``spawn``: forking a process that is running
+                    # download threads can deadlock the child.
+                    self._decode_pool = ProcessPoolExecutor(
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                index = self._near_indexes[path] = NearDuplicateIndex(
+                    path, executor=self._decode_pool
+                )
+            return index
+
+    def _start_run(
+        self,
+        query: str,
+        limit: int,
+        output_dir: str | Path,
+        engine: str,
+        badsites: list[str] | None,
+        name: str,
+        max_workers: int,
+        force_replace: bool,
+        timeout: int,
+        verbose: bool,
+        image_filter: str,
+        mkt: str,
+        ddg_safe_search: str,
+        ddg_region: str,
+        adult_filter_off: bool,
+        cancel: CancelToken | None,
+        manifest: bool,
+        manifest_path: str | os.PathLike | None,
+        manifest_fields: list[str] | None,
+        manifest_flush_every: int,
+        manifest_fsync: bool,
+        manifest_format: str,
+        min_dimension: int | None,
+        min_bytes: int | None,
+        max_bytes: int | None,
+        weight: float = 1.0,
+        max_per_host: int | None = None,
+        min_host_delay: float | None = None,
+        adaptive: bool = False,
+        hash_index: bool | str | os.PathLike | HashIndex | None = None,
+        near_duplicate_distance: int | None = None,
+        canonicalize_urls: bool | URLCanonicalizer = True,
+        seen_urls: bool | str | os.PathLike | SeenURLStore | None = None,
+        seen_error_rate: float | None = None,
+        http_cache: bool | str | os.PathLike | HTTPCache | None = None,
+        catalog: bool | str | os.PathLike | RunCatalog | None = None,
+        engine_cls: type[ImageEngine] | None = None,
+        async_options: dict[str, object] | None = None,
+        stream: EventChannel | None = None,
+    ) -> _SearchRun:
+        """Build the engine for one search and wire the hooks into it.
+
+        Shared by :meth:`search` and the native path of
+        :meth:`search_async`; the caller runs the engine, then calls
+        ``run.close()`` and :meth:`_finish_run`. ``engine_cls``
+        overrides the registry lookup (used to pick the asyncio
+        counterpart of a built-in engine), and ``async_options`` are
+        extra keyword arguments for an :class:`AsyncImageEngine`.
+        ``stream`` receives the run's events and gates its downloads
+        (see :meth:`iter_search`).
         """
+        if not weight > 0:
+            raise ValueError(f"weight must be > 0, got {weight}")
         image_dir = Path(output_dir) / query
         image_dir.mkdir(parents=True, exist_ok=True)
 
@@ -357,83 +922,559 @@ class Downloader:
 
         # --- Manifest writer (v3.5.0+) ---
         # Constructed here so it is open and ready to receive
-        # records from the very first image attempt. Wrapped in
-        # try/finally below to guarantee ``close()`` is called
-        # even on exception. ``self._manifest_writer`` is also
-        # set on the instance so the success/error hooks inside
-        # ``_run_engine`` can append records to it.
-        manifest_writer: ManifestWriter | None = None
+        # records from the very first image attempt. The caller
+        # closes it through ``run.close()`` in a ``finally``. Each
+        # run carries its own writer (v3.7.0+), so concurrent
+        # searches on one Downloader never write into each other's
+        # manifests.
+        manifest_writer: ManifestSink | None = None
         manifest_abs_path: str | None = None
         if manifest:
             resolved_manifest_path = (
-                Path(manifest_path) if manifest_path else image_dir / "manifest.jsonl"
+                Path(manifest_path)
+                if manifest_path
+                else image_dir / MANIFEST_FILENAMES.get(manifest_format, "manifest.jsonl")
             )
-            manifest_writer = ManifestWriter(
+            # Records arrive from the download worker threads; a JSONL
+            # manifest is written by one thread that batches them
+            # (v3.7.0+).
+            manifest_writer = open_manifest_sink(
+                manifest_format,
                 resolved_manifest_path,
                 fields=manifest_fields,
                 flush_every=manifest_flush_every,
+                fsync=manifest_fsync,
             )
-            manifest_abs_path = str(resolved_manifest_path.resolve())
-        # Expose to the success/error hooks below.
-        self._manifest_writer = manifest_writer
-        self._manifest_engine_name = engine
-        self._manifest_query = query
-
-        engine_kwargs: dict[str, object] = {}
-        if engine == "bing":
-            engine_kwargs = {
-                "adult": adult,
-                "filter": image_filter,
-                "mkt": mkt,
-            }
-        elif engine == "duckduckgo":
-            engine_kwargs = {
-                "safe_search": ddg_safe_search,
-                "region": ddg_region,
+            manifest_abs_path = str(manifest_writer.path.resolve())
+
+        # Everything below can still fail (a bad option, a missing
+        # optional dependency, the engine constructor); close whatever
+        # was opened so far so a failed start leaves no writer thread,
+        # budget share or catalog run behind.
+        download_share: DownloadShare | None = None
+        catalog_run: CatalogRun | None = None
+        try:
+            engine_kwargs: dict[str, object] = {}
+            if engine == "bing":
+                engine_kwargs = {
+                    "adult": adult,
+                    "filter": image_filter,
+                    "mkt": mkt,
+                }
+            elif engine == "duckduckgo":
+                engine_kwargs = {
+                    "safe_search": ddg_safe_search,
+                    "region": ddg_region,
+                }
+
+            # Pass the cancel token to the engine so cooperative engines
+            # (Bing, DuckDuckGo) can abort between page fetches.
+            if cancel is not None:
+                engine_kwargs["cancel"] = cancel
+            # ``min_dimension`` (v3.6.0+) flows through ``engine_kwargs``
+            # like every other option, the same way ``cancel`` does.
+            # Bing and DuckDuckGo accept it in their own constructors and
+            # forward it via ``super().__init__()``; custom engines that
+            # don't override ``__init__`` inherit support for it directly
+            # from ``ImageEngine``. As with ``cancel``, we only add the
+            # key when it's actually used so engines that don't accept it
+            # (and don't use the feature) are unaffected.
+            if min_dimension is not None:
+                engine_kwargs["min_dimension"] = min_dimension
+            if min_bytes is not None:
+                engine_kwargs["min_bytes"] = min_bytes
+            if max_bytes is not None:
+                engine_kwargs["max_bytes"] = max_bytes
+            if max_per_host is not None:
+                engine_kwargs["max_per_host"] = max_per_host
+            if min_host_delay is not None:
+                engine_kwargs["min_host_delay"] = min_host_delay
+            if adaptive:
+                engine_kwargs["adaptive"] = adaptive
+            if hash_index is not None and hash_index is not False:
+                engine_kwargs["hash_index"] = self._hash_index(
+                    image_dir / HASH_INDEX_FILENAME if hash_index is True else hash_index
+                )
+            if canonicalize_urls is not True:
+                engine_kwargs["canonicalize_urls"] = canonicalize_urls
+            if seen_urls is not None and seen_urls is not False:
+                engine_kwargs["seen_urls"] = self._seen_url_store(
+                    Path(output_dir) / SEEN_URLS_FILENAME if seen_urls is True else seen_urls
+                )
+            if seen_error_rate is not None:
+                engine_kwargs["seen_error_rate"] = seen_error_rate
+            if http_cache is not None and http_cache is not False:
+                engine_kwargs["http_cache"] = self._http_cache(
+                    Path(output_dir) / HTTP_CACHE_DIRNAME if http_cache is True else http_cache
+                )
+            if near_duplicate_distance is not None:
+                engine_kwargs["near_duplicates"] = self._near_duplicate_index(
+                    image_dir / NEAR_DUPLICATE_INDEX_FILENAME
+                )
+                engine_kwargs["near_duplicate_distance"] = near_duplicate_distance
+            if async_options:
+                engine_kwargs.update(async_options)
+
+            # --- Global download budget (v3.7.0+) ---
+            # Each run draws from the Downloader's scheduler through its
+            # own weighted share, released by ``run.close()``.
+            if self.scheduler is not None:
+                with self._registry_lock:
+                    target_cls = engine_cls or self._registry.get(engine)
+                if target_cls is not None and _accepts_kwarg(target_cls, "download_share"):
+                    download_share = self.scheduler.share(
+                        weight,
+                        name=query,
+                        threaded=not (
+                            isinstance(target_cls, type)
+                            and issubclass(target_cls, AsyncImageEngine)
+                        ),
+                    )
+                    engine_kwargs["download_share"] = download_share
+
+            common_kwargs: dict[str, object] = {
+                "timeout": timeout,
+                "verbose": verbose,
+                "badsites": badsites or [],
+                "name": name,
+                "max_workers": max_workers,
+                "force_replace": force_replace,
             }
+            if engine_cls is None:
+                engine_obj = self.build_engine(
+                    engine_name=engine,
+                    query=query,
+                    limit=limit,
+                    output_dir=image_dir,
+                    **common_kwargs,
+                    **engine_kwargs,
+                )
+            else:
+                engine_obj = self._construct_engine(
+                    engine_cls, query, limit, image_dir, {**common_kwargs, **engine_kwargs}
+                )
 
-        # Pass the cancel token to the engine so cooperative engines
-        # (Bing, DuckDuckGo) can abort between page fetches.
-        if cancel is not None:
-            engine_kwargs["cancel"] = cancel
-        # ``min_dimension`` (v3.6.0+) flows through ``engine_kwargs``
-        # like every other option, the same way ``cancel`` does.
-        # Bing and DuckDuckGo accept it in their own constructors and
-        # forward it via ``super().__init__()``; custom engines that
-        # don't override ``__init__`` inherit support for it directly
-        # from ``ImageEngine``. As with ``cancel``, we only add the
-        # key when it's actually used so engines that don't accept it
-        # (and don't use the feature) are unaffected.
-        if min_dimension is not None:
-            engine_kwargs["min_dimension"] = min_dimension
-
-        engine_obj = self.build_engine(
-            engine_name=engine,
-            query=query,
-            limit=limit,
-            output_dir=image_dir,
-            timeout=timeout,
-            verbose=verbose,
-            badsites=badsites or [],
-            name=name,
-            max_workers=max_workers,
-            force_replace=force_replace,
-            **engine_kwargs,
+            if self.on_engine_start:
+                try:
+                    self.on_engine_start(engine, query)
+                except Exception:  # never let a user hook break the run
+                    logging.exception("on_engine_start hook raised; continuing")
+
+            # --- Run catalog (v3.7.0+) ---
+            # Registered once the engine exists, so a run that fails to
+            # start leaves no row behind.
+            if catalog is not None and catalog is not False:
+                catalog_run = self._catalog(
+                    Path(output_dir) / CATALOG_FILENAME if catalog is True else catalog
+                ).start_run(query, engine)
+
+            run = _SearchRun(
+                downloader=self,
+                engine_obj=engine_obj,
+                engine=engine,
+                query=query,
+                limit=limit,
+                image_dir=image_dir,
+                cancel=cancel,
+                manifest_writer=manifest_writer,
+                manifest_path=manifest_abs_path,
+                download_share=download_share,
+                stream=stream,
+                catalog_run=catalog_run,
+            )
+            run.install_hooks()
+            if stream is not None:
+                engine_obj._dispatch_gate = stream.wait_for_room
+            return run
+        except BaseException:
+            if manifest_writer is not None:
+                manifest_writer.close()
+            if download_share is not None:
+                download_share.close()
+            if catalog_run is not None:
+                catalog_run.close()
+            raise
+
+    def _finish_run(self, run: _SearchRun) -> Result:
+        """Build the :class:`Result` for a finished run and fire ``on_engine_done``."""
+        result = run.result()
+        if self.on_engine_done:
+            try:
+                self.on_engine_done(run.engine, result)
+            except Exception:
+                logging.exception("on_engine_done hook raised; continuing")
+
+        return result
+
+    async def search_async(
+        self,
+        query: str,
+        limit: int = 100,
+        output_dir: str | Path = "dataset",
+        engine: str = "bing",
+        badsites: list[str] | None = None,
+        name: str = "Image",
+        max_workers: int = 4,
+        force_replace: bool = False,
+        timeout: int = 60,
+        verbose: bool = DEFAULT_VERBOSE,
+        image_filter: str = "",
+        mkt: str = "en-US",
+        ddg_safe_search: str = "moderate",
+        ddg_region: str = "us-en",
+        adult_filter_off: bool = False,
+        cancel: CancelToken | None = None,
+        manifest: bool = False,
+        manifest_path: str | os.PathLike | None = None,
+        manifest_fields: list[str] | None = None,
+        manifest_flush_every: int = 1,
+        manifest_fsync: bool = False,
+        manifest_format: str = "jsonl",
+        min_dimension: int | None = None,
+        min_bytes: int | None = None,
+        max_bytes: int | None = None,
+        concurrency: int | None = None,
+        weight: float = 1.0,
+        max_per_host: int | None = None,
+        min_host_delay: float | None = None,
+        adaptive: bool = False,
+        hash_index: bool | str | os.PathLike | HashIndex | None = None,
+        near_duplicate_distance: int | None = None,
+        canonicalize_urls: bool | URLCanonicalizer = True,
+        seen_urls: bool | str | os.PathLike | SeenURLStore | None = None,
+        seen_error_rate: float | None = None,
+        http_cache: bool | str | os.PathLike | HTTPCache | None = None,
+        catalog: bool | str | os.PathLike | RunCatalog | None = None,
+    ) -> Result:
+        """Async counterpart of :meth:`search`.
+
+        For the built-in engines (and any registered
+        :class:`AsyncImageEngine`) the search runs natively on the
+        event loop (v3.7.0+): pages and images are fetched over
+        non-blocking sockets via :attr:`async_transport`, with at most
+        ``concurrency`` downloads in flight, so many concurrent
+        searches cost no extra OS threads. Other engines keep the
+        previous behaviour of running the blocking :meth:`search` in a
+        worker thread via :func:`asyncio.to_thread`, and so do the
+        built-in ones when the ``Downloader`` has a caller-supplied
+        ``transport``, ``HTTP(S)_PROXY`` is set (the non-blocking
+        transport supports neither), or it was created with
+        ``native_async=False``. Either way the
+        parameters, hooks, and returned :class:`Result` are the same
+        as :meth:`search`.
+
+        Use this in async code (FastAPI, aiohttp, Jupyter with
+        ``top-level await``) so a long search doesn't block the
+        event loop.
+
+        Parameters
+        ----------
+        concurrency : int | None
+            Maximum simultaneous downloads on the native path
+            (default :data:`DEFAULT_ASYNC_CONCURRENCY`, 32). Ignored
+            for engines that run in a worker thread, which use
+            ``max_workers``. Either way the search also draws from
+            the Downloader-wide ``max_concurrent_downloads`` budget.
+        weight : float
+            Share of that budget under contention; see :meth:`search`.
+
+        Example
+        -------
+        >>> import asyncio
+        >>> from better_bing_image_downloader import Downloader
+        >>>
+        >>> async def main():
+        ...     dl = Downloader()
+        ...     result = await dl.search_async("red panda", limit=10)
+        ...     print(result.count)
+        >>>
+        >>> asyncio.run(main())
+        """
+        options = {
+            "query": query,
+            "limit": limit,
+            "output_dir": output_dir,
+            "engine": engine,
+            "badsites": badsites,
+            "name": name,
+            "max_workers": max_workers,
+            "force_replace": force_replace,
+            "timeout": timeout,
+            "verbose": verbose,
+            "image_filter": image_filter,
+            "mkt": mkt,
+            "ddg_safe_search": ddg_safe_search,
+            "ddg_region": ddg_region,
+            "adult_filter_off": adult_filter_off,
+            "cancel": cancel,
+            "manifest": manifest,
+            "manifest_path": manifest_path,
+            "manifest_fields": manifest_fields,
+            "manifest_flush_every": manifest_flush_every,
+            "manifest_fsync": manifest_fsync,
+            "manifest_format": manifest_format,
+            "min_dimension": min_dimension,
+            "min_bytes": min_bytes,
+            "max_bytes": max_bytes,
+            "weight": weight,
+            "max_per_host": max_per_host,
+            "min_host_delay": min_host_delay,
+            "adaptive": adaptive,
+            "hash_index": hash_index,
+            "near_duplicate_distance": near_duplicate_distance,
+            "canonicalize_urls": canonicalize_urls,
+            "seen_urls": seen_urls,
+            "seen_error_rate": seen_error_rate,
+            "http_cache": http_cache,
+            "catalog": catalog,
+        }
+        engine_cls = self._async_engine_class(engine)
+        if engine_cls is None:
+            # ``asyncio.to_thread`` is the right call here:
+            # - it doesn't require the function to be a coroutine
+            # - it gives back the GIL so the event loop can serve
+            #   other tasks while the search runs
+            # - it works in any context (no global executor needed)
+            return await asyncio.to_thread(self.search, **options)  # type: ignore[arg-type]
+
+        async_options: dict[str, object] = {}
+        if concurrency is not None:
+            async_options["concurrency"] = concurrency
+        # Starting and closing a run touch the disk (the output
+        # directory, manifest, catalog), so they run in worker threads.
+        run = await asyncio.to_thread(
+            self._start_run,
+            **options,  # type: ignore[arg-type]
+            engine_cls=engine_cls,
+            async_options=async_options,
         )
+        try:
+            await run.engine_obj.run_async()  # type: ignore[attr-defined]
+        finally:
+            await asyncio.to_thread(run.close)
+        return self._finish_run(run)
+
+    def iter_search(
+        self, query: str, buffer_size: int = DEFAULT_STREAM_BUFFER, **options: Any
+    ) -> SearchStream:
+        """Run a search in the background and stream its events (v3.7.0+).
+
+        Returns a :class:`~better_bing_image_downloader.stream.SearchStream`
+        that yields an :class:`ImageResult` for every saved image, a
+        :class:`SkippedImage` for every image a filter rejected, and a
+        :class:`FailedImage` for every failure, as they happen. At most
+        ``buffer_size`` events wait for the consumer; when the buffer
+        is full, no new download starts until the consumer catches up
+        (downloads in flight finish and add their events). The pause
+        happens on the stream's own thread, so a slow consumer never
+        ties up the shared worker pool. A stream that is dropped
+        without being closed stays paused until it is
+        garbage-collected.
+        Events are not kept anywhere else, so memory use doesn't grow
+        with the run; the ``Result`` passed to ``on_engine_done`` has
+        empty ``images`` and ``errors`` lists. Hooks fire as in
+        :meth:`search`.
+
+        Call :meth:`SearchStream.close` (or use the stream as a context
+        manager) to stop early. An exception raised by the engine is
+        re-raised by the iteration after the last event.
 
-        # Wire hooks: the engine records every successful save into
-        # ``manifest`` and increments ``download_count`` / ``_slots_used``.
-        # We tap the same counters to drive ``Result.images`` and fire
-        # the user's ``on_image`` callback.
-        if self.on_engine_start:
-            try:
-                self.on_engine_start(engine, query)
-            except Exception:  # never let a user hook break the run
-                logging.exception("on_engine_start hook raised; continuing")
+        Parameters
+        ----------
+        query : str
+            The search query.
+        buffer_size : int
+            Maximum number of events waiting for the consumer.
+            Default :data:`~better_bing_image_downloader.stream.DEFAULT_STREAM_BUFFER`.
+        **options
+            Any other :meth:`search` keyword argument.
+
+        Raises
+        ------
+        TypeError
+            If ``options`` holds an argument :meth:`search` doesn't take.
+        ValueError
+            If ``buffer_size`` is less than 1.
+
+        Example
+        -------
+        >>> with Downloader() as dl, dl.iter_search("cats", limit=500) as events:
+        ...     for event in events:
+        ...         if isinstance(event, ImageResult):
+        ...             preprocess(event.path)
+        """
+        arguments = inspect.signature(self.search).bind(query, **options)
+        arguments.apply_defaults()
+        params = arguments.arguments
+        # The stream stops the engine through its cancel token, so
+        # every streamed run has one.
+        if params["cancel"] is None:
+            params["cancel"] = CancelToken()
+        stream = SearchStream(buffer_size, params["cancel"])
+        run = self._start_run(**params, stream=stream._channel)
+        stream._start(run)
+        return stream
+
+    def search_many(
+        self,
+        queries: Iterable[str],
+        parallel: int = DEFAULT_QUERY_PARALLELISM,
+        checkpoint: str | os.PathLike | QueryCheckpoint | None = None,
+        **options: Any,
+    ) -> Iterator[Result]:
+        """Run :meth:`search` for every query; yield each :class:`Result` as it finishes.
+
+        All the searches run on this ``Downloader`` (v3.7.0+), so they
+        share its transport, caches, download worker pool, and
+        ``max_concurrent_downloads`` budget; up to ``parallel`` of
+        them fetch results pages at once. Results come back in
+        completion order, not input order. Repeated queries are run
+        once.
+
+        Parameters
+        ----------
+        queries : Iterable[str]
+            Queries to search; consumed lazily.
+        parallel : int
+            Maximum number of queries searched at once. A new query
+            starts when the caller asks for the next result after one
+            has finished, so stopping the iteration starts no more.
+            Default
+            :data:`~better_bing_image_downloader.batch.DEFAULT_QUERY_PARALLELISM`.
+        checkpoint : str | os.PathLike | QueryCheckpoint | None
+            Make the batch resumable: every query that finishes
+            is recorded in this JSON Lines file, and queries already
+            recorded there are skipped. A query that was cancelled,
+            or whose search never produced a candidate URL (an empty
+            result or an outage on the first results page look the
+            same), isn't recorded, so a re-run tries it again.
+            Default ``None``.
+        **options
+            Keyword arguments passed to every :meth:`search` call
+            (``limit``, ``output_dir``, ``engine``, ...). A ``cancel``
+            token also stops new queries from starting.
+
+        Raises
+        ------
+        ValueError
+            If ``parallel`` is less than 1, or ``manifest_path`` is
+            given (every query would write to the same file).
+        Exception
+            Whatever a :meth:`search` raised. Queries not yet started
+            are abandoned; those already running finish first, and
+            are recorded in the checkpoint.
+
+        Example
+        -------
+        >>> with Downloader() as dl:
+        ...     for result in dl.search_many(["cats", "dogs"], limit=20):
+        ...         print(result.query, result.count)
+        """
+        if parallel < 1:
+            raise ValueError(f"parallel must be >= 1, got {parallel}")
+        if options.get("manifest_path") is not None:
+            raise ValueError("search_many() can't share one manifest_path between queries")
+        owns_checkpoint = checkpoint is not None and not isinstance(checkpoint, QueryCheckpoint)
+        done: QueryCheckpoint | None = (
+            QueryCheckpoint(checkpoint)  # type: ignore[arg-type]
+            if owns_checkpoint
+            else checkpoint  # type: ignore[assignment]
+        )
+        cancel: CancelToken | None = options.get("cancel")
+        todo = iter(_unique(queries))
+        # Searches get their own threads: they block on downloads
+        # running in ``self.executor``, so running them there could
+        # starve it.
+        pool = ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="bbid-query")
+        running: dict[Future[Result], str] = {}
+
+        def start_next() -> None:
+            for query in todo:
+                if cancel is not None and cancel.cancelled:
+                    return
+                if done is not None and query in done:
+                    logging.info("Skipping %r: already in the checkpoint", query)
+                    continue
+                running[pool.submit(self.search, query, **options)] = query
+                return
 
-        images: list[ImageResult] = []
-        errors: list[tuple[str, BaseException]] = []
-        seen_paths: set[Path] = set()
+        try:
+            for _ in range(parallel):
+                start_next()
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    del running[future]
+                    result = future.result()
+                    if done is not None and _finished(result):
+                        done.record(result)
+                    yield result
+                    # Only once the caller asks for more: a caller that
+                    # stops here doesn't wait for a search it won't see.
+                    start_next()
+        finally:
+            # On an error (or if the caller stops iterating) no new
+            # query starts; running ones finish and are checkpointed.
+            pool.shutdown(wait=True)
+            if done is not None:
+                for future in running:
+                    if future.exception() is None and _finished(future.result()):
+                        done.record(future.result())
+                if owns_checkpoint:
+                    done.close()
+
+
+def _finished(result: Result) -> bool:
+    """Whether ``search_many`` may checkpoint ``result`` as done."""
+    return not result.cancelled and not result.no_results_found
+
+
+class _SearchRun:
+    """Per-search state and the hooks wired into one engine instance.
+
+    Created by :meth:`Downloader._start_run`. The engine records every
+    successful save into ``manifest`` and increments
+    ``download_count`` / ``_slots_used``; this object taps the same
+    save path to build ``Result.images``, collect errors, fire the
+    user's ``on_image`` / ``on_error`` / ``on_progress`` callbacks, and
+    append manifest records.
+    """
+
+    def __init__(
+        self,
+        downloader: Downloader,
+        engine_obj: ImageEngine,
+        engine: str,
+        query: str,
+        limit: int,
+        image_dir: Path,
+        cancel: CancelToken | None,
+        manifest_writer: ManifestSink | None,
+        manifest_path: str | None,
+        download_share: DownloadShare | None = None,
+        stream: EventChannel | None = None,
+        catalog_run: CatalogRun | None = None,
+    ) -> None:
+        self.downloader = downloader
+        self.engine_obj = engine_obj
+        self.engine = engine
+        self.query = query
+        self.limit = limit
+        self.image_dir = image_dir
+        self.cancel = cancel
+        self.manifest_writer = manifest_writer
+        self.manifest_path = manifest_path
+        self.download_share = download_share
+        # ``stream`` (v3.7.0+) receives every event of an
+        # ``iter_search`` run; images and errors are then handed to
+        # it instead of being kept here.
+        self.stream = stream
+        # ``catalog_run`` (v3.7.0+) receives the same records as the
+        # manifest.
+        self.catalog_run = catalog_run
+        self.images: list[ImageResult] = []
+        self.errors: list[tuple[str, BaseException]] = []
+        self.seen_paths: set[Path] = set()
         # ``download_image_calls`` counts every time the engine
         # asked ``download_image`` to consider a candidate. We use
         # this to distinguish "no candidates fetched" from
@@ -442,17 +1483,19 @@ class Downloader:
         # nothing. (Resume-skip paths in download_image return
         # 0 before save_image is called, so save_attempts alone
         # would conflate the two cases.)
-        download_image_calls = 0
+        self.download_image_calls = 0
         # ``save_attempts`` is the number of times save_image was
         # actually invoked (not skipped due to resume). Useful for
         # debugging.
-        save_attempts = 0
-        # ``min_dimension_skips`` (v3.6.0+) counts images rejected by
-        # the ``min_dimension`` filter. Unlike other ``ImageSaveError``
-        # subclasses, these don't go into ``errors`` — they're an
-        # intentional filter outcome, not a failure — so they need
-        # their own counter to feed into ``Result.skipped`` below.
-        min_dimension_skips = 0
+        self.save_attempts = 0
+        # ``filter_skips`` counts images rejected by a user-configured
+        # filter (``ImageSkipped``: ``min_dimension`` since v3.6.0,
+        # ``min_bytes``/``max_bytes`` since v3.7.0). Unlike other
+        # ``ImageSaveError`` subclasses, these don't go into
+        # ``errors`` — they're an intentional filter outcome, not a
+        # failure — so they need their own counter to feed into
+        # ``Result.skipped`` below.
+        self.filter_skips = 0
         # ``progress_state`` tracks timing samples for ETA
         # computation. We need at least 2 samples (one for the
         # previous download, one for the current) to extrapolate.
@@ -460,137 +1503,37 @@ class Downloader:
         # ``_last_time`` is the time of the most recent sample,
         # ``_last_count`` is the ``download_count`` at the time of
         # the most recent sample.
-        progress_state: dict[str, float | int] = {
+        self.progress_state: dict[str, float | int] = {
             "_start_time": time.monotonic(),
             "_last_time": time.monotonic(),
             "_last_count": 0,
         }
 
-        # Monkey-patch both save_image and download_image to count
-        # calls and to capture every successful save and every error.
-        # As of v3.4.0, we use ``_save_image_raising`` directly so
-        # the wrapper receives typed ``ImageSaveError`` subclasses
-        # (NetworkError, InvalidImageError, DuplicateImageError,
-        # WriteError) instead of a generic ``False`` return.
+    def install_hooks(self) -> None:
+        """Wrap the engine's save and download entry points.
+
+        As of v3.4.0, the wrappers call ``_save_image_raising``
+        directly so they receive typed ``ImageSaveError`` subclasses
+        (NetworkError, InvalidImageError, DuplicateImageError,
+        WriteError) instead of a generic ``False`` return. Async
+        engines (v3.7.0+) get the same wrappers around their
+        coroutine counterparts.
+        """
+        engine_obj = self.engine_obj
         original_save_raising = engine_obj._save_image_raising
         original_download = engine_obj.download_image
 
         def save_with_hooks(link: str, file_path) -> bool:
-            nonlocal save_attempts, min_dimension_skips
-            save_attempts += 1
+            self.save_attempts += 1
             try:
                 # ``_save_image_raising`` returns the MD5 hex digest
                 # of the saved bytes (v3.5.0+). The legacy
                 # ``save_image`` wrapper does not return it; we
                 # rely on the raising variant here.
                 file_md5 = original_save_raising(link, file_path)
-            except BelowMinDimension as exc:
-                # v3.6.0+: a too-small image is an intentional filter
-                # outcome, not a failure — unlike the other
-                # ImageSaveError subclasses below, it does NOT go
-                # into Result.errors or fire on_error. It's recorded
-                # as a manifest "skip" and counted in Result.skipped.
-                min_dimension_skips += 1
-                if self._manifest_writer is not None:
-                    self._append_manifest_record(
-                        status="skipped",
-                        url=link,
-                        file_path=None,
-                        md5=None,
-                        error=exc,
-                        engine_obj=engine_obj,
-                    )
-                return False
-            except ImageSaveError as exc:
-                # Typed save failure (v3.4.0+). Surface via on_error
-                # and Result.errors.
-                errors.append((link, exc))
-                if self.on_error:
-                    try:
-                        self.on_error(link, exc)
-                    except Exception:
-                        logging.exception("on_error hook raised; continuing")
-                # Manifest append (v3.5.0+): record the typed failure.
-                if self._manifest_writer is not None:
-                    self._append_manifest_record(
-                        status="error",
-                        url=link,
-                        file_path=None,
-                        md5=None,
-                        error=exc,
-                        engine_obj=engine_obj,
-                    )
-                return False
             except Exception as exc:
-                # Unhandled exception in save_image (e.g. a bug in
-                # the engine subclass). Surface generically.
-                errors.append((link, exc))
-                if self.on_error:
-                    try:
-                        self.on_error(link, exc)
-                    except Exception:
-                        logging.exception("on_error hook raised; continuing")
-                # Manifest append (v3.5.0+): record the unhandled failure.
-                if self._manifest_writer is not None:
-                    self._append_manifest_record(
-                        status="error",
-                        url=link,
-                        file_path=None,
-                        md5=None,
-                        error=exc,
-                        engine_obj=engine_obj,
-                    )
-                return False
-            fp = Path(file_path)
-            if fp in seen_paths:
-                return True
-            seen_paths.add(fp)
-            try:
-                size = fp.stat().st_size
-            except OSError:
-                size = 0
-            # Re-detect mime by file extension since we already validated
-            # via filetype during save_image.
-            mime = _guess_mime(fp)
-            ir = ImageResult(
-                path=fp,
-                source_url=link,
-                engine=engine,
-                query=query,
-                image_index=engine_obj.download_count,  # set by save_image
-                size_bytes=size,
-                mime_type=mime,
-            )
-            images.append(ir)
-            if self.on_image:
-                try:
-                    self.on_image(ir)
-                except Exception:
-                    logging.exception("on_image hook raised; continuing")
-            # Fire the on_progress hook (v3.4.0+). The engine's
-            # ``download_count`` is incremented inside
-            # ``download_image`` *after* ``save_image`` returns,
-            # so we add 1 to account for the image we just saved.
-            if self.on_progress:
-                done = engine_obj.download_count + 1
-                total = limit
-                pct = (done / total * 100.0) if total > 0 else 0.0
-                eta = _compute_eta(progress_state, done, total)
-                try:
-                    self.on_progress(pct, done, total, eta)
-                except Exception:
-                    logging.exception("on_progress hook raised; continuing")
-            # Manifest append (v3.5.0+): one record per successful save.
-            if self._manifest_writer is not None:
-                self._append_manifest_record(
-                    status="ok",
-                    url=link,
-                    file_path=fp,
-                    md5=file_md5,
-                    error=None,
-                    engine_obj=engine_obj,
-                )
-            return True
+                return self.record_failure(link, exc)
+            return self.record_success(link, file_path, file_md5)
 
         # ``save_image`` is defined on the base ``ImageEngine`` class,
         # so this attribute assignment is legal Python but mypy flags
@@ -598,80 +1541,127 @@ class Downloader:
         engine_obj.save_image = save_with_hooks  # type: ignore[method-assign]
 
         def download_with_count(link: str, index: int):
-            nonlocal download_image_calls
-            download_image_calls += 1
+            self.download_image_calls += 1
             return original_download(link, index)
 
         # Wrap download_image to count how many candidates the engine
         # considered (including resume-skips).
         engine_obj.download_image = download_with_count  # type: ignore[method-assign]
 
-        try:
-            engine_obj.run()
-        finally:
-            # Always close the manifest writer, even on exception.
-            # The writer is idempotent, so a second close (e.g. if
-            # the search raises after a successful run) is a no-op.
-            if manifest_writer is not None:
-                manifest_writer.close()
-
-        # Compute the run's high-level outcome flags.
-        # ``no_results_found`` is True when the engine considered
-        # zero candidate URLs. This distinguishes "the search
-        # returned nothing" from "the search returned stuff but
-        # it was all skipped or failed" — a distinction that was
-        # invisible in 3.2.0 and earlier.
-        no_results_found = download_image_calls == 0
-        cancelled = cancel is not None and cancel.cancelled
-
-        # ``skipped`` is clamped to zero: if a custom engine
-        # incremented ``download_count`` without ``_slots_used`` (or
-        # vice versa), the subtraction can go negative. We don't
-        # want a nonsensical negative count in the result.
-        # ``min_dimension_skips`` (v3.6.0+) is added on top: those
-        # images never touch ``_slots_used``/``download_count`` at
-        # all (the engine just moves on to the next candidate), so
-        # they need to be folded in separately.
-        skipped = max(0, engine_obj._slots_used - engine_obj.download_count) + min_dimension_skips
+        if not isinstance(engine_obj, AsyncImageEngine):
+            return
+        original_save_raising_async = engine_obj._save_image_raising_async
+        original_download_async = engine_obj.download_image_async
 
-        result = Result(
-            query=query,
-            engine=engine,
-            output_dir=image_dir,
-            images=images,
-            skipped=skipped,
-            errors=errors,
-            no_results_found=no_results_found,
-            cancelled=cancelled,
-            manifest_path=manifest_abs_path,
+        async def save_with_hooks_async(link: str, file_path) -> bool:
+            self.save_attempts += 1
+            try:
+                file_md5 = await original_save_raising_async(link, file_path)
+            except Exception as exc:
+                return self.record_failure(link, exc)
+            return self.record_success(link, file_path, file_md5)
+
+        async def download_with_count_async(link: str, index: int):
+            self.download_image_calls += 1
+            return await original_download_async(link, index)
+
+        engine_obj.save_image_async = save_with_hooks_async  # type: ignore[method-assign]
+        engine_obj.download_image_async = download_with_count_async  # type: ignore[method-assign]
+
+    def record_failure(self, link: str, exc: Exception) -> bool:
+        """Record a failed or filtered save; always returns ``False``."""
+        dl = self.downloader
+        if isinstance(exc, ImageSkipped):
+            # v3.6.0+: a filtered image (too small in pixels, or
+            # outside the byte-size range) is an intentional
+            # outcome, not a failure — unlike the other
+            # ImageSaveError subclasses below, it does NOT go
+            # into Result.errors or fire on_error. It's recorded
+            # as a manifest "skip" and counted in Result.skipped.
+            self.filter_skips += 1
+            self.append_manifest_record("skipped", link, None, None, exc)
+            if self.stream is not None:
+                self.stream.put(SkippedImage(link, exc))
+            return False
+        # A typed save failure (v3.4.0+) or an unhandled exception
+        # in save_image (e.g. a bug in the engine subclass): surface
+        # via on_error and Result.errors either way.
+        if self.stream is None:
+            self.errors.append((link, exc))
+        if dl.on_error:
+            try:
+                dl.on_error(link, exc)
+            except Exception:
+                logging.exception("on_error hook raised; continuing")
+        # Manifest append (v3.5.0+): record the failure.
+        self.append_manifest_record("error", link, None, None, exc)
+        if self.stream is not None:
+            self.stream.put(FailedImage(link, exc))
+        return False
+
+    def record_success(self, link: str, file_path, file_md5: str) -> bool:
+        """Record a successful save; always returns ``True``."""
+        dl = self.downloader
+        engine_obj = self.engine_obj
+        fp = Path(file_path)
+        if fp in self.seen_paths:
+            return True
+        self.seen_paths.add(fp)
+        try:
+            size = fp.stat().st_size
+        except OSError:
+            size = 0
+        # Re-detect mime by file extension since we already validated
+        # via filetype during save_image.
+        mime = _guess_mime(fp)
+        ir = ImageResult(
+            path=fp,
+            source_url=link,
+            engine=self.engine,
+            query=self.query,
+            image_index=engine_obj.download_count,  # set by save_image
+            size_bytes=size,
+            mime_type=mime,
         )
-        # Attach the engine instance to the Result so the legacy
-        # ``downloader()`` function can read ``engine.download_count``
-        # for backwards compatibility.
-        result._engine = engine_obj
-
-        if self.on_engine_done:
+        if self.stream is None:
+            self.images.append(ir)
+        if dl.on_image:
             try:
-                self.on_engine_done(engine, result)
+                dl.on_image(ir)
             except Exception:
-                logging.exception("on_engine_done hook raised; continuing")
-
-        return result
-
-    def _append_manifest_record(
+                logging.exception("on_image hook raised; continuing")
+        # Fire the on_progress hook (v3.4.0+). The engine's
+        # ``download_count`` is incremented inside
+        # ``download_image`` *after* ``save_image`` returns,
+        # so we add 1 to account for the image we just saved.
+        if dl.on_progress:
+            done = engine_obj.download_count + 1
+            total = self.limit
+            pct = (done / total * 100.0) if total > 0 else 0.0
+            eta = _compute_eta(self.progress_state, done, total)
+            try:
+                dl.on_progress(pct, done, total, eta)
+            except Exception:
+                logging.exception("on_progress hook raised; continuing")
+        # Manifest append (v3.5.0+): one record per successful save.
+        self.append_manifest_record("ok", link, fp, file_md5, None)
+        if self.stream is not None:
+            self.stream.put(ir)
+        return True
+
+    def append_manifest_record(
         self,
         status: str,
         url: str,
         file_path: Path | None,
         md5: str | None,
         error: BaseException | None,
-        engine_obj: ImageEngine,
     ) -> None:
         """Build a manifest record dict and append it to the writer.
 
-        Called from the success and error paths inside :meth:`search`
-        when ``manifest=True`` was passed. The record is filtered to
-        the writer's configured fields automatically.
+        A no-op unless ``manifest=True`` or a ``catalog`` was passed;
+        the catalog (v3.7.0+) gets the same record. The record is
+        filtered to the writer's configured fields automatically.
 
         ``file_path`` is stored relative to ``output_dir`` (i.e. as
         ``"<query>/Image_1.jpg"``) so the manifest is portable
@@ -679,8 +1669,10 @@ class Downloader:
         the engine wrote outside ``output_dir``), the basename is
         used as a fallback.
         """
-        if self._manifest_writer is None:
+        sinks = [sink for sink in (self.manifest_writer, self.catalog_run) if sink is not None]
+        if not sinks:
             return
+        engine_obj = self.engine_obj
         # ``index`` is 1-based and counts every record (success or
         # failure). The engine's ``download_count`` is incremented
         # inside ``download_image`` *after* ``save_image`` returns,
@@ -698,99 +1690,72 @@ class Downloader:
                 file_rel = str(file_path.resolve().relative_to(Path.cwd()))
             except ValueError:
                 file_rel = file_path.name
-        self._manifest_writer.append(
-            {
-                "index": index,
-                "status": status,
-                "url": url,
-                "file": file_rel,
-                "md5": md5,
-                "error": type(error).__name__ if error is not None else None,
-                "engine": self._manifest_engine_name,
-                "query": self._manifest_query,
-                "source_page": getattr(engine_obj, "last_page_url", None),
-                "downloaded_at": _utcnow_iso(),
-            }
-        )
-
-    async def search_async(
-        self,
-        query: str,
-        limit: int = 100,
-        output_dir: str | Path = "dataset",
-        engine: str = "bing",
-        badsites: list[str] | None = None,
-        name: str = "Image",
-        max_workers: int = 4,
-        force_replace: bool = False,
-        timeout: int = 60,
-        verbose: bool = DEFAULT_VERBOSE,
-        image_filter: str = "",
-        mkt: str = "en-US",
-        ddg_safe_search: str = "moderate",
-        ddg_region: str = "us-en",
-        adult_filter_off: bool = False,
-        cancel: CancelToken | None = None,
-        manifest: bool = False,
-        manifest_path: str | os.PathLike | None = None,
-        manifest_fields: list[str] | None = None,
-        manifest_flush_every: int = 1,
-        min_dimension: int | None = None,
-    ) -> Result:
-        """Async wrapper around :meth:`search`.
-
-        Runs the (blocking) ``search()`` in a worker thread via
-        :func:`asyncio.to_thread`, so it works with the stdlib-only
-        urllib-based engines without requiring an event loop on
-        the engine side. Returns the same :class:`Result`.
+        record = {
+            "index": index,
+            "status": status,
+            "url": url,
+            "file": file_rel,
+            "md5": md5,
+            "error": type(error).__name__ if error is not None else None,
+            "engine": self.engine,
+            "query": self.query,
+            "source_page": _source_page(engine_obj, url),
+            "downloaded_at": _utcnow_iso(),
+        }
+        for sink in sinks:
+            sink.append(record)
+
+    def close(self) -> None:
+        """Close the manifest writer and leave the download budget. Idempotent."""
+        if self.manifest_writer is not None:
+            self.manifest_writer.close()
+        if self.catalog_run is not None:
+            self.catalog_run.close()
+        if self.download_share is not None:
+            self.download_share.close()
+
+    def result(self) -> Result:
+        """Build the :class:`Result` once the engine has finished."""
+        engine_obj = self.engine_obj
+        # Compute the run's high-level outcome flags.
+        # ``no_results_found`` is True when the engine considered
+        # zero candidate URLs. This distinguishes "the search
+        # returned nothing" from "the search returned stuff but
+        # it was all skipped or failed" — a distinction that was
+        # invisible in 3.2.0 and earlier.
+        no_results_found = self.download_image_calls == 0
+        cancelled = self.cancel is not None and self.cancel.cancelled
 
-        Use this in async code (FastAPI, aiohttp, Jupyter with
-        ``top-level await``) so a long search doesn't block the
-        event loop.
+        # ``skipped`` is clamped to zero: if a custom engine
+        # incremented ``download_count`` without ``_slots_used`` (or
+        # vice versa), the subtraction can go negative. We don't
+        # want a nonsensical negative count in the result.
+        # ``filter_skips`` (v3.6.0+) is added on top: those images
+        # never touch ``_slots_used``/``download_count`` at all (the
+        # engine just moves on to the next candidate), so they need
+        # to be folded in separately.
+        skipped = max(0, engine_obj._slots_used - engine_obj.download_count) + self.filter_skips
 
-        Example
-        -------
-        >>> import asyncio
-        >>> from better_bing_image_downloader import Downloader
-        >>>
-        >>> async def main():
-        ...     dl = Downloader()
-        ...     result = await dl.search_async("red panda", limit=10)
-        ...     print(result.count)
-        >>>
-        >>> asyncio.run(main())
-        """
-        import asyncio
-
-        # ``asyncio.to_thread`` is the right call here:
-        # - it doesn't require the function to be a coroutine
-        # - it gives back the GIL so the event loop can serve
-        #   other tasks while the search runs
-        # - it works in any context (no global executor needed)
-        return await asyncio.to_thread(
-            self.search,
-            query=query,
-            limit=limit,
-            output_dir=output_dir,
-            engine=engine,
-            badsites=badsites,
-            name=name,
-            max_workers=max_workers,
-            force_replace=force_replace,
-            timeout=timeout,
-            verbose=verbose,
-            image_filter=image_filter,
-            mkt=mkt,
-            ddg_safe_search=ddg_safe_search,
-            ddg_region=ddg_region,
-            adult_filter_off=adult_filter_off,
-            cancel=cancel,
-            manifest=manifest,
-            manifest_path=manifest_path,
-            manifest_fields=manifest_fields,
-            manifest_flush_every=manifest_flush_every,
-            min_dimension=min_dimension,
+        result = Result(
+            query=self.query,
+            engine=self.engine,
+            output_dir=self.image_dir,
+            images=self.images,
+            skipped=skipped,
+            errors=self.errors,
+            no_results_found=no_results_found,
+            cancelled=cancelled,
+            manifest_path=self.manifest_path,
         )
+        limiter = getattr(engine_obj, "limiter", None)
+        if limiter is not None:
+            result.concurrency_limit = limiter.limit
+            result.concurrency_history = list(limiter.history)
+        # Attach the engine instance to the Result so the legacy
+        # ``downloader()`` function can read ``engine.download_count``
+        # for backwards compatibility.
+        result._engine = engine_obj
+        return result
 
 
 def _utcnow_iso() -> str:
@@ -837,6 +1802,44 @@ def _compute_eta(state: dict[str, float | int], done: int, total: int) -> float
     return remaining / rate
 
 
+def _source_page(engine_obj: object, url: str) -> str | None:
+    """Return the results page ``url`` was found on, for the manifest."""
+    if isinstance(engine_obj, ImageEngine):
+        return engine_obj.source_page_for(url)
+    return getattr(engine_obj, "last_page_url", None)
+
+
+def _unique(queries: Iterable[str]) -> Iterator[str]:
+    """Yield each query once, in first-seen order."""
+    seen: set[str] = set()
+    for query in queries:
+        if query in seen:
+            logging.info("Skipping repeated query %r", query)
+            continue
+        seen.add(query)
+        yield query
+
+
+def _accepts_kwarg(engine_cls: object, name: str) -> bool:
+    """Return ``True`` if calling ``engine_cls`` accepts keyword ``name``.
+
+    Used to skip session injection for custom engines whose fixed
+    ``__init__`` signature predates it. Uninspectable callables (e.g.
+    test doubles) are assumed to accept it.
+    """
+    try:
+        params = inspect.signature(engine_cls).parameters  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return True
+    return name in params or any(p.kind is p.VAR_KEYWORD for p in params.values())
+
+
+def _uses_proxy() -> bool:
+    """Return ``True`` if the environment routes HTTP or HTTPS through a proxy."""
+    proxies = urllib.request.getproxies()
+    return bool(proxies.get("http") or proxies.get("https"))
+
+
 def _guess_mime(path: Path) -> str:
     """Return a best-effort MIME type from the file extension."""
     import mimetypes
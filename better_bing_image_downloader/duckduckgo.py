@@ -14,19 +14,29 @@ The flow is:
 We use a :class:`http.cookiejar.CookieJar` so the session-cookie set on
 the initial fetch is replayed to ``i.js`` (otherwise ``i.js`` returns
 ``403 Forbidden``).
+
+Since v3.7.0 step 1 is skipped when a :class:`VQDCache` already holds
+a token for the query and region; a token ``i.js`` rejects with
+``403`` is dropped and replaced.
 """
 
 from __future__ import annotations
 
+import asyncio
 import gzip
 import http.cookiejar
 import json
 import logging
+import os
 import re
+import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from collections import OrderedDict
+from concurrent.futures import Executor, as_completed
+from typing import Callable
 
 try:
     import brotli
@@ -36,9 +46,20 @@ except ImportError:  # pragma: no cover
     brotli = None
     _HAS_BROTLI = False
 
+from .async_engine import AsyncImageEngine
 from .base import DEFAULT_VERBOSE, MAX_FUTURE_TIMEOUT, ImageEngine
-
-__all__ = ["DuckDuckGo"]
+from .hashindex import HashIndex
+from .hosts import DEFAULT_MAX_PER_HOST
+from .httpcache import HTTPCache
+from .pagecache import PageCache
+from .perceptual import DEFAULT_NEAR_DUPLICATE_DISTANCE, NearDuplicateIndex
+from .pipeline import submit_download
+from .scheduler import DownloadShare
+from .seenurls import SeenURLStore
+from .transport import Transport, UrllibTransport
+from .urls import URLCanonicalizer
+
+__all__ = ["AsyncDuckDuckGo", "DEFAULT_VQD_TTL", "DuckDuckGo", "VQDCache"]
 
 # Brotli is required because DuckDuckGo's CDN advertises ``br`` encoding
 # on the image search endpoints and returns 403 if the client refuses
@@ -51,6 +72,93 @@ _BROTLI_MISSING_MSG = (
     "[duckduckgo]'`)."
 )
 
+# How long a cached vqd token is reused (v3.7.0+). DuckDuckGo doesn't
+# document their lifetime; an expired one is replaced as soon as
+# ``i.js`` rejects it with ``403``, so this only bounds how long a
+# token is trusted without being checked.
+DEFAULT_VQD_TTL = 15 * 60.0
+
+
+class VQDCache:
+    """Thread-safe cache of DuckDuckGo ``vqd`` tokens (v3.7.0+).
+
+    Each search needs a token from the results landing page, a full
+    page fetch, decode, and regex for a few bytes. Engines sharing a
+    ``VQDCache`` fetch one per ``(query, region)`` and reuse it until
+    it is ``ttl`` seconds old or ``i.js`` answers ``403``, whichever
+    comes first. Tokens are bound to the session cookie, so share a
+    cache only between engines using one cookie jar; ``Downloader``
+    keeps one for all the searches it runs.
+
+    Parameters
+    ----------
+    ttl : float
+        Seconds a token is reused.
+    max_entries : int
+        Tokens kept; the least recently used one is dropped beyond it.
+    clock : Callable[[], float]
+        Monotonic time source, replaceable for tests.
+
+    Raises
+    ------
+    ValueError
+        If ``ttl`` or ``max_entries`` is not positive.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_VQD_TTL,
+        max_entries: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ttl <= 0:
+            raise ValueError(f"ttl must be > 0, got {ttl}")
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._lock = threading.Lock()
+        # (query, region) -> (token, expiry time)
+        self._tokens: OrderedDict[tuple[str, str], tuple[str, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._tokens)
+
+    def get(self, query: str, region: str) -> str | None:
+        """The cached token for ``(query, region)``, or ``None`` if missing or expired."""
+        key = (query, region)
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= self.clock():
+                del self._tokens[key]
+                return None
+            self._tokens.move_to_end(key)
+            return entry[0]
+
+    def put(self, query: str, region: str, token: str) -> None:
+        """Cache ``token`` for ``(query, region)``."""
+        key = (query, region)
+        with self._lock:
+            self._tokens[key] = (token, self.clock() + self.ttl)
+            self._tokens.move_to_end(key)
+            while len(self._tokens) > self.max_entries:
+                self._tokens.popitem(last=False)
+
+    def invalidate(self, query: str, region: str, token: str) -> None:
+        """Drop ``token`` after ``i.js`` rejected it.
+
+        A no-op if another search already replaced it with a newer one.
+        """
+        key = (query, region)
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry is not None and entry[0] == token:
+                del self._tokens[key]
+
 
 class DuckDuckGo(ImageEngine):
     """Download images from DuckDuckGo's image search.
@@ -80,6 +188,71 @@ class DuckDuckGo(ImageEngine):
     region : str
         DuckDuckGo region code (e.g. ``"us-en"``, ``"uk-en"``). Default
         ``"us-en"``.
+    transport : Transport | None
+        HTTP transport for the vqd fetch, ``i.js`` pages, and image
+        downloads. It must carry a cookie jar (both built-in
+        transports do) or ``i.js`` answers ``403``. Defaults to a
+        :class:`UrllibTransport` with a fresh cookie jar.
+    min_bytes, max_bytes : int | None
+        Allowed image body size range in bytes; images outside it are
+        skipped (see :class:`OutsideByteLimits`). ``None`` disables
+        either bound.
+    executor : concurrent.futures.Executor | None
+        Shared worker pool to run downloads on (not shut down by the
+        engine). Defaults to a private ``max_workers`` pool per run;
+        :class:`Downloader` passes its long-lived pool.
+    download_share : DownloadShare | None
+        Claim on a global download budget shared with other searches
+        (see :mod:`~better_bing_image_downloader.scheduler`).
+        :class:`Downloader` passes one per search.
+    max_per_host : int
+        Maximum concurrent downloads from one image host; ``0`` for no
+        cap. Default :data:`~better_bing_image_downloader.hosts.DEFAULT_MAX_PER_HOST`
+        (no cap).
+    min_host_delay : float
+        Minimum seconds between the starts of two downloads from the
+        same host. Default ``0.0``.
+    adaptive : bool
+        Resize concurrency during the run from observed latency and
+        errors, starting at ``max_workers`` (see
+        :mod:`~better_bing_image_downloader.adaptive`). Default ``False``.
+    hash_index : HashIndex | str | os.PathLike | None
+        Persistent MD5 index for deduplication across runs (see
+        :mod:`~better_bing_image_downloader.hashindex`). Default
+        ``None`` (deduplicate within this run only).
+    near_duplicates : NearDuplicateIndex | None
+        Perceptual-hash index for skipping near-duplicate images (see
+        :mod:`~better_bing_image_downloader.perceptual`). Default
+        ``None`` (MD5 deduplication only).
+    near_duplicate_distance : int
+        Maximum Hamming distance between two perceptual hashes for the
+        images to count as near-duplicates. Default
+        :data:`~better_bing_image_downloader.perceptual.DEFAULT_NEAR_DUPLICATE_DISTANCE`.
+    canonicalize_urls : URLCanonicalizer | bool
+        Compare result links by their canonical form (see
+        :mod:`~better_bing_image_downloader.urls`) rather than the raw
+        string; pass a :class:`URLCanonicalizer` for custom rules, or
+        ``False`` to compare raw strings. Default ``True``.
+    seen_urls : SeenURLStore | str | os.PathLike | None
+        Persistent store of links fetched by earlier runs, which are
+        skipped without a request (see
+        :mod:`~better_bing_image_downloader.seenurls`). Default ``None``.
+    seen_error_rate : float | None
+        Keep the run's seen links and image digests in Bloom filters
+        with this false-positive bound instead of sets (v3.7.0+).
+    page_cache : PageCache | None
+        Cache of the links found on results pages; pages it holds are
+        not requested again (v3.7.0+). ``Downloader`` passes the one
+        it keeps in its ``cache_dir``.
+    http_cache : HTTPCache | str | os.PathLike | None
+        Cache of image validators and bodies: images fetched before
+        are requested conditionally and a ``304`` reuses the stored
+        body (see :mod:`~better_bing_image_downloader.httpcache`,
+        v3.7.0+). Default ``None``.
+    vqd_cache : VQDCache | None
+        Cache of ``vqd`` tokens shared between searches (v3.7.0+).
+        ``Downloader`` passes its own. ``None`` fetches a token for
+        every run.
     """
 
     PAGE_SIZE = 100  # DDG's i.js returns up to 100 results per page
@@ -104,6 +277,23 @@ class DuckDuckGo(ImageEngine):
         region: str = "us-en",
         cancel=None,
         min_dimension: int | None = None,
+        transport: Transport | None = None,
+        min_bytes: int | None = None,
+        max_bytes: int | None = None,
+        executor: Executor | None = None,
+        download_share: DownloadShare | None = None,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+        min_host_delay: float = 0.0,
+        adaptive: bool = False,
+        hash_index: HashIndex | str | os.PathLike | None = None,
+        near_duplicates: NearDuplicateIndex | None = None,
+        near_duplicate_distance: int = DEFAULT_NEAR_DUPLICATE_DISTANCE,
+        canonicalize_urls: URLCanonicalizer | bool = True,
+        seen_urls: SeenURLStore | str | os.PathLike | None = None,
+        seen_error_rate: float | None = None,
+        page_cache: PageCache | None = None,
+        http_cache: HTTPCache | str | os.PathLike | None = None,
+        vqd_cache: VQDCache | None = None,
     ):
         super().__init__(
             query=query,
@@ -117,6 +307,22 @@ class DuckDuckGo(ImageEngine):
             force_replace=force_replace,
             cancel=cancel,
             min_dimension=min_dimension,
+            transport=transport,
+            min_bytes=min_bytes,
+            max_bytes=max_bytes,
+            executor=executor,
+            download_share=download_share,
+            max_per_host=max_per_host,
+            min_host_delay=min_host_delay,
+            adaptive=adaptive,
+            hash_index=hash_index,
+            near_duplicates=near_duplicates,
+            near_duplicate_distance=near_duplicate_distance,
+            canonicalize_urls=canonicalize_urls,
+            seen_urls=seen_urls,
+            seen_error_rate=seen_error_rate,
+            page_cache=page_cache,
+            http_cache=http_cache,
         )
         if safe_search not in self.VALID_SAFE_SEARCH:
             raise ValueError(
@@ -125,16 +331,19 @@ class DuckDuckGo(ImageEngine):
             )
         self.safe_search = safe_search
         self.region = region
+        self.vqd_cache = vqd_cache
         self._backoff = self.BACKOFF_INITIAL
-        self._cookie_jar = http.cookiejar.CookieJar()
-        self._opener = urllib.request.build_opener(
-            urllib.request.HTTPCookieProcessor(self._cookie_jar)
-        )
+        # The session cookie set by the vqd fetch lives in the
+        # transport's jar and is replayed to ``i.js`` from there.
+        self._cookie_jar = self.transport.cookie_jar
         if not _HAS_BROTLI:
             raise ImportError(_BROTLI_MISSING_MSG)
 
     # --- HTTP helpers ---
 
+    def _default_transport(self) -> Transport:
+        return UrllibTransport(cookie_jar=http.cookiejar.CookieJar())
+
     def _decode(self, raw: bytes, encoding: str) -> str:
         """Decode a response body, handling gzip and brotli."""
         if encoding == "gzip":
@@ -152,6 +361,13 @@ class DuckDuckGo(ImageEngine):
         Returns the raw response body and the ``Content-Encoding`` header
         value (which may be empty for uncompressed responses).
         """
+        request = urllib.request.Request(url, None, headers=self._browser_headers(referer))
+        with self.transport.open(request, timeout=self.timeout) as response:
+            return response.read(), response.headers.get("Content-Encoding", "")
+
+    @staticmethod
+    def _browser_headers(referer: str | None = None) -> dict[str, str]:
+        """The browser-like headers sent with every plain ``GET``."""
         headers = {
             "User-Agent": (
                 "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -164,21 +380,48 @@ class DuckDuckGo(ImageEngine):
         }
         if referer:
             headers["Referer"] = referer
-        request = urllib.request.Request(url, None, headers=headers)
-        with self._opener.open(request, timeout=self.timeout) as response:
-            return response.read(), response.headers.get("Content-Encoding", "")
+        return headers
 
     # --- Search ---
 
     def _fetch_vqd(self) -> str:
         """Fetch the short-lived ``vqd`` token required by ``i.js``."""
-        url = (
+        raw, enc = self._get(self._vqd_url())
+        return self._parse_vqd(self._decode(raw, enc))
+
+    def _get_vqd(self) -> str:
+        """A ``vqd`` token from :attr:`vqd_cache`, fetching one on a miss (v3.7.0+)."""
+        cache = self.vqd_cache
+        vqd = cache.get(self.query, self.region) if cache is not None else None
+        if vqd is None:
+            vqd = self._fetch_vqd()
+            if cache is not None:
+                cache.put(self.query, self.region, vqd)
+        return vqd
+
+    def _token_rejected(self, error: Exception, vqd: str | None) -> bool:
+        """Whether ``error`` is ``i.js`` refusing ``vqd``; if so, forget the token.
+
+        ``i.js`` answers ``403`` once a token has expired. The caller
+        then fetches a fresh one and retries the page.
+        """
+        if vqd is None or getattr(error, "code", None) != 403:
+            return False
+        if self.vqd_cache is not None:
+            self.vqd_cache.invalidate(self.query, self.region, vqd)
+        return True
+
+    def _vqd_url(self) -> str:
+        """URL of the search landing page that carries the ``vqd`` token."""
+        return (
             "https://duckduckgo.com/?q="
             + urllib.parse.quote_plus(self.query)
             + "&iax=images&ia=images"
         )
-        raw, enc = self._get(url)
-        html = self._decode(raw, enc)
+
+    @staticmethod
+    def _parse_vqd(html: str) -> str:
+        """Extract the ``vqd`` token from the search landing page."""
         m = re.search(r'vqd=([\'"])(\d[\d\-]+)\1', html)
         if not m:
             raise RuntimeError(
@@ -208,16 +451,25 @@ class DuckDuckGo(ImageEngine):
     def _fetch_page(self, vqd: str, offset: int) -> list[str]:
         """Fetch a single page of image URLs from ``i.js``."""
         url = self._build_page_url(vqd, offset)
-        # i.js must be requested as XHR
-        opener_with_xhr = urllib.request.build_opener(
-            urllib.request.HTTPCookieProcessor(self._cookie_jar)
-        )
-        # Tell opener to add X-Requested-With via a custom addheaders
-        opener_with_xhr.addheaders = [
-            ("X-Requested-With", "XMLHttpRequest"),
-            ("Accept", "application/json, text/plain, */*"),
-        ]
-        headers = {
+        request = urllib.request.Request(url, None, headers=self._page_headers())
+        with self.transport.open(request, timeout=self.timeout) as response:
+            raw = response.read()
+            enc = response.headers.get("Content-Encoding", "")
+        return self._parse_page(self._decode(raw, enc))
+
+    def _page_cache_key(self, page: int) -> str | None:
+        """Cache key of the page at offset ``page`` (v3.7.0+).
+
+        The page URL without its ``vqd``, which is a session token and
+        doesn't change the results, plus the safe-search setting.
+        """
+        return f"duckduckgo {self._build_page_url('', page)} safe={self.safe_search}"
+
+    def _page_headers(self) -> dict[str, str]:
+        """Headers for an ``i.js`` request."""
+        # i.js must be requested as XHR: the X-Requested-With and
+        # Accept headers below are what mark it as one.
+        return {
             "User-Agent": (
                 "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
                 "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -226,18 +478,13 @@ class DuckDuckGo(ImageEngine):
             "Accept": "application/json, text/plain, */*",
             "Accept-Language": "en-US,en;q=0.9",
             "Accept-Encoding": "gzip, deflate, br",
-            "Referer": (
-                "https://duckduckgo.com/?q="
-                + urllib.parse.quote_plus(self.query)
-                + "&iax=images&ia=images"
-            ),
+            "Referer": self._vqd_url(),
             "X-Requested-With": "XMLHttpRequest",
         }
-        request = urllib.request.Request(url, None, headers=headers)
-        with opener_with_xhr.open(request, timeout=self.timeout) as response:
-            raw = response.read()
-            enc = response.headers.get("Content-Encoding", "")
-        text = self._decode(raw, enc)
+
+    @staticmethod
+    def _parse_page(text: str) -> list[str]:
+        """Extract the image URLs from an ``i.js`` JSON body."""
         try:
             data = json.loads(text)
         except json.JSONDecodeError as e:
@@ -262,17 +509,31 @@ class DuckDuckGo(ImageEngine):
         if self.verbose:
             logging.info("\n\n[!]Indexing DuckDuckGo for: %s\n", self.query)
 
-        try:
-            vqd = self._fetch_vqd()
-        except (urllib.error.HTTPError, urllib.error.URLError) as e:
-            logging.error("Failed to fetch vqd token from DuckDuckGo: %s", e)
-            return
-        except Exception as e:  # pragma: no cover - defensive
-            logging.error("Unexpected error fetching vqd: %s", e)
-            return
+        # With the first page cached (v3.7.0+), the token is fetched
+        # only if the run gets to a page that isn't.
+        vqd = None
+        if self._cached_page(0) is None:
+            try:
+                vqd = self._get_vqd()
+            except (urllib.error.HTTPError, urllib.error.URLError) as e:
+                logging.error("Failed to fetch vqd token from DuckDuckGo: %s", e)
+                return
+            except Exception as e:  # pragma: no cover - defensive
+                logging.error("Unexpected error fetching vqd: %s", e)
+                return
+
+        self._run_pipeline(self._iter_page_links(vqd))
+        logging.info("\n\n[%%] Done. Downloaded %d images.", self.download_count)
+
+    def _iter_page_links(self, vqd: str | None):
+        """Yield the new, non-blacklisted links from each results page in turn.
 
+        Runs on the pipeline's page-fetcher thread (v3.7.0+). Pages
+        with no unseen links are skipped, up to a safety cap of 20.
+        """
         offset = 0
         page_num = 0
+        token_refreshed = False
         while self._slots_used < self.limit:
             # Check the cancel token (v3.3.0+). Returns immediately if
             # the user called ``cancel_token.cancel()`` from another
@@ -284,12 +545,26 @@ class DuckDuckGo(ImageEngine):
             if self.verbose:
                 logging.info("[!]Indexing page: %d (offset=%d)", page_num + 1, offset)
             try:
-                # Track the URL we are about to fetch so the manifest
-                # writer (v3.5.0+) can record provenance for every
-                # image sourced from this page.
-                self.last_page_url = self._build_page_url(vqd, offset)
-                links = self._fetch_page(vqd, offset)
+                # Track the page URL so the manifest writer (v3.5.0+)
+                # can record provenance for every image sourced from
+                # this page. Cached pages (v3.7.0+) are not requested.
+                links = self._cached_page(offset)
+                if links is None:
+                    if vqd is None:
+                        vqd = self._get_vqd()
+                    self.last_page_url = self._build_page_url(vqd, offset)
+                    links = self._fetch_page(vqd, offset)
+                    self._cache_page(offset, links)
+                else:
+                    self.last_page_url = self._build_page_url(vqd or "", offset)
             except (urllib.error.HTTPError, urllib.error.URLError) as e:
+                if not token_refreshed and self._token_rejected(e, vqd):
+                    # Expired token (v3.7.0+): retry the page at once
+                    # with a new one, fetched on the next pass.
+                    logging.info("DuckDuckGo rejected the vqd token; fetching a new one.")
+                    vqd = None
+                    token_refreshed = True
+                    continue
                 wait = self._consume_backoff()
                 logging.error(
                     "Network error from DuckDuckGo: %s. Retrying in %.1fs.",
@@ -300,41 +575,31 @@ class DuckDuckGo(ImageEngine):
                 continue
             except Exception as e:  # pragma: no cover - defensive
                 logging.error("Unexpected error from DuckDuckGo: %s", e)
-                break
+                return
 
             self._reset_backoff()
+            token_refreshed = False
 
             if not links:
                 logging.info("[%%] No more images are available")
-                break
+                return
 
             # Filter seen/badsites
-            filtered = [
-                link
-                for link in links
-                if link not in self.seen and not any(badsite in link for badsite in self.badsites)
-            ]
+            filtered = self._filter_new_links(links)
             self.seen.update(links)
+            offset += self.PAGE_SIZE
+            page_num += 1
 
             if not filtered:
                 # No new URLs on this page; try the next one.
-                offset += self.PAGE_SIZE
-                page_num += 1
                 if page_num > 20:  # safety: stop after 20 empty pages
                     logging.info("[%%] No new images after %d pages, stopping", page_num)
-                    break
+                    return
                 continue
 
-            remaining = self.limit - self._slots_used
-            to_download = filtered[:remaining]
-            self._download_batch(to_download, start_index=self.download_count + 1)
-
-            if self._slots_used >= self.limit:
-                break
-            offset += self.PAGE_SIZE
-            page_num += 1
-
-        logging.info("\n\n[%%] Done. Downloaded %d images.", self.download_count)
+            filtered = self._skip_known_urls(filtered)
+            if filtered:
+                yield filtered
 
     def _download_batch(self, links: list[str], start_index: int) -> None:
         """Download a batch of links starting at ``start_index``.
@@ -345,11 +610,9 @@ class DuckDuckGo(ImageEngine):
         if not links:
             return
         if self.max_workers > 1:
-            from concurrent.futures import ThreadPoolExecutor, as_completed
-
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            with self._download_executor() as executor:
                 futures = [
-                    executor.submit(self.download_image, link, i)
+                    submit_download(executor, self.download_share, self.download_image, link, i)
                     for i, link in enumerate(links, start_index)
                 ]
                 for future in as_completed(futures, timeout=MAX_FUTURE_TIMEOUT):
@@ -362,3 +625,129 @@ class DuckDuckGo(ImageEngine):
                 if self._slots_used >= self.limit:
                     break
                 self.download_image(link, i)
+
+
+class AsyncDuckDuckGo(AsyncImageEngine, DuckDuckGo):
+    """:class:`DuckDuckGo` with a native asyncio path (v3.7.0+).
+
+    Takes every :class:`DuckDuckGo` argument plus ``concurrency`` and
+    ``async_transport`` (see :class:`AsyncImageEngine`). The vqd
+    session cookie lives in the shared cookie jar, so it carries over
+    between this engine and the threaded one.
+    """
+
+    async def run_async(self) -> None:
+        """Download images until ``self.limit`` is reached or pages exhausted."""
+        if not _HAS_BROTLI:  # pragma: no cover
+            raise ImportError(_BROTLI_MISSING_MSG)
+
+        if self.verbose:
+            logging.info("\n\n[!]Indexing DuckDuckGo for: %s\n", self.query)
+
+        vqd = None
+        if self._cached_page(0) is None:
+            try:
+                vqd = await self._get_vqd_async()
+            except (urllib.error.HTTPError, urllib.error.URLError) as e:
+                logging.error("Failed to fetch vqd token from DuckDuckGo: %s", e)
+                return
+            except Exception as e:  # pragma: no cover - defensive
+                logging.error("Unexpected error fetching vqd: %s", e)
+                return
+
+        await self._run_pipeline_async(self._aiter_page_links(vqd))
+        logging.info("\n\n[%%] Done. Downloaded %d images.", self.download_count)
+
+    async def _get_async(
+        self, url: str, referer: str | None = None, headers: dict | None = None
+    ) -> tuple[bytes, str]:
+        """Async :meth:`DuckDuckGo._get`."""
+        async with await self.async_transport.open(
+            url, headers or self._browser_headers(referer), timeout=self.timeout
+        ) as response:
+            return await response.read(), response.headers.get("Content-Encoding", "")
+
+    async def _fetch_vqd_async(self) -> str:
+        """Async :meth:`DuckDuckGo._fetch_vqd`."""
+        raw, enc = await self._get_async(self._vqd_url())
+        return self._parse_vqd(self._decode(raw, enc))
+
+    async def _get_vqd_async(self) -> str:
+        """Async :meth:`DuckDuckGo._get_vqd`."""
+        cache = self.vqd_cache
+        vqd = cache.get(self.query, self.region) if cache is not None else None
+        if vqd is None:
+            vqd = await self._fetch_vqd_async()
+            if cache is not None:
+                cache.put(self.query, self.region, vqd)
+        return vqd
+
+    async def _fetch_page_async(self, vqd: str, offset: int) -> list[str]:
+        """Async :meth:`DuckDuckGo._fetch_page`."""
+        url = self._build_page_url(vqd, offset)
+        raw, enc = await self._get_async(url, headers=self._page_headers())
+        return self._parse_page(self._decode(raw, enc))
+
+    async def _aiter_page_links(self, vqd: str | None):
+        """Async :meth:`DuckDuckGo._iter_page_links`."""
+        offset = 0
+        page_num = 0
+        token_refreshed = False
+        while self._slots_used < self.limit:
+            if self.is_cancelled():
+                if self.verbose:
+                    logging.info("[!] Cancellation requested; stopping.")
+                return
+            if self.verbose:
+                logging.info("[!]Indexing page: %d (offset=%d)", page_num + 1, offset)
+            try:
+                links = await asyncio.to_thread(self._cached_page, offset)
+                if links is None:
+                    if vqd is None:
+                        vqd = await self._get_vqd_async()
+                    self.last_page_url = self._build_page_url(vqd, offset)
+                    links = await self._fetch_page_async(vqd, offset)
+                    await asyncio.to_thread(self._cache_page, offset, links)
+                else:
+                    self.last_page_url = self._build_page_url(vqd or "", offset)
+            except (urllib.error.HTTPError, urllib.error.URLError) as e:
+                if not token_refreshed and self._token_rejected(e, vqd):
+                    # Expired token (v3.7.0+): retry the page at once
+                    # with a new one, fetched on the next pass.
+                    logging.info("DuckDuckGo rejected the vqd token; fetching a new one.")
+                    vqd = None
+                    token_refreshed = True
+                    continue
+                wait = self._consume_backoff()
+                logging.error(
+                    "Network error from DuckDuckGo: %s. Retrying in %.1fs.",
+                    e,
+                    wait,
+                )
+                await asyncio.sleep(wait)
+                continue
+            except Exception as e:  # pragma: no cover - defensive
+                logging.error("Unexpected error from DuckDuckGo: %s", e)
+                return
+
+            self._reset_backoff()
+            token_refreshed = False
+
+            if not links:
+                logging.info("[%%] No more images are available")
+                return
+
+            filtered = self._filter_new_links(links)
+            self.seen.update(links)
+            offset += self.PAGE_SIZE
+            page_num += 1
+
+            if not filtered:
+                if page_num > 20:  # safety: stop after 20 empty pages
+                    logging.info("[%%] No new images after %d pages, stopping", page_num)
+                    return
+                continue
+
+            filtered = await asyncio.to_thread(self._skip_known_urls, filtered)
+            if filtered:
+                yield filtered
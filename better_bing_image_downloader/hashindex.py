@@ -0,0 +1,203 @@
+"""Persistent content-hash index for cross-run deduplication (v3.7.0+).
+
+MD5 deduplication used to live only in ``ImageEngine._file_hashes``,
+an in-memory set that starts empty on every run, so re-running or
+resuming a query saved byte-identical images again under new indices.
+A :class:`HashIndex` keeps the MD5 of every image saved into a
+dataset on disk, so later runs (in this process or another one) reject
+those images as duplicates too.
+
+The file is compact and append-only: an 8-byte header followed by one
+raw 16-byte MD5 digest per saved image (1,000,000 images take 16 MB).
+It is read in full the first time it is needed and each new digest is
+appended as soon as its image has been moved into place, so a crash
+loses at most the digest being written; a truncated trailing record is
+ignored on load and cut off before the next append. Several processes
+may append to one file, but digests added by another process are only
+seen after a reload; :meth:`HashIndex.compact` removes any duplicates
+that this leaves behind.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+__all__ = ["HASH_INDEX_FILENAME", "HashIndex"]
+
+# File name used for ``hash_index=True``: the index lives next to the
+# images it describes, in the query's output directory.
+HASH_INDEX_FILENAME = ".bbid-hashes"
+
+_MAGIC = b"BBIDMD5\x01"
+_DIGEST_SIZE = 16
+
+
+class HashIndex:
+    """Thread-safe on-disk set of MD5 digests of saved images.
+
+    One index can be shared by any number of engines and output
+    directories; pass the same instance (or path) to each of them.
+    ``Downloader`` shares one instance per path between its searches.
+
+    Digests are passed around as hex strings, the form
+    ``ImageEngine._save_image_raising`` returns. Saving an image goes
+    through :meth:`claim` (reserve the digest, ``False`` if it is
+    already known), then :meth:`commit` once the file is in place or
+    :meth:`release` if writing it failed.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Index file. Created (with its parent directories) on the first
+        :meth:`commit`.
+
+    Raises
+    ------
+    ValueError
+        On first use, if ``path`` exists but is not a hash index.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._known: set[bytes] | None = None
+        self._claimed: set[bytes] = set()
+        self._file = None
+
+    def __repr__(self) -> str:
+        return f"HashIndex({str(self.path)!r})"
+
+    def __enter__(self) -> HashIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __contains__(self, md5_hex: object) -> bool:
+        if not isinstance(md5_hex, str):
+            return False
+        with self._lock:
+            return bytes.fromhex(md5_hex) in self._load()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    def claim(self, md5_hex: str) -> bool:
+        """Reserve ``md5_hex`` for an image about to be saved.
+
+        Returns ``False`` if the digest is already in the index or
+        reserved by another save in progress.
+        """
+        digest = bytes.fromhex(md5_hex)
+        with self._lock:
+            if digest in self._load() or digest in self._claimed:
+                return False
+            self._claimed.add(digest)
+            return True
+
+    def release(self, md5_hex: str) -> None:
+        """Drop a :meth:`claim` whose image was not saved after all."""
+        with self._lock:
+            self._claimed.discard(bytes.fromhex(md5_hex))
+
+    def commit(self, md5_hex: str) -> None:
+        """Record ``md5_hex`` as saved and append it to the file. Idempotent."""
+        digest = bytes.fromhex(md5_hex)
+        with self._lock:
+            self._claimed.discard(digest)
+            known = self._load()
+            if digest in known:
+                return
+            known.add(digest)
+            f = self._append_handle()
+            f.write(digest)
+            f.flush()
+
+    def compact(self) -> int:
+        """Rewrite the file with its digests sorted and deduplicated.
+
+        Re-reads the file first, picking up digests appended by other
+        processes. Returns the number of digests kept.
+        """
+        with self._lock:
+            self._close_handle()
+            self._known = None
+            known = self._load()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".hashindex-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(_MAGIC)
+                    f.write(b"".join(sorted(known)))
+                os.replace(tmp, self.path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp)
+                raise
+            return len(known)
+
+    def close(self) -> None:
+        """Close the append handle. Idempotent; the index stays usable."""
+        with self._lock:
+            self._close_handle()
+
+    # --- Internals (called with ``_lock`` held) ---
+
+    def _load(self) -> set[bytes]:
+        if self._known is None:
+            self._known = set(_read_records(self.path, _MAGIC, _DIGEST_SIZE))
+        return self._known
+
+    def _append_handle(self):
+        if self._file is None:
+            self._file = _open_for_append(self.path, _MAGIC, _DIGEST_SIZE)
+        return self._file
+
+    def _close_handle(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# --- Record files (shared with ``perceptual.NearDuplicateIndex``) ---
+
+
+def _read_records(path: Path, magic: bytes, size: int) -> list[bytes]:
+    """Return the fixed-``size`` records of an append-only index file.
+
+    A missing file, or a header cut short by a crash, reads as empty;
+    a truncated trailing record is ignored.
+
+    Raises
+    ------
+    ValueError
+        If the file does not start with ``magic``.
+    """
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return []
+    if not (data.startswith(magic) or magic.startswith(data)):
+        raise ValueError(f"{path} is not an index file of this kind")
+    body = memoryview(data)[len(magic) :]
+    usable = len(body) - len(body) % size
+    return [bytes(body[i : i + size]) for i in range(0, usable, size)]
+
+
+def _open_for_append(path: Path, magic: bytes, size: int):
+    """Open an index file for appending records, writing the header if needed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    f = open(path, "ab")  # noqa: SIM115 - held open by the caller for appends
+    end = f.tell()
+    if end < len(magic):
+        f.truncate(0)
+        f.write(magic)
+    elif (end - len(magic)) % size:
+        # A previous writer died mid-record: drop the partial one.
+        f.truncate(end - (end - len(magic)) % size)
+    return f
@@ -0,0 +1,343 @@
+"""Per-host politeness and dispatch for image downloads (v3.7.0+).
+
+Image URLs from Bing and DuckDuckGo cluster on a handful of CDNs
+(pinimg, wikimedia, shopify, ...). Handing them to workers in page
+order means several workers often queue up on one slow or throttling
+host while other hosts sit idle, and host-level 429s and timeouts are
+the most common :class:`~better_bing_image_downloader.base.NetworkError`.
+
+Two pieces fix that:
+
+- :class:`HostTracker` (one per engine, ``ImageEngine.hosts``) keeps
+  per-host state: requests in flight, the start of the last request,
+  an exponentially weighted moving average of request latency, and a
+  cooldown after the host answers ``429``/``503`` or times out. It
+  decides when a host may take another request:
+
+  * never more than ``max_per_host`` at once, if set (no cap by
+    default);
+  * at least ``min_delay`` seconds between request starts;
+  * only one at a time while the host is *slow* (average latency at
+    least :data:`SLOW_HOST_FACTOR` times the (low) median of all hosts), so
+    a slow host cannot tie up the whole worker pool;
+  * nothing until a throttling cooldown (``Retry-After`` if sent,
+    otherwise doubling from 1s up to 30s) has passed.
+
+- :class:`HostQueue` holds the links waiting to be downloaded, grouped
+  by host, and hands out the next link round-robin across the hosts
+  that the tracker says are ready. Both download pipelines (threaded
+  and asyncio) dispatch from one.
+"""
+
+from __future__ import annotations
+
+import collections
+import email.utils
+import math
+import socket
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.parse
+from typing import Callable, NamedTuple
+
+__all__ = [
+    "DEFAULT_MAX_PER_HOST",
+    "HostQueue",
+    "HostStats",
+    "HostTracker",
+    "SLOW_HOST_FACTOR",
+    "host_of",
+]
+
+# Default cap on concurrent requests to one host: none. Results often
+# cluster on one CDN, and a fixed cap would hold such a run below its
+# ``max_workers``; slow and throttling hosts are still held back. Pass
+# ``max_per_host=4`` (or any other cap) to opt in.
+DEFAULT_MAX_PER_HOST = 0
+
+# A host whose average latency is this many times the median of all
+# hosts is treated as slow and limited to one request at a time.
+SLOW_HOST_FACTOR = 3.0
+
+# Weight of the newest sample in the per-host latency average.
+_LATENCY_ALPHA = 0.3
+
+# Cooldown after a throttling response (429/503) or a timeout, doubled
+# on every consecutive one and reset by a success.
+_MIN_COOLDOWN = 1.0  # seconds
+_MAX_COOLDOWN = 30.0  # seconds
+_THROTTLE_CODES = frozenset({429, 503})
+
+
+def host_of(link: str) -> str:
+    """Return the lower-cased host name of ``link`` (``""`` if it has none)."""
+    try:
+        return urllib.parse.urlsplit(link).hostname or ""
+    except ValueError:
+        return ""
+
+
+class HostStats(NamedTuple):
+    """Per-host counters reported by :meth:`HostTracker.stats`.
+
+    Attributes
+    ----------
+    in_flight : int
+        Requests to the host currently running.
+    requests : int
+        Requests completed.
+    failures : int
+        Requests that ended in a network error (including throttling).
+    throttled : int
+        Requests answered with ``429``/``503`` or that timed out.
+    latency : float | None
+        Moving average of request duration in seconds; ``None`` before
+        the first completed request.
+    slow : bool
+        Whether the host is currently limited to one request at a time.
+    """
+
+    in_flight: int
+    requests: int
+    failures: int
+    throttled: int
+    latency: float | None
+    slow: bool
+
+
+class _Host:
+    __slots__ = (
+        "in_flight",
+        "requests",
+        "failures",
+        "throttled",
+        "latency",
+        "last_start",
+        "not_before",
+        "cooldown",
+    )
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.throttled = 0
+        self.latency: float | None = None
+        self.last_start = -math.inf
+        self.not_before = -math.inf
+        self.cooldown = 0.0
+
+
+class HostTracker:
+    """Thread-safe per-host limits, latency tracking, and throttling cooldowns.
+
+    Parameters
+    ----------
+    max_per_host : int
+        Maximum concurrent requests to one host; ``0`` for no cap.
+    min_delay : float
+        Minimum seconds between the starts of two requests to the same
+        host.
+    clock : Callable[[], float]
+        Monotonic time source (tests substitute a fake one).
+
+    Raises
+    ------
+    ValueError
+        If ``max_per_host`` or ``min_delay`` is negative.
+    """
+
+    def __init__(
+        self,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+        min_delay: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_per_host < 0:
+            raise ValueError(f"max_per_host must be >= 0, got {max_per_host}")
+        if min_delay < 0:
+            raise ValueError(f"min_delay must be >= 0, got {min_delay}")
+        self.max_per_host = max_per_host
+        self.min_delay = min_delay
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._hosts: dict[str, _Host] = {}
+        self._median_latency: float | None = None
+
+    # --- Dispatch (called with ``_lock`` held, by HostQueue) ---
+
+    def _host(self, host: str) -> _Host:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _Host()
+        return state
+
+    def _is_slow(self, state: _Host) -> bool:
+        median = self._median_latency
+        return (
+            median is not None
+            and state.latency is not None
+            and state.latency >= SLOW_HOST_FACTOR * median
+        )
+
+    def _available_at(self, host: str, now: float) -> float:
+        """Earliest time ``host`` may start another request (``inf``: wait for one to end)."""
+        state = self._host(host)
+        cap = 1 if self._is_slow(state) else self.max_per_host
+        if cap and state.in_flight >= cap:
+            return math.inf
+        return max(state.not_before, state.last_start + self.min_delay, now)
+
+    def _begin(self, host: str, now: float) -> None:
+        state = self._host(host)
+        state.in_flight += 1
+        state.last_start = now
+
+    # --- Public API ---
+
+    def end(self, host: str) -> None:
+        """Mark a request dispatched by :class:`HostQueue` as finished."""
+        with self._lock:
+            self._host(host).in_flight -= 1
+
+    def observe(self, host: str, elapsed: float, error: BaseException | None = None) -> None:
+        """Record a completed request to ``host``.
+
+        ``error`` is the network error it failed with, if any. A
+        ``429``/``503`` response or a timeout starts (or doubles) the
+        host's cooldown; any success resets it.
+        """
+        with self._lock:
+            state = self._host(host)
+            state.requests += 1
+            if error is None:
+                state.cooldown = 0.0
+                state.latency = (
+                    elapsed
+                    if state.latency is None
+                    else (1 - _LATENCY_ALPHA) * state.latency + _LATENCY_ALPHA * elapsed
+                )
+                samples = [s.latency for s in self._hosts.values() if s.latency is not None]
+                self._median_latency = statistics.median_low(samples) if len(samples) > 1 else None
+                return
+            state.failures += 1
+            hint = _throttle_hint(error)
+            if hint is None:
+                return
+            state.throttled += 1
+            state.cooldown = min(_MAX_COOLDOWN, max(_MIN_COOLDOWN, hint, state.cooldown * 2))
+            state.not_before = self.clock() + state.cooldown
+
+    def stats(self) -> dict[str, HostStats]:
+        """Return a snapshot of every host seen so far."""
+        with self._lock:
+            return {
+                host: HostStats(
+                    in_flight=s.in_flight,
+                    requests=s.requests,
+                    failures=s.failures,
+                    throttled=s.throttled,
+                    latency=s.latency,
+                    slow=self._is_slow(s),
+                )
+                for host, s in self._hosts.items()
+            }
+
+
+class HostQueue:
+    """Links waiting to be downloaded, dispatched round-robin across ready hosts.
+
+    Not bounded itself; the pipelines stop reading pages while
+    ``len(queue)`` is at their read-ahead limit.
+
+    Parameters
+    ----------
+    tracker : HostTracker
+        Decides which hosts may take another request.
+    """
+
+    def __init__(self, tracker: HostTracker) -> None:
+        self.tracker = tracker
+        # Host -> its pending links. Dict order is the round-robin
+        # order: a host moves to the back each time it is served.
+        self._pending: dict[str, collections.deque[str]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put(self, link: str) -> None:
+        """Queue ``link`` behind the other links of its host."""
+        host = host_of(link)
+        with self.tracker._lock:
+            self._pending.setdefault(host, collections.deque()).append(link)
+            self._size += 1
+
+    def pop(self) -> tuple[str, str] | float:
+        """Take the next link whose host is ready.
+
+        Returns ``(link, host)``; the caller must call
+        ``tracker.end(host)`` once the download finishes. If no host is
+        ready, returns the number of seconds until one could be
+        (``inf`` when the queue is empty or every host with pending
+        links is at its concurrency cap).
+        """
+        tracker = self.tracker
+        with tracker._lock:
+            now = tracker.clock()
+            wait = math.inf
+            for host in list(self._pending):
+                ready_at = tracker._available_at(host, now)
+                if ready_at > now:
+                    wait = min(wait, ready_at - now)
+                    continue
+                links = self._pending.pop(host)
+                link = links.popleft()
+                if links:
+                    self._pending[host] = links
+                self._size -= 1
+                tracker._begin(host, now)
+                return link, host
+            return wait
+
+
+def _throttle_hint(error: BaseException) -> float | None:
+    """Cooldown hint for a failed request: ``None`` if it wasn't throttling.
+
+    Walks the exception's ``__cause__`` chain (``NetworkError`` wraps
+    the underlying ``urllib`` error). Returns the ``Retry-After``
+    delay for a 429/503 that sends one, ``0.0`` for other throttling
+    responses and for timeouts.
+    """
+    seen: set[int] = set()
+    exc: BaseException | None = error
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, urllib.error.HTTPError):
+            if exc.code not in _THROTTLE_CODES:
+                return None
+            return _retry_after(exc.headers.get("Retry-After") if exc.headers else None)
+        if isinstance(exc, (socket.timeout, TimeoutError)):
+            return 0.0
+        if isinstance(exc, urllib.error.URLError) and isinstance(
+            exc.reason, (socket.timeout, TimeoutError)
+        ):
+            return 0.0
+        exc = exc.__cause__
+    return None
+
+
+def _retry_after(value: str | None) -> float:
+    """Parse a ``Retry-After`` header (seconds or HTTP date); ``0.0`` if absent."""
+    if not value:
+        return 0.0
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return max(0.0, when.timestamp() - time.time())
@@ -0,0 +1,200 @@
+"""Conditional-request cache for image downloads (v3.7.0+).
+
+Re-crawling a URL, or re-running a query with ``force_replace=True``,
+downloaded every image body again even when it hadn't changed. With an
+:class:`HTTPCache` attached, an engine remembers the ``ETag`` and
+``Last-Modified`` validators of each image it fetched, together with a
+copy of the body, and sends them back as ``If-None-Match`` /
+``If-Modified-Since`` the next time. A ``304 Not Modified`` answer is a
+cache hit: the stored body goes through the same checks as a download
+(file type, size limits, dimensions, deduplication) and is saved
+without being transferred again.
+
+Bodies are stored once per content, under their MD5, and hard-linked
+from the downloaded file when the cache is on the same file system
+(copied otherwise), so caching the images of a dataset costs almost no
+extra disk space. A stored body whose MD5 no longer matches (the image
+was edited in place through the hard link) is discarded and the image
+fetched in full. Validators live in a SQLite table in WAL mode, like
+:class:`~better_bing_image_downloader.seenurls.SeenURLStore`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+__all__ = ["HTTP_CACHE_DIRNAME", "HTTPCache", "HTTPCacheEntry"]
+
+# Directory used by ``Downloader.search(http_cache=True)``, at the top
+# of the output tree so every query under it shares the cache.
+HTTP_CACHE_DIRNAME = ".bbid-http"
+
+
+class HTTPCacheEntry(NamedTuple):
+    """What the cache knows about one URL.
+
+    Attributes
+    ----------
+    etag : str | None
+        The ``ETag`` the server sent with the body.
+    last_modified : str | None
+        The ``Last-Modified`` the server sent with the body.
+    md5 : str
+        MD5 hex digest of the stored body.
+    path : Path
+        Stored copy of the body.
+    """
+
+    etag: str | None
+    last_modified: str | None
+    md5: str
+    path: Path
+
+    def validators(self) -> dict[str, str]:
+        """Request headers that make the next fetch conditional."""
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """Thread-safe on-disk cache of image validators and bodies.
+
+    Parameters
+    ----------
+    directory : str | os.PathLike
+        Cache directory; created on first use. Holds ``index.sqlite``
+        and the stored bodies under ``objects/``.
+    """
+
+    def __init__(self, directory: str | os.PathLike) -> None:
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def __repr__(self) -> str:
+        return f"HTTPCache({str(self.directory)!r})"
+
+    def __enter__(self) -> HTTPCache:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()
+        return int(count)
+
+    def lookup(self, url: str) -> HTTPCacheEntry | None:
+        """The entry for ``url``, or ``None`` if there is none or its body is gone."""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT etag, last_modified, md5 FROM entries WHERE url = ?", (url,))
+                .fetchone()
+            )
+        if row is None:
+            return None
+        etag, last_modified, md5 = row
+        path = self._object_path(md5)
+        if not path.is_file():
+            return None
+        return HTTPCacheEntry(etag, last_modified, md5, path)
+
+    def store(
+        self,
+        url: str,
+        etag: str | None,
+        last_modified: str | None,
+        body_path: str | os.PathLike,
+        md5: str,
+    ) -> None:
+        """Remember ``url``'s validators and the body at ``body_path``.
+
+        Does nothing if the server sent neither validator. The body is
+        hard-linked into the cache where possible, copied otherwise.
+
+        Raises
+        ------
+        OSError
+            If the body can't be stored.
+        """
+        if etag is None and last_modified is None:
+            return
+        target = self._object_path(md5)
+        if not target.is_file():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(Path(body_path), target)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (url, etag, last_modified, md5) "
+                "VALUES (?, ?, ?, ?)",
+                (url, etag, last_modified, md5),
+            )
+            conn.commit()
+
+    def forget(self, url: str) -> None:
+        """Drop the entry for ``url`` (the stored body is kept for other URLs)."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection. Idempotent; the cache reopens on next use."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _object_path(self, md5: str) -> Path:
+        return self.directory / "objects" / md5[:2] / md5
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Used from many download threads, serialised by ``_lock``.
+            conn = sqlite3.connect(
+                self.directory / "index.sqlite", check_same_thread=False, timeout=30
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries (url TEXT PRIMARY KEY, etag TEXT, "
+                "last_modified TEXT, md5 TEXT NOT NULL) WITHOUT ROWID"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Hard-link ``source`` to ``target``, or copy it there atomically."""
+    try:
+        os.link(source, target)
+        return
+    except FileExistsError:
+        return
+    except OSError:
+        pass  # another file system, or links not supported
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".object-")
+    try:
+        with os.fdopen(fd, "wb") as out, open(source, "rb") as src:
+            shutil.copyfileobj(src, out)
+        os.replace(tmp, target)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
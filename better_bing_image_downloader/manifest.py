@@ -11,12 +11,26 @@ The writer is intentionally minimal:
   written (so engines can pass full records).
 - File is opened in append mode with line buffering, so a crash
   in the middle of a run leaves a valid (partial) manifest.
-- The writer is **not** thread-safe; ``Downloader.search`` is
-  single-threaded for record-append.
+- ``append()`` may be called from several threads (v3.7.0+).
+
+Records are appended from the download worker threads, one write per
+record. :class:`BackgroundManifestWriter` (v3.7.0+), which
+``Downloader.search`` uses, takes records through a queue and leaves
+serialisation and I/O to one writer thread. That thread writes
+whatever has queued up in a single call and flushes once per batch,
+so heavy concurrent runs stop paying a write and a flush per image.
+
+Every writer is a :class:`ManifestSink` (v3.7.0+). ``manifest_format``
+picks the sink ``Downloader.search`` opens. ``"jsonl"`` is the default,
+and ``"parquet"`` is the columnar
+:class:`~better_bing_image_downloader.columnar.ParquetManifestWriter`.
 
 Public surface:
 
+- :class:`ManifestSink` — the interface every manifest writer implements
 - :class:`ManifestWriter` — the writer
+- :class:`BackgroundManifestWriter` — the batching, threaded writer
+- :func:`open_manifest_sink` — opens the sink for a ``manifest_format``
 - :class:`ManifestFieldError` — raised when an unknown field is requested
 - :data:`DEFAULT_MANIFEST_FIELDS` — the default 10-field set
 """
@@ -26,6 +40,10 @@ from __future__ import annotations
 import json
 import logging
 import os
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import IO, Any
 
@@ -49,6 +67,24 @@ DEFAULT_MANIFEST_FIELDS: list[str] = [
 ]
 
 
+# ``manifest_format`` values, mapped to the default file name the
+# manifest gets inside the query directory (v3.7.0+).
+MANIFEST_FILENAMES: dict[str, str] = {
+    "jsonl": "manifest.jsonl",
+    "parquet": "manifest.parquet",
+}
+
+# ``BackgroundManifestWriter`` writes a batch at the latest this many
+# seconds after its first record was appended.
+DEFAULT_MANIFEST_FLUSH_INTERVAL = 1.0
+
+# Upper bound on the records one write call takes, so a large backlog
+# is still flushed in reasonably sized pieces.
+_MAX_BATCH = 4096
+
+_CLOSE = object()
+
+
 class ManifestFieldError(ValueError):
     """Raised when an unknown field is requested in ``manifest_fields``.
 
@@ -57,7 +93,96 @@ class ManifestFieldError(ValueError):
     """
 
 
-class ManifestWriter:
+class ManifestSink(ABC):
+    """Destination for manifest records (v3.7.0+).
+
+    Subclasses implement :meth:`append` and :meth:`close`; the base
+    class validates the field list and provides :attr:`fields` and
+    the context-manager protocol. ``append`` is called from the
+    download worker threads, so it must be thread-safe, and it must
+    log rather than raise: manifest writes must never crash a search.
+
+    Parameters
+    ----------
+    fields : list[str] | None
+        Fields kept from each record, in order. ``None`` means
+        :data:`DEFAULT_MANIFEST_FIELDS`.
+
+    Attributes
+    ----------
+    path : Path
+        File the records end up in; set by the subclass.
+
+    Raises
+    ------
+    ManifestFieldError
+        If ``fields`` names an unknown field.
+    """
+
+    path: Path
+
+    def __init__(self, fields: list[str] | None = None) -> None:
+        if fields is None:
+            fields = list(DEFAULT_MANIFEST_FIELDS)
+        unknown = [f for f in fields if f not in DEFAULT_MANIFEST_FIELDS]
+        if unknown:
+            raise ManifestFieldError(
+                f"unknown manifest field(s) {unknown!r}; " f"valid: {DEFAULT_MANIFEST_FIELDS}"
+            )
+        self._fields = list(fields)
+
+    @property
+    def fields(self) -> list[str]:
+        """The list of field names that will appear in each written record."""
+        return list(self._fields)
+
+    @abstractmethod
+    def append(self, record: dict) -> None:
+        """Add one record, projected to :attr:`fields`."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Write out everything appended and release the file. Idempotent."""
+
+    def __enter__(self) -> ManifestSink:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def open_manifest_sink(
+    manifest_format: str,
+    path: str | os.PathLike,
+    fields: list[str] | None = None,
+    flush_every: int = 1,
+    fsync: bool = False,
+) -> ManifestSink:
+    """Open the sink ``Downloader.search`` uses for ``manifest_format`` (v3.7.0+).
+
+    ``"jsonl"`` opens a :class:`BackgroundManifestWriter`; ``"parquet"``
+    a :class:`~better_bing_image_downloader.columnar.ParquetManifestWriter`,
+    which ignores ``flush_every`` and ``fsync``.
+
+    Raises
+    ------
+    ValueError
+        If ``manifest_format`` is not in :data:`MANIFEST_FILENAMES`.
+    ImportError
+        For ``"parquet"`` without pyarrow installed.
+    """
+    if manifest_format == "jsonl":
+        return BackgroundManifestWriter(path, fields=fields, flush_every=flush_every, fsync=fsync)
+    if manifest_format == "parquet":
+        from .columnar import ParquetManifestWriter
+
+        return ParquetManifestWriter(path, fields=fields)
+    raise ValueError(
+        f"unknown manifest_format {manifest_format!r}; valid: {sorted(MANIFEST_FILENAMES)}"
+    )
+
+
+class ManifestWriter(ManifestSink):
     """Append-only JSONL writer for search run records.
 
     Each call to :meth:`append` writes one line of JSON. Records are
@@ -65,10 +190,9 @@ class ManifestWriter:
     written, so callers can pass a fully-populated record dict and
     rely on the writer to project it.
 
-    The writer is not thread-safe; it is intended for use from the
-    single-threaded ``Downloader.search`` main loop. Engines do
-    their own parallel image downloads, but record-appending happens
-    in the main thread.
+    :meth:`append` is thread-safe (v3.7.0+): each record is written
+    under a lock, so lines from concurrent download workers never
+    interleave.
 
     Example
     -------
@@ -86,33 +210,30 @@ class ManifestWriter:
         fields: list[str] | None = None,
         flush_every: int = 1,
     ) -> None:
-        if fields is None:
-            fields = list(DEFAULT_MANIFEST_FIELDS)
-        unknown = [f for f in fields if f not in DEFAULT_MANIFEST_FIELDS]
-        if unknown:
-            raise ManifestFieldError(
-                f"unknown manifest field(s) {unknown!r}; " f"valid: {DEFAULT_MANIFEST_FIELDS}"
-            )
+        super().__init__(fields)
         if flush_every < 1:
             raise ValueError("flush_every must be >= 1")
-        self._fields = list(fields)
         self._flush_every = flush_every
         self._pending = 0
         self._closed = False
+        self._lock = threading.Lock()
         # Ensure parent dir exists (match output_dir semantics in base.py).
-        resolved = Path(path).expanduser()
-        resolved.parent.mkdir(parents=True, exist_ok=True)
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
         # Line-buffered append mode. buffering=1 = line buffered.
         # ``close()`` is the canonical way to release the handle; the
         # writer is also usable as a context manager.
         self._fp: IO[str] = open(  # noqa: SIM115 - managed via close()/__exit__
-            resolved, "a", encoding="utf-8", buffering=1
+            self.path, "a", encoding="utf-8", buffering=self._buffering
         )
 
-    @property
-    def fields(self) -> list[str]:
-        """The list of field names that will appear in each written line."""
-        return list(self._fields)
+    # Line buffering: every record reaches the OS as soon as it is
+    # written.
+    _buffering = 1
+
+    def _serialize(self, record: dict) -> str:
+        filtered = {k: record.get(k) for k in self._fields}
+        return json.dumps(filtered, ensure_ascii=False, separators=(",", ":")) + "\n"
 
     def append(self, record: dict) -> None:
         """Write one record as a JSON line. Filters to configured fields.
@@ -121,32 +242,175 @@ class ManifestWriter:
         is logged via :mod:`logging` and swallowed: manifest writes
         must never crash a search.
         """
-        if self._closed:
-            return
-        try:
-            filtered = {k: record.get(k) for k in self._fields}
-            line = json.dumps(filtered, ensure_ascii=False, separators=(",", ":"))
-            self._fp.write(line + "\n")
-            self._pending += 1
-            if self._pending >= self._flush_every:
-                self._fp.flush()
-                self._pending = 0
-        except Exception as exc:  # noqa: BLE001 - defensive
-            logger.warning("manifest write failed: %s", exc)
+        with self._lock:
+            if self._closed:
+                return
+            try:
+                self._fp.write(self._serialize(record))
+                self._pending += 1
+                if self._pending >= self._flush_every:
+                    self._fp.flush()
+                    self._pending = 0
+            except Exception as exc:  # noqa: BLE001 - defensive
+                logger.warning("manifest write failed: %s", exc)
 
     def close(self) -> None:
         """Flush and close the file. Idempotent."""
-        if self._closed:
-            return
+        with self._lock:
+            if self._closed:
+                return
+            self._close_file()
+            self._closed = True
+
+    def _close_file(self) -> None:
         try:
             self._fp.flush()
             self._fp.close()
         except Exception as exc:  # noqa: BLE001 - defensive
             logger.warning("manifest close failed: %s", exc)
-        self._closed = True
 
-    def __enter__(self) -> ManifestWriter:
-        return self
 
-    def __exit__(self, *exc: Any) -> None:
-        self.close()
+class BackgroundManifestWriter(ManifestWriter):
+    """:class:`ManifestWriter` that writes from a dedicated thread (v3.7.0+).
+
+    :meth:`append` only puts the record on a queue, so download
+    workers never wait on the file. The writer thread serialises
+    whatever has queued up and writes it with one call, then flushes.
+    When the queue runs dry it waits for more records, and writes the
+    batch once ``flush_every`` records have arrived or
+    ``flush_interval`` seconds have passed since the first one.
+    ``flush_every=1`` therefore writes each record promptly when the
+    run is quiet and still batches under load.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        Manifest file; appended to.
+    fields : list[str] | None
+        Fields written per record; see :class:`ManifestWriter`.
+    flush_every : int
+        Records after which a batch is written without waiting for
+        ``flush_interval``.
+    flush_interval : float
+        Longest time, in seconds, a record waits to be written.
+    fsync : bool
+        ``fsync`` the file after every batch, not only on
+        :meth:`checkpoint` and :meth:`close`.
+
+    Raises
+    ------
+    ManifestFieldError
+        If ``fields`` names an unknown field.
+    ValueError
+        If ``flush_every`` is less than 1 or ``flush_interval`` is
+        negative.
+    """
+
+    # The writer thread flushes explicitly after each batch.
+    _buffering = -1
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        fields: list[str] | None = None,
+        flush_every: int = 1,
+        flush_interval: float = DEFAULT_MANIFEST_FLUSH_INTERVAL,
+        fsync: bool = False,
+    ) -> None:
+        if flush_interval < 0:
+            raise ValueError("flush_interval must be >= 0")
+        super().__init__(path, fields=fields, flush_every=flush_every)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._queue: queue.SimpleQueue[object] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write_loop, name="bbid-manifest", daemon=True)
+        self._thread.start()
+
+    def append(self, record: dict) -> None:
+        """Queue one record for the writer thread. Never blocks on I/O."""
+        # Checked and queued under the lock, so nothing lands behind
+        # the close sentinel where the writer thread would never see it.
+        with self._lock:
+            if not self._closed:
+                self._queue.put(record)
+
+    def checkpoint(self) -> None:
+        """Block until every record appended so far is written and fsynced."""
+        done = threading.Event()
+        with self._lock:
+            if self._closed:
+                return
+            self._queue.put(done)
+        done.wait()
+
+    def close(self) -> None:
+        """Write the queued records, fsync if configured, and close. Idempotent."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_CLOSE)
+        self._thread.join()
+
+    # --- Writer thread ---
+
+    def _write_loop(self) -> None:
+        while True:
+            batch, marker = _next_batch(self._queue, self._flush_every, self.flush_interval)
+            self._write(batch, sync=self.fsync or marker is not None)
+            if isinstance(marker, threading.Event):
+                marker.set()
+            elif marker is _CLOSE:
+                self._close_file()
+                return
+
+    def _write(self, batch: list[dict], sync: bool) -> None:
+        lines = []
+        for record in batch:
+            try:
+                lines.append(self._serialize(record))
+            except Exception as exc:  # noqa: BLE001 - defensive
+                logger.warning("manifest write failed: %s", exc)
+        try:
+            if lines:
+                self._fp.write("".join(lines))
+            self._fp.flush()
+            if sync:
+                os.fsync(self._fp.fileno())
+        except Exception as exc:  # noqa: BLE001 - defensive
+            logger.warning("manifest write failed: %s", exc)
+
+
+def _next_batch(
+    items: queue.SimpleQueue[object], size: int, interval: float
+) -> tuple[list[Any], object]:
+    """Collect queued items until a batch is due; return them and any control item.
+
+    Blocks for the first item, then takes every item already queued.
+    While the queue is empty it waits for more, until ``size`` items
+    are collected or ``interval`` seconds have passed since the first.
+    A :data:`_CLOSE` sentinel or a :class:`threading.Event` ends the
+    batch early and is returned as the control item (else ``None``).
+    """
+    batch: list[Any] = []
+    item = items.get()
+    deadline = time.monotonic() + interval
+    while True:
+        if item is _CLOSE or isinstance(item, threading.Event):
+            return batch, item
+        batch.append(item)
+        if len(batch) >= _MAX_BATCH:
+            return batch, None
+        try:
+            # Items already queued cost nothing to include.
+            item = items.get_nowait()
+            continue
+        except queue.Empty:
+            pass
+        remaining = deadline - time.monotonic()
+        if len(batch) >= size or remaining <= 0:
+            return batch, None
+        try:
+            item = items.get(timeout=remaining)
+        except queue.Empty:
+            return batch, None
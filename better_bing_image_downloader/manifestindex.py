@@ -0,0 +1,315 @@
+"""Offset index over JSONL manifests (v3.7.0+).
+
+Answering "which URLs failed with NetworkError for query X?" or "was
+md5 Y saved anywhere?" used to mean parsing every line of every
+``manifest.jsonl``. A :class:`ManifestIndex` is a sidecar SQLite
+database holding, for each record, the manifest it is in, its byte
+offset, and the ``md5``, ``url``, ``status``, ``query`` and ``error``
+values, indexed for lookup. :meth:`ManifestIndex.find` selects the
+matching offsets and parses only those lines, each after a single
+``seek``.
+
+Manifests that are still being written are picked up incrementally.
+The index remembers how far into each file it has read, and
+:meth:`ManifestIndex.refresh` indexes only the complete lines added
+since then. A torn last line is left for the next refresh. A manifest
+that was truncated or replaced is indexed again from the start.
+
+``bbid manifest`` is the CLI form.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+__all__ = [
+    "MANIFEST_INDEX_FILENAME",
+    "ManifestIndex",
+    "ManifestMatch",
+    "find_manifests",
+]
+
+# File name ``bbid manifest`` uses by default, in the directory searched.
+MANIFEST_INDEX_FILENAME = ".bbid-manifest-index.sqlite"
+
+# Records inserted per transaction while indexing.
+_INSERT_BATCH = 10_000
+
+# Record fields the index can filter on.
+_KEYS = ("md5", "url", "status", "query", "error")
+
+
+class ManifestMatch(NamedTuple):
+    """One manifest record returned by :meth:`ManifestIndex.find`."""
+
+    manifest: Path
+    offset: int
+    record: dict
+
+
+def find_manifests(root: str | os.PathLike) -> list[Path]:
+    """Return the ``manifest.jsonl`` files under ``root``, or ``[root]`` for a file."""
+    root = Path(root)
+    if root.is_file():
+        return [root]
+    return sorted(root.rglob("manifest.jsonl"))
+
+
+class ManifestIndex:
+    """Thread-safe sidecar index over one or more JSONL manifests.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        SQLite database file; created (with its parent directories)
+        on first use.
+
+    Example
+    -------
+
+    >>> with ManifestIndex("dataset/.bbid-manifest-index.sqlite") as index:
+    ...     for manifest in find_manifests("dataset"):
+    ...         index.add(manifest)
+    ...     failed = [m.record["url"] for m in index.find(query="cats", error="NetworkError")]
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def __repr__(self) -> str:
+        return f"ManifestIndex({str(self.path)!r})"
+
+    def __enter__(self) -> ManifestIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of indexed records."""
+        with self._lock:
+            (count,) = self._connect().execute("SELECT COUNT(*) FROM records").fetchone()
+        return int(count)
+
+    @property
+    def manifests(self) -> list[Path]:
+        """The manifests added to the index."""
+        with self._lock:
+            rows = self._connect().execute("SELECT path FROM manifests ORDER BY id").fetchall()
+        return [Path(path) for (path,) in rows]
+
+    def add(self, manifest: str | os.PathLike) -> int:
+        """Start tracking ``manifest`` and index its new lines; return how many.
+
+        Adding a manifest that is already tracked just refreshes it.
+
+        Raises
+        ------
+        OSError
+            If the manifest can't be read.
+        """
+        path = Path(manifest).resolve()
+        path.stat()  # don't track a manifest we can't find
+        with self._lock:
+            conn = self._connect()
+            conn.execute("INSERT OR IGNORE INTO manifests (path) VALUES (?)", (str(path),))
+            conn.commit()
+            return self._catch_up(conn, path)
+
+    def refresh(self) -> int:
+        """Index the lines appended to every tracked manifest; return how many.
+
+        Manifests that no longer exist are skipped.
+        """
+        added = 0
+        for manifest in self.manifests:
+            with self._lock:
+                try:
+                    added += self._catch_up(self._connect(), manifest)
+                except FileNotFoundError:
+                    logging.warning("Manifest %s is gone; skipping", manifest)
+        return added
+
+    def find(
+        self,
+        md5: str | None = None,
+        url: str | None = None,
+        status: str | None = None,
+        query: str | None = None,
+        error: str | None = None,
+        limit: int | None = None,
+        refresh: bool = True,
+    ) -> Iterator[ManifestMatch]:
+        """Yield the records matching every given filter, in manifest order.
+
+        With ``refresh`` (the default), lines appended since the last
+        call are indexed first. Only the matching lines are read.
+        """
+        if refresh:
+            self.refresh()
+        clauses = []
+        params: list[object] = []
+        for column, value in zip(_KEYS, (md5, url, status, query, error)):
+            if value is not None:
+                clauses.append(f"r.{column} = ?")
+                params.append(value)
+        sql = "SELECT m.path, r.offset FROM records r JOIN manifests m ON m.id = r.manifest_id"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY r.manifest_id, r.offset"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        yield from _read_matches(rows)
+
+    def count(self, **filters: str) -> int:
+        """Return how many records match ``filters`` (see :meth:`find`), without reading them.
+
+        Raises
+        ------
+        TypeError
+            For a filter that is not an indexed field.
+        """
+        unknown = set(filters) - set(_KEYS)
+        if unknown:
+            raise TypeError(f"unknown filter(s) {sorted(unknown)}; valid: {list(_KEYS)}")
+        self.refresh()
+        sql = "SELECT COUNT(*) FROM records"
+        if filters:
+            sql += " WHERE " + " AND ".join(f"{column} = ?" for column in filters)
+        with self._lock:
+            (count,) = self._connect().execute(sql, list(filters.values())).fetchone()
+        return int(count)
+
+    def close(self) -> None:
+        """Close the database connection. Idempotent; the index reopens on next use."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --- Internals (called with ``_lock`` held) ---
+
+    def _catch_up(self, conn: sqlite3.Connection, manifest: Path) -> int:
+        manifest_id, inode, indexed_to = conn.execute(
+            "SELECT id, inode, indexed_to FROM manifests WHERE path = ?", (str(manifest),)
+        ).fetchone()
+        with open(manifest, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if inode != stat.st_ino or stat.st_size < indexed_to:
+                # Replaced or truncated: what we indexed is stale.
+                conn.execute("DELETE FROM records WHERE manifest_id = ?", (manifest_id,))
+                indexed_to = 0
+            f.seek(indexed_to)
+            added = 0
+            rows: list[tuple[object, ...]] = []
+            offset = indexed_to
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # still being written
+                rows.append((manifest_id, offset, *_keys(line)))
+                offset += len(line)
+                if len(rows) >= _INSERT_BATCH:
+                    added += self._insert(conn, manifest_id, stat.st_ino, offset, rows)
+                    rows = []
+            added += self._insert(conn, manifest_id, stat.st_ino, offset, rows)
+        return added
+
+    def _insert(
+        self,
+        conn: sqlite3.Connection,
+        manifest_id: int,
+        inode: int,
+        indexed_to: int,
+        rows: list[tuple[object, ...]],
+    ) -> int:
+        # Lines that aren't JSON objects are skipped, not indexed.
+        records = [row for row in rows if row[2:] != (None,) * len(_KEYS)]
+        with conn:
+            conn.executemany(
+                "INSERT INTO records (manifest_id, offset, md5, url, status, query, error) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                records,
+            )
+            conn.execute(
+                "UPDATE manifests SET inode = ?, indexed_to = ? WHERE id = ?",
+                (inode, indexed_to, manifest_id),
+            )
+        return len(records)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Shared by callers on several threads, serialised by ``_lock``.
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS manifests (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT NOT NULL UNIQUE,
+                    inode INTEGER,
+                    indexed_to INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS records (
+                    manifest_id INTEGER NOT NULL REFERENCES manifests (id),
+                    offset INTEGER NOT NULL,
+                    md5 TEXT,
+                    url TEXT,
+                    status TEXT,
+                    query TEXT,
+                    error TEXT,
+                    PRIMARY KEY (manifest_id, offset)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS records_md5 ON records (md5) WHERE md5 IS NOT NULL;
+                CREATE INDEX IF NOT EXISTS records_url ON records (url);
+                CREATE INDEX IF NOT EXISTS records_query ON records (query, status);
+                CREATE INDEX IF NOT EXISTS records_status ON records (status, error);
+                """)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+
+def _keys(line: bytes) -> tuple[object, ...]:
+    """Return the indexed field values of one manifest line, ``None`` where absent."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return (None,) * len(_KEYS)
+    if not isinstance(record, dict):
+        return (None,) * len(_KEYS)
+    return tuple(record.get(key) for key in _KEYS)
+
+
+def _read_matches(rows: list[tuple[str, int]]) -> Iterator[ManifestMatch]:
+    """Seek to each ``(path, offset)`` and parse the line there."""
+    current: Path | None = None
+    f = None
+    try:
+        for path_str, offset in rows:
+            path = Path(path_str)
+            if path != current:
+                if f is not None:
+                    f.close()
+                f = open(path, "rb")  # noqa: SIM115 - closed below
+                current = path
+            f.seek(offset)
+            try:
+                record = json.loads(f.readline())
+            except ValueError:
+                continue  # the file changed under the index
+            yield ManifestMatch(path, offset, record)
+    finally:
+        if f is not None:
+            f.close()
@@ -0,0 +1,185 @@
+"""On-disk cache of parsed search-results pages (v3.7.0+).
+
+Every run used to request the same results pages again, even when the
+same query ran minutes earlier, and re-running a batch of queries
+after a crash hit the search backends for every one of them. With a
+:class:`PageCache` attached, engines look each page up by a key
+naming the engine, the page URL, and the filters that shape the
+results (see ``_page_cache_key`` on :class:`~better_bing_image_downloader.bing.Bing`
+and :class:`~better_bing_image_downloader.duckduckgo.DuckDuckGo`),
+and only fetch the pages it doesn't hold.
+
+The cache stores the image URLs extracted from a page, not its HTML,
+so a hit skips both the request and the parse, and entries stay
+small. Entries older than ``ttl`` seconds are ignored and eventually
+deleted; once the cache grows past ``max_bytes`` the least recently
+used entries are evicted. Like
+:class:`~better_bing_image_downloader.seenurls.SeenURLStore` it is a
+single SQLite table in WAL mode, so several processes can share one
+cache directory.
+
+``Downloader(cache_dir=...)`` keeps one in ``<cache_dir>/pages.sqlite``
+and hands it to every engine it builds.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+__all__ = [
+    "DEFAULT_PAGE_CACHE_MAX_BYTES",
+    "DEFAULT_PAGE_CACHE_TTL",
+    "PAGE_CACHE_FILENAME",
+    "PageCache",
+]
+
+# File name ``Downloader`` uses inside its ``cache_dir``.
+PAGE_CACHE_FILENAME = "pages.sqlite"
+
+# Search results drift slowly; a day keeps a crashed batch re-runnable
+# without serving noticeably stale results.
+DEFAULT_PAGE_CACHE_TTL = 24 * 60 * 60.0
+
+# About 250,000 pages of 35 URLs.
+DEFAULT_PAGE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+class PageCache:
+    """Thread-safe on-disk map from page keys to extracted image URLs.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        SQLite database file; created (with its parent directories)
+        on first use.
+    ttl : float
+        Seconds an entry stays valid.
+    max_bytes : int
+        Size of the stored URL lists above which the least recently
+        used entries are evicted.
+    clock : Callable[[], float]
+        Wall-clock time source, replaceable for tests.
+
+    Raises
+    ------
+    ValueError
+        If ``ttl`` or ``max_bytes`` is not positive.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        ttl: float = DEFAULT_PAGE_CACHE_TTL,
+        max_bytes: int = DEFAULT_PAGE_CACHE_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if ttl <= 0:
+            raise ValueError(f"ttl must be > 0, got {ttl}")
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be > 0, got {max_bytes}")
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def __repr__(self) -> str:
+        return f"PageCache({str(self.path)!r}, ttl={self.ttl})"
+
+    def __enter__(self) -> PageCache:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of entries, expired ones included until they are evicted."""
+        with self._lock:
+            (count,) = self._connect().execute("SELECT COUNT(*) FROM pages").fetchone()
+        return int(count)
+
+    def get(self, key: str) -> list[str] | None:
+        """Return the URLs stored under ``key``, or ``None`` if missing or expired."""
+        now = self.clock()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT links FROM pages WHERE key = ? AND created > ?", (key, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE pages SET accessed = ? WHERE key = ?", (now, key))
+            conn.commit()
+        links: list[str] = json.loads(row[0])
+        return links
+
+    def put(self, key: str, links: list[str]) -> None:
+        """Store ``links`` under ``key``, evicting old entries if over ``max_bytes``."""
+        data = json.dumps(links, separators=(",", ":"))
+        size = len(key) + len(data)
+        now = self.clock()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO pages (key, links, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, data, size, now, now),
+            )
+            self._evict(conn, now)
+            conn.commit()
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM pages")
+            conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection. Idempotent; the cache reopens on next use."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --- Internals (called with ``_lock`` held) ---
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()
+        if total <= self.max_bytes:
+            return
+        conn.execute("DELETE FROM pages WHERE created <= ?", (now - self.ttl,))
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM pages ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM pages WHERE key = ?", stale)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Used from many engine threads, serialised by ``_lock``.
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages (key TEXT PRIMARY KEY, links TEXT NOT NULL, "
+                "size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL) "
+                "WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
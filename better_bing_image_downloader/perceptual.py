@@ -0,0 +1,261 @@
+"""Perceptual-hash near-duplicate filtering (v3.7.0+).
+
+MD5 deduplication only catches byte-identical files, but search results
+are full of the same picture re-encoded at another size or quality.
+With a :class:`NearDuplicateIndex` attached, an engine computes a
+64-bit difference hash (dHash) of every image that passed validation
+and skips it with
+:class:`~better_bing_image_downloader.base.NearDuplicateImage` if an
+image already saved has a hash within ``near_duplicate_distance`` bits
+of it.
+
+- The hash is taken from a small grayscale decode: for JPEG,
+  ``Image.draft`` lets the decoder downscale in the DCT domain, so a
+  large photo is never decoded at full size. Decoding runs on the
+  index's ``executor``: ``Downloader`` passes a process pool so it
+  doesn't hold the GIL while the download threads are working.
+- Lookups go through a :class:`BKTree`, which only visits the subtrees
+  that can hold a hash within the distance, instead of comparing
+  against every saved image.
+- Hashes are kept in an append-only file next to the images (an 8-byte
+  header, then 8 bytes per image), so later runs skip near-duplicates
+  of earlier ones as well.
+
+Decoding needs Pillow, an optional dependency:
+``pip install 'better-bing-image-downloader[perceptual]'``.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Executor, Future
+from pathlib import Path
+
+from .hashindex import _open_for_append, _read_records
+
+try:
+    from PIL import Image
+
+    _HAS_PIL = True
+except ImportError:  # pragma: no cover
+    Image = None  # type: ignore[assignment]
+    _HAS_PIL = False
+
+__all__ = [
+    "BKTree",
+    "DEFAULT_NEAR_DUPLICATE_DISTANCE",
+    "NEAR_DUPLICATE_INDEX_FILENAME",
+    "NearDuplicateIndex",
+    "dhash",
+    "hamming",
+]
+
+# Default Hamming distance (out of 64 bits) at or below which two
+# images count as the same picture. Resized and re-compressed copies
+# typically land within a few bits; unrelated images around 32.
+DEFAULT_NEAR_DUPLICATE_DISTANCE = 6
+
+# File name of the index ``Downloader`` keeps in each query directory.
+NEAR_DUPLICATE_INDEX_FILENAME = ".bbid-phashes"
+
+_MAGIC = b"BBIDPHS\x01"
+_HASH_BYTES = 8
+
+# dHash compares horizontally adjacent pixels of a (SIZE+1) x SIZE
+# thumbnail, giving SIZE * SIZE bits.
+_DHASH_SIZE = 8
+
+_PIL_MISSING_MSG = (
+    "Near-duplicate filtering requires the 'Pillow' package to decode "
+    "images. Install it with `pip install Pillow` (or "
+    "`pip install 'better-bing-image-downloader[perceptual]'`)."
+)
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+def dhash(path: str | os.PathLike) -> int:
+    """Return the 64-bit difference hash of the image file at ``path``.
+
+    A module-level function so it can run in a process pool.
+
+    Raises
+    ------
+    ImportError
+        If Pillow is not installed.
+    OSError
+        If Pillow cannot decode the file.
+    """
+    if not _HAS_PIL:
+        raise ImportError(_PIL_MISSING_MSG)
+    with Image.open(path) as im:
+        # A no-op for formats other than JPEG.
+        im.draft("L", (8 * _DHASH_SIZE, 8 * _DHASH_SIZE))
+        small = im.convert("L").resize((_DHASH_SIZE + 1, _DHASH_SIZE), Image.Resampling.BILINEAR)
+        pixels = small.tobytes()
+    value = 0
+    for row in range(_DHASH_SIZE):
+        start = row * (_DHASH_SIZE + 1)
+        for col in range(start, start + _DHASH_SIZE):
+            value = value << 1 | (pixels[col] > pixels[col + 1])
+    return value
+
+
+class BKTree:
+    """Burkhard-Keller tree of hashes under the Hamming distance.
+
+    Each child edge is labelled with its distance to the parent, so a
+    search for hashes within ``d`` of a query at distance ``k`` from a
+    node only descends into edges labelled ``k - d`` to ``k + d``.
+    Not thread-safe; :class:`NearDuplicateIndex` locks around it.
+    """
+
+    def __init__(self) -> None:
+        # Node: (hash, {edge distance: child node}).
+        self._root: tuple[int, dict] | None = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value: int) -> None:
+        """Insert ``value`` (a hash already in the tree is not added twice)."""
+        if self._root is None:
+            self._root = (value, {})
+            self._size = 1
+            return
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (value, {})
+                self._size += 1
+                return
+            node = child
+
+    def nearest(self, value: int, max_distance: int) -> int | None:
+        """Smallest distance from ``value`` to a hash in the tree, if ``<= max_distance``."""
+        best: int | None = None
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node_value, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= max_distance and (best is None or distance < best):
+                best = distance
+                if best == 0:
+                    break
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for edge, child in children.items() if low <= edge <= high)
+        return best
+
+
+class NearDuplicateIndex:
+    """Thread-safe, optionally persistent set of perceptual hashes.
+
+    Saving an image goes through :meth:`claim` (``None`` means no
+    near-duplicate is known and the hash is now reserved), then
+    :meth:`commit` once the file is in place or :meth:`release` if
+    writing it failed; the same protocol as
+    :class:`~better_bing_image_downloader.hashindex.HashIndex`.
+
+    Parameters
+    ----------
+    path : str | os.PathLike | None
+        Index file, loaded on first use and appended to by
+        :meth:`commit`. ``None`` keeps the index in memory only.
+    executor : Executor | None
+        Where :meth:`submit` decodes images, typically a process pool.
+        ``None`` decodes in the calling thread.
+
+    Raises
+    ------
+    ImportError
+        If Pillow is not installed.
+    """
+
+    def __init__(
+        self, path: str | os.PathLike | None = None, executor: Executor | None = None
+    ) -> None:
+        if not _HAS_PIL:
+            raise ImportError(_PIL_MISSING_MSG)
+        self.path = Path(path) if path is not None else None
+        self.executor = executor
+        self._lock = threading.Lock()
+        self._stored: BKTree | None = None  # hashes loaded from ``path``
+        self._added = BKTree()  # hashes committed through this object
+        self._claimed: list[int] = []
+        self._file = None
+
+    def __repr__(self) -> str:
+        path = str(self.path) if self.path is not None else None
+        return f"NearDuplicateIndex({path!r})"
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load()) + len(self._added)
+
+    def submit(self, image_path: str | os.PathLike) -> Future:
+        """Compute :func:`dhash` of ``image_path`` on the executor."""
+        if self.executor is not None:
+            return self.executor.submit(dhash, os.fspath(image_path))
+        future: Future = Future()
+        try:
+            future.set_result(dhash(image_path))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def claim(self, value: int, max_distance: int, include_stored: bool = True) -> int | None:
+        """Reserve ``value`` unless a known hash is within ``max_distance`` of it.
+
+        Returns the distance to the closest such hash (nothing is
+        reserved then), or ``None``. Hashes from the file are ignored
+        when ``include_stored`` is false (``force_replace`` runs).
+        """
+        with self._lock:
+            trees = [self._added, self._load()] if include_stored else [self._added]
+            matches = [d for d in (t.nearest(value, max_distance) for t in trees) if d is not None]
+            matches += [d for d in (hamming(value, c) for c in self._claimed) if d <= max_distance]
+            if matches:
+                return min(matches)
+            self._claimed.append(value)
+            return None
+
+    def release(self, value: int) -> None:
+        """Drop a :meth:`claim` whose image was not saved after all."""
+        with self._lock:
+            self._claimed.remove(value)
+
+    def commit(self, value: int) -> None:
+        """Record a claimed hash as saved, appending it to the file."""
+        with self._lock:
+            self._claimed.remove(value)
+            self._added.add(value)
+            if self.path is None:
+                return
+            if self._file is None:
+                self._file = _open_for_append(self.path, _MAGIC, _HASH_BYTES)
+            self._file.write(value.to_bytes(_HASH_BYTES, "big"))
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the append handle. Idempotent; the index stays usable."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _load(self) -> BKTree:
+        if self._stored is None:
+            self._stored = BKTree()
+            if self.path is not None:
+                for record in _read_records(self.path, _MAGIC, _HASH_BYTES):
+                    self._stored.add(int.from_bytes(record, "big"))
+        return self._stored
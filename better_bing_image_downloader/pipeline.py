@@ -0,0 +1,346 @@
+"""Producer/consumer download pipeline used by the built-in engines (v3.7.0+).
+
+Before 3.7.0, ``Bing.run`` and ``DuckDuckGo.run`` fetched one results
+page, downloaded every image on it, and only then fetched the next page,
+so the slowest image on each page stalled the whole run. The
+:class:`DownloadPipeline` removes that per-page barrier:
+
+- a page-fetcher thread pulls link lists from the engine's page
+  generator and feeds them into a queue. Queued plus in-flight links
+  are capped at what the run can still save, a few per worker, and
+  ``queue_size`` (see ``ImageEngine._read_ahead``), so a small
+  ``limit`` never fetches pages it will not use;
+- the calling thread dispatches the queued links, submitting one task
+  per link to the engine's executor with at most ``max_workers`` in
+  flight. Each task calls the engine's ``download_image`` once and
+  returns its thread to the pool, so on the shared ``executor`` (the
+  ``Downloader`` pool) concurrent searches interleave their downloads
+  instead of one search parking its workers on every thread. The
+  queue is a :class:`~better_bing_image_downloader.hosts.HostQueue`,
+  so links are taken round-robin across hosts and never exceed the
+  engine's per-host limits. With a ``download_share``, the dispatcher
+  takes the share's slot *before* submitting (``submit_download``), so the scheduler decides
+  which search's download gets the next free pool thread;
+- both sides stop as soon as ``limit`` images are saved, the cancel
+  token fires, or the pages run out.
+
+Image indices keep the same meaning as before: they start at
+``download_count + 1`` and an index whose download failed is handed to
+the next candidate, so saved files stay densely numbered.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+from concurrent.futures import Executor, Future
+from typing import TYPE_CHECKING, Callable, Iterable, TypeVar
+
+from .hosts import HostQueue
+
+if TYPE_CHECKING:
+    from .base import ImageEngine
+    from .scheduler import DownloadShare
+
+__all__ = ["DownloadPipeline", "IndexAllocator", "submit_download"]
+
+_T = TypeVar("_T")
+
+# Marks a pool thread running a download whose ``download_share`` slot
+# the dispatcher already holds (see ``holds_dispatched_slot``).
+_dispatched = threading.local()
+
+# How often the blocked dispatcher and the page fetcher wake up to re-check
+# the stop conditions (cancel token, limit reached, other side
+# finished) and whether a throttled host has become ready.
+_POLL_INTERVAL = 0.05  # seconds
+
+
+def holds_dispatched_slot() -> bool:
+    """Whether the current thread runs a download submitted by :func:`submit_download`.
+
+    ``ImageEngine._download_slot`` checks this so such a download does
+    not take a second slot from its share.
+    """
+    return getattr(_dispatched, "held", False)
+
+
+def submit_download(
+    executor: Executor, share: DownloadShare | None, fn: Callable[..., _T], *args: object
+) -> Future[_T]:
+    """Submit a download to ``executor`` once ``share`` grants it a slot.
+
+    The slot is taken on the calling thread, so downloads queue in the
+    scheduler's weighted order instead of parking pool threads, and is
+    released when ``fn`` returns.
+    """
+    if share is None:
+        return executor.submit(fn, *args)
+    share.acquire()
+
+    def task() -> _T:
+        _dispatched.held = True
+        try:
+            return fn(*args)
+        finally:
+            _dispatched.held = False
+            share.release()
+
+    try:
+        return executor.submit(task)
+    except BaseException:
+        share.release()
+        raise
+
+
+class IndexAllocator:
+    """Hand out image indices to concurrent downloads and track failures.
+
+    Indices start at ``start``. A download that fails gives its index
+    back, and the smallest returned index is reused first, so saved
+    files stay densely numbered however downloads interleave.
+    Thread-safe; shared by :class:`DownloadPipeline` and the asyncio
+    engines.
+
+    Parameters
+    ----------
+    start : int
+        First index to hand out.
+    max_consecutive_failures : int
+        :meth:`settle` reports ``True`` once this many downloads in a
+        row have failed.
+    """
+
+    def __init__(self, start: int, max_consecutive_failures: int) -> None:
+        self._lock = threading.Lock()
+        self._next = start
+        self._free: list[int] = []
+        self._failures_in_row = 0
+        self._max_consecutive_failures = max_consecutive_failures
+
+    def claim(self) -> int:
+        """Return the index for the next download."""
+        with self._lock:
+            if self._free:
+                return heapq.heappop(self._free)
+            index = self._next
+            self._next += 1
+            return index
+
+    def settle(self, index: int, outcome: int | None) -> bool:
+        """Record a finished download; return ``True`` if the run should stop.
+
+        ``None`` means the save failed: the index goes back to the pool
+        for the next candidate. ``0`` (resume skip) and a positive index
+        both mean the index is now taken.
+        """
+        with self._lock:
+            if outcome is not None:
+                self._failures_in_row = 0
+                return False
+            heapq.heappush(self._free, index)
+            self._failures_in_row += 1
+            if self._failures_in_row < self._max_consecutive_failures:
+                return False
+        logging.warning(
+            "No images could be downloaded from the last %d candidates; stopping",
+            self._max_consecutive_failures,
+        )
+        return True
+
+
+class DownloadPipeline:
+    """Overlap page fetching with image downloads for one engine run.
+
+    Parameters
+    ----------
+    engine : ImageEngine
+        The engine whose ``download_image``, counters, ``limit``, and
+        cancel token drive the run.
+    pages : Iterable[list[str]]
+        Lazily-fetched pages of new (already filtered) image links. It
+        is consumed on the page-fetcher thread, so any retries or
+        backoff sleeps inside it never block the download workers.
+        When a page is yielded, ``engine.last_page_url`` must be the
+        URL it came from; it is recorded as the links' source page.
+    queue_size : int
+        Maximum number of links fetched ahead of the downloads. The
+        fetcher also stops reading ahead once queued plus in-flight
+        links cover what the run can still save.
+    max_consecutive_failures : int
+        Stop once this many downloads in a row have failed, the
+        pipelined equivalent of the old "no images could be
+        downloaded from this page" guard.
+    """
+
+    def __init__(
+        self,
+        engine: ImageEngine,
+        pages: Iterable[list[str]],
+        queue_size: int,
+        max_consecutive_failures: int,
+    ) -> None:
+        self.engine = engine
+        self._pages = pages
+        self._queue = HostQueue(engine.hosts)
+        self._queue_size = max(1, queue_size)
+        self._pages_done = False
+        self._stop = threading.Event()
+        # Guards ``_in_flight`` and ``_pages_done``; notified whenever a
+        # link is queued or a download task finishes.
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._indices = IndexAllocator(engine.download_count + 1, max_consecutive_failures)
+        self._producer_error: BaseException | None = None
+        self._task_error: BaseException | None = None
+
+    # --- Entry point ---
+
+    def run(self) -> None:
+        """Run until the limit is reached, the pages run out, or cancellation.
+
+        Re-raises any unexpected exception from the page generator or a
+        download task once in-flight downloads have finished.
+        """
+        producer = threading.Thread(target=self._produce, name="bbid-page-fetcher", daemon=True)
+        producer.start()
+        try:
+            with self.engine._download_executor() as executor:
+                self._dispatch(executor)
+        except BaseException:
+            self._stop.set()
+            raise
+        finally:
+            # On a normal finish, tasks still waiting for a pool thread
+            # must run: setting ``_stop`` first would make them skip
+            # their links.
+            with self._cond:
+                while self._in_flight:
+                    self._cond.wait(_POLL_INTERVAL)
+            self._stop.set()
+            producer.join()
+        if self._producer_error is not None:
+            raise self._producer_error
+        if self._task_error is not None:
+            raise self._task_error
+
+    # --- Stop conditions ---
+
+    def _finished(self) -> bool:
+        engine = self.engine
+        if self._stop.is_set():
+            return True
+        if engine.is_cancelled() or engine._slots_used >= engine.limit:
+            self._stop.set()
+            return True
+        return False
+
+    # --- Page-fetcher side ---
+
+    def _produce(self) -> None:
+        try:
+            for links in self._pages:
+                page_url = self.engine.last_page_url
+                for link in links:
+                    self.engine._record_source_page(link, page_url)
+                    if not self._put(link):
+                        return
+                if self._finished():
+                    return
+        except BaseException as exc:  # re-raised from run()
+            self._producer_error = exc
+            self._stop.set()
+        finally:
+            with self._cond:
+                self._pages_done = True
+                self._cond.notify_all()
+
+    def _put(self, link: str) -> bool:
+        """Block until ``link`` is queued; ``False`` if the run stopped first."""
+        with self._cond:
+            while len(self._queue) + self._in_flight >= min(
+                self._queue_size, self.engine._read_ahead()
+            ):
+                if self._finished():
+                    return False
+                self._cond.wait(_POLL_INTERVAL)
+            if self._finished():
+                return False
+            self._queue.put(link)
+            self._cond.notify_all()
+            return True
+
+    # --- Dispatch side ---
+
+    def _dispatch(self, executor: Executor) -> None:
+        """Submit one download task per queued link until the run stops."""
+        engine = self.engine
+        while True:
+            with self._cond:
+                # Don't start more downloads than could still be
+                # needed: with ``_in_flight`` downloads pending, at most
+                # ``limit - _slots_used`` of them can count. Also stay
+                # within ``max_workers`` (in adaptive mode, the
+                # engine's current concurrency limit).
+                while (
+                    not self._finished()
+                    and self._in_flight > 0
+                    and (
+                        engine._slots_used + self._in_flight >= engine.limit
+                        or self._in_flight >= engine._concurrency_limit()
+                    )
+                ):
+                    self._cond.wait(_POLL_INTERVAL)
+            if engine._dispatch_gate is not None:
+                engine._dispatch_gate()
+            taken = self._next_link()
+            if taken is None:
+                return
+            link, host = taken
+            with self._cond:
+                self._in_flight += 1
+            try:
+                submit_download(executor, engine.download_share, self._download, link, host)
+            except BaseException:
+                self._done(host)
+                raise
+
+    def _download(self, link: str, host: str) -> None:
+        """Pool task: download one link, then give the thread back."""
+        engine = self.engine
+        try:
+            if self._finished():
+                return
+            index = self._indices.claim()
+            outcome = None
+            try:
+                outcome = engine.download_image(link, index)
+            except Exception as e:
+                logging.error("Error processing download: %s", e)
+            if self._indices.settle(index, outcome):
+                self._stop.set()
+        except BaseException as exc:  # re-raised from run()
+            self._task_error = exc
+            self._stop.set()
+        finally:
+            self._done(host)
+
+    def _done(self, host: str) -> None:
+        self.engine.hosts.end(host)
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def _next_link(self) -> tuple[str, str] | None:
+        """Block until a link's host is ready; ``None`` once there is nothing left."""
+        with self._cond:
+            while not self._finished():
+                taken = self._queue.pop()
+                if isinstance(taken, tuple):
+                    self._cond.notify_all()  # the page fetcher may read ahead again
+                    return taken
+                if self._pages_done and not len(self._queue):
+                    return None
+                self._cond.wait(min(taken, _POLL_INTERVAL))
+            return None
@@ -1,7 +1,9 @@
 """Public result types for the embeddable API (v3.2.0+).
 
 ``ImageResult`` is the value object returned for each successful image
-download; ``Result`` aggregates a complete search run.
+download; ``Result`` aggregates a complete search run. ``SkippedImage``
+and ``FailedImage`` (v3.7.0+) are the other events yielded by
+:meth:`Downloader.iter_search`.
 
 These are plain ``dataclass``-style classes (built on
 ``typing.NamedTuple`` for Python 3.8+ compatibility) so they are:
@@ -18,7 +20,8 @@ from pathlib import Path
 from typing import TYPE_CHECKING, NamedTuple
 
 if TYPE_CHECKING:
-    from .base import ImageEngine
+    from .adaptive import LimitChange
+    from .base import ImageEngine, ImageSkipped
 
 
 class ImageResult(NamedTuple):
@@ -55,6 +58,37 @@ class ImageResult(NamedTuple):
     mime_type: str
 
 
+class SkippedImage(NamedTuple):
+    """An image a filter rejected during a streamed search (v3.7.0+).
+
+    Attributes
+    ----------
+    url : str
+        The image URL.
+    reason : ImageSkipped
+        Why it was skipped (e.g. :class:`BelowMinDimension`).
+    """
+
+    url: str
+    reason: ImageSkipped
+
+
+class FailedImage(NamedTuple):
+    """An image that could not be saved during a streamed search (v3.7.0+).
+
+    Attributes
+    ----------
+    url : str
+        The image URL.
+    error : BaseException
+        What went wrong; the same exception :attr:`Result.errors`
+        would hold.
+    """
+
+    url: str
+    error: BaseException
+
+
 class Result:
     """Aggregated outcome of a :meth:`Downloader.search` call.
 
@@ -96,6 +130,12 @@ class Result:
         record per attempted download (success or failure), with
         status, URL, file path, MD5, error class, and provenance
         metadata. Useful for ML dataset preparation pipelines.
+    concurrency_limit : int | None
+        The engine's concurrency limit when the run ended, for runs
+        with ``adaptive=True`` (v3.7.0+); ``None`` otherwise.
+    concurrency_history : list[LimitChange]
+        Every change of the adaptive limit, starting with its initial
+        value; empty for non-adaptive runs.
     """
 
     __slots__ = (
@@ -108,6 +148,8 @@ class Result:
         "no_results_found",
         "cancelled",
         "manifest_path",
+        "concurrency_limit",
+        "concurrency_history",
         "_engine",
     )
     _engine: ImageEngine | None  # type annotation for mypy
@@ -123,6 +165,8 @@ class Result:
         no_results_found: bool = False,
         cancelled: bool = False,
         manifest_path: str | None = None,
+        concurrency_limit: int | None = None,
+        concurrency_history: list[LimitChange] | None = None,
     ) -> None:
         self.query = query
         self.engine = engine
@@ -140,6 +184,12 @@ class Result:
         # manifest file written by ``Downloader.search(manifest=True)``,
         # or ``None`` if no manifest was requested.
         self.manifest_path = manifest_path
+        # ``concurrency_limit`` / ``concurrency_history`` (v3.7.0+) are
+        # filled in for adaptive runs from the engine's ``limiter``.
+        self.concurrency_limit = concurrency_limit
+        self.concurrency_history: list[LimitChange] = (
+            list(concurrency_history) if concurrency_history else []
+        )
         # ``_engine`` is set by ``Downloader.search()`` to expose the
         # underlying engine instance for advanced users. Always present
         # in real ``Downloader``-produced Results; ``None`` when a
@@ -0,0 +1,317 @@
+"""Global download-slot budget shared by concurrent searches (v3.7.0+).
+
+Each search sizes its own concurrency (``max_workers`` threads, or
+``concurrency`` coroutines on the asyncio path), so twenty simultaneous
+``search_async`` calls used to open hundreds of sockets with nothing
+coordinating them. A :class:`DownloadScheduler` caps how many image
+downloads may be in flight across *all* searches of a
+:class:`~better_bing_image_downloader.downloader.Downloader`, and
+shares that budget fairly between the searches that want it:
+
+- every search registers a :class:`DownloadShare` with a ``weight``;
+- an engine holds a slot from its share only while an image body is
+  being fetched (see ``ImageEngine._download_slot``);
+- while there are free slots, any share gets one immediately. Once the
+  budget is exhausted, each freed slot goes to the waiting share with
+  the lowest ``(in_use + 1) / weight``, so under contention searches
+  converge on slot counts proportional to their weights (a weight-2
+  search gets twice the downloads of a weight-1 search). Ties go to the
+  longest waiter.
+
+Threaded searches also have to share the ``Downloader``'s worker pool,
+which is usually smaller than the budget. Shares registered with
+``threaded=True`` additionally count against ``max_threaded`` (the
+``Downloader`` sets it to the pool size), and pipelined runs take
+their slot *before* handing a download to the pool (see
+``DownloadPipeline``), so the pool's threads go out in the same
+weighted order instead of first-come-first-served.
+
+Shares can be waited on from threads (:meth:`DownloadShare.acquire`)
+and from any event loop (:meth:`DownloadShare.acquire_async`), so the
+threaded and the asyncio engines draw from the same budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import itertools
+import threading
+from typing import AsyncIterator, Callable, Iterator, NamedTuple
+
+__all__ = [
+    "DEFAULT_MAX_CONCURRENT_DOWNLOADS",
+    "DownloadScheduler",
+    "DownloadShare",
+    "SchedulerStats",
+]
+
+# Default global budget for ``Downloader``: two searches at the async
+# default concurrency (32), or four threaded searches at the
+# ``max_workers`` clamp (16).
+DEFAULT_MAX_CONCURRENT_DOWNLOADS = 64
+
+
+class SchedulerStats(NamedTuple):
+    """Snapshot of a :class:`DownloadScheduler`.
+
+    Attributes
+    ----------
+    max_concurrent : int
+        The global slot budget.
+    in_use : int
+        Slots currently held across all shares.
+    waiting : int
+        Downloads blocked waiting for a slot.
+    shares : int
+        Registered (not yet closed) shares, i.e. active searches.
+    """
+
+    max_concurrent: int
+    in_use: int
+    waiting: int
+    shares: int
+
+
+class _Waiter:
+    """One blocked :meth:`DownloadShare.acquire` call."""
+
+    __slots__ = ("seq", "wake", "granted")
+
+    def __init__(self, seq: int, wake: Callable[[], None]) -> None:
+        self.seq = seq
+        self.wake = wake
+        self.granted = False
+
+
+class DownloadScheduler:
+    """Thread-safe global budget of concurrent download slots.
+
+    Parameters
+    ----------
+    max_concurrent : int
+        Maximum number of downloads in flight across all shares.
+    max_threaded : int | None
+        Maximum number of those held by threaded shares, normally the
+        size of the worker pool they run on. ``None`` means only
+        ``max_concurrent`` applies.
+
+    Raises
+    ------
+    ValueError
+        If ``max_concurrent`` or ``max_threaded`` is smaller than 1.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_DOWNLOADS,
+        max_threaded: int | None = None,
+    ) -> None:
+        if max_concurrent < 1:
+            raise ValueError(f"max_concurrent must be >= 1, got {max_concurrent}")
+        if max_threaded is not None and max_threaded < 1:
+            raise ValueError(f"max_threaded must be >= 1, got {max_threaded}")
+        self.max_concurrent = max_concurrent
+        self.max_threaded = max_threaded
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._threaded_in_use = 0
+        self._shares: list[DownloadShare] = []
+        self._seq = itertools.count()
+
+    def share(self, weight: float = 1.0, name: str = "", threaded: bool = False) -> DownloadShare:
+        """Register a new share of the budget, normally one per search.
+
+        ``threaded`` shares also count against ``max_threaded``.
+
+        Raises
+        ------
+        ValueError
+            If ``weight`` is not positive.
+        """
+        if not weight > 0:
+            raise ValueError(f"weight must be > 0, got {weight}")
+        share = DownloadShare(self, weight, name, threaded)
+        with self._lock:
+            self._shares.append(share)
+        return share
+
+    def stats(self) -> SchedulerStats:
+        """Return a snapshot of slot usage."""
+        with self._lock:
+            return SchedulerStats(
+                max_concurrent=self.max_concurrent,
+                in_use=self._in_use,
+                waiting=sum(len(s._waiters) for s in self._shares),
+                shares=len(self._shares),
+            )
+
+    # --- Internals (called by DownloadShare) ---
+
+    def _enqueue(self, share: DownloadShare, wake: Callable[[], None]) -> _Waiter | None:
+        """Take a slot for ``share`` now, or queue a waiter woken by ``wake``.
+
+        Returns ``None`` when the slot was granted immediately.
+        """
+        with self._lock:
+            # Waiters only exist while the budget they draw from is
+            # exhausted (every release hands its slot straight to
+            # one), so a free slot can be taken without jumping the
+            # queue.
+            if self._has_room(share):
+                self._take(share)
+                return None
+            waiter = _Waiter(next(self._seq), wake)
+            share._waiters.append(waiter)
+            return waiter
+
+    def _abandon(self, share: DownloadShare, waiter: _Waiter) -> bool:
+        """Withdraw a waiter; ``True`` if it had already been granted a slot."""
+        with self._lock:
+            if waiter.granted:
+                return True
+            share._waiters.remove(waiter)
+            return False
+
+    def _release(self, share: DownloadShare) -> None:
+        with self._lock:
+            share._in_use -= 1
+            self._in_use -= 1
+            if share.threaded:
+                self._threaded_in_use -= 1
+            self._grant_waiters()
+
+    def _unregister(self, share: DownloadShare) -> None:
+        with self._lock:
+            if share in self._shares:
+                self._shares.remove(share)
+
+    def _has_room(self, share: DownloadShare) -> bool:
+        # Caller holds ``self._lock``.
+        if self._in_use >= self.max_concurrent:
+            return False
+        return (
+            not share.threaded
+            or self.max_threaded is None
+            or self._threaded_in_use < self.max_threaded
+        )
+
+    def _take(self, share: DownloadShare) -> None:
+        share._in_use += 1
+        self._in_use += 1
+        if share.threaded:
+            self._threaded_in_use += 1
+
+    def _grant_waiters(self) -> None:
+        # Caller holds ``self._lock``.
+        while True:
+            waiting = [s for s in self._shares if s._waiters and self._has_room(s)]
+            if not waiting:
+                return
+            share = min(waiting, key=lambda s: ((s._in_use + 1) / s.weight, s._waiters[0].seq))
+            waiter = share._waiters.popleft()
+            waiter.granted = True
+            self._take(share)
+            waiter.wake()
+
+
+class DownloadShare:
+    """One search's claim on a :class:`DownloadScheduler` budget.
+
+    Created by :meth:`DownloadScheduler.share`. Engines call
+    :meth:`slot` / :meth:`slot_async` around each download; ``close``
+    removes the share once the search is over.
+
+    Attributes
+    ----------
+    weight : float
+        Relative share of the budget under contention.
+    name : str
+        Free-form label (``Downloader`` uses the query).
+    threaded : bool
+        Whether this share's downloads run on a worker pool and count
+        against the scheduler's ``max_threaded``.
+    """
+
+    def __init__(
+        self, scheduler: DownloadScheduler, weight: float, name: str, threaded: bool = False
+    ) -> None:
+        self.scheduler = scheduler
+        self.weight = weight
+        self.name = name
+        self.threaded = threaded
+        self._in_use = 0
+        self._waiters: collections.deque[_Waiter] = collections.deque()
+
+    @property
+    def in_use(self) -> int:
+        """Slots this share currently holds."""
+        return self._in_use
+
+    def acquire(self) -> None:
+        """Block the calling thread until a slot is granted."""
+        event = threading.Event()
+        waiter = self.scheduler._enqueue(self, event.set)
+        if waiter is not None:
+            event.wait()
+
+    async def acquire_async(self) -> None:
+        """Wait on the running event loop until a slot is granted."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(_resolve, future)
+
+        waiter = self.scheduler._enqueue(self, wake)
+        if waiter is None:
+            return
+        try:
+            await future
+        except BaseException:
+            # Cancelled while waiting: give back a slot that was granted
+            # in the meantime, or just leave the queue.
+            if self.scheduler._abandon(self, waiter):
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Return a slot taken with :meth:`acquire` or :meth:`acquire_async`."""
+        self.scheduler._release(self)
+
+    @contextlib.contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one slot for the duration of the ``with`` block."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    @contextlib.asynccontextmanager
+    async def slot_async(self) -> AsyncIterator[None]:
+        """Async :meth:`slot`."""
+        await self.acquire_async()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """Unregister from the scheduler. Slots still held are returned as usual."""
+        self.scheduler._unregister(self)
+
+    def __enter__(self) -> DownloadShare:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"DownloadShare(name={self.name!r}, weight={self.weight}, in_use={self._in_use})"
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
@@ -0,0 +1,103 @@
+"""Persistent store of image URLs already fetched (v3.7.0+).
+
+``ImageEngine.seen`` only remembers links for one run, so overlapping
+queries into the same output tree (``cat``, ``cats``, ``kitten``, ...)
+download many of the same images again. A :class:`SeenURLStore`
+remembers the canonical key (see :mod:`~better_bing_image_downloader.urls`)
+of every link an engine fetched to a definite outcome: saved, or
+rejected as a duplicate, invalid, or filtered image. Links that failed
+with a network error are not recorded, so a later run retries them.
+
+Engines drop stored links from each results page before any of them
+is requested. The store is a single SQLite table in WAL mode, so
+several processes can share one file.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable
+
+__all__ = ["SEEN_URLS_FILENAME", "SeenURLStore"]
+
+# File name used by ``Downloader.search(seen_urls=True)``, at the top
+# of the output tree so every query under it shares the store.
+SEEN_URLS_FILENAME = ".bbid-seen.sqlite"
+
+# SQLite's default limit on host parameters is 999.
+_QUERY_CHUNK = 500
+
+
+class SeenURLStore:
+    """Thread-safe on-disk set of canonical URL keys.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        SQLite database file; created (with its parent directories)
+        on first use.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def __repr__(self) -> str:
+        return f"SeenURLStore({str(self.path)!r})"
+
+    def __enter__(self) -> SeenURLStore:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and bool(self.known([key]))
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connect().execute("SELECT COUNT(*) FROM seen").fetchone()
+        return int(count)
+
+    def known(self, keys: Iterable[str]) -> set[str]:
+        """Return the subset of ``keys`` already in the store."""
+        keys = list(dict.fromkeys(keys))
+        found: set[str] = set()
+        with self._lock:
+            conn = self._connect()
+            for start in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[start : start + _QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(f"SELECT key FROM seen WHERE key IN ({placeholders})", chunk)
+                found.update(row[0] for row in rows)
+        return found
+
+    def add(self, key: str) -> None:
+        """Record ``key``. Idempotent."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("INSERT OR IGNORE INTO seen (key) VALUES (?)", (key,))
+            conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection. Idempotent; the store reopens on next use."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Used from many download threads, serialised by ``_lock``.
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY) WITHOUT ROWID")
+            conn.commit()
+            self._conn = conn
+        return self._conn
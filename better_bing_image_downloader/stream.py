@@ -0,0 +1,203 @@
+"""Streaming search results (v3.7.0+).
+
+:meth:`Downloader.search` returns once the whole run is over, with
+every :class:`~better_bing_image_downloader.results.ImageResult` held
+in :attr:`Result.images`. A pipeline that preprocesses images as they
+arrive has to wait for the last one, and memory grows with the run.
+
+:meth:`Downloader.iter_search` instead returns a :class:`SearchStream`:
+the engine runs on a background thread and each saved image, filtered
+image, and failure is handed over as it happens. Download workers never
+wait for the consumer: they append the event and return their thread
+to the pool. Backpressure is applied where downloads are dispatched,
+on the stream's own thread: while ``buffer_size`` events are waiting,
+no new download starts, so memory stays bounded (the buffer plus one
+event per download in flight) however long the run is. Nothing is
+accumulated on the consumer's behalf.
+
+A stream that is neither read nor closed keeps its search paused, and
+its run open, until it is garbage-collected, which closes it. Other
+searches on the same ``Downloader`` are not held up.
+"""
+
+from __future__ import annotations
+
+import collections
+import threading
+import weakref
+from typing import TYPE_CHECKING, Iterator, Union
+
+from .results import FailedImage, ImageResult, SkippedImage
+
+if TYPE_CHECKING:
+    from .downloader import CancelToken, _SearchRun
+
+__all__ = ["DEFAULT_STREAM_BUFFER", "SearchEvent", "SearchStream"]
+
+# Events buffered between the download workers and the consumer.
+DEFAULT_STREAM_BUFFER = 64
+
+SearchEvent = Union[ImageResult, SkippedImage, FailedImage]
+
+_END = object()
+
+
+class EventChannel:
+    """The events of one streamed run, shared by its engine and its :class:`SearchStream`.
+
+    Kept apart from the stream so the run's threads never hold a
+    reference to it: an abandoned stream can be garbage-collected, and
+    its finalizer closes the channel.
+    """
+
+    def __init__(self, buffer_size: int, cancel: CancelToken) -> None:
+        self.buffer_size = buffer_size
+        self.cancel = cancel
+        self.error: BaseException | None = None
+        self._events: collections.deque[object] = collections.deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, event: object) -> None:
+        """Hand ``event`` to the consumer. Never blocks; dropped once closed."""
+        with self._cond:
+            if self._closed:
+                return
+            self._events.append(event)
+            self._cond.notify_all()
+
+    def get(self) -> object:
+        """Block until an event is available and return it."""
+        with self._cond:
+            while not self._events and not self._closed:
+                self._cond.wait()
+            if not self._events:
+                return _END
+            event = self._events.popleft()
+            self._cond.notify_all()
+            return event
+
+    def wait_for_room(self) -> None:
+        """Block while ``buffer_size`` events are waiting; the engine's dispatch gate."""
+        with self._cond:
+            while len(self._events) >= self.buffer_size and not self._closed:
+                self._cond.wait()
+
+    def finish(self) -> None:
+        """Mark the end of the run, after its last event."""
+        self.put(_END)
+
+    def close(self) -> None:
+        """Drop pending events, wake everyone up, and cancel the run. Idempotent."""
+        with self._cond:
+            self._closed = True
+            self._events.clear()
+            self._cond.notify_all()
+        self.cancel.cancel()
+
+
+class SearchStream:
+    """Iterator over the events of a running search.
+
+    Created by :meth:`Downloader.iter_search`; not meant to be built
+    directly. Yields :class:`ImageResult`, :class:`SkippedImage` and
+    :class:`FailedImage` objects in the order they happen. Use it as a
+    context manager, or call :meth:`close`, to stop the search early;
+    a stream dropped without either is closed when it is
+    garbage-collected.
+
+    Attributes
+    ----------
+    saved : int
+        Images yielded so far.
+    skipped : int
+        :class:`SkippedImage` events yielded so far.
+    failed : int
+        :class:`FailedImage` events yielded so far.
+    """
+
+    def __init__(self, buffer_size: int, cancel: CancelToken) -> None:
+        if buffer_size < 1:
+            raise ValueError(f"buffer_size must be >= 1, got {buffer_size}")
+        self.saved = 0
+        self.skipped = 0
+        self.failed = 0
+        self._channel = EventChannel(buffer_size, cancel)
+        self._cancel = cancel
+        self._thread: threading.Thread | None = None
+        self._finished = False
+        weakref.finalize(self, self._channel.close)
+
+    def __repr__(self) -> str:
+        state = "finished" if self._finished else "running"
+        return (
+            f"SearchStream({state}, saved={self.saved}, skipped={self.skipped}, "
+            f"failed={self.failed})"
+        )
+
+    def __iter__(self) -> Iterator[SearchEvent]:
+        return self
+
+    def __next__(self) -> SearchEvent:
+        if self._finished:
+            raise StopIteration
+        event = self._channel.get()
+        if event is _END:
+            self._finish()
+            if self._channel.error is not None:
+                raise self._channel.error
+            raise StopIteration
+        if isinstance(event, ImageResult):
+            self.saved += 1
+        elif isinstance(event, SkippedImage):
+            self.skipped += 1
+        else:
+            self.failed += 1
+        return event  # type: ignore[return-value]
+
+    def __enter__(self) -> SearchStream:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @property
+    def cancelled(self) -> bool:
+        """``True`` if the search was cancelled, by :meth:`close` or its token."""
+        return bool(self._cancel.cancelled)
+
+    def close(self) -> None:
+        """Stop the search and wait for its engine to wind down. Idempotent.
+
+        Downloads already in flight finish (their events are dropped);
+        no new ones start.
+        """
+        if self._finished:
+            return
+        self._channel.close()
+        self._finish()
+
+    # --- Producer side ---
+
+    def _start(self, run: _SearchRun) -> None:
+        self._thread = threading.Thread(
+            target=_produce, args=(run, self._channel), name="bbid-stream", daemon=True
+        )
+        self._thread.start()
+
+    def _finish(self) -> None:
+        self._finished = True
+        if self._thread is not None:
+            self._thread.join()
+
+
+def _produce(run: _SearchRun, channel: EventChannel) -> None:
+    """Body of a stream's background thread: run the engine, then end the stream."""
+    try:
+        run.engine_obj.run()
+    except BaseException as e:
+        channel.error = e
+    finally:
+        run.close()
+        run.downloader._finish_run(run)
+        channel.finish()
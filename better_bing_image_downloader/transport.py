@@ -0,0 +1,443 @@
+"""Pluggable HTTP transport layer shared by engines and image downloads.
+
+Every HTTP request the package makes — search-results pages, the
+DuckDuckGo ``vqd`` bootstrap, and the image bodies themselves — goes
+through a :class:`Transport`. Two implementations ship:
+
+- :class:`UrllibTransport` — one ``urlopen`` (or opener) call per
+  request, exactly what the engines did before transports existed.
+  It is the default for engines constructed directly, so code that
+  patches ``urllib.request.urlopen`` keeps working.
+- :class:`PooledTransport` — keeps a pool of idle keep-alive
+  connections per ``(scheme, host)``, so consecutive requests to the
+  same CDN reuse one TCP connection and TLS session instead of paying
+  a fresh handshake per image. :class:`Downloader` builds one of these
+  and hands it to every engine it constructs.
+
+Both are built on ``urllib.request`` openers, so cookie handling,
+redirects, proxies, and ``HTTPError`` semantics are unchanged.
+
+Public surface:
+
+- :class:`Transport` — the interface (subclass it to plug in your own)
+- :class:`UrllibTransport`, :class:`PooledTransport` — implementations
+- :class:`PoolStats` — counters returned by :meth:`Transport.stats`
+"""
+
+from __future__ import annotations
+
+import http.client
+import http.cookiejar
+import logging
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Callable, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "DEFAULT_MAX_IDLE_PER_HOST",
+    "DEFAULT_IDLE_TIMEOUT",
+    "PoolStats",
+    "PooledTransport",
+    "Transport",
+    "UrllibTransport",
+]
+
+# How many idle keep-alive connections we keep per host. Matches the
+# ``max_workers`` clamp in ``ImageEngine`` so a full worker pool
+# hammering one CDN never has to open a fresh connection.
+DEFAULT_MAX_IDLE_PER_HOST = 16
+
+# Idle connections older than this are closed instead of reused. Most
+# CDNs drop idle keep-alive sockets after 60-120s; staying well under
+# that avoids the "reused a socket the server already closed" retry.
+DEFAULT_IDLE_TIMEOUT = 30.0  # seconds
+
+
+class PoolStats(NamedTuple):
+    """Connection-pool counters for a :class:`Transport`.
+
+    Attributes
+    ----------
+    requests : int
+        Total requests sent through the transport.
+    connections_created : int
+        New TCP (and TLS) connections opened.
+    connections_reused : int
+        Requests served on an already-open keep-alive connection.
+    connections_discarded : int
+        Connections closed instead of being returned to the pool
+        (server asked to close, body not fully read, pool full, idle
+        timeout, or a stale socket).
+    idle : int
+        Connections currently parked in the pool.
+    hosts : int
+        Distinct ``(scheme, host)`` keys with at least one idle
+        connection.
+    """
+
+    requests: int
+    connections_created: int
+    connections_reused: int
+    connections_discarded: int
+    idle: int
+    hosts: int
+
+
+class Transport:
+    """Base class for HTTP transports.
+
+    Subclasses implement :meth:`open`, which takes a fully-built
+    :class:`urllib.request.Request` and returns a response object with
+    the same surface as ``urllib.request.urlopen``'s return value
+    (``read()``, ``headers``, ``status``, context-manager support).
+    Errors are raised as ``urllib.error.HTTPError`` / ``URLError`` so
+    engines' existing retry and classification logic applies.
+
+    Attributes
+    ----------
+    cookie_jar : http.cookiejar.CookieJar | None
+        The cookie jar replayed on every request, or ``None`` if the
+        transport doesn't handle cookies.
+    """
+
+    cookie_jar: http.cookiejar.CookieJar | None = None
+
+    def open(self, request: urllib.request.Request, timeout: float) -> Any:
+        """Send ``request`` and return the response."""
+        raise NotImplementedError
+
+    def stats(self) -> PoolStats:
+        """Return a snapshot of this transport's connection counters."""
+        return PoolStats(0, 0, 0, 0, 0, 0)
+
+    def close(self) -> None:
+        """Release any pooled connections. Idempotent."""
+
+    def __enter__(self) -> Transport:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class UrllibTransport(Transport):
+    """One connection per request, via ``urllib.request``.
+
+    Parameters
+    ----------
+    cookie_jar : http.cookiejar.CookieJar | None
+        If given (and ``opener`` is not), requests go through an
+        opener with an ``HTTPCookieProcessor`` for this jar.
+    opener : urllib.request.OpenerDirector | None
+        Explicit opener to use. If neither argument is given, requests
+        go through the module-level ``urllib.request.urlopen``.
+    """
+
+    def __init__(
+        self,
+        cookie_jar: http.cookiejar.CookieJar | None = None,
+        opener: urllib.request.OpenerDirector | None = None,
+    ) -> None:
+        self.cookie_jar = cookie_jar
+        if opener is None and cookie_jar is not None:
+            opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(cookie_jar))
+        self.opener = opener
+        self._requests = 0
+        self._lock = threading.Lock()
+
+    def open(self, request: urllib.request.Request, timeout: float) -> Any:
+        with self._lock:
+            self._requests += 1
+        if self.opener is None:
+            # Looked up at call time (not bound at import) so tests and
+            # callers that patch ``urllib.request.urlopen`` still win.
+            return urllib.request.urlopen(request, timeout=timeout)
+        return self.opener.open(request, timeout=timeout)
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(self._requests, self._requests, 0, self._requests, 0, 0)
+
+
+# --- Keep-alive connection pool ---
+
+_PoolKey = tuple  # (scheme, host[:port], tunnel_host)
+
+
+class _ConnectionPool:
+    """Thread-safe LIFO pool of idle ``http.client`` connections per host."""
+
+    def __init__(self, max_idle_per_host: int, idle_timeout: float) -> None:
+        self.max_idle_per_host = max_idle_per_host
+        self.idle_timeout = idle_timeout
+        self._idle: dict[_PoolKey, list[tuple[http.client.HTTPConnection, float]]] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self.requests = 0
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def acquire(
+        self, key: _PoolKey, factory: Callable[[], http.client.HTTPConnection]
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        """Return ``(connection, reused)`` for ``key``.
+
+        Pops the most recently used idle connection (LIFO keeps the
+        warmest sockets in play and lets the rest age out), dropping
+        any that have sat idle past ``idle_timeout``.
+        """
+        stale: list[http.client.HTTPConnection] = []
+        conn = None
+        now = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            idle = self._idle.get(key)
+            while idle:
+                candidate, parked_at = idle.pop()
+                if now - parked_at <= self.idle_timeout:
+                    conn = candidate
+                    break
+                stale.append(candidate)
+            if idle is not None and not idle:
+                del self._idle[key]
+            self.discarded += len(stale)
+            if conn is not None:
+                self.reused += 1
+            else:
+                self.created += 1
+        for old in stale:
+            old.close()
+        if conn is not None:
+            return conn, True
+        return factory(), False
+
+    def release(self, key: _PoolKey, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        """Park ``conn`` for reuse, or close it if it can't be reused."""
+        if reusable:
+            with self._lock:
+                if not self._closed:
+                    idle = self._idle.setdefault(key, [])
+                    if len(idle) < self.max_idle_per_host:
+                        idle.append((conn, time.monotonic()))
+                        return
+        self.discard(conn)
+
+    def discard(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self.discarded += 1
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn, _ in conns:
+                conn.close()
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(
+                requests=self.requests,
+                connections_created=self.created,
+                connections_reused=self.reused,
+                connections_discarded=self.discarded,
+                idle=sum(len(v) for v in self._idle.values()),
+                hosts=len(self._idle),
+            )
+
+
+class _PooledResponse(http.client.HTTPResponse):
+    """``HTTPResponse`` that hands its connection back to the pool.
+
+    The connection is released as soon as the body has been fully
+    read (``_close_conn`` runs at EOF) or the response is closed. A
+    response closed before EOF still has unread bytes on the socket,
+    so its connection is discarded rather than reused.
+    """
+
+    _release: Callable[[bool], None] | None = None
+    _reusable = True
+
+    def close(self) -> None:
+        if self.fp is not None and (self.chunked or self.length != 0):
+            # Unread body bytes are still on the socket.
+            self._reusable = False
+        super().close()
+        self._release_conn()
+
+    def _close_conn(self) -> None:
+        super()._close_conn()  # type: ignore[misc]
+        self._release_conn()
+
+    def _release_conn(self) -> None:
+        release, self._release = self._release, None
+        if release is not None:
+            release(self._reusable and not self.will_close)
+
+
+# Errors that mean "the server closed this idle keep-alive socket
+# before we reused it". Safe to retry once on a fresh connection since
+# every request we send is an idempotent GET.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionError, BrokenPipeError)
+
+
+class _PooledHandlerMixin:
+    """``do_open`` replacement for ``HTTPHandler`` / ``HTTPSHandler``.
+
+    Mirrors ``urllib.request.AbstractHTTPHandler.do_open`` except that
+    it sends ``Connection: keep-alive`` and checks connections out of a
+    :class:`_ConnectionPool` instead of opening (and then closing) one
+    per request.
+    """
+
+    _pool: _ConnectionPool
+
+    def _pooled_open(self, scheme: str, factory: Callable, req: urllib.request.Request) -> Any:
+        host = req.host
+        if not host:
+            raise urllib.error.URLError("no host given")
+        tunnel_host = getattr(req, "_tunnel_host", None)
+        key = (scheme, host, tunnel_host)
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update({k: v for k, v in req.headers.items() if k not in headers})
+        headers["Connection"] = "keep-alive"
+        headers = {name.title(): val for name, val in headers.items()}
+        tunnel_headers = {}
+        if tunnel_host and "Proxy-Authorization" in headers:
+            tunnel_headers["Proxy-Authorization"] = headers.pop("Proxy-Authorization")
+
+        def new_connection() -> http.client.HTTPConnection:
+            conn: http.client.HTTPConnection = factory(host, req.timeout)
+            if tunnel_host:
+                conn.set_tunnel(tunnel_host, headers=tunnel_headers)
+            return conn
+
+        conn, reused = self._pool.acquire(key, new_connection)
+        while True:
+            conn.timeout = req.timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(req.timeout)
+            conn.response_class = _PooledResponse
+            try:
+                try:
+                    conn.request(
+                        req.get_method(),
+                        req.selector,
+                        req.data,
+                        headers,
+                        encode_chunked=req.has_header("Transfer-encoding"),
+                    )
+                except OSError as err:
+                    raise urllib.error.URLError(err) from err
+                response = conn.getresponse()
+            except Exception as exc:
+                self._pool.discard(conn)
+                stale = isinstance(exc, _STALE_CONNECTION_ERRORS) or (
+                    isinstance(exc, urllib.error.URLError)
+                    and isinstance(exc.reason, _STALE_CONNECTION_ERRORS)
+                )
+                if reused and stale:
+                    conn, reused = self._pool.acquire(key, new_connection)
+                    continue
+                raise
+            break
+
+        response._release = lambda reusable: self._pool.release(key, conn, reusable)
+        response.url = req.get_full_url()
+        response.msg = response.reason
+        return response
+
+
+class _PooledHTTPHandler(_PooledHandlerMixin, urllib.request.HTTPHandler):
+    def __init__(self, pool: _ConnectionPool) -> None:
+        super().__init__()
+        self._pool = pool
+
+    def http_open(self, req: urllib.request.Request) -> Any:
+        return self._pooled_open(
+            "http", lambda host, timeout: http.client.HTTPConnection(host, timeout=timeout), req
+        )
+
+
+class _PooledHTTPSHandler(_PooledHandlerMixin, urllib.request.HTTPSHandler):
+    def __init__(self, pool: _ConnectionPool, context: Any = None) -> None:
+        super().__init__(context=context)
+        self._pool = pool
+        self._ssl_context = context
+
+    def https_open(self, req: urllib.request.Request) -> Any:
+        return self._pooled_open(
+            "https",
+            lambda host, timeout: http.client.HTTPSConnection(
+                host, timeout=timeout, context=self._ssl_context
+            ),
+            req,
+        )
+
+
+class PooledTransport(Transport):
+    """Keep-alive transport with per-host connection pools.
+
+    Safe to share between threads and between engines: connections
+    are checked out for the lifetime of one response and returned to
+    the pool once its body has been read (or discarded if it can't be
+    reused).
+
+    Parameters
+    ----------
+    cookie_jar : http.cookiejar.CookieJar | None
+        Cookie jar replayed on every request. A fresh jar is created
+        if omitted.
+    max_idle_per_host : int
+        Maximum idle connections kept per ``(scheme, host)``. Extra
+        connections are closed when released. Must be >= 0; ``0``
+        disables reuse entirely.
+    idle_timeout : float
+        Seconds an idle connection may sit in the pool before it is
+        closed instead of reused.
+    ssl_context : ssl.SSLContext | None
+        Optional TLS context for HTTPS connections.
+
+    Example
+    -------
+
+    >>> from better_bing_image_downloader.transport import PooledTransport
+    >>> with PooledTransport(max_idle_per_host=8) as transport:
+    ...     dl = Downloader(transport=transport)
+    ...     dl.search("red panda", limit=50)
+    ...     print(transport.stats())
+    """
+
+    def __init__(
+        self,
+        cookie_jar: http.cookiejar.CookieJar | None = None,
+        max_idle_per_host: int = DEFAULT_MAX_IDLE_PER_HOST,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        ssl_context: Any = None,
+    ) -> None:
+        if max_idle_per_host < 0:
+            raise ValueError("max_idle_per_host must be >= 0")
+        self.cookie_jar = cookie_jar if cookie_jar is not None else http.cookiejar.CookieJar()
+        self.max_idle_per_host = max_idle_per_host
+        self._pool = _ConnectionPool(max_idle_per_host, idle_timeout)
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookie_jar),
+            _PooledHTTPHandler(self._pool),
+            _PooledHTTPSHandler(self._pool, context=ssl_context),
+        )
+
+    def open(self, request: urllib.request.Request, timeout: float) -> Any:
+        return self.opener.open(request, timeout=timeout)
+
+    def stats(self) -> PoolStats:
+        return self._pool.stats()
+
+    def close(self) -> None:
+        self._pool.close()
@@ -0,0 +1,179 @@
+"""Image URL canonicalization (v3.7.0+).
+
+Search results often list one image under several URLs: with and
+without tracking parameters, over ``http`` and ``https``, or as a CDN
+rendition at another size (``/236x/`` and ``/736x/`` on Pinterest,
+``-300x200.jpg`` on WordPress, ``/thumb/.../640px-`` on Wikimedia).
+Engines compare links by the key a :class:`URLCanonicalizer` maps them
+to instead of by the raw string, both for the per-run ``seen`` check
+and for the persistent
+:class:`~better_bing_image_downloader.seenurls.SeenURLStore`.
+
+The key is only used for comparisons; downloads always use the
+original link. The canonical form:
+
+- ignores the scheme (``http`` and ``https`` give the same key),
+  lower-cases the host, and drops default ports and the fragment;
+- drops tracking parameters (:data:`DEFAULT_TRACKING_PARAMS`, plus any
+  parameter starting with ``utm_``) and sorts the rest;
+- applies each matching :class:`CDNRule`, which rewrites the path
+  and/or drops size parameters for one family of hosts.
+"""
+
+from __future__ import annotations
+
+import re
+import urllib.parse
+from typing import Iterable, NamedTuple
+
+__all__ = [
+    "CDNRule",
+    "DEFAULT_CDN_RULES",
+    "DEFAULT_TRACKING_PARAMS",
+    "URLCanonicalizer",
+    "canonicalize_url",
+]
+
+# Query parameters that identify a click or campaign, never the image.
+DEFAULT_TRACKING_PARAMS = frozenset(
+    {
+        "fbclid",
+        "gclid",
+        "dclid",
+        "msclkid",
+        "mc_cid",
+        "mc_eid",
+        "igshid",
+        "_ga",
+        "ref_src",
+        "cmpid",
+    }
+)
+
+_TRACKING_PREFIXES = ("utm_",)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class CDNRule(NamedTuple):
+    """A rewrite that collapses one CDN's renditions of an image.
+
+    Attributes
+    ----------
+    host : str
+        Regular expression the host must fully match.
+    path : str | None
+        Regular expression substituted in the path (``re.sub``), or
+        ``None`` to leave the path alone.
+    replacement : str
+        Replacement for ``path`` matches.
+    drop_params : frozenset[str]
+        Query parameters (size, crop, quality, ...) dropped for this
+        host.
+    """
+
+    host: str
+    path: str | None = None
+    replacement: str = ""
+    drop_params: frozenset = frozenset()
+
+
+_SIZE_PARAMS = frozenset({"w", "h", "width", "height", "fit", "crop", "q", "quality", "dpr"})
+
+DEFAULT_CDN_RULES = (
+    # Pinterest: /236x/, /474x/, /736x/, /originals/ ... of one pin.
+    CDNRule(r"i\.pinimg\.com", r"^/(?:originals|\d+x\d*)/", "/"),
+    # Wikimedia thumbnails: /thumb/a/ab/Name.jpg/640px-Name.jpg -> original.
+    CDNRule(r"upload\.wikimedia\.org", r"/thumb(/.+?)/\d+px-[^/]+$", r"\1"),
+    # WordPress resized copies: /wp-content/uploads/name-300x200.jpg ->
+    # name.jpg. Only under the uploads path (on any host, since
+    # WordPress sites use their own domains); elsewhere ``-WxH`` is
+    # often part of the name of a distinct image.
+    CDNRule(
+        r".*",
+        r"(/wp-content/uploads/.+)-\d+x\d+(\.(?:jpe?g|png|gif|webp))$",
+        r"\1\2",
+    ),
+    # Shopify: name_600x.jpg, name_grande.jpg, name_100x100@2x.jpg -> name.jpg.
+    CDNRule(
+        r"(?:cdn\.shopify\.com|.*\.myshopify\.com)",
+        r"_(?:\d+x\d*|x\d+|pico|icon|thumb|small|compact|medium|large|grande|master)"
+        r"(?:_crop_\w+)?(?:@\dx)?(\.\w+)$",
+        r"\1",
+        frozenset({"v", "width", "height"}),
+    ),
+    # Query-string resizers.
+    CDNRule(r"images\.unsplash\.com", drop_params=_SIZE_PARAMS | {"auto", "fm", "ixlib", "ixid"}),
+    CDNRule(r".*\.(?:imgix\.net|cloudinary\.com|squarespace-cdn\.com)", drop_params=_SIZE_PARAMS),
+    CDNRule(r".*\.wp\.com", drop_params=frozenset({"resize", "fit", "w", "h", "ssl", "zoom"})),
+)
+
+
+class URLCanonicalizer:
+    """Map image URLs to comparison keys; see the module docstring.
+
+    Parameters
+    ----------
+    tracking_params : Iterable[str]
+        Query parameters dropped for every host (in addition to
+        ``utm_*``).
+    cdn_rules : Iterable[CDNRule]
+        Host-specific rewrites, applied in order.
+
+    Raises
+    ------
+    re.error
+        If a rule's host or path pattern is not a valid regular
+        expression.
+    """
+
+    def __init__(
+        self,
+        tracking_params: Iterable[str] = DEFAULT_TRACKING_PARAMS,
+        cdn_rules: Iterable[CDNRule] = DEFAULT_CDN_RULES,
+    ) -> None:
+        self.tracking_params = frozenset(p.lower() for p in tracking_params)
+        self.cdn_rules = tuple(cdn_rules)
+        self._compiled = [
+            (
+                re.compile(rule.host),
+                re.compile(rule.path) if rule.path is not None else None,
+                rule.replacement,
+                frozenset(p.lower() for p in rule.drop_params),
+            )
+            for rule in self.cdn_rules
+        ]
+
+    def __call__(self, url: str) -> str:
+        """Return the canonical key of ``url`` (``url`` itself if it can't be parsed)."""
+        try:
+            parts = urllib.parse.urlsplit(url.strip())
+            host = (parts.hostname or "").rstrip(".")
+            port = parts.port
+        except ValueError:
+            return url
+        if not host:
+            return url
+        if port is not None and port != _DEFAULT_PORTS.get(parts.scheme.lower()):
+            host = f"{host}:{port}"
+
+        path = parts.path or "/"
+        drop = set(self.tracking_params)
+        for host_re, path_re, replacement, drop_params in self._compiled:
+            if not host_re.fullmatch(host):
+                continue
+            if path_re is not None:
+                path = path_re.sub(replacement, path)
+            drop |= drop_params
+
+        params = [
+            (name, value)
+            for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+            if name.lower() not in drop and not name.lower().startswith(_TRACKING_PREFIXES)
+        ]
+        query = urllib.parse.urlencode(sorted(params))
+        return f"//{host}{path}" + (f"?{query}" if query else "")
+
+
+# The canonicalizer engines use unless given another one.
+canonicalize_url = URLCanonicalizer()
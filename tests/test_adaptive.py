@@ -0,0 +1,172 @@
+"""Tests for adaptive download concurrency (v3.7.0+)."""
+
+from __future__ import annotations
+
+import socket
+import threading
+import time
+import urllib.error
+from pathlib import Path
+
+import pytest
+
+from better_bing_image_downloader import (
+    AdaptiveLimit,
+    Downloader,
+    ImageEngine,
+    NetworkError,
+    Result,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _error(cause: BaseException) -> NetworkError:
+    error = NetworkError(url="https://a.test/x.jpg", message=str(cause))
+    error.__cause__ = cause
+    return error
+
+
+def _window(limiter: AdaptiveLimit, clock: FakeClock, latency: float, seconds: float = 1.0):
+    """Feed one full window of successful fetches."""
+    n = max(limiter.limit, 4)
+    for _ in range(n):
+        clock.now += seconds / n
+        limiter.observe(latency)
+
+
+def test_limit_grows_while_latency_is_stable() -> None:
+    clock = FakeClock()
+    limiter = AdaptiveLimit(initial=2, maximum=6, clock=clock)
+    for _ in range(10):
+        _window(limiter, clock, 0.1)
+    assert limiter.limit == 6
+    assert [c.reason for c in limiter.history] == ["start"] + ["increase"] * 4
+    assert [c.limit for c in limiter.history] == [2, 3, 4, 5, 6]
+
+
+def test_congestion_halves_the_limit_once_per_window() -> None:
+    clock = FakeClock()
+    limiter = AdaptiveLimit(initial=8, clock=clock)
+    throttled = _error(urllib.error.HTTPError("u", 429, "slow down", None, None))
+    limiter.observe(0.1, throttled)
+    limiter.observe(0.1, throttled)
+    assert limiter.limit == 4
+    assert limiter.history[-1].reason == "congestion"
+
+
+@pytest.mark.parametrize(
+    "cause",
+    [
+        urllib.error.HTTPError("u", 502, "bad gateway", None, None),
+        urllib.error.URLError(socket.timeout("timed out")),
+    ],
+)
+def test_server_errors_and_timeouts_are_congestion(cause: BaseException) -> None:
+    limiter = AdaptiveLimit(initial=4)
+    limiter.observe(1.0, _error(cause))
+    assert limiter.limit == 2
+
+
+def test_client_errors_do_not_shrink_the_limit() -> None:
+    limiter = AdaptiveLimit(initial=4)
+    limiter.observe(0.1, _error(urllib.error.HTTPError("u", 404, "gone", None, None)))
+    assert limiter.limit == 4
+
+
+def test_rising_latency_shrinks_the_limit() -> None:
+    clock = FakeClock()
+    limiter = AdaptiveLimit(initial=5, clock=clock)
+    _window(limiter, clock, 0.1)
+    grown = limiter.limit
+    _window(limiter, clock, 0.5)
+    assert limiter.limit == grown - 1
+    assert limiter.history[-1].reason == "latency"
+
+
+def test_falling_throughput_holds_the_limit() -> None:
+    clock = FakeClock()
+    limiter = AdaptiveLimit(initial=4, clock=clock)
+    _window(limiter, clock, 0.1, seconds=1.0)
+    grown = limiter.limit
+    _window(limiter, clock, 0.1, seconds=5.0)
+    assert limiter.limit == grown
+
+
+def test_limit_stays_within_bounds() -> None:
+    limiter = AdaptiveLimit(initial=1, minimum=1, maximum=2)
+    throttled = _error(urllib.error.HTTPError("u", 503, "busy", None, None))
+    for _ in range(20):
+        limiter.observe(0.1, throttled)
+    assert limiter.limit == 1
+    with pytest.raises(ValueError):
+        AdaptiveLimit(initial=1, minimum=3, maximum=2)
+
+
+class GateEngine(ImageEngine):
+    """Pipelined engine recording its peak concurrency under a fixed limit."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.active = 0
+        self.peak = 0
+        self._active_lock = threading.Lock()
+
+    def run(self) -> None:
+        self._run_pipeline(iter([[f"https://h{i}.test/{i}.jpg" for i in range(24)]]))
+
+    def download_image(self, link: str, index: int):
+        with self._active_lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.01)
+        with self._active_lock:
+            self.active -= 1
+        with self._count_lock:
+            self.download_count += 1
+            self._slots_used += 1
+        return index
+
+
+def test_pipeline_follows_the_adaptive_limit(tmp_path: Path) -> None:
+    engine = GateEngine("q", 24, tmp_path, max_workers=3, adaptive=True)
+    assert engine.limiter is not None
+    assert (engine.limiter.limit, engine.limiter.maximum) == (3, 16)
+    engine.run()
+    # No fetches were reported, so the limit never moved.
+    assert engine.download_count == 24
+    assert engine.peak <= 3
+
+
+def test_fixed_mode_has_no_limiter(tmp_path: Path) -> None:
+    engine = GateEngine("q", 1, tmp_path)
+    assert engine.limiter is None
+
+
+def test_result_reports_limit_history(tmp_path: Path) -> None:
+    class Observed(ImageEngine):
+        def run(self) -> None:
+            if self.limiter is None:
+                return
+            for _ in range(8):
+                self.limiter.observe(0.01)
+
+    with Downloader() as dl:
+        dl.register("obs", Observed)
+        result = dl.search("q", limit=1, engine="obs", output_dir=tmp_path, adaptive=True)
+        fixed = dl.search("q", limit=1, engine="obs", output_dir=tmp_path / "fixed")
+    assert result.concurrency_limit == 5
+    assert [c.limit for c in result.concurrency_history] == [4, 5]
+    assert fixed.concurrency_limit is None and fixed.concurrency_history == []
+
+
+def test_hand_built_result_defaults() -> None:
+    result = Result(query="q", engine="bing", output_dir=Path("."))
+    assert result.concurrency_limit is None
+    assert result.concurrency_history == []
@@ -0,0 +1,361 @@
+"""Tests for the native asyncio engine path (v3.7.0+).
+
+``AsyncTransport`` and the async engines are exercised against a local
+HTTP/1.1 server, so keep-alive, chunked bodies and concurrency limits
+are observable without network access.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import threading
+import time
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from better_bing_image_downloader import (
+    AsyncBing,
+    AsyncImageEngine,
+    AsyncTransport,
+    Bing,
+    Downloader,
+    ImageEngine,
+    SeenURLStore,
+)
+from better_bing_image_downloader import base as _base
+from better_bing_image_downloader.duckduckgo import AsyncDuckDuckGo
+from better_bing_image_downloader.transport import UrllibTransport
+
+PNG_1x1 = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01"
+    b"\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\rIDATx\x9cc\xf8\x0f"
+    b"\x00\x00\x01\x01\x00\x05\x18\xd8N\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    peers: set = set()
+    in_flight = 0
+    peak = 0
+    delay = 0.0
+    lock = threading.Lock()
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        cls = type(self)
+        cls.peers.add(self.client_address)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+        try:
+            time.sleep(cls.delay)
+            self._respond()
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def _respond(self) -> None:
+        body = PNG_1x1 + self.path.encode()
+        if self.path.startswith("/redirect"):
+            self.send_response(302)
+            self.send_header("Location", "/img/redirected.png")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path.startswith("/missing"):
+            self.send_error(404)
+        elif self.path.startswith("/cookie"):
+            self.send_response(200)
+            self.send_header("Set-Cookie", "session=abc; Path=/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path.startswith("/echo"):
+            cookie = (self.headers.get("Cookie") or "").encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(cookie)))
+            self.end_headers()
+            self.wfile.write(cookie)
+        elif self.path.startswith("/chunked"):
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i in range(0, len(body), 16):
+                piece = body[i : i + 16]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(piece), piece))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.peers = set()
+    _Handler.in_flight = _Handler.peak = 0
+    _Handler.delay = 0.0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _bing_page(urls: list[str]) -> str:
+    return "".join(f'<a m="{{murl&quot;:&quot;{u}&quot;}}">' for u in urls)
+
+
+# --- AsyncTransport ---
+
+
+def test_async_transport_reuses_connection(server: str) -> None:
+    async def fetch_all(transport: AsyncTransport) -> list[bytes]:
+        bodies = []
+        for i in range(5):
+            async with await transport.open(f"{server}/img{i}.png", timeout=5) as resp:
+                bodies.append(await resp.read())
+        await transport.aclose()
+        return bodies
+
+    transport = AsyncTransport()
+    bodies = asyncio.run(fetch_all(transport))
+    assert all(b.startswith(PNG_1x1) for b in bodies)
+    stats = transport.stats()
+    assert stats.requests == 5
+    assert stats.connections_created == 1
+    assert stats.connections_reused == 4
+    assert len(_Handler.peers) == 1
+
+
+def test_async_transport_reads_chunked_body_in_pieces(server: str) -> None:
+    async def fetch() -> list[bytes]:
+        transport = AsyncTransport()
+        pieces = []
+        async with await transport.open(f"{server}/chunked.png", timeout=5) as resp:
+            while True:
+                piece = await resp.read(10)
+                if not piece:
+                    break
+                pieces.append(piece)
+        await transport.aclose()
+        return pieces
+
+    pieces = asyncio.run(fetch())
+    assert b"".join(pieces) == PNG_1x1 + b"/chunked.png"
+    assert max(len(p) for p in pieces) <= 10
+
+
+def test_async_transport_follows_redirects_and_raises_http_errors(server: str) -> None:
+    async def fetch() -> bytes:
+        transport = AsyncTransport()
+        try:
+            async with await transport.open(f"{server}/redirect", timeout=5) as resp:
+                body: bytes = await resp.read()
+            with pytest.raises(urllib.error.HTTPError) as err:
+                await transport.open(f"{server}/missing", timeout=5)
+            assert err.value.code == 404
+            return body
+        finally:
+            await transport.aclose()
+
+    assert asyncio.run(fetch()) == PNG_1x1 + b"/img/redirected.png"
+
+
+def test_async_transport_shares_cookie_jar(server: str) -> None:
+    async def fetch(transport: AsyncTransport) -> bytes:
+        async with await transport.open(f"{server}/cookie", timeout=5) as resp:
+            await resp.read()
+        async with await transport.open(f"{server}/echo", timeout=5) as resp:
+            body: bytes = await resp.read()
+        await transport.aclose()
+        return body
+
+    with Downloader() as dl:
+        assert dl.async_transport.cookie_jar is dl.cookie_jar
+        assert asyncio.run(fetch(dl.async_transport)) == b"session=abc"
+        assert any(c.name == "session" for c in dl.cookie_jar)
+
+
+def test_async_transport_validates_pool_size() -> None:
+    with pytest.raises(ValueError):
+        AsyncTransport(max_idle_per_host=-1)
+
+
+# --- Async engines ---
+
+
+def test_async_bing_downloads_on_the_event_loop(server: str, tmp_path: Path) -> None:
+    urls = [f"{server}/img/{i}.png" for i in range(4)]
+    with patch.object(AsyncBing, "_fetch_page_async", side_effect=[_bing_page(urls), ""]):
+        engine = AsyncBing("cats", 4, tmp_path, "off", 60, "", False)
+        engine.run()
+    saved = sorted(p.name for p in tmp_path.iterdir())
+    assert saved == ["Image_1.png", "Image_2.png", "Image_3.png", "Image_4.png"]
+    assert engine.download_count == 4
+
+
+def test_async_engine_respects_concurrency(server: str, tmp_path: Path) -> None:
+    _Handler.delay = 0.05
+    urls = [f"{server}/img/{i}.png" for i in range(12)]
+    with patch.object(AsyncBing, "_fetch_page_async", side_effect=[_bing_page(urls), ""]):
+        engine = AsyncBing("cats", 12, tmp_path, "off", 60, "", False, concurrency=3)
+        engine.run()
+    assert engine.download_count == 12
+    assert 1 < _Handler.peak <= 3
+
+
+def test_async_engine_keeps_disk_and_cache_io_off_the_loop(server: str, tmp_path: Path) -> None:
+    urls = [f"{server}/img/{i}.png" for i in range(3)]
+    loop_thread = threading.current_thread().name  # ``asyncio.run`` uses this thread
+    threads: list[str] = []
+    existing_index = AsyncBing._existing_index
+
+    def on_thread(method):
+        def wrapper(self, *args, **kwargs):
+            if method is not existing_index or self._existing is None:
+                threads.append(threading.current_thread().name)  # not a cache hit
+            return method(self, *args, **kwargs)
+
+        return wrapper
+
+    with patch.object(
+        AsyncBing, "_fetch_page_async", side_effect=[_bing_page(urls), ""]
+    ), patch.object(AsyncBing, "_existing_index", on_thread(existing_index)), patch.object(
+        AsyncBing, "_commit_saved_file", on_thread(AsyncBing._commit_saved_file)
+    ), patch.object(
+        AsyncBing, "_cached_page", on_thread(AsyncBing._cached_page)
+    ):
+        engine = AsyncBing("cats", 3, tmp_path, "off", 60, "", False)
+        engine.run()
+    assert engine.download_count == 3
+    assert threads and loop_thread not in threads
+
+
+def test_async_engine_writes_temp_files_and_seen_urls_off_the_loop(
+    server: str, tmp_path: Path
+) -> None:
+    urls = [f"{server}/img/{i}.png" for i in range(3)]
+    loop_thread = threading.current_thread().name
+    threads: list[str] = []
+
+    def on_thread(function):
+        def wrapper(*args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    with SeenURLStore(tmp_path / "seen.sqlite") as store, patch.object(
+        AsyncBing, "_fetch_page_async", side_effect=[_bing_page(urls), ""]
+    ), patch.object(SeenURLStore, "add", on_thread(SeenURLStore.add)), patch.object(
+        _base.tempfile, "mkstemp", on_thread(tempfile.mkstemp)
+    ):
+        engine = AsyncBing("cats", 3, tmp_path, "off", 60, "", False, seen_urls=store)
+        engine.run()
+        assert len(store) == 3
+    assert engine.download_count == 3
+    assert len(threads) == 6 and loop_thread not in threads
+
+
+def test_async_engine_rejects_bad_concurrency(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        AsyncBing("cats", 1, tmp_path, "off", 60, "", False, concurrency=0)
+
+
+def test_async_ddg_downloads_pages(server: str, tmp_path: Path) -> None:
+    urls = [f"{server}/img/{i}.png" for i in range(3)]
+    with patch.object(AsyncDuckDuckGo, "_fetch_vqd_async", return_value="vqd"), patch.object(
+        AsyncDuckDuckGo, "_fetch_page_async", side_effect=[urls, []]
+    ):
+        engine = AsyncDuckDuckGo("cats", 3, tmp_path, timeout=5)
+        engine.run()
+    assert engine.download_count == 3
+
+
+# --- Downloader.search_async ---
+
+
+def test_search_async_runs_natively(server: str, tmp_path: Path) -> None:
+    urls = [f"{server}/img/{i}.png" for i in range(3)]
+    seen: list[str] = []
+    threads: list[str] = []
+
+    async def main(dl: Downloader):
+        return await dl.search_async(
+            "cats", limit=3, output_dir=tmp_path, manifest=True, concurrency=2
+        )
+
+    def start_run(self, **options):
+        threads.append(threading.current_thread().name)
+        return start_run.original(self, **options)
+
+    start_run.original = Downloader._start_run
+    with Downloader(on_image=lambda img: seen.append(img.source_url)) as dl, patch.object(
+        AsyncBing, "_fetch_page_async", side_effect=[_bing_page(urls), ""]
+    ), patch.object(Bing, "run", side_effect=AssertionError("threaded path")), patch.object(
+        Downloader, "_start_run", start_run
+    ):
+        result = asyncio.run(main(dl))
+    # The run is set up (directories, manifest) off the event loop.
+    assert threads and threading.current_thread().name not in threads
+    assert result.count == 3
+    assert sorted(seen) == sorted(urls)
+    assert result.manifest_path is not None and Path(result.manifest_path).exists()
+    assert {img.source_url for img in result.images} == set(urls)
+
+
+def test_search_async_falls_back_to_thread_for_sync_engines(tmp_path: Path) -> None:
+    threads: list[str] = []
+
+    class SyncEngine(ImageEngine):
+        def run(self) -> None:
+            threads.append(threading.current_thread().name)
+
+    with Downloader() as dl:
+        dl.register("sync", SyncEngine)
+        result = asyncio.run(dl.search_async("cats", limit=1, engine="sync", output_dir=tmp_path))
+    assert result.count == 0
+    assert threads and threads[0] != threading.main_thread().name
+
+
+@pytest.mark.parametrize("setup", ["proxy", "transport", "opt_out"])
+def test_search_async_runs_stock_engines_in_a_thread_when_native_cant_apply(
+    setup: str, tmp_path: Path, monkeypatch
+) -> None:
+    kwargs: dict = {}
+    if setup == "proxy":
+        monkeypatch.setenv("HTTPS_PROXY", "http://proxy.test:3128")
+    elif setup == "transport":
+        kwargs["transport"] = UrllibTransport()
+    else:
+        kwargs["native_async"] = False
+    with Downloader(**kwargs) as dl, patch.object(Bing, "run") as run, patch.object(
+        AsyncBing, "run_async", side_effect=AssertionError("native path")
+    ):
+        asyncio.run(dl.search_async("cats", limit=1, output_dir=tmp_path))
+    assert run.called
+
+
+def test_search_async_uses_registered_async_engine(tmp_path: Path) -> None:
+    class LoopEngine(AsyncImageEngine):
+        ran_on_loop = False
+
+        async def run_async(self) -> None:
+            asyncio.get_running_loop()
+            type(self).ran_on_loop = True
+
+    with Downloader() as dl:
+        dl.register("loop", LoopEngine)
+        asyncio.run(dl.search_async("cats", limit=1, engine="loop", output_dir=tmp_path))
+    assert LoopEngine.ran_on_loop
@@ -1,5 +1,6 @@
 """Tests for atomic-write and reliability behavior in the base engine."""
 
+import io
 import os
 from unittest.mock import MagicMock, patch
 
@@ -15,7 +16,7 @@ class TestAtomicWrite:
         """A successful save produces the target file and no leftover temp file."""
         fake_image = b"\xff\xd8\xff" * 50
         mock_response = MagicMock()
-        mock_response.read.return_value = fake_image
+        mock_response.read.side_effect = io.BytesIO(fake_image).read
         mock_response.__enter__ = lambda s: s
         mock_response.__exit__ = MagicMock(return_value=False)
         mock_urlopen.return_value = mock_response
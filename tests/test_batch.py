@@ -0,0 +1,198 @@
+"""Tests for multi-query batches: ``search_many`` and ``bbid --queries-file`` (v3.7.0+)."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from better_bing_image_downloader import (
+    Bing,
+    CancelToken,
+    Downloader,
+    ImageEngine,
+    QueryCheckpoint,
+)
+from better_bing_image_downloader import download as _download
+from better_bing_image_downloader.batch import read_queries
+
+PNG = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x08\x00\x00\x00\x08" + b"\x00" * 32
+
+
+class SleepyEngine(ImageEngine):
+    """Records which queries ran and how many ran at once.
+
+    Each run "finds" one link, except for queries in ``empty``.
+    """
+
+    ran: list[str] = []
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    delays: dict[str, float] = {}
+    empty: set[str] = set()
+
+    def download_image(self, link: str, index: int) -> bool:
+        return True
+
+    def run(self) -> None:
+        cls = type(self)
+        with cls.lock:
+            cls.ran.append(self.query)
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            if self.query == "boom":
+                raise RuntimeError("search failed")
+            time.sleep(cls.delays.get(self.query, 0.01))
+            if self.query not in cls.empty:
+                self.download_image(f"https://e.test/{self.query}.png", 1)
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+
+@pytest.fixture
+def dl():
+    SleepyEngine.ran = []
+    SleepyEngine.active = SleepyEngine.peak = 0
+    SleepyEngine.delays = {}
+    SleepyEngine.empty = set()
+    with Downloader() as downloader:
+        downloader.register("sleepy", SleepyEngine)
+        yield downloader
+
+
+def test_read_queries_skips_blanks_and_comments(tmp_path: Path) -> None:
+    path = tmp_path / "queries.txt"
+    path.write_text("cats\n\n  # animals\n red panda \n", encoding="utf-8")
+    assert read_queries(path) == ["cats", "red panda"]
+
+
+def test_results_arrive_as_queries_finish(dl: Downloader, tmp_path: Path) -> None:
+    SleepyEngine.delays = {"slow": 0.3}
+    results = dl.search_many(
+        ["slow", "fast", "fast"], parallel=2, engine="sleepy", limit=1, output_dir=tmp_path
+    )
+    assert [r.query for r in results] == ["fast", "slow"]
+    assert sorted(SleepyEngine.ran) == ["fast", "slow"]
+
+
+def test_parallelism_is_bounded(dl: Downloader, tmp_path: Path) -> None:
+    queries = [f"q{i}" for i in range(8)]
+    results = list(
+        dl.search_many(queries, parallel=3, engine="sleepy", limit=1, output_dir=tmp_path)
+    )
+    assert len(results) == 8
+    assert 1 < SleepyEngine.peak <= 3
+
+
+def test_stopping_early_starts_no_new_query(dl: Downloader, tmp_path: Path) -> None:
+    checkpoint = tmp_path / "done.jsonl"
+    results = dl.search_many(
+        ["a", "b"], parallel=1, checkpoint=checkpoint, engine="sleepy", output_dir=tmp_path
+    )
+    for result in results:
+        assert result.query == "a"
+        break
+    results.close()
+    assert SleepyEngine.ran == ["a"]
+    assert QueryCheckpoint(checkpoint).completed == {"a"}
+
+
+def test_checkpoint_resumes_after_a_failure(dl: Downloader, tmp_path: Path) -> None:
+    checkpoint = tmp_path / "done.jsonl"
+    options = {"engine": "sleepy", "limit": 1, "output_dir": tmp_path, "parallel": 1}
+    with pytest.raises(RuntimeError):
+        for _ in dl.search_many(["a", "boom", "b"], checkpoint=checkpoint, **options):
+            pass
+    assert SleepyEngine.ran == ["a", "boom"]
+
+    SleepyEngine.ran = []
+    results = list(dl.search_many(["a", "b"], checkpoint=checkpoint, **options))
+    assert [r.query for r in results] == ["b"]
+    assert SleepyEngine.ran == ["b"]
+    records = [json.loads(line) for line in checkpoint.read_text().splitlines()]
+    assert [r["query"] for r in records] == ["a", "b"]
+
+
+def test_queries_without_results_are_not_checkpointed(dl: Downloader, tmp_path: Path) -> None:
+    checkpoint = tmp_path / "done.jsonl"
+    options = {"engine": "sleepy", "limit": 1, "output_dir": tmp_path, "checkpoint": checkpoint}
+    SleepyEngine.empty = {"b"}  # e.g. the first results page failed
+    results = list(dl.search_many(["a", "b"], **options))
+    assert sorted(r.query for r in results) == ["a", "b"]
+    assert QueryCheckpoint(checkpoint).completed == {"a"}
+
+    SleepyEngine.ran = []
+    SleepyEngine.empty = set()
+    assert [r.query for r in dl.search_many(["a", "b"], **options)] == ["b"]
+    assert QueryCheckpoint(checkpoint).completed == {"a", "b"}
+
+
+def test_cancel_stops_new_queries(dl: Downloader, tmp_path: Path) -> None:
+    cancel = CancelToken()
+    checkpoint = QueryCheckpoint(tmp_path / "done.jsonl")
+    results = dl.search_many(
+        ["a", "b", "c"],
+        parallel=1,
+        checkpoint=checkpoint,
+        cancel=cancel,
+        engine="sleepy",
+        limit=1,
+        output_dir=tmp_path,
+    )
+    next(results)
+    cancel.cancel()
+    # "b" started before the cancel; it comes back cancelled.
+    assert all(r.cancelled for r in results)
+    assert "c" not in SleepyEngine.ran
+    assert checkpoint.completed == {"a"}
+
+
+def test_checkpoint_ignores_a_torn_last_line(tmp_path: Path) -> None:
+    path = tmp_path / "done.jsonl"
+    path.write_text('{"query": "a"}\n{"query": "b', encoding="utf-8")
+    with QueryCheckpoint(path) as checkpoint:
+        assert "a" in checkpoint and "b" not in checkpoint
+        with Downloader() as dl:
+            dl.register("sleepy", SleepyEngine)
+            list(dl.search_many(["b"], checkpoint=checkpoint, engine="sleepy", output_dir=tmp_path))
+    assert QueryCheckpoint(path).completed == {"a", "b"}
+
+
+def test_rejects_bad_arguments(dl: Downloader, tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        next(dl.search_many(["a"], parallel=0))
+    with pytest.raises(ValueError):
+        next(dl.search_many(["a"], manifest_path=tmp_path / "m.jsonl"))
+
+
+def test_cli_queries_file(tmp_path: Path, monkeypatch, capsys) -> None:
+    queries = tmp_path / "queries.txt"
+    queries.write_text("cats\ndogs\n", encoding="utf-8")
+    out = tmp_path / "out"
+    monkeypatch.setattr(
+        "sys.argv", ["bbid", "--queries-file", str(queries), "--output_dir", str(out)]
+    )
+    page = "murl&quot;:&quot;https://e.test/1.png&quot;"
+    with patch.object(Bing, "_fetch_page", lambda self, n: page if n == 0 else ""), patch.object(
+        Bing, "_http_get", return_value=PNG
+    ):
+        _download.main()
+    printed = capsys.readouterr().out.splitlines()
+    assert sorted(line.split(":")[0] for line in printed) == ["cats", "dogs"]
+    assert QueryCheckpoint(out / ".bbid-checkpoint.jsonl").completed == {"cats", "dogs"}
+
+
+def test_cli_requires_exactly_one_query_source(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr("sys.argv", ["bbid"])
+    with pytest.raises(SystemExit):
+        _download.main()
+    monkeypatch.setattr("sys.argv", ["bbid", "cats", "--queries-file", str(tmp_path / "q")])
+    with pytest.raises(SystemExit):
+        _download.main()
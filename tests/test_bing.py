@@ -1,3 +1,4 @@
+import io
 import tempfile
 import threading
 import unittest
@@ -75,7 +76,7 @@ class TestBingSaveImage(unittest.TestCase):
     def test_save_image_success_returns_true(self, mock_filetype, mock_urlopen):
         fake_image = b"\xff\xd8\xff" * 10
         mock_response = MagicMock()
-        mock_response.read.return_value = fake_image
+        mock_response.read.side_effect = io.BytesIO(fake_image).read
         mock_response.__enter__ = lambda s: s
         mock_response.__exit__ = MagicMock(return_value=False)
         mock_urlopen.return_value = mock_response
@@ -0,0 +1,182 @@
+"""Tests for the scalable Bloom filter and compact seen sets (v3.7.0+)."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from better_bing_image_downloader import (
+    Downloader,
+    DuplicateImageError,
+    ImageEngine,
+    ScalableBloomFilter,
+    WriteError,
+)
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+def test_no_false_negatives_and_bounded_false_positives() -> None:
+    bloom = ScalableBloomFilter(error_rate=0.01, initial_capacity=100)
+    added = [f"https://e.test/{i}.jpg" for i in range(5000)]
+    bloom.update(added)
+    assert all(url in bloom for url in added)
+    false_positives = sum(f"https://other.test/{i}.jpg" in bloom for i in range(20000))
+    assert false_positives / 20000 < 0.01
+    # The chain grew from 100 keys instead of being sized up front.
+    assert len(bloom._filters) > 1
+    assert len(bloom) > 4900
+
+
+def test_memory_is_a_few_bytes_per_key() -> None:
+    bloom = ScalableBloomFilter(error_rate=0.001, initial_capacity=1000)
+    bloom.update(f"https://e.test/{i}.jpg" for i in range(64000))
+    # Under 8 bytes per key even with the newest filter half empty.
+    assert bloom.nbytes < 8 * 64000
+
+
+def test_add_reports_known_keys_and_accepts_bytes() -> None:
+    bloom = ScalableBloomFilter()
+    assert bloom.add("a") is True
+    assert bloom.add("a") is False
+    bloom.add(b"\x00\x01")
+    assert b"\x00\x01" in bloom
+    assert 42 not in bloom
+    assert len(bloom) == 2
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"error_rate": 0},
+        {"error_rate": 1},
+        {"initial_capacity": 0},
+        {"growth": 1},
+        {"tightening": 1},
+    ],
+)
+def test_rejects_bad_parameters(kwargs: dict) -> None:
+    with pytest.raises(ValueError):
+        ScalableBloomFilter(**kwargs)
+
+
+def test_round_trips_through_disk(tmp_path: Path) -> None:
+    bloom = ScalableBloomFilter(error_rate=0.01, initial_capacity=50)
+    keys = [f"k{i}" for i in range(300)]
+    bloom.update(keys)
+    path = tmp_path / "sub" / "seen.bloom"
+    bloom.save(path)
+    loaded = ScalableBloomFilter.load(path)
+    assert all(key in loaded for key in keys)
+    assert (len(loaded), loaded.error_rate, loaded.initial_capacity) == (len(bloom), 0.01, 50)
+    assert loaded.to_bytes() == bloom.to_bytes()
+    # Adding to a loaded filter keeps growing the same chain.
+    loaded.add("new")
+    assert "new" in loaded
+
+
+def test_from_bytes_rejects_other_data() -> None:
+    with pytest.raises(ValueError):
+        ScalableBloomFilter.from_bytes(b"not a filter")
+    data = ScalableBloomFilter().to_bytes()
+    bloom = ScalableBloomFilter()
+    bloom.add("x")
+    with pytest.raises(ValueError):
+        ScalableBloomFilter.from_bytes(bloom.to_bytes()[:-1])
+    assert len(ScalableBloomFilter.from_bytes(data)) == 0
+
+
+def test_concurrent_adds_are_not_lost() -> None:
+    bloom = ScalableBloomFilter(initial_capacity=64)
+    threads = [
+        threading.Thread(target=bloom.update, args=([f"{t}-{i}" for i in range(500)],))
+        for t in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(f"{t}-{i}" in bloom for t in range(8) for i in range(500))
+
+
+class Engine(ImageEngine):
+    def __init__(self, *args, pages=(), **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.pages = pages
+
+    def run(self) -> None:
+        def pages():
+            for page in self.pages:
+                links = self._filter_new_links(page)
+                self.seen.update(links)
+                if links:
+                    yield links
+
+        self._run_pipeline(pages())
+
+    def _http_get(self, url: str, headers: dict | None = None) -> bytes:
+        return PNG + (b"same" if "copy" in url else url.encode())
+
+
+def test_engine_uses_bloom_filters_when_configured(tmp_path: Path) -> None:
+    engine = Engine(
+        "q",
+        10,
+        tmp_path,
+        pages=[["https://e.test/a.png", "https://e.test/a.png?utm_source=x"]],
+        seen_error_rate=0.001,
+    )
+    assert isinstance(engine.seen, ScalableBloomFilter)
+    assert isinstance(engine._seen_keys, ScalableBloomFilter)
+    assert isinstance(engine._file_hashes, ScalableBloomFilter)
+    engine.run()
+    assert engine.download_count == 1
+    assert "https://e.test/a.png" in engine.seen
+
+    with pytest.raises(ValueError):
+        Engine("q", 1, tmp_path, seen_error_rate=1.5)
+
+
+def test_bloom_backed_run_still_dedupes_by_md5(tmp_path: Path) -> None:
+    engine = Engine(
+        "q",
+        10,
+        tmp_path,
+        pages=[["https://e.test/copy1.png", "https://e.test/copy2.png"]],
+        max_workers=1,
+        seen_error_rate=0.001,
+    )
+    engine.run()
+    assert engine.download_count == 1
+
+
+def test_failed_save_does_not_mark_the_digest_seen(tmp_path: Path) -> None:
+    engine = Engine("q", 10, tmp_path, seen_error_rate=0.001)
+    tmp = tmp_path / "tmp.part"
+    tmp.write_bytes(PNG)
+    with pytest.raises(WriteError):
+        engine._commit_saved_file("https://e.test/x.png", str(tmp), tmp_path / "no" / "\0", "ab")
+    # The digest was never committed, so the same image can still be saved.
+    tmp.write_bytes(PNG)
+    engine._commit_saved_file("https://e.test/x.png", str(tmp), tmp_path / "x.png", "ab")
+    tmp.write_bytes(PNG)
+    with pytest.raises(DuplicateImageError):
+        engine._commit_saved_file("https://e.test/y.png", str(tmp), tmp_path / "y.png", "ab")
+
+
+def test_search_threads_seen_error_rate(tmp_path: Path) -> None:
+    engines: list[ImageEngine] = []
+
+    class Fixed(Engine):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, pages=[["https://e.test/a.png"]], **kwargs)
+            engines.append(self)
+
+    with Downloader() as dl:
+        dl.register("fixed", Fixed)
+        result = dl.search("q", limit=1, engine="fixed", output_dir=tmp_path, seen_error_rate=0.01)
+    assert result.count == 1
+    assert isinstance(engines[0].seen, ScalableBloomFilter)
+    assert engines[0].seen.error_rate == 0.01
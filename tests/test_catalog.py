@@ -0,0 +1,139 @@
+"""Tests for the SQLite ``RunCatalog`` (v3.7.0+)."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from better_bing_image_downloader import Bing, Downloader, RunCatalog
+from better_bing_image_downloader import download as _download
+
+PNG = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x08\x00\x00\x00\x08" + b"\x00" * 32
+
+
+def _record(i: int, status: str = "ok") -> dict:
+    return {
+        "status": status,
+        "url": f"https://e.test/{i}.png",
+        "file": f"cats/Image_{i}.png" if status == "ok" else None,
+        "md5": f"{i:032x}" if status == "ok" else None,
+        "error": "NetworkError" if status == "error" else None,
+        "source_page": "https://e.test/page",
+        "downloaded_at": "2026-10-17T00:00:00+00:00",
+    }
+
+
+def test_records_and_lookups(tmp_path: Path) -> None:
+    with RunCatalog(tmp_path / "c.sqlite") as catalog:
+        with catalog.start_run("cats", "bing") as run:
+            run.append(_record(1))
+            run.append(_record(2, "error"))
+        (entry,) = catalog.find(md5=f"{1:032x}")
+        assert (entry.engine, entry.query, entry.url) == ("bing", "cats", "https://e.test/1.png")
+        assert catalog.has_md5(f"{1:032x}") and not catalog.has_md5("0" * 32)
+        assert catalog.has_url("https://e.test/1.png")
+        assert not catalog.has_url("https://e.test/2.png")  # failed, not saved
+        assert [e.url for e in catalog.find(query="cats", status="error")] == [
+            "https://e.test/2.png"
+        ]
+        assert catalog.status_counts(query="cats") == {"ok": 1, "error": 1}
+        assert catalog.status_counts(query="dogs") == {}
+        assert len(catalog) == 2
+
+
+def test_runs_are_marked_finished(tmp_path: Path) -> None:
+    path = tmp_path / "c.sqlite"
+    with RunCatalog(path) as catalog:
+        run = catalog.start_run("cats", "bing")
+        run.append(_record(1))
+        run.close()
+        run.close()
+        run.append(_record(2))
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute("SELECT query, finished_at FROM runs").fetchall()
+        (count,) = conn.execute("SELECT COUNT(*) FROM attempts").fetchone()
+    assert [(query, finished is not None) for query, finished in rows] == [("cats", True)]
+    assert count == 1
+
+
+def test_lookups_use_the_indexes(tmp_path: Path) -> None:
+    path = tmp_path / "c.sqlite"
+    with RunCatalog(path) as catalog:
+        catalog.start_run("cats", "bing").close()
+    with sqlite3.connect(path) as conn:
+        for column in ("md5", "url", "query"):
+            plan = conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM attempts WHERE {column} = 'x'"
+            ).fetchall()
+            assert "USING INDEX" in " ".join(str(row[-1]) for row in plan)
+
+
+def test_concurrent_records_are_committed_in_batches(tmp_path: Path) -> None:
+    with RunCatalog(tmp_path / "c.sqlite", batch_size=1000, flush_interval=10) as catalog:
+        run = catalog.start_run("cats", "bing")
+        threads = [
+            threading.Thread(
+                target=lambda n=n: [run.append(_record(n * 100 + i)) for i in range(100)]
+            )
+            for n in range(8)
+        ]
+        with patch.object(catalog, "_commit", wraps=catalog._commit) as commit:
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert len(catalog) == 800
+        assert commit.call_count <= 2
+
+
+def test_reopens_after_close(tmp_path: Path) -> None:
+    catalog = RunCatalog(tmp_path / "c.sqlite")
+    catalog.start_run("cats", "bing").append(_record(1))
+    catalog.close()
+    catalog.close()
+    catalog.start_run("dogs", "bing").append(_record(2))
+    assert len(catalog) == 2
+    catalog.close()
+
+
+def test_rejects_bad_arguments(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        RunCatalog(tmp_path / "c.sqlite", batch_size=0)
+    with pytest.raises(ValueError):
+        RunCatalog(tmp_path / "c.sqlite", flush_interval=-1)
+
+
+def test_downloader_records_every_query_in_one_catalog(tmp_path: Path) -> None:
+    urls = [f"https://e.test/{i}.png" for i in range(3)]
+    page = "".join(f"murl&quot;:&quot;{u}&quot;" for u in urls)
+
+    def http_get(url: str, *args, **kwargs) -> bytes:
+        if url.endswith("/2.png"):
+            raise OSError("connection reset")
+        return PNG + url.encode()
+
+    with patch.object(Bing, "_fetch_page", lambda self, n: page if n == 0 else ""), patch.object(
+        Bing, "_http_get", side_effect=http_get
+    ), Downloader() as dl:
+        for query in ("cats", "dogs"):
+            dl.search(query, limit=3, output_dir=tmp_path, catalog=True, max_workers=4)
+    with RunCatalog(tmp_path / ".bbid-catalog.sqlite") as catalog:
+        assert catalog.status_counts() == {"ok": 4, "error": 2}
+        assert {e.query for e in catalog.find(url="https://e.test/0.png")} == {"cats", "dogs"}
+        (failed,) = catalog.find(query="dogs", status="error")
+        assert failed.url == "https://e.test/2.png"
+
+
+def test_cli_catalog(tmp_path: Path, monkeypatch) -> None:
+    db = tmp_path / "runs.sqlite"
+    monkeypatch.setattr(
+        "sys.argv", ["bbid", "cats", "--output_dir", str(tmp_path), "--catalog", str(db)]
+    )
+    with patch.object(Bing, "_fetch_page", return_value=""):
+        _download.main()
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("SELECT query, engine FROM runs").fetchall() == [("cats", "bing")]
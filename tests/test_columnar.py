@@ -0,0 +1,133 @@
+"""Tests for pluggable manifest sinks and the Parquet manifest (v3.7.0+)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from better_bing_image_downloader import Bing, Downloader, ManifestFieldError, ManifestSink
+from better_bing_image_downloader import download as _download
+from better_bing_image_downloader.manifest import BackgroundManifestWriter, open_manifest_sink
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from better_bing_image_downloader import ParquetManifestWriter  # noqa: E402
+
+PNG = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x08\x00\x00\x00\x08" + b"\x00" * 32
+
+
+def _record(i: int, status: str = "ok") -> dict:
+    return {
+        "index": i,
+        "status": status,
+        "url": f"https://e.test/{i}.png",
+        "md5": f"{i:032x}",
+        "engine": "bing",
+        "query": "cats",
+    }
+
+
+def test_writers_are_sinks(tmp_path: Path) -> None:
+    jsonl = open_manifest_sink("jsonl", tmp_path / "m.jsonl")
+    parquet = open_manifest_sink("parquet", tmp_path / "m.parquet")
+    assert isinstance(jsonl, BackgroundManifestWriter)
+    assert isinstance(parquet, ParquetManifestWriter)
+    assert all(isinstance(sink, ManifestSink) for sink in (jsonl, parquet))
+    jsonl.close()
+    parquet.close()
+    with pytest.raises(ValueError):
+        open_manifest_sink("csv", tmp_path / "m.csv")
+
+
+def test_row_groups_and_encodings(tmp_path: Path) -> None:
+    with ParquetManifestWriter(tmp_path / "m.parquet", row_group_size=4) as writer:
+        for i in range(10):
+            writer.append(_record(i, "ok" if i % 3 else "error"))
+    metadata = pq.ParquetFile(writer.path).metadata
+    assert metadata.num_rows == 10
+    assert metadata.num_row_groups == 3
+    columns = {
+        metadata.row_group(0).column(c).path_in_schema: metadata.row_group(0).column(c)
+        for c in range(metadata.num_columns)
+    }
+    assert "RLE_DICTIONARY" in columns["status"].encodings
+    assert "RLE_DICTIONARY" not in columns["url"].encodings
+    assert columns["index"].statistics.min == 0 and columns["index"].statistics.max == 3
+
+
+def test_reads_only_the_requested_columns(tmp_path: Path) -> None:
+    path = tmp_path / "m.parquet"
+    with ParquetManifestWriter(path) as writer:
+        for i in range(5):
+            writer.append(_record(i))
+    table = pq.read_table(path, columns=["status", "md5", "url"])
+    assert table.column_names == ["status", "md5", "url"]
+    assert table.column("url").to_pylist() == [f"https://e.test/{i}.png" for i in range(5)]
+    assert table.column("status").type.value_type == "string"
+
+
+def test_each_writer_adds_a_part(tmp_path: Path) -> None:
+    path = tmp_path / "m.parquet"
+    for run in range(2):
+        with ParquetManifestWriter(path, fields=["index", "url"]) as writer:
+            writer.append({"index": run, "url": "u", "status": "ignored"})
+    assert len(list(path.glob("part-*.parquet"))) == 2
+    table = pq.read_table(path)
+    assert table.column_names == ["index", "url"]
+    assert sorted(table.column("index").to_pylist()) == [0, 1]
+
+
+def test_part_is_hidden_until_closed(tmp_path: Path) -> None:
+    path = tmp_path / "m.parquet"
+    writer = ParquetManifestWriter(path)
+    writer.append(_record(1))
+    assert not writer.path.exists()
+    assert pq.read_table(path).num_rows == 0
+    writer.close()
+    writer.close()
+    writer.append(_record(2))
+    assert pq.read_table(path).num_rows == 1
+
+
+def test_rejects_bad_arguments(tmp_path: Path) -> None:
+    with pytest.raises(ManifestFieldError):
+        ParquetManifestWriter(tmp_path / "m.parquet", fields=["colour"])
+    with pytest.raises(ValueError):
+        ParquetManifestWriter(tmp_path / "m.parquet", row_group_size=0)
+
+
+def test_downloader_writes_a_parquet_manifest(tmp_path: Path) -> None:
+    urls = [f"https://e.test/{i}.png" for i in range(4)]
+    page = "".join(f"murl&quot;:&quot;{u}&quot;" for u in urls)
+    with patch.object(Bing, "_fetch_page", lambda self, n: page if n == 0 else ""), patch.object(
+        Bing, "_http_get", side_effect=lambda url, *a, **k: PNG + url.encode()
+    ), Downloader() as dl:
+        result = dl.search(
+            "cats", limit=4, output_dir=tmp_path, manifest=True, manifest_format="parquet"
+        )
+    part = Path(result.manifest_path)
+    assert part.parent == (tmp_path / "cats" / "manifest.parquet").resolve()
+    table = pq.read_table(part.parent)
+    assert sorted(table.column("url").to_pylist()) == urls
+    assert set(table.column("status").to_pylist()) == {"ok"}
+
+
+def test_cli_manifest_format(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(
+        "sys.argv",
+        [
+            "bbid",
+            "cats",
+            "--output_dir",
+            str(tmp_path),
+            "--manifest",
+            "--manifest-format",
+            "parquet",
+        ],
+    )
+    with patch.object(Bing, "_fetch_page", return_value=""):
+        _download.main()
+    assert (tmp_path / "cats" / "manifest.parquet").is_dir()
+    assert not (tmp_path / "cats" / "manifest.jsonl").exists()
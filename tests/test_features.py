@@ -1,3 +1,4 @@
+import io
 import json
 from unittest.mock import MagicMock, patch
 
@@ -107,11 +108,15 @@ class TestDeduplication:
         with patch("better_bing_image_downloader.base.urllib.request.urlopen") as mock_open, patch(
             "better_bing_image_downloader.base.filetype.guess"
         ) as mock_ft:
-            mock_response = MagicMock()
-            mock_response.read.return_value = fake_image
-            mock_response.__enter__ = lambda s: s
-            mock_response.__exit__ = MagicMock(return_value=False)
-            mock_open.return_value = mock_response
+
+            def make_response(*_args, **_kwargs):
+                r = MagicMock()
+                r.read.side_effect = io.BytesIO(fake_image).read
+                r.__enter__ = lambda s: s
+                r.__exit__ = MagicMock(return_value=False)
+                return r
+
+            mock_open.side_effect = make_response
             mock_kind = MagicMock()
             mock_kind.mime = "image/jpeg"
             mock_ft.return_value = mock_kind
@@ -135,7 +140,7 @@ class TestDeduplication:
 
             def make_response(content):
                 r = MagicMock()
-                r.read.return_value = content
+                r.read.side_effect = io.BytesIO(content).read
                 r.__enter__ = lambda s: s
                 r.__exit__ = MagicMock(return_value=False)
                 return r
@@ -0,0 +1,152 @@
+"""Tests for the persistent cross-run hash index (v3.7.0+)."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from pathlib import Path
+
+import pytest
+
+from better_bing_image_downloader import (
+    Downloader,
+    DuplicateImageError,
+    HashIndex,
+    ImageEngine,
+)
+from better_bing_image_downloader.hashindex import HASH_INDEX_FILENAME
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+def _md5(data: bytes) -> str:
+    return hashlib.md5(data).hexdigest()
+
+
+class Engine(ImageEngine):
+    """Serves the same PNG body for every URL ending in ``same.png``."""
+
+    def run(self) -> None:
+        pass
+
+    def _http_get(self, url: str, headers: dict | None = None) -> bytes:
+        return PNG if url.endswith("same.png") else PNG + url.encode()
+
+
+def test_digests_persist_across_instances(tmp_path: Path) -> None:
+    path = tmp_path / "hashes"
+    with HashIndex(path) as index:
+        assert index.claim(_md5(b"a"))
+        index.commit(_md5(b"a"))
+        index.commit(_md5(b"a"))
+    assert path.stat().st_size == 8 + 16
+    reloaded = HashIndex(path)
+    assert _md5(b"a") in reloaded
+    assert not reloaded.claim(_md5(b"a"))
+    assert len(reloaded) == 1
+
+
+def test_claim_is_exclusive_until_released(tmp_path: Path) -> None:
+    index = HashIndex(tmp_path / "hashes")
+    digest = _md5(b"x")
+    assert index.claim(digest)
+    assert not index.claim(digest)
+    index.release(digest)
+    assert index.claim(digest)
+    assert not (tmp_path / "hashes").exists()
+
+
+def test_truncated_record_ignored_and_repaired(tmp_path: Path) -> None:
+    path = tmp_path / "hashes"
+    with HashIndex(path) as index:
+        index.commit(_md5(b"a"))
+    with open(path, "ab") as f:
+        f.write(b"\x01\x02\x03")
+    with HashIndex(path) as index:
+        assert len(index) == 1
+        index.commit(_md5(b"b"))
+    assert path.stat().st_size == 8 + 32
+    assert len(HashIndex(path)) == 2
+
+
+def test_compact_merges_other_writers(tmp_path: Path) -> None:
+    path = tmp_path / "hashes"
+    first, second = HashIndex(path), HashIndex(path)
+    first.commit(_md5(b"a"))
+    second.commit(_md5(b"a"))
+    second.commit(_md5(b"b"))
+    assert first.compact() == 2
+    assert path.stat().st_size == 8 + 32
+    assert _md5(b"b") in first
+
+
+def test_foreign_file_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "hashes"
+    path.write_bytes(b"not an index at all")
+    with pytest.raises(ValueError):
+        len(HashIndex(path))
+
+
+def test_engine_rejects_images_from_earlier_runs(tmp_path: Path) -> None:
+    path = tmp_path / "hashes"
+    first = Engine("q", 5, tmp_path / "a", hash_index=path)
+    first._save_image_raising("https://a.test/same.png", tmp_path / "a" / "Image_1.png")
+    second = Engine("q", 5, tmp_path / "b", hash_index=path)
+    with pytest.raises(DuplicateImageError, match="hashes"):
+        second._save_image_raising("https://b.test/same.png", tmp_path / "b" / "Image_1.png")
+    assert not list((tmp_path / "b").iterdir())
+    # Unrelated images are still saved and recorded.
+    assert second.save_image("https://b.test/other.png", tmp_path / "b" / "Image_2.png")
+    assert len(HashIndex(path)) == 2
+
+
+def test_force_replace_records_without_rejecting(tmp_path: Path) -> None:
+    index = HashIndex(tmp_path / "hashes")
+    index.commit(_md5(PNG))
+    engine = Engine("q", 5, tmp_path, hash_index=index, force_replace=True)
+    assert engine.save_image("https://a.test/same.png", tmp_path / "Image_1.png")
+    assert len(index) == 1
+
+
+def test_concurrent_saves_keep_one_copy(tmp_path: Path) -> None:
+    index = HashIndex(tmp_path / "hashes")
+    engines = [Engine("q", 5, tmp_path / str(i), hash_index=index) for i in range(4)]
+    saved = []
+    threads = [
+        threading.Thread(
+            target=lambda e=e: saved.append(
+                e.save_image("https://x.test/same.png", e.output_dir / "Image_1.png")
+            )
+        )
+        for e in engines
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert saved.count(True) == 1
+
+
+def test_search_keeps_index_in_query_dir(tmp_path: Path) -> None:
+    class OneImage(Engine):
+        def run(self) -> None:
+            self.download_image("https://a.test/same.png", self._slots_used + 1)
+
+    with Downloader() as dl:
+        dl.register("one", OneImage)
+        first = dl.search("cats", limit=1, engine="one", output_dir=tmp_path, hash_index=True)
+        assert (tmp_path / "cats" / HASH_INDEX_FILENAME).exists()
+        again = dl.search(
+            "cats", limit=1, engine="one", output_dir=tmp_path / "again", hash_index=True
+        )
+        shared = tmp_path / "shared"
+        dl.search("dogs", limit=1, engine="one", output_dir=tmp_path, hash_index=shared)
+        repeat = dl.search(
+            "cats", limit=1, engine="one", output_dir=tmp_path / "third", hash_index=shared
+        )
+    assert first.count == 1
+    # A different output directory has its own index.
+    assert again.count == 1
+    # The shared index already holds the dogs image.
+    assert repeat.count == 0
+    assert isinstance(repeat.errors[0][1], DuplicateImageError)
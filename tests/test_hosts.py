@@ -0,0 +1,231 @@
+"""Tests for per-host dispatch and politeness limits (v3.7.0+)."""
+
+from __future__ import annotations
+
+import email.message
+import math
+import socket
+import threading
+import time
+import urllib.error
+from pathlib import Path
+
+import pytest
+
+from better_bing_image_downloader import Downloader, HostTracker, ImageEngine, NetworkError
+from better_bing_image_downloader.hosts import HostQueue, host_of
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _http_error(code: int, retry_after: str | None = None) -> NetworkError:
+    headers = email.message.Message()
+    if retry_after is not None:
+        headers["Retry-After"] = retry_after
+    cause = urllib.error.HTTPError("https://a.test/x.jpg", code, "err", headers, None)
+    error = NetworkError(url="https://a.test/x.jpg", message=f"network error: {cause}")
+    error.__cause__ = cause
+    return error
+
+
+def _drain(queue: HostQueue) -> list[str]:
+    links = []
+    while True:
+        taken = queue.pop()
+        if not isinstance(taken, tuple):
+            return links
+        links.append(taken[0])
+
+
+def test_links_interleaved_across_hosts() -> None:
+    queue = HostQueue(HostTracker(max_per_host=0))
+    for link in [
+        "https://a.test/1",
+        "https://a.test/2",
+        "https://a.test/3",
+        "https://b.test/1",
+        "https://b.test/2",
+        "https://c.test/1",
+    ]:
+        queue.put(link)
+    assert [host_of(link) for link in _drain(queue)] == [
+        "a.test",
+        "b.test",
+        "c.test",
+        "a.test",
+        "b.test",
+        "a.test",
+    ]
+    assert len(queue) == 0
+
+
+def test_per_host_cap_holds_back_links() -> None:
+    tracker = HostTracker(max_per_host=2)
+    queue = HostQueue(tracker)
+    for i in range(3):
+        queue.put(f"https://a.test/{i}")
+    assert len(_drain(queue)) == 2
+    assert queue.pop() == math.inf
+    tracker.end("a.test")
+    assert queue.pop() == ("https://a.test/2", "a.test")
+
+
+def test_min_delay_spaces_requests() -> None:
+    clock = FakeClock()
+    queue = HostQueue(HostTracker(max_per_host=0, min_delay=0.5, clock=clock))
+    queue.put("https://a.test/1")
+    queue.put("https://a.test/2")
+    assert isinstance(queue.pop(), tuple)
+    assert queue.pop() == pytest.approx(0.5)
+    clock.now += 0.5
+    assert isinstance(queue.pop(), tuple)
+
+
+def test_throttling_response_starts_cooldown() -> None:
+    clock = FakeClock()
+    tracker = HostTracker(clock=clock)
+    queue = HostQueue(tracker)
+    tracker.observe("a.test", 0.1, _http_error(429, retry_after="5"))
+    queue.put("https://a.test/1")
+    queue.put("https://b.test/1")
+    # The throttled host is skipped; the other one is served.
+    assert queue.pop() == ("https://b.test/1", "b.test")
+    assert queue.pop() == pytest.approx(5.0)
+    clock.now += 5
+    assert queue.pop() == ("https://a.test/1", "a.test")
+    stats = tracker.stats()["a.test"]
+    assert (stats.failures, stats.throttled) == (1, 1)
+
+
+def test_cooldown_doubles_and_resets_on_success() -> None:
+    clock = FakeClock()
+    tracker = HostTracker(clock=clock)
+    queue = HostQueue(tracker)
+    tracker.observe("a.test", 0.1, _http_error(503))
+    tracker.observe("a.test", 0.1, _http_error(503))
+    queue.put("https://a.test/1")
+    assert queue.pop() == pytest.approx(2.0)
+    clock.now += 2
+    tracker.observe("a.test", 0.1)
+    tracker.observe("a.test", 0.1, _http_error(429))
+    assert queue.pop() == pytest.approx(1.0)
+
+
+def test_timeouts_throttle_but_other_errors_do_not() -> None:
+    clock = FakeClock()
+    tracker = HostTracker(clock=clock)
+    timeout = NetworkError(url="https://a.test/x", message="timed out")
+    timeout.__cause__ = urllib.error.URLError(socket.timeout("timed out"))
+    tracker.observe("a.test", 1.0, timeout)
+    tracker.observe("b.test", 1.0, _http_error(404))
+    queue = HostQueue(tracker)
+    queue.put("https://a.test/1")
+    queue.put("https://b.test/1")
+    assert queue.pop() == ("https://b.test/1", "b.test")
+    assert tracker.stats()["a.test"].throttled == 1
+    assert tracker.stats()["b.test"].throttled == 0
+
+
+def test_slow_host_limited_to_one_request() -> None:
+    tracker = HostTracker(max_per_host=4)
+    tracker.observe("fast.test", 0.1)
+    tracker.observe("other.test", 0.1)
+    tracker.observe("slow.test", 2.0)
+    assert tracker.stats()["slow.test"].slow
+    assert not tracker.stats()["fast.test"].slow
+    queue = HostQueue(tracker)
+    for i in range(3):
+        queue.put(f"https://slow.test/{i}")
+    assert len(_drain(queue)) == 1
+
+
+def test_invalid_limits() -> None:
+    with pytest.raises(ValueError):
+        HostTracker(max_per_host=-1)
+    with pytest.raises(ValueError):
+        HostTracker(min_delay=-0.1)
+
+
+class HostRecordingEngine(ImageEngine):
+    """Pipelined engine recording the peak concurrency per host."""
+
+    def __init__(self, *args, links=(), **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.links = list(links)
+        self.active: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self.order: list[str] = []
+        self._active_lock = threading.Lock()
+
+    def run(self) -> None:
+        self._run_pipeline(iter([self.links]))
+
+    def download_image(self, link: str, index: int):
+        host = host_of(link)
+        with self._active_lock:
+            self.order.append(host)
+            self.active[host] = self.active.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.active[host])
+        time.sleep(0.02)
+        with self._active_lock:
+            self.active[host] -= 1
+        with self._count_lock:
+            self.download_count += 1
+            self._slots_used += 1
+        return index
+
+
+def test_pipeline_respects_per_host_cap(tmp_path: Path) -> None:
+    links = [f"https://a.test/{i}.jpg" for i in range(8)] + [
+        f"https://b.test/{i}.jpg" for i in range(8)
+    ]
+    engine = HostRecordingEngine("q", 16, tmp_path, max_workers=8, max_per_host=2, links=links)
+    engine.run()
+    assert engine.download_count == 16
+    assert engine.peak == {"a.test": 2, "b.test": 2}
+    # Page order was a* then b*, but b's links started straight away.
+    assert "b.test" in engine.order[:3]
+
+
+def test_single_host_run_uses_every_worker_by_default(tmp_path: Path) -> None:
+    links = [f"https://a.test/{i}.jpg" for i in range(16)]
+    engine = HostRecordingEngine("q", 16, tmp_path, max_workers=8, links=links)
+    engine.run()
+    assert engine.hosts.max_per_host == 0
+    assert engine.peak == {"a.test": 8}
+
+
+def test_save_path_reports_latency_and_errors(tmp_path: Path) -> None:
+    class Failing(ImageEngine):
+        def run(self) -> None:
+            pass
+
+        def _http_get(self, url: str, headers: dict | None = None) -> bytes:
+            raise urllib.error.HTTPError(url, 429, "Too Many Requests", None, None)
+
+    engine = Failing("q", 1, tmp_path)
+    assert not engine.save_image("https://cdn.test/a.jpg", tmp_path / "a.jpg")
+    stats = engine.hosts.stats()["cdn.test"]
+    assert (stats.requests, stats.failures, stats.throttled) == (1, 1, 1)
+
+
+def test_search_forwards_host_limits(tmp_path: Path) -> None:
+    seen = []
+
+    class Recorder(ImageEngine):
+        def run(self) -> None:
+            seen.append((self.hosts.max_per_host, self.hosts.min_delay))
+
+    with Downloader() as dl:
+        dl.register("rec", Recorder)
+        dl.search("cats", limit=1, engine="rec", output_dir=tmp_path)
+        dl.search(
+            "cats", limit=1, engine="rec", output_dir=tmp_path, max_per_host=1, min_host_delay=0.2
+        )
+    assert seen == [(0, 0.0), (1, 0.2)]
@@ -0,0 +1,191 @@
+"""Tests for conditional image requests through ``HTTPCache`` (v3.7.0+).
+
+Images are served by a local HTTP/1.1 server that honours
+``If-None-Match``, so the bytes saved by revalidation are observable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from better_bing_image_downloader import AsyncBing, Bing, Downloader, HTTPCache
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    version = 1
+    full = 0
+    not_modified = 0
+    lock = threading.Lock()
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        cls = type(self)
+        etag = f'"v{cls.version}"'
+        if self.headers.get("If-None-Match") == etag:
+            with cls.lock:
+                cls.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        body = PNG + f"{self.path} v{cls.version}".encode()
+        with cls.lock:
+            cls.full += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", "Mon, 05 Oct 2026 10:00:00 GMT")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.version = 1
+    _Handler.full = _Handler.not_modified = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _bing_page(urls: list[str]) -> str:
+    return "".join(f"murl&quot;:&quot;{u}&quot;" for u in urls)
+
+
+def _run_bing(urls: list[str], output_dir: Path, cache: HTTPCache) -> Bing:
+    page = _bing_page(urls)
+    with patch.object(Bing, "_fetch_page", lambda self, n: page if n == 0 else ""):
+        engine = Bing(
+            "cats",
+            len(urls),
+            output_dir,
+            "off",
+            5,
+            "",
+            False,
+            force_replace=True,
+            http_cache=cache,
+        )
+        engine.run()
+    return engine
+
+
+def test_store_and_lookup(tmp_path: Path) -> None:
+    body = tmp_path / "a.png"
+    body.write_bytes(PNG)
+    cache = HTTPCache(tmp_path / "cache")
+    cache.store("https://e.test/a.png", '"x"', None, body, "d41d8cd9")
+    entry = cache.lookup("https://e.test/a.png")
+    assert entry is not None
+    assert entry.validators() == {"If-None-Match": '"x"'}
+    assert entry.path.read_bytes() == PNG
+    assert os.path.samefile(entry.path, body)  # hard link, not a copy
+    assert cache.lookup("https://e.test/b.png") is None
+    assert len(cache) == 1
+
+
+def test_responses_without_validators_are_not_stored(tmp_path: Path) -> None:
+    body = tmp_path / "a.png"
+    body.write_bytes(PNG)
+    cache = HTTPCache(tmp_path / "cache")
+    cache.store("https://e.test/a.png", None, None, body, "d41d8cd9")
+    assert len(cache) == 0
+
+
+def test_entry_without_body_is_a_miss(tmp_path: Path) -> None:
+    body = tmp_path / "a.png"
+    body.write_bytes(PNG)
+    with HTTPCache(tmp_path / "cache") as cache:
+        cache.store("u", None, "Mon, 05 Oct 2026 10:00:00 GMT", body, "abcd")
+        cache.lookup("u").path.unlink()  # type: ignore[union-attr]
+        assert cache.lookup("u") is None
+
+
+def test_refresh_revalidates_instead_of_downloading(server: str, tmp_path: Path) -> None:
+    urls = [f"{server}/{i}.png" for i in range(3)]
+    cache = HTTPCache(tmp_path / "cache")
+    _run_bing(urls, tmp_path / "out", cache)
+    first = {p.name: p.read_bytes() for p in (tmp_path / "out").iterdir()}
+    assert (_Handler.full, _Handler.not_modified) == (3, 0)
+
+    engine = _run_bing(urls, tmp_path / "out", cache)
+    assert engine.download_count == 3
+    assert (_Handler.full, _Handler.not_modified) == (3, 3)
+    assert {p.name: p.read_bytes() for p in (tmp_path / "out").iterdir()} == first
+
+
+def test_changed_images_are_downloaded_again(server: str, tmp_path: Path) -> None:
+    urls = [f"{server}/a.png"]
+    cache = HTTPCache(tmp_path / "cache")
+    _run_bing(urls, tmp_path / "one", cache)
+    _Handler.version = 2
+    _run_bing(urls, tmp_path / "two", cache)
+    assert (_Handler.full, _Handler.not_modified) == (2, 0)
+    (saved,) = (tmp_path / "two").iterdir()
+    assert saved.read_bytes().endswith(b"v2")
+    assert cache.lookup(urls[0]).etag == '"v2"'  # type: ignore[union-attr]
+
+
+def test_corrupted_body_is_fetched_in_full(server: str, tmp_path: Path) -> None:
+    urls = [f"{server}/a.png"]
+    cache = HTTPCache(tmp_path / "cache")
+    _run_bing(urls, tmp_path / "one", cache)
+    # Editing the saved image also edits the hard-linked cached body.
+    (saved,) = (tmp_path / "one").iterdir()
+    saved.write_bytes(PNG + b"edited")
+    engine = _run_bing(urls, tmp_path / "two", cache)
+    assert engine.download_count == 1
+    assert (_Handler.full, _Handler.not_modified) == (2, 1)
+    (fresh,) = (tmp_path / "two").iterdir()
+    assert fresh.read_bytes().endswith(b"v1")
+
+
+def test_async_engine_revalidates(server: str, tmp_path: Path) -> None:
+    urls = [f"{server}/{i}.png" for i in range(2)]
+    cache = HTTPCache(tmp_path / "cache")
+    for _ in range(2):
+        with patch.object(AsyncBing, "_fetch_page_async", side_effect=[_bing_page(urls), ""]):
+            engine = AsyncBing(
+                "cats",
+                2,
+                tmp_path / "out",
+                "off",
+                5,
+                "",
+                False,
+                force_replace=True,
+                http_cache=cache,
+            )
+            asyncio.run(engine.run_async())
+        assert engine.download_count == 2
+    assert (_Handler.full, _Handler.not_modified) == (2, 2)
+
+
+def test_downloader_keeps_the_cache_in_the_output_tree(server: str, tmp_path: Path) -> None:
+    page = _bing_page([f"{server}/a.png"])
+    with patch.object(
+        Bing, "_fetch_page", lambda self, n: page if n == 0 else ""
+    ), Downloader() as dl:
+        for _ in range(2):
+            result = dl.search(
+                "cats", limit=1, output_dir=tmp_path, force_replace=True, http_cache=True
+            )
+            assert result.count == 1
+    assert (_Handler.full, _Handler.not_modified) == (1, 1)
+    assert (tmp_path / ".bbid-http" / "index.sqlite").exists()
@@ -0,0 +1,85 @@
+"""Tests for the incremental legacy ``_manifest.json`` writer (v3.7.0+)."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from better_bing_image_downloader import download as _download
+
+
+def _result(entries: dict) -> SimpleNamespace:
+    return SimpleNamespace(_engine=SimpleNamespace(manifest=entries), images=[])
+
+
+def _write(tmp_path: Path, entries: dict) -> Path:
+    _download._write_legacy_manifest(tmp_path, _result(entries))
+    return tmp_path / "_manifest.json"
+
+
+def test_appends_match_a_full_rewrite(tmp_path: Path) -> None:
+    path = _write(tmp_path, {})
+    assert path.read_text() == "{}"
+    _write(tmp_path, {"Image_1.jpg": "https://e.test/1.jpg"})
+    _write(tmp_path, {"Image_2.jpg": "https://e.test/2.jpg", "Image_3.jpg": "https://e.test/ü"})
+    expected = {
+        "Image_1.jpg": "https://e.test/1.jpg",
+        "Image_2.jpg": "https://e.test/2.jpg",
+        "Image_3.jpg": "https://e.test/ü",
+    }
+    assert path.read_text() == json.dumps(expected, indent=2)
+
+
+def test_existing_entries_are_not_read(tmp_path: Path) -> None:
+    path = tmp_path / "_manifest.json"
+    old = {f"Image_{i}.jpg": f"https://e.test/{i}.jpg" for i in range(20_000)}
+    path.write_text(json.dumps(old, indent=2))
+    with patch.object(_download.json, "load", side_effect=AssertionError("full read")):
+        _write(tmp_path, {"Image_new.jpg": "https://e.test/new.jpg"})
+    data = json.loads(path.read_text())
+    assert len(data) == 20_001 and data["Image_new.jpg"] == "https://e.test/new.jpg"
+
+
+def test_later_runs_win_for_repeated_names(tmp_path: Path) -> None:
+    _write(tmp_path, {"Image_1.jpg": "https://e.test/old.jpg"})
+    path = _write(tmp_path, {"Image_1.jpg": "https://e.test/new.jpg"})
+    assert json.loads(path.read_text()) == {"Image_1.jpg": "https://e.test/new.jpg"}
+
+
+def test_a_run_without_entries_leaves_the_file_alone(tmp_path: Path) -> None:
+    path = tmp_path / "_manifest.json"
+    path.write_text('{"Image_1.jpg": "https://e.test/1.jpg"}\n')
+    _download._write_legacy_manifest(tmp_path, None)
+    assert path.read_text() == '{"Image_1.jpg": "https://e.test/1.jpg"}\n'
+    _write(tmp_path, {"Image_2.jpg": "https://e.test/2.jpg"})
+    assert json.loads(path.read_text()) == {
+        "Image_1.jpg": "https://e.test/1.jpg",
+        "Image_2.jpg": "https://e.test/2.jpg",
+    }
+
+
+def test_a_torn_file_is_rewritten(tmp_path: Path) -> None:
+    path = tmp_path / "_manifest.json"
+    path.write_text('{\n  "Image_1.jpg": "https://e.te')
+    _write(tmp_path, {"Image_2.jpg": "https://e.test/2.jpg"})
+    assert json.loads(path.read_text()) == {"Image_2.jpg": "https://e.test/2.jpg"}
+
+
+def test_repeated_runs_over_the_same_names_stay_bounded(tmp_path: Path) -> None:
+    names = [f"Image_{i}.jpg" for i in range(1, 101)]
+    path = _write(tmp_path, {name: f"https://e.test/0/{name}" for name in names})
+    compacted = path.stat().st_size
+    for run in range(1, 11):
+        _write(tmp_path, {name: f"https://e.test/{run}/{name}" for name in names})
+        assert path.stat().st_size <= 3 * compacted + 100
+    assert json.loads(path.read_text()) == {name: f"https://e.test/10/{name}" for name in names}
+
+
+def test_appends_between_compactions_skip_the_full_read(tmp_path: Path) -> None:
+    _write(tmp_path, {f"Image_{i}.jpg": f"https://e.test/{i}.jpg" for i in range(1000)})
+    with patch.object(_download.json, "load", side_effect=AssertionError("full read")):
+        _write(tmp_path, {"Image_1.jpg": "https://e.test/again.jpg"})
+    with open(tmp_path / "_manifest.json") as f:
+        assert json.load(f)["Image_1.jpg"] == "https://e.test/again.jpg"
@@ -0,0 +1,187 @@
+"""Tests for the threaded, batching ``BackgroundManifestWriter`` (v3.7.0+)."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from better_bing_image_downloader import BackgroundManifestWriter, Bing, Downloader, ManifestWriter
+from better_bing_image_downloader import manifest as _manifest
+
+PNG = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x08\x00\x00\x00\x08" + b"\x00" * 32
+
+
+def _records(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class _CountingFile:
+    """Wraps the writer's file and counts write calls."""
+
+    def __init__(self, fp) -> None:
+        self.fp = fp
+        self.writes = 0
+
+    def write(self, data: str) -> int:
+        self.writes += 1
+        return self.fp.write(data)
+
+    def __getattr__(self, name: str):
+        return getattr(self.fp, name)
+
+
+@pytest.mark.parametrize("cls", [ManifestWriter, BackgroundManifestWriter])
+def test_concurrent_appends_write_whole_lines(cls, tmp_path: Path) -> None:
+    path = tmp_path / "m.jsonl"
+    writer = cls(path, fields=["url", "query"])
+
+    def worker(n: int) -> None:
+        for i in range(200):
+            writer.append({"url": f"https://e.test/{n}/{i}.png", "query": "x" * 500})
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    writer.close()
+    urls = [r["url"] for r in _records(path)]
+    assert len(urls) == len(set(urls)) == 16 * 200
+    # Each worker's records keep their order.
+    mine = [u for u in urls if u.startswith("https://e.test/7/")]
+    assert mine == [f"https://e.test/7/{i}.png" for i in range(200)]
+
+
+def test_queued_records_share_one_write(tmp_path: Path) -> None:
+    writer = BackgroundManifestWriter(tmp_path / "m.jsonl", flush_every=100, flush_interval=10)
+    counting = _CountingFile(writer._fp)
+    writer._fp = counting  # type: ignore[assignment]
+    for i in range(100):
+        writer.append({"url": str(i)})
+    writer.checkpoint()
+    assert counting.writes == 1
+    writer.close()
+    assert len(_records(tmp_path / "m.jsonl")) == 100
+
+
+def test_records_are_written_after_the_flush_interval(tmp_path: Path) -> None:
+    path = tmp_path / "m.jsonl"
+    with BackgroundManifestWriter(path, flush_every=1000, flush_interval=0.05) as writer:
+        writer.append({"url": "a"})
+        deadline = time.monotonic() + 5
+        while not path.read_text(encoding="utf-8") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [r["url"] for r in _records(path)] == ["a"]
+
+
+def test_checkpoint_fsyncs(tmp_path: Path) -> None:
+    with patch.object(_manifest.os, "fsync") as fsync:
+        with BackgroundManifestWriter(tmp_path / "m.jsonl", flush_every=1000) as writer:
+            writer.append({"url": "a"})
+            writer.checkpoint()
+            assert fsync.call_count == 1
+            assert len(_records(tmp_path / "m.jsonl")) == 1
+        # close() is a checkpoint too.
+        assert fsync.call_count == 2
+
+
+def test_fsync_every_batch(tmp_path: Path) -> None:
+    with patch.object(_manifest.os, "fsync") as fsync, BackgroundManifestWriter(
+        tmp_path / "m.jsonl", fsync=True
+    ) as writer:
+        writer.append({"url": "a"})
+        deadline = time.monotonic() + 5
+        while not fsync.called and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert fsync.called
+
+
+def test_unserialisable_record_is_dropped(tmp_path: Path, caplog) -> None:
+    path = tmp_path / "m.jsonl"
+    with caplog.at_level(logging.WARNING), BackgroundManifestWriter(path) as writer:
+        writer.append({"url": object()})
+        writer.append({"url": "ok"})
+    assert [r["url"] for r in _records(path)] == ["ok"]
+    assert "manifest write failed" in caplog.text
+
+
+def test_close_is_idempotent_and_later_appends_are_ignored(tmp_path: Path) -> None:
+    path = tmp_path / "m.jsonl"
+    writer = BackgroundManifestWriter(path)
+    writer.append({"url": "a"})
+    writer.close()
+    writer.close()
+    writer.append({"url": "b"})
+    writer.checkpoint()
+    assert [r["url"] for r in _records(path)] == ["a"]
+    assert not writer._thread.is_alive()
+
+
+def test_appends_racing_close_are_written_or_dropped(tmp_path: Path) -> None:
+    for attempt in range(20):
+        path = tmp_path / f"m{attempt}.jsonl"
+        writer = BackgroundManifestWriter(path)
+        start = threading.Barrier(5)
+
+        def worker(n: int, writer=writer, start=start) -> None:
+            start.wait()
+            for i in range(200):
+                writer.append({"url": f"{n}/{i}"})
+                writer.checkpoint()
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        start.wait()
+        writer.close()
+        for t in threads:
+            t.join()
+        # Nothing was queued behind the close sentinel.
+        assert writer._queue.empty()
+
+
+def test_failed_search_start_closes_the_manifest(tmp_path: Path) -> None:
+    def writer_threads() -> int:
+        return sum(t.name == "bbid-manifest" for t in threading.enumerate())
+
+    before = writer_threads()
+    with patch.object(Downloader, "build_engine", side_effect=RuntimeError("boom")), Downloader(
+        max_concurrent_downloads=4
+    ) as dl:
+        with pytest.raises(RuntimeError):
+            dl.search("cats", output_dir=tmp_path, manifest=True)
+        assert writer_threads() == before
+        assert not dl.scheduler._shares
+
+
+def test_rejects_bad_arguments(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        BackgroundManifestWriter(tmp_path / "m.jsonl", flush_interval=-1)
+    with pytest.raises(ValueError):
+        BackgroundManifestWriter(tmp_path / "m.jsonl", flush_every=0)
+
+
+def test_downloader_writes_every_record_from_concurrent_workers(tmp_path: Path) -> None:
+    urls = [f"https://e.test/{i}.png" for i in range(40)]
+    page = "".join(f"murl&quot;:&quot;{u}&quot;" for u in urls)
+    with patch.object(Bing, "_fetch_page", lambda self, n: page if n == 0 else ""), patch.object(
+        Bing, "_http_get", side_effect=lambda url, *a, **k: PNG + url.encode()
+    ), patch.object(_manifest.os, "fsync") as fsync, Downloader() as dl:
+        result = dl.search(
+            "cats",
+            limit=40,
+            output_dir=tmp_path,
+            max_workers=16,
+            manifest=True,
+            manifest_fsync=True,
+        )
+    assert result.count == 40
+    records = _records(Path(result.manifest_path))
+    assert sorted(r["url"] for r in records) == sorted(urls)
+    assert fsync.called
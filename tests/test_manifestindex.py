@@ -0,0 +1,129 @@
+"""Tests for ``ManifestIndex`` and ``bbid manifest`` (v3.7.0+)."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from better_bing_image_downloader import ManifestIndex, ManifestWriter
+from better_bing_image_downloader import download as _download
+from better_bing_image_downloader import manifestindex as _manifestindex
+from better_bing_image_downloader.manifestindex import find_manifests
+
+
+def _record(i: int, query: str = "cats") -> dict:
+    failed = i % 4 == 0
+    return {
+        "index": i,
+        "status": "error" if failed else "ok",
+        "url": f"https://e.test/{query}/{i}.png",
+        "md5": None if failed else f"{query}{i:028x}",
+        "error": "NetworkError" if failed else None,
+        "engine": "bing",
+        "query": query,
+    }
+
+
+def _manifest(path: Path, records: list[dict]) -> Path:
+    with ManifestWriter(path) as writer:
+        for record in records:
+            writer.append(record)
+    return path
+
+
+@pytest.fixture
+def dataset(tmp_path: Path) -> Path:
+    for query in ("cats", "dogs"):
+        _manifest(tmp_path / query / "manifest.jsonl", [_record(i, query) for i in range(1, 21)])
+    return tmp_path
+
+
+def test_lookups_across_manifests(dataset: Path) -> None:
+    with ManifestIndex(dataset / "index.sqlite") as index:
+        for manifest in find_manifests(dataset):
+            assert index.add(manifest) == 20
+        assert len(index) == 40
+        (match,) = index.find(md5=f"dogs{7:028x}")
+        assert match.manifest == (dataset / "dogs" / "manifest.jsonl").resolve()
+        assert match.record["url"] == "https://e.test/dogs/7.png"
+        failed = [m.record["url"] for m in index.find(query="cats", error="NetworkError")]
+        assert failed == [f"https://e.test/cats/{i}.png" for i in (4, 8, 12, 16, 20)]
+        assert list(index.find(url="https://e.test/cats/3.png"))[0].record["index"] == 3
+        assert index.count(status="ok") == 30
+        assert index.count() == 40
+        assert len(list(index.find(status="ok", limit=3))) == 3
+        with pytest.raises(TypeError):
+            index.count(colour="red")
+
+
+def test_only_matching_lines_are_parsed(dataset: Path) -> None:
+    with ManifestIndex(dataset / "index.sqlite") as index:
+        for manifest in find_manifests(dataset):
+            index.add(manifest)
+        with patch.object(_manifestindex.json, "loads", wraps=json.loads) as loads:
+            matches = list(index.find(query="dogs", status="error", refresh=False))
+        assert len(matches) == loads.call_count == 5
+
+
+def test_picks_up_appended_lines(tmp_path: Path) -> None:
+    path = _manifest(tmp_path / "manifest.jsonl", [_record(1), _record(2)])
+    with ManifestIndex(tmp_path / "index.sqlite") as index:
+        index.add(path)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(_record(3)) + "\n")
+            f.write(json.dumps(_record(5))[:20])  # still being written
+            f.flush()
+            assert index.refresh() == 1
+            assert [m.record["index"] for m in index.find()] == [1, 2, 3]
+            f.write(json.dumps(_record(5))[20:] + "\n")
+        assert [m.record["index"] for m in index.find()] == [1, 2, 3, 5]
+        assert index.refresh() == 0
+
+
+def test_rebuilt_manifests_are_reindexed(tmp_path: Path) -> None:
+    path = _manifest(tmp_path / "manifest.jsonl", [_record(i) for i in range(1, 6)])
+    with ManifestIndex(tmp_path / "index.sqlite") as index:
+        index.add(path)
+        path.unlink()
+        _manifest(path, [_record(9)])
+        assert [m.record["index"] for m in index.find()] == [9]
+        assert len(index) == 1
+
+
+def test_index_survives_reopening(tmp_path: Path) -> None:
+    path = _manifest(tmp_path / "manifest.jsonl", [_record(1)])
+    with ManifestIndex(tmp_path / "index.sqlite") as index:
+        index.add(path)
+    with ManifestIndex(tmp_path / "index.sqlite") as index:
+        assert index.manifests == [path.resolve()]
+        assert index.refresh() == 0
+        assert index.count(status="ok") == 1
+
+
+def test_missing_manifest_is_not_tracked(tmp_path: Path) -> None:
+    with ManifestIndex(tmp_path / "index.sqlite") as index:
+        with pytest.raises(OSError):
+            index.add(tmp_path / "nope.jsonl")
+        assert index.manifests == []
+
+
+def test_cli_filters(dataset: Path, monkeypatch, capsys) -> None:
+    argv = ["bbid", "manifest", str(dataset), "--query", "cats", "--error", "NetworkError"]
+    monkeypatch.setattr("sys.argv", argv)
+    _download.main()
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["index"] for line in lines] == [4, 8, 12, 16, 20]
+    assert (dataset / ".bbid-manifest-index.sqlite").exists()
+
+    monkeypatch.setattr("sys.argv", ["bbid", "manifest", str(dataset), "--status", "ok", "--count"])
+    _download.main()
+    assert capsys.readouterr().out.strip() == "30"
+
+
+def test_cli_requires_manifests(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr("sys.argv", ["bbid", "manifest", str(tmp_path)])
+    with pytest.raises(SystemExit):
+        _download.main()
@@ -0,0 +1,134 @@
+"""Tests for the search-results page cache (v3.7.0+)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from better_bing_image_downloader import Bing, Downloader, DuckDuckGo, PageCache
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_ttl(tmp_path: Path) -> None:
+    clock = FakeClock()
+    cache = PageCache(tmp_path / "pages.sqlite", ttl=60, clock=clock)
+    cache.put("k", ["https://e.test/a.jpg"])
+    clock.now += 59
+    assert cache.get("k") == ["https://e.test/a.jpg"]
+    clock.now += 2
+    assert cache.get("k") is None
+    assert cache.get("missing") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path) -> None:
+    clock = FakeClock()
+    # Each entry is 71 bytes, so three fit.
+    cache = PageCache(tmp_path / "pages.sqlite", max_bytes=250, clock=clock)
+    links = [f"https://e.test/{i}.jpg" for i in range(3)]
+    for key in ("a", "b", "c"):
+        clock.now += 1
+        cache.put(key, links)
+    clock.now += 1
+    cache.get("a")
+    clock.now += 1
+    cache.put("d", links)
+    assert cache.get("b") is None
+    assert cache.get("a") == links and cache.get("d") == links
+    assert len(cache) == 3
+
+
+def test_cache_persists_across_instances(tmp_path: Path) -> None:
+    with PageCache(tmp_path / "pages.sqlite") as cache:
+        cache.put("k", ["u"])
+    assert PageCache(tmp_path / "pages.sqlite").get("k") == ["u"]
+
+
+def test_rejects_bad_limits(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        PageCache(tmp_path / "p.sqlite", ttl=0)
+    with pytest.raises(ValueError):
+        PageCache(tmp_path / "p.sqlite", max_bytes=0)
+
+
+def _bing_page(urls) -> str:
+    return "".join(f"murl&quot;:&quot;{u}&quot;" for u in urls)
+
+
+def test_bing_rerun_reads_pages_from_cache(tmp_path: Path) -> None:
+    urls = [f"https://e.test/{i}.png" for i in range(3)]
+    fetched: list[int] = []
+
+    def fetch_page(self, page_counter: int) -> str:
+        fetched.append(page_counter)
+        return _bing_page(urls) if page_counter == 0 else ""
+
+    with patch.object(Bing, "_fetch_page", fetch_page), patch.object(
+        Bing, "_http_get", side_effect=lambda url, *a, **k: PNG + url.encode()
+    ):
+        with Downloader(cache_dir=tmp_path / "cache") as dl:
+            first = dl.search("cats", limit=3, output_dir=tmp_path / "one")
+        with Downloader(cache_dir=tmp_path / "cache") as dl:
+            second = dl.search("cats", limit=3, output_dir=tmp_path / "two")
+    assert fetched.count(0) == 1
+    assert first.count == second.count == 3
+    assert (tmp_path / "cache" / "pages.sqlite").exists()
+
+
+def test_bing_cache_key_covers_filters(tmp_path: Path) -> None:
+    base = Bing("cats", 1, tmp_path, "off", 60, "", False)
+    photo = Bing("cats", 1, tmp_path, "off", 60, "photo", False)
+    adult = Bing("cats", 1, tmp_path, "moderate", 60, "", False)
+    keys = {e._page_cache_key(0) for e in (base, photo, adult)}
+    assert len(keys) == 3
+    assert base._page_cache_key(0) != base._page_cache_key(1)
+
+
+def test_empty_pages_are_not_cached(tmp_path: Path) -> None:
+    cache = PageCache(tmp_path / "pages.sqlite")
+    with patch.object(Bing, "_fetch_page", return_value=""):
+        Bing("cats", 1, tmp_path, "off", 60, "", False, page_cache=cache).run()
+    assert len(cache) == 0
+
+
+def test_duckduckgo_cached_run_skips_the_vqd_fetch(tmp_path: Path) -> None:
+    cache = PageCache(tmp_path / "pages.sqlite")
+    urls = [f"https://e.test/{i}.png" for i in range(2)]
+    first_pages: list[list[str]] = []
+    with patch.object(DuckDuckGo, "_fetch_vqd", return_value="1-2") as vqd, patch.object(
+        DuckDuckGo, "_fetch_page", return_value=urls
+    ) as fetch, patch.object(
+        # Consume only the first results page.
+        DuckDuckGo,
+        "_run_pipeline",
+        lambda self, pages: first_pages.append(next(pages)),
+    ):
+        DuckDuckGo("cats", 5, tmp_path / "one", page_cache=cache).run()
+        DuckDuckGo("cats", 5, tmp_path / "two", page_cache=cache).run()
+    assert vqd.call_count == 1
+    assert fetch.call_count == 1
+    assert first_pages == [urls, urls]
+
+
+def test_duckduckgo_key_ignores_the_vqd_token(tmp_path: Path) -> None:
+    moderate = DuckDuckGo("cats", 1, tmp_path)
+    strict = DuckDuckGo("cats", 1, tmp_path, safe_search="strict")
+    key = moderate._page_cache_key(0)
+    assert "vqd=" in key and "vqd=1" not in key
+    assert key != strict._page_cache_key(0)
+    assert key != moderate._page_cache_key(100)
+
+
+def test_no_cache_without_cache_dir() -> None:
+    with Downloader() as dl:
+        assert dl.page_cache is None
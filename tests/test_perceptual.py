@@ -0,0 +1,161 @@
+"""Tests for perceptual-hash near-duplicate filtering (v3.7.0+)."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from better_bing_image_downloader import (  # noqa: E402
+    AsyncImageEngine,
+    Downloader,
+    ImageEngine,
+    NearDuplicateImage,
+    NearDuplicateIndex,
+)
+from better_bing_image_downloader.perceptual import BKTree, dhash, hamming  # noqa: E402
+
+
+def _picture(size: int, quality: int, seed: int = 0) -> bytes:
+    """A smooth random picture, encoded as JPEG at ``size`` px."""
+    rng = random.Random(seed)
+    base = Image.new("L", (4, 4))
+    base.putdata([rng.randrange(256) for _ in range(16)])
+    im = base.resize((size, size), Image.Resampling.BICUBIC).convert("RGB")
+    out = io.BytesIO()
+    im.save(out, "JPEG", quality=quality)
+    return out.getvalue()
+
+
+ORIGINAL = _picture(512, 95)
+RESIZED = _picture(200, 40)
+OTHER = _picture(512, 95, seed=7)
+BODIES = {"original": ORIGINAL, "resized": RESIZED, "other": OTHER}
+
+
+class Engine(ImageEngine):
+    def run(self) -> None:
+        pass
+
+    def _http_get(self, url: str, headers: dict | None = None) -> bytes:
+        return BODIES[url.rsplit("/", 1)[-1].split(".")[0]]
+
+
+def _hash(data: bytes, tmp_path: Path) -> int:
+    path = tmp_path / "probe.jpg"
+    path.write_bytes(data)
+    return dhash(path)
+
+
+def test_reencoded_copy_is_close_and_other_picture_is_not(tmp_path: Path) -> None:
+    original = _hash(ORIGINAL, tmp_path)
+    assert hamming(original, _hash(RESIZED, tmp_path)) <= 6
+    assert hamming(original, _hash(OTHER, tmp_path)) > 6
+
+
+def test_bktree_matches_brute_force() -> None:
+    rng = random.Random(1)
+    values = [rng.getrandbits(64) for _ in range(500)]
+    tree = BKTree()
+    for value in values:
+        tree.add(value)
+    assert len(tree) == 500
+    for _ in range(50):
+        probe = rng.choice(values) ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64))
+        expected = min(hamming(probe, v) for v in values)
+        assert tree.nearest(probe, 10) == (expected if expected <= 10 else None)
+    assert BKTree().nearest(0, 64) is None
+
+
+def test_engine_skips_near_duplicates_across_runs(tmp_path: Path) -> None:
+    path = tmp_path / "phashes"
+    first = Engine("q", 5, tmp_path / "a", near_duplicates=NearDuplicateIndex(path))
+    first._save_image_raising("https://a.test/original.jpg", tmp_path / "a" / "Image_1.jpg")
+    with pytest.raises(NearDuplicateImage) as info:
+        first._save_image_raising("https://a.test/resized.jpg", tmp_path / "a" / "Image_2.jpg")
+    assert info.value.distance <= 6
+    assert sorted(p.name for p in (tmp_path / "a").iterdir()) == ["Image_1.jpg"]
+
+    second = Engine("q", 5, tmp_path / "b", near_duplicates=NearDuplicateIndex(path))
+    assert not second.save_image("https://b.test/resized.jpg", tmp_path / "b" / "Image_1.jpg")
+    assert second.save_image("https://b.test/other.jpg", tmp_path / "b" / "Image_2.jpg")
+    assert len(NearDuplicateIndex(path)) == 2
+
+
+def test_distance_zero_only_matches_identical_hashes(tmp_path: Path) -> None:
+    engine = Engine(
+        "q", 5, tmp_path, near_duplicates=NearDuplicateIndex(), near_duplicate_distance=0
+    )
+    assert engine.save_image("https://a.test/original.jpg", tmp_path / "Image_1.jpg")
+    resized_distance = hamming(_hash(ORIGINAL, tmp_path), _hash(RESIZED, tmp_path))
+    saved = engine.save_image("https://a.test/resized.jpg", tmp_path / "Image_2.jpg")
+    assert saved is (resized_distance > 0)
+    with pytest.raises(ValueError):
+        Engine("q", 5, tmp_path, near_duplicate_distance=-1)
+
+
+def test_force_replace_ignores_stored_hashes(tmp_path: Path) -> None:
+    path = tmp_path / "phashes"
+    Engine("q", 5, tmp_path, near_duplicates=NearDuplicateIndex(path)).save_image(
+        "https://a.test/original.jpg", tmp_path / "Image_1.jpg"
+    )
+    engine = Engine("q", 5, tmp_path, near_duplicates=NearDuplicateIndex(path), force_replace=True)
+    assert engine.save_image("https://a.test/original.jpg", tmp_path / "Image_1.jpg")
+    assert not engine.save_image("https://a.test/resized.jpg", tmp_path / "Image_2.jpg")
+
+
+def test_undecodable_images_fall_back_to_md5(tmp_path: Path) -> None:
+    class Undecodable(Engine):
+        def _http_get(self, url: str, headers: dict | None = None) -> bytes:
+            # Accepted by ``filetype`` (BMP magic), but not decodable.
+            return b"BM" + url.encode() + b"\x00" * 64
+
+    engine = Undecodable("q", 5, tmp_path, near_duplicates=NearDuplicateIndex())
+    assert engine.save_image("https://a.test/1.bmp", tmp_path / "Image_1.bmp")
+    assert len(engine.near_duplicates) == 0
+
+
+def test_async_engine_runs_the_same_stage(tmp_path: Path) -> None:
+    class AsyncEngine(AsyncImageEngine, Engine):
+        async def run_async(self) -> None:
+            pass
+
+    engine = AsyncEngine("q", 5, tmp_path, near_duplicates=NearDuplicateIndex())
+
+    async def main() -> None:
+        assert await engine.save_image_async("https://a.test/original.jpg", tmp_path / "1.jpg")
+        with pytest.raises(NearDuplicateImage):
+            await engine._save_image_raising_async("https://a.test/resized.jpg", tmp_path / "2.jpg")
+
+    asyncio.run(main())
+
+
+def test_search_records_near_duplicates_as_skipped(tmp_path: Path) -> None:
+    class Pictures(Engine):
+        def run(self) -> None:
+            self._run_pipeline(
+                iter([[f"https://a.test/{n}.jpg" for n in ("original", "resized", "other")]])
+            )
+
+    with Downloader() as dl:
+        dl.register("pics", Pictures)
+        result = dl.search(
+            "q",
+            limit=3,
+            engine="pics",
+            output_dir=tmp_path,
+            max_workers=1,
+            manifest=True,
+            near_duplicate_distance=6,
+        )
+    assert result.count == 2
+    assert result.skipped == 1
+    records = [json.loads(line) for line in Path(result.manifest_path).read_text().splitlines()]
+    assert [r["error"] for r in records if r["status"] == "skipped"] == ["NearDuplicateImage"]
+    assert (tmp_path / "q" / ".bbid-phashes").stat().st_size == 8 + 2 * 8
@@ -0,0 +1,169 @@
+"""Tests for pipelined page fetching (v3.7.0+).
+
+Engines hand ``_run_pipeline`` a generator of link pages; the next page
+is fetched on a background thread while earlier images download.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from better_bing_image_downloader import Bing, CancelToken, ImageEngine
+
+PNG = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x08\x00\x00\x00\x08" + b"\x00" * 32
+
+
+class PagedEngine(ImageEngine):
+    """Engine serving canned pages; ``download_image`` is scripted per link."""
+
+    def __init__(self, *args, pages=(), outcome=None, delay=0.0, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.pages = [list(p) for p in pages]
+        self.outcome = outcome or (lambda link: True)
+        self.delay = delay
+        self.events: list[tuple[str, str]] = []
+        self.saved: dict[int, str] = {}
+        self._events_lock = threading.Lock()
+
+    def _log(self, kind: str, value: str) -> None:
+        with self._events_lock:
+            self.events.append((kind, value))
+
+    def run(self) -> None:
+        self._run_pipeline(self._pages())
+
+    def _pages(self):
+        for i, links in enumerate(self.pages):
+            self.last_page_url = f"page-{i}"
+            self._log("page", self.last_page_url)
+            yield links
+
+    def download_image(self, link: str, index: int):
+        time.sleep(self.delay)
+        if not self.outcome(link):
+            return None
+        with self._count_lock:
+            self.saved[index] = link
+            self.download_count += 1
+            self._slots_used += 1
+        self._log("done", link)
+        return index
+
+
+def _links(page: int, n: int) -> list[str]:
+    return [f"https://example.test/{page}/{i}.jpg" for i in range(n)]
+
+
+def test_next_page_fetched_while_downloads_run(tmp_path: Path) -> None:
+    engine = PagedEngine(
+        "q", 6, tmp_path, max_workers=2, pages=[_links(0, 3), _links(1, 3)], delay=0.05
+    )
+    engine.run()
+    second_page_at = engine.events.index(("page", "page-1"))
+    done_before = [e for e in engine.events[:second_page_at] if e[0] == "done"]
+    # Page 1 was requested before page 0's images had all finished.
+    assert len(done_before) < 3
+    assert engine.download_count == 6
+
+
+def test_limit_respected_across_pages(tmp_path: Path) -> None:
+    engine = PagedEngine(
+        "q", 5, tmp_path, max_workers=8, pages=[_links(0, 4), _links(1, 4), _links(2, 4)]
+    )
+    engine.run()
+    assert engine.download_count == 5
+    assert sorted(engine.saved) == [1, 2, 3, 4, 5]
+
+
+def test_small_limit_fetches_one_page(tmp_path: Path) -> None:
+    def fetch_page(self, n: int) -> str:
+        urls = [f"https://h{n}-{i}.example.test/{i}.png" for i in range(35)]
+        return "".join(f"murl&quot;:&quot;{u}&quot;" for u in urls)
+
+    with patch.object(
+        Bing, "_fetch_page", autospec=True, side_effect=fetch_page
+    ) as fetch, patch.object(
+        Bing, "_http_get", side_effect=lambda url, *a, **k: PNG + url.encode()
+    ):
+        engine = Bing("cats", 5, tmp_path, max_workers=4)
+        engine.run()
+    assert engine.download_count == 5
+    assert fetch.call_count == 1
+
+
+def test_links_queued_on_a_busy_pool_are_still_downloaded(tmp_path: Path) -> None:
+    # The page runs out while the shared pool is busy elsewhere; the
+    # links already handed to it must still be downloaded.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pool.submit(time.sleep, 0.2)
+        engine = PagedEngine("q", 10, tmp_path, max_workers=4, pages=[_links(0, 1)], executor=pool)
+        engine.run()
+    assert engine.download_count == 1
+
+
+def test_failed_indices_reused_so_numbering_stays_dense(tmp_path: Path) -> None:
+    engine = PagedEngine(
+        "q",
+        4,
+        tmp_path,
+        max_workers=3,
+        pages=[_links(0, 6), _links(1, 6)],
+        outcome=lambda link: not link.endswith(("/1.jpg", "/3.jpg")),
+    )
+    engine.run()
+    assert sorted(engine.saved) == [1, 2, 3, 4]
+
+
+def test_consecutive_failures_stop_the_run(tmp_path: Path) -> None:
+    engine = PagedEngine("q", 10, tmp_path, max_workers=2, pages=[_links(0, 50)] * 10)
+    engine.MAX_CONSECUTIVE_FAILURES = 5
+    engine.outcome = lambda link: False
+    calls = []
+    original = engine.download_image
+
+    def counting(link, index):
+        calls.append(link)
+        return original(link, index)
+
+    engine.download_image = counting
+    engine.run()
+    assert 5 <= len(calls) < 10
+
+
+def test_cancel_stops_page_fetching(tmp_path: Path) -> None:
+    token = CancelToken()
+
+    def pages():
+        for i in range(1000):
+            if i == 2:
+                token.cancel()
+            yield _links(i, 2)
+
+    engine = PagedEngine("q", 1000, tmp_path, max_workers=2, cancel=token)
+    engine._run_pipeline(pages())
+    assert engine.download_count < 1000
+
+
+def test_page_generator_error_propagates(tmp_path: Path) -> None:
+    def pages():
+        yield _links(0, 1)
+        raise RuntimeError("boom")
+
+    engine = PagedEngine("q", 10, tmp_path)
+    with pytest.raises(RuntimeError, match="boom"):
+        engine._run_pipeline(pages())
+
+
+def test_source_page_tracked_per_link(tmp_path: Path) -> None:
+    engine = PagedEngine("q", 4, tmp_path, max_workers=2, pages=[_links(0, 2), _links(1, 2)])
+    engine.run()
+    assert engine.source_page_for(_links(0, 2)[0]) == "page-0"
+    assert engine.source_page_for(_links(1, 2)[1]) == "page-1"
+    # Unknown links fall back to the most recent page.
+    assert engine.source_page_for("https://example.test/other.jpg") == engine.last_page_url
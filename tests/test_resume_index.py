@@ -0,0 +1,60 @@
+"""Tests for the in-memory resume index of ``output_dir`` (v3.7.0+)."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest import mock
+
+from better_bing_image_downloader import ImageEngine
+
+# Smallest valid PNG header ``filetype`` recognises.
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+class Engine(ImageEngine):
+    def run(self) -> None:
+        pass
+
+    def _http_get(self, url: str, headers: dict | None = None) -> bytes:
+        return PNG + url.encode()
+
+
+def test_existing_files_indexed_by_number(tmp_path: Path) -> None:
+    for name in ["Image_1.jpg", "Image_2.png", "Image_03.jpg", "Image_4", "Other_5.jpg"]:
+        (tmp_path / name).write_bytes(b"x")
+    engine = Engine("q", 10, tmp_path)
+    assert engine._existing_index() == {1: "Image_1.jpg", 2: "Image_2.png"}
+    assert engine.download_image("https://a.test/1.jpg", 1) == 0
+    assert engine.download_image("https://a.test/3.jpg", 3) == 3
+
+
+def test_directory_scanned_once(tmp_path: Path) -> None:
+    (tmp_path / "Image_1.jpg").write_bytes(b"x")
+    engine = Engine("q", 10, tmp_path)
+    with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+        for i in range(1, 6):
+            engine.download_image(f"https://a.test/{i}.jpg", i)
+    assert scandir.call_count == 1
+    assert not list(tmp_path.glob("Image_1.png"))
+
+
+def test_saved_files_added_to_index(tmp_path: Path) -> None:
+    engine = Engine("q", 10, tmp_path)
+    assert engine.download_image("https://a.test/7.png", 7) == 7
+    assert engine._existing_index()[7] == "Image_7.png"
+    # A second link for the same slot is now a resume skip.
+    assert engine.download_image("https://a.test/other.png", 7) == 0
+
+
+def test_force_replace_ignores_index(tmp_path: Path) -> None:
+    (tmp_path / "Image_1.png").write_bytes(b"old")
+    engine = Engine("q", 10, tmp_path, force_replace=True)
+    assert engine.download_image("https://a.test/1.png", 1) == 1
+    assert (tmp_path / "Image_1.png").read_bytes() != b"old"
+
+
+def test_files_outside_output_dir_not_indexed(tmp_path: Path) -> None:
+    engine = Engine("q", 10, tmp_path / "out")
+    assert engine.save_image("https://a.test/x.png", tmp_path / "Image_9.png")
+    assert 9 not in engine._existing_index()
@@ -0,0 +1,285 @@
+"""Tests for the Downloader-wide download budget (v3.7.0+)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from better_bing_image_downloader import (
+    AsyncImageEngine,
+    Downloader,
+    DownloadScheduler,
+    ImageEngine,
+)
+
+
+def _hold(share, started: threading.Event | None = None) -> threading.Thread:
+    """Acquire one slot on a background thread (released by the test)."""
+
+    def target() -> None:
+        share.acquire()
+        if started is not None:
+            started.set()
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_free_slots_granted_immediately() -> None:
+    scheduler = DownloadScheduler(3)
+    share = scheduler.share()
+    for _ in range(3):
+        share.acquire()
+    stats = scheduler.stats()
+    assert (stats.in_use, stats.waiting, stats.shares) == (3, 0, 1)
+    for _ in range(3):
+        share.release()
+    assert scheduler.stats().in_use == 0
+
+
+def test_waiter_woken_by_release() -> None:
+    scheduler = DownloadScheduler(1)
+    share = scheduler.share()
+    share.acquire()
+    got = threading.Event()
+    thread = _hold(share, got)
+    time.sleep(0.05)
+    assert not got.is_set()
+    assert scheduler.stats().waiting == 1
+    share.release()
+    assert got.wait(2)
+    thread.join(2)
+    assert share.in_use == 1
+
+
+def test_freed_slots_shared_by_weight() -> None:
+    scheduler = DownloadScheduler(4)
+    blocker = scheduler.share(name="blocker")
+    for _ in range(4):
+        blocker.acquire()
+    light = scheduler.share(weight=1, name="light")
+    heavy = scheduler.share(weight=3, name="heavy")
+    threads = [_hold(light) for _ in range(4)] + [_hold(heavy) for _ in range(4)]
+    deadline = time.monotonic() + 2
+    while scheduler.stats().waiting < 8 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    blocker.close()
+    for _ in range(4):
+        blocker.release()
+    deadline = time.monotonic() + 2
+    while scheduler.stats().in_use < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # Four freed slots split 1:3 between the waiting shares.
+    assert (light.in_use, heavy.in_use) == (1, 3)
+    for _ in range(light.in_use):
+        light.release()
+    for _ in range(heavy.in_use):
+        heavy.release()
+    for thread in threads:
+        thread.join(2)
+
+
+def test_threaded_shares_limited_to_max_threaded() -> None:
+    scheduler = DownloadScheduler(4, max_threaded=2)
+    threaded = scheduler.share(threaded=True)
+    other = scheduler.share()
+    threaded.acquire()
+    threaded.acquire()
+    got = threading.Event()
+    thread = _hold(threaded, got)
+    other.acquire()  # the async side still has room
+    assert not got.wait(0.05)
+    threaded.release()
+    assert got.wait(2)
+    thread.join(2)
+    assert (threaded.in_use, other.in_use) == (2, 1)
+
+
+def test_async_acquire_and_cancellation_returns_slot() -> None:
+    scheduler = DownloadScheduler(1)
+    share = scheduler.share()
+
+    async def main() -> None:
+        async with share.slot_async():
+            waiter = asyncio.ensure_future(share.acquire_async())
+            await asyncio.sleep(0.01)
+            assert scheduler.stats().waiting == 1
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        assert scheduler.stats() == (1, 0, 0, 1)
+
+    asyncio.run(main())
+
+
+def test_async_waiter_woken_from_thread() -> None:
+    scheduler = DownloadScheduler(1)
+    share = scheduler.share()
+    share.acquire()
+
+    async def main() -> None:
+        waiter = asyncio.ensure_future(share.acquire_async())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        threading.Timer(0.01, share.release).start()
+        await asyncio.wait_for(waiter, 2)
+
+    asyncio.run(main())
+    assert share.in_use == 1
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        DownloadScheduler(0)
+    with pytest.raises(ValueError):
+        DownloadScheduler(2).share(weight=0)
+    with pytest.raises(ValueError):
+        DownloadScheduler(2, max_threaded=0)
+    with Downloader() as dl, pytest.raises(ValueError):
+        dl.search("cats", limit=1, weight=-1)
+
+
+class BudgetEngine(AsyncImageEngine):
+    """Async engine whose downloads only hold a budget slot and sleep."""
+
+    peak = 0
+    in_flight = 0
+    done = 0
+
+    async def run_async(self) -> None:
+        async def pages():
+            yield [f"https://example.test/{self.query}/{i}.jpg" for i in range(self.limit)]
+
+        await self._run_pipeline_async(pages())
+
+    async def download_image_async(self, link: str, index: int):
+        async with self.download_share.slot_async():
+            cls = type(self)
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+            await asyncio.sleep(0.01)
+            cls.in_flight -= 1
+            cls.done += 1
+        with self._count_lock:
+            self.download_count += 1
+            self._slots_used += 1
+        return index
+
+
+def test_concurrent_searches_share_the_budget(tmp_path: Path) -> None:
+    BudgetEngine.peak = BudgetEngine.in_flight = BudgetEngine.done = 0
+
+    async def main(dl: Downloader) -> None:
+        await asyncio.gather(
+            *(
+                dl.search_async(f"q{i}", limit=6, engine="budget", output_dir=tmp_path)
+                for i in range(5)
+            )
+        )
+
+    with Downloader(max_concurrent_downloads=3) as dl:
+        dl.register("budget", BudgetEngine)
+        asyncio.run(main(dl))
+        assert dl.scheduler is not None and dl.scheduler.stats().shares == 0
+    assert BudgetEngine.done == 30
+    assert BudgetEngine.peak == 3
+
+
+class SlowThreadedEngine(ImageEngine):
+    """Pipelined engine whose downloads sleep; records the order they finish in."""
+
+    finished: list[str] = []
+
+    def run(self) -> None:
+        links = [f"https://h{i}.example.test/{self.query}.jpg" for i in range(self.limit)]
+        self._run_pipeline(iter([links]))
+
+    def download_image(self, link: str, index: int):
+        time.sleep(0.01 + index % 7 * 0.003)  # staggered, like real downloads
+        with self._count_lock:
+            type(self).finished.append(self.query)
+            self.download_count += 1
+            self._slots_used += 1
+        return index
+
+
+def test_threaded_searches_share_the_pool_by_weight(tmp_path: Path) -> None:
+    SlowThreadedEngine.finished = []
+    with Downloader(pool_size=4) as dl:
+        dl.register("slow", SlowThreadedEngine)
+        threads = [
+            threading.Thread(
+                target=dl.search,
+                args=(query,),
+                kwargs={
+                    "limit": 40,
+                    "engine": "slow",
+                    "output_dir": tmp_path,
+                    "max_workers": 4,
+                    "weight": weight,
+                },
+            )
+            for query, weight in (("light", 1), ("heavy", 3))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    order = SlowThreadedEngine.finished
+    assert len(order) == 80
+    # While both run, the four pool threads split about 1:3; handed
+    # out first-come-first-served they would split 1:1.
+    heavy_done = len(order) - order[::-1].index("heavy")
+    assert order[:heavy_done].count("light") <= 20
+
+
+def test_share_injected_with_search_weight(tmp_path: Path) -> None:
+    shares = []
+
+    class Recorder(ImageEngine):
+        def run(self) -> None:
+            shares.append(self.download_share)
+
+    with Downloader() as dl:
+        dl.register("rec", Recorder)
+        dl.search("cats", limit=1, engine="rec", output_dir=tmp_path, weight=2.5)
+    assert shares[0].weight == 2.5
+    assert shares[0].name == "cats"
+
+
+def test_budget_can_be_disabled(tmp_path: Path) -> None:
+    shares = []
+
+    class Recorder(ImageEngine):
+        def run(self) -> None:
+            shares.append(self.download_share)
+
+    with Downloader(max_concurrent_downloads=None) as dl:
+        assert dl.scheduler is None
+        dl.register("rec", Recorder)
+        dl.search("cats", limit=1, engine="rec", output_dir=tmp_path)
+    assert shares == [None]
+
+
+def test_save_path_holds_a_slot_while_fetching(tmp_path: Path) -> None:
+    scheduler = DownloadScheduler(2)
+    share = scheduler.share()
+    held = []
+
+    class Fetcher(ImageEngine):
+        def run(self) -> None:
+            pass
+
+        def _http_get(self, url: str, headers: dict | None = None) -> bytes:
+            held.append(share.in_use)
+            return b"not an image"
+
+    engine = Fetcher("q", 1, tmp_path, download_share=share)
+    assert not engine.save_image("https://example.test/a.jpg", tmp_path / "a.jpg")
+    assert held == [1]
+    assert share.in_use == 0
@@ -0,0 +1,189 @@
+"""Tests for URL canonicalization and the persistent seen-URL store (v3.7.0+)."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from better_bing_image_downloader import (
+    Bing,
+    CDNRule,
+    Downloader,
+    ImageEngine,
+    SeenURLStore,
+    URLCanonicalizer,
+)
+from better_bing_image_downloader.urls import canonicalize_url
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        ("https://Example.COM/a.jpg#top", "http://example.com:80/a.jpg"),
+        ("https://e.test/a.jpg?utm_source=x&b=2&a=1&fbclid=z", "https://e.test/a.jpg?a=1&b=2"),
+        ("https://i.pinimg.com/236x/ab/cd/ef.jpg", "https://i.pinimg.com/originals/ab/cd/ef.jpg"),
+        (
+            "https://upload.wikimedia.org/wikipedia/commons/thumb/a/ab/Cat.jpg/640px-Cat.jpg",
+            "https://upload.wikimedia.org/wikipedia/commons/a/ab/Cat.jpg",
+        ),
+        (
+            "https://blog.test/wp-content/uploads/2024/05/cat-300x200.jpg",
+            "https://blog.test/wp-content/uploads/2024/05/cat.jpg",
+        ),
+        (
+            "https://i0.wp.com/blog.test/wp-content/uploads/cat-1024x768.png?resize=300%2C200",
+            "https://i0.wp.com/blog.test/wp-content/uploads/cat.png",
+        ),
+        (
+            "https://cdn.shopify.com/s/files/1/cat_600x.jpg?v=1",
+            "https://cdn.shopify.com/s/files/1/cat.jpg",
+        ),
+        ("https://images.unsplash.com/photo-1?w=400&q=80", "https://images.unsplash.com/photo-1"),
+    ],
+)
+def test_variants_share_a_key(a: str, b: str) -> None:
+    assert canonicalize_url(a) == canonicalize_url(b)
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        ("https://e.test/a.jpg", "https://e.test/b.jpg"),
+        ("https://e.test/a.jpg?id=1", "https://e.test/a.jpg?id=2"),
+        ("https://e.test/a.jpg?w=400", "https://e.test/a.jpg?w=800"),
+        ("https://e.test:8080/a.jpg", "https://e.test/a.jpg"),
+        ("https://e.test/wallpaper-1920x1080.jpg", "https://e.test/wallpaper-1280x720.jpg"),
+        ("https://e.test/p.jpg?ref=blue", "https://e.test/p.jpg?ref=red"),
+    ],
+)
+def test_distinct_images_keep_distinct_keys(a: str, b: str) -> None:
+    assert canonicalize_url(a) != canonicalize_url(b)
+
+
+def test_custom_rules() -> None:
+    canon = URLCanonicalizer(
+        tracking_params={"session"},
+        cdn_rules=[CDNRule(r"img\.test", r"/s\d+/", "/", frozenset({"size"}))],
+    )
+    assert canon("https://img.test/s64/a.jpg?size=2&session=9") == "//img.test/a.jpg"
+    # ``utm_*`` is always dropped; the default rules are not applied.
+    assert canon("https://i.pinimg.com/236x/a.jpg?utm_x=1") == "//i.pinimg.com/236x/a.jpg"
+
+
+def test_store_persists_and_is_shared_across_threads(tmp_path: Path) -> None:
+    path = tmp_path / "seen.sqlite"
+    with SeenURLStore(path) as store:
+        threads = [
+            threading.Thread(target=lambda i=i: store.add(f"//e.test/{i}")) for i in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        store.add("//e.test/0")
+    reopened = SeenURLStore(path)
+    assert len(reopened) == 20
+    keys = [f"//e.test/{i}" for i in range(0, 1500, 3)]
+    assert reopened.known(keys) == {f"//e.test/{i}" for i in range(0, 20, 3)}
+    assert "//e.test/1" in reopened and "//e.test/99" not in reopened
+
+
+class Engine(ImageEngine):
+    def __init__(self, *args, pages=(), **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.pages = pages
+        self.requested: list[str] = []
+        self._requested_lock = threading.Lock()
+
+    def run(self) -> None:
+        def pages():
+            for page in self.pages:
+                links = self._filter_new_links(page)
+                self.seen.update(links)
+                links = self._skip_known_urls(links)
+                if links:
+                    yield links
+
+        self._run_pipeline(pages())
+
+    def _http_get(self, url: str, headers: dict | None = None) -> bytes:
+        with self._requested_lock:
+            self.requested.append(url)
+        if "bad" in url:
+            return b"not an image"
+        return PNG + url.encode()
+
+
+def test_variants_within_a_run_downloaded_once(tmp_path: Path) -> None:
+    page = ["https://e.test/a.jpg?utm_source=x", "http://e.test/a.jpg", "https://e.test/b.jpg"]
+    engine = Engine("q", 10, tmp_path, pages=[page], max_workers=1)
+    engine.run()
+    assert engine.requested == [page[0], page[2]]
+
+    raw = Engine("q", 10, tmp_path / "raw", pages=[page], canonicalize_urls=False)
+    raw.run()
+    assert len(raw.requested) == 3
+
+
+def test_store_skips_links_fetched_by_earlier_runs(tmp_path: Path) -> None:
+    store = SeenURLStore(tmp_path / "seen.sqlite")
+    first_page = ["https://e.test/a.png", "https://e.test/bad.png"]
+    first = Engine("q", 10, tmp_path / "one", pages=[first_page], seen_urls=store)
+    first.run()
+    assert first.download_count == 1
+    # Both reached a definite outcome (saved / invalid image).
+    assert len(store) == 2
+
+    second_page = [
+        "http://e.test/a.png?utm_medium=y",
+        "https://e.test/bad.png",
+        "https://e.test/c.png",
+    ]
+    second = Engine("q", 10, tmp_path / "two", pages=[second_page], seen_urls=store)
+    second.run()
+    assert second.requested == ["https://e.test/c.png"]
+
+
+def test_network_failures_are_not_recorded(tmp_path: Path) -> None:
+    class Offline(Engine):
+        def _http_get(self, url: str, headers: dict | None = None) -> bytes:
+            raise OSError("connection refused")
+
+    store = SeenURLStore(tmp_path / "seen.sqlite")
+    Offline("q", 10, tmp_path, pages=[["https://e.test/a.png"]], seen_urls=store).run()
+    assert len(store) == 0
+
+
+def test_bing_keeps_paging_past_known_links(tmp_path: Path) -> None:
+    def page(urls):
+        return "".join(f"murl&quot;:&quot;{u}&quot;" for u in urls)
+
+    store = SeenURLStore(tmp_path / "seen.sqlite")
+    known = [f"https://e.test/{i}.png" for i in range(3)]
+    for url in known:
+        store.add(canonicalize_url(url))
+    fresh = ["https://e.test/new.png"]
+    with patch.object(
+        Bing, "_fetch_page", side_effect=[page(known), page(fresh), ""]
+    ), patch.object(Bing, "_http_get", return_value=PNG) as get:
+        engine = Bing("cats", 5, tmp_path, "off", 60, "", False, seen_urls=store)
+        engine.run()
+    assert [c.args[0] for c in get.call_args_list] == fresh
+
+
+def test_search_shares_store_across_queries(tmp_path: Path) -> None:
+    class Fixed(Engine):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, pages=[["https://e.test/shared.png"]], **kwargs)
+
+    with Downloader() as dl:
+        dl.register("fixed", Fixed)
+        first = dl.search("cats", limit=1, engine="fixed", output_dir=tmp_path, seen_urls=True)
+        second = dl.search("kittens", limit=1, engine="fixed", output_dir=tmp_path, seen_urls=True)
+    assert (first.count, second.count) == (1, 0)
+    assert (tmp_path / ".bbid-seen.sqlite").exists()
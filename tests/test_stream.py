@@ -0,0 +1,151 @@
+"""Tests for ``Downloader.iter_search`` streaming (v3.7.0+)."""
+
+from __future__ import annotations
+
+import gc
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from better_bing_image_downloader import (
+    Bing,
+    Downloader,
+    FailedImage,
+    ImageEngine,
+    ImageResult,
+    SkippedImage,
+)
+
+PNG = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x08\x00\x00\x00\x08" + b"\x00" * 32
+
+
+def _bing_page(urls) -> str:
+    return "".join(f"murl&quot;:&quot;{u}&quot;" for u in urls)
+
+
+class _Server:
+    """Canned Bing results whose image fetches are counted."""
+
+    def __init__(self, count: int) -> None:
+        self.urls = [f"https://e.test/{i}.png" for i in range(count)]
+        self.fetched = 0
+        self.lock = threading.Lock()
+
+    def http_get(self, url: str, *args, **kwargs) -> bytes:
+        with self.lock:
+            self.fetched += 1
+        if url.endswith("/3.png"):
+            return b"not an image"
+        return PNG + url.encode()
+
+    def patches(self):
+        page = _bing_page(self.urls)
+        return patch.object(
+            Bing, "_fetch_page", lambda engine, n: page if n == 0 else ""
+        ), patch.object(Bing, "_http_get", side_effect=self.http_get)
+
+
+def test_events_stream_as_they_happen(tmp_path: Path) -> None:
+    server = _Server(6)
+    fetch, get = server.patches()
+    with fetch, get, Downloader() as dl:
+        stream = dl.iter_search("cats", limit=5, output_dir=tmp_path, min_dimension=8)
+        events = list(stream)
+    saved = [e for e in events if isinstance(e, ImageResult)]
+    failed = [e for e in events if isinstance(e, FailedImage)]
+    assert len(saved) == 5 and all(e.path.exists() for e in saved)
+    assert [e.url for e in failed] == ["https://e.test/3.png"]
+    assert (stream.saved, stream.failed) == (5, 1)
+
+
+def test_filtered_images_are_skip_events(tmp_path: Path) -> None:
+    server = _Server(2)
+    fetch, get = server.patches()
+    with fetch, get, Downloader() as dl:
+        events = list(dl.iter_search("cats", limit=2, output_dir=tmp_path, min_dimension=64))
+    assert {type(e) for e in events} == {SkippedImage}
+    assert all(e.reason.min_dimension == 64 for e in events)
+
+
+def test_slow_consumer_pauses_downloads(tmp_path: Path) -> None:
+    server = _Server(200)
+    fetch, get = server.patches()
+    with fetch, get, Downloader() as dl:
+        with dl.iter_search(
+            "cats", limit=200, output_dir=tmp_path, buffer_size=2, max_workers=2
+        ) as stream:
+            next(stream)
+            time.sleep(0.3)
+            # The buffer, one event per download in flight, and the one consumed.
+            assert server.fetched <= 2 + 2 + 1 + 1
+        assert stream.cancelled
+    assert server.fetched < 200
+
+
+def test_paused_stream_leaves_the_pool_to_other_searches(tmp_path: Path) -> None:
+    server = _Server(50)
+    fetch, get = server.patches()
+    with fetch, get, Downloader(pool_size=2) as dl, dl.iter_search(
+        "cats", limit=50, output_dir=tmp_path, buffer_size=1, max_workers=2
+    ) as stream:
+        next(stream)
+        time.sleep(0.1)
+        result = dl.search("dogs", limit=5, output_dir=tmp_path, max_workers=2)
+        assert result.count == 5
+
+
+def test_abandoned_stream_is_closed(tmp_path: Path) -> None:
+    server = _Server(50)
+    fetch, get = server.patches()
+    with fetch, get, Downloader() as dl:
+        stream = dl.iter_search("cats", limit=50, output_dir=tmp_path, buffer_size=1)
+        cancel = stream._cancel
+        thread = stream._thread
+        del stream
+        gc.collect()
+        assert cancel.cancelled
+        thread.join(5)
+        assert not thread.is_alive()
+    assert server.fetched < 50
+
+
+def test_close_before_reading_stops_the_run(tmp_path: Path) -> None:
+    server = _Server(100)
+    fetch, get = server.patches()
+    with fetch, get, Downloader() as dl:
+        stream = dl.iter_search("cats", limit=100, output_dir=tmp_path, buffer_size=1)
+        stream.close()
+        stream.close()
+        assert list(stream) == []
+    assert server.fetched < 100
+
+
+def test_engine_errors_are_raised_after_the_events(tmp_path: Path) -> None:
+    class Broken(ImageEngine):
+        def run(self) -> None:
+            raise RuntimeError("backend down")
+
+    with Downloader() as dl:
+        dl.register("broken", Broken)
+        with pytest.raises(RuntimeError, match="backend down"):
+            list(dl.iter_search("cats", engine="broken", output_dir=tmp_path))
+
+
+def test_images_are_not_accumulated(tmp_path: Path) -> None:
+    server = _Server(2)
+    fetch, get = server.patches()
+    done = []
+    with fetch, get, Downloader(on_engine_done=lambda engine, r: done.append(r)) as dl:
+        assert len(list(dl.iter_search("cats", limit=2, output_dir=tmp_path))) == 2
+    assert done[0].images == [] and done[0].errors == []
+
+
+def test_rejects_unknown_options(tmp_path: Path) -> None:
+    with Downloader() as dl:
+        with pytest.raises(TypeError):
+            dl.iter_search("cats", colour="red")
+        with pytest.raises(ValueError):
+            dl.iter_search("cats", output_dir=tmp_path, buffer_size=0)
@@ -0,0 +1,203 @@
+"""Tests for the streaming image save path (v3.7.0+).
+
+``_save_image_raising`` reads a small head of the body, rejects
+non-images and too-small images from it, and otherwise streams the rest
+to disk chunk by chunk.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from better_bing_image_downloader import Bing, Downloader, ImageEngine
+from better_bing_image_downloader.base import (
+    IMAGE_SNIFF_BYTES,
+    IMAGE_STREAM_CHUNK_SIZE,
+    BelowMinDimension,
+    DuplicateImageError,
+    InvalidImageError,
+    OutsideByteLimits,
+)
+
+
+def _png(width: int, height: int, padding: int = 0) -> bytes:
+    header = (
+        b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
+        + width.to_bytes(4, "big")
+        + height.to_bytes(4, "big")
+        + b"\x08\x06\x00\x00\x00\x00\x00\x00\x00"
+    )
+    return header + os.urandom(padding)
+
+
+class CountingResponse(io.BytesIO):
+    """In-memory response that records how it was read."""
+
+    def __init__(self, body: bytes) -> None:
+        super().__init__(body)
+        self.bytes_read = 0
+        self.largest_read = 0
+
+    def read(self, size: int | None = -1) -> bytes:
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        self.largest_read = max(self.largest_read, len(chunk))
+        return chunk
+
+
+def _engine(tmp_path: Path, **kwargs) -> Bing:
+    return Bing("cats", 10, tmp_path, **kwargs)
+
+
+def test_small_image_rejected_from_header_alone(tmp_path: Path) -> None:
+    body = _png(16, 16, padding=4 * 1024 * 1024)
+    response = CountingResponse(body)
+    b = _engine(tmp_path, min_dimension=512)
+    with patch.object(b, "_http_open", return_value=response), pytest.raises(BelowMinDimension):
+        b._save_image_raising("https://example.test/a.png", tmp_path / "a.png")
+    assert response.bytes_read <= IMAGE_SNIFF_BYTES
+    assert response.closed
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_non_image_rejected_from_header_alone(tmp_path: Path) -> None:
+    response = CountingResponse(b"<html>" + b"x" * (1024 * 1024))
+    b = _engine(tmp_path)
+    with patch.object(b, "_http_open", return_value=response), pytest.raises(InvalidImageError):
+        b._save_image_raising("https://example.test/a.png", tmp_path / "a.png")
+    assert response.bytes_read <= IMAGE_SNIFF_BYTES
+    assert response.closed
+
+
+def test_large_body_streamed_in_chunks(tmp_path: Path) -> None:
+    body = _png(1024, 1024, padding=1024 * 1024)
+    response = CountingResponse(body)
+    b = _engine(tmp_path, min_dimension=512)
+    target = tmp_path / "a.png"
+    with patch.object(b, "_http_open", return_value=response):
+        md5 = b._save_image_raising("https://example.test/a.png", target)
+    assert md5 == hashlib.md5(body).hexdigest()
+    assert target.read_bytes() == body
+    assert response.largest_read <= IMAGE_STREAM_CHUNK_SIZE
+
+
+def test_jpeg_sof_after_large_exif_still_filtered(tmp_path: Path) -> None:
+    # SOI, a 60 KB APP1 segment (exceeds the initial sniff), then SOF0
+    # declaring a 32x32 image.
+    app1_payload = b"\x00" * (60 * 1024)
+    app1 = b"\xff\xe1" + (len(app1_payload) + 2).to_bytes(2, "big") + app1_payload
+    sof0 = b"\xff\xc0\x00\x11\x08" + (32).to_bytes(2, "big") + (32).to_bytes(2, "big") + b"\x03"
+    body = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    body += app1 + sof0 + os.urandom(1024 * 1024)
+    response = CountingResponse(body)
+    b = _engine(tmp_path, min_dimension=64)
+    with patch.object(b, "_http_open", return_value=response), pytest.raises(BelowMinDimension):
+        b._save_image_raising("https://example.test/a.jpg", tmp_path / "a.jpg")
+    assert response.bytes_read < len(body) // 2
+
+
+def test_duplicate_discards_temp_file(tmp_path: Path) -> None:
+    body = _png(8, 8, padding=100 * 1024)
+    b = _engine(tmp_path)
+    with patch.object(b, "_http_open", side_effect=lambda url: CountingResponse(body)):
+        b._save_image_raising("https://example.test/a.png", tmp_path / "a.png")
+        with pytest.raises(DuplicateImageError):
+            b._save_image_raising("https://example.test/b.png", tmp_path / "b.png")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.png"]
+
+
+def test_overridden_http_get_still_used(tmp_path: Path) -> None:
+    body = _png(8, 8, padding=10)
+
+    class CannedBing(Bing):
+        def _http_get(self, url, headers=None):
+            return body
+
+    b = CannedBing("cats", 10, tmp_path)
+    target = tmp_path / "a.png"
+    b._save_image_raising("https://example.test/a.png", target)
+    assert target.read_bytes() == body
+
+
+# --- min_bytes / max_bytes ---
+
+
+def test_content_length_over_max_rejected_before_reading(tmp_path: Path) -> None:
+    body = _png(1024, 1024, padding=2 * 1024 * 1024)
+    response = CountingResponse(body)
+    response.headers = {"Content-Length": str(len(body))}
+    b = _engine(tmp_path, max_bytes=1024 * 1024)
+    with patch.object(b, "_http_open", return_value=response), pytest.raises(
+        OutsideByteLimits
+    ) as info:
+        b._save_image_raising("https://example.test/a.png", tmp_path / "a.png")
+    assert response.bytes_read == 0
+    assert info.value.size == len(body)
+    assert info.value.max_bytes == 1024 * 1024
+
+
+def test_max_bytes_enforced_while_streaming_without_content_length(tmp_path: Path) -> None:
+    limit = 300 * 1024
+    response = CountingResponse(_png(1024, 1024, padding=5 * 1024 * 1024))
+    b = _engine(tmp_path, max_bytes=limit)
+    with patch.object(b, "_http_open", return_value=response), pytest.raises(OutsideByteLimits):
+        b._save_image_raising("https://example.test/a.png", tmp_path / "a.png")
+    assert response.bytes_read == limit + 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_min_bytes_rejects_small_body(tmp_path: Path) -> None:
+    response = CountingResponse(_png(64, 64, padding=100))
+    b = _engine(tmp_path, min_bytes=10 * 1024)
+    with patch.object(b, "_http_open", return_value=response), pytest.raises(OutsideByteLimits):
+        b._save_image_raising("https://example.test/a.png", tmp_path / "a.png")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_body_within_limits_saved(tmp_path: Path) -> None:
+    body = _png(64, 64, padding=50 * 1024)
+    b = _engine(tmp_path, min_bytes=1024, max_bytes=len(body))
+    target = tmp_path / "a.png"
+    with patch.object(b, "_http_open", return_value=CountingResponse(body)):
+        b._save_image_raising("https://example.test/a.png", target)
+    assert target.read_bytes() == body
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"min_bytes": -1}, {"max_bytes": -1}, {"min_bytes": 10, "max_bytes": 5}]
+)
+def test_byte_limits_validated(tmp_path: Path, kwargs: dict) -> None:
+    with pytest.raises(ValueError):
+        _engine(tmp_path, **kwargs)
+
+
+def test_byte_limit_skip_recorded_as_skipped(tmp_path: Path) -> None:
+    from better_bing_image_downloader import base as _base
+
+    class FakeEngine(ImageEngine):
+        def run(self) -> None:
+            self.download_image("https://example.test/1.png", 1)
+
+    def fake_http_get(self, url, headers=None):
+        return _png(64, 64, padding=10 * 1024)
+
+    dl = Downloader()
+    dl.register("fake", FakeEngine)
+    errors = []
+    dl.on_error = lambda url, exc: errors.append(exc)
+    with patch.object(_base.ImageEngine, "_http_get", fake_http_get):
+        result = dl.search(
+            "cat", limit=1, engine="fake", output_dir=tmp_path, manifest=True, max_bytes=1024
+        )
+    assert errors == []
+    assert result.errors == []
+    assert result.skipped == 1
+    records = [json.loads(line) for line in Path(result.manifest_path).read_text().splitlines()]
+    assert [(r["status"], r["error"]) for r in records] == [("skipped", "OutsideByteLimits")]
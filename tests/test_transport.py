@@ -0,0 +1,192 @@
+"""Tests for the pluggable HTTP transport layer (v3.7.0+).
+
+The pooled transport is exercised against a local HTTP/1.1 server so
+connection reuse is observable without network access.
+"""
+
+from __future__ import annotations
+
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from better_bing_image_downloader import Bing, Downloader, PooledTransport, UrllibTransport
+from better_bing_image_downloader.duckduckgo import DuckDuckGo
+
+PNG_1x1 = (
+    b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01"
+    b"\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\rIDATx\x9cc\xf8\x0f"
+    b"\x00\x00\x01\x01\x00\x05\x18\xd8N\x00\x00\x00\x00IEND\xaeB`\x82"
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    peers: set = set()
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        type(self).peers.add(self.client_address)
+        body = PNG_1x1 + self.path.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.peers = set()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_pooled_transport_reuses_connection(server: str) -> None:
+    with PooledTransport() as transport:
+        for i in range(5):
+            req = urllib.request.Request(f"{server}/img{i}.png")
+            with transport.open(req, timeout=5) as resp:
+                assert resp.read().startswith(PNG_1x1)
+        stats = transport.stats()
+    assert stats.requests == 5
+    assert stats.connections_created == 1
+    assert stats.connections_reused == 4
+    # Every request came from the same client socket.
+    assert len(_Handler.peers) == 1
+
+
+def test_pooled_transport_discards_partially_read_response(server: str) -> None:
+    with PooledTransport() as transport:
+        req = urllib.request.Request(f"{server}/a.png")
+        with transport.open(req, timeout=5) as resp:
+            resp.read(4)
+        assert transport.stats().idle == 0
+        with transport.open(urllib.request.Request(f"{server}/b.png"), timeout=5) as resp:
+            resp.read()
+        stats = transport.stats()
+    assert stats.connections_created == 2
+    assert stats.connections_discarded >= 1
+
+
+def test_max_idle_per_host_zero_disables_reuse(server: str) -> None:
+    with PooledTransport(max_idle_per_host=0) as transport:
+        for i in range(3):
+            with transport.open(urllib.request.Request(f"{server}/{i}"), timeout=5) as resp:
+                resp.read()
+        assert transport.stats().connections_created == 3
+
+
+def test_max_idle_per_host_validated() -> None:
+    with pytest.raises(ValueError):
+        PooledTransport(max_idle_per_host=-1)
+
+
+def test_engine_downloads_through_injected_transport(server: str, tmp_path: Path) -> None:
+    with PooledTransport() as transport:
+        b = Bing("cats", 3, tmp_path, transport=transport)
+        assert b.save_image(f"{server}/1.png", tmp_path / "1.png")
+        assert b.save_image(f"{server}/2.png", tmp_path / "2.png")
+        assert transport.stats().connections_reused == 1
+
+
+def test_engines_default_to_urllib_transport(tmp_path: Path) -> None:
+    assert isinstance(Bing("cats", 1, tmp_path).transport, UrllibTransport)
+    ddg = DuckDuckGo("cats", 1, tmp_path)
+    assert isinstance(ddg.transport, UrllibTransport)
+    assert ddg.transport.cookie_jar is not None
+
+
+def test_downloader_passes_its_transport_to_engines(tmp_path: Path) -> None:
+    mock_cls = MagicMock()
+    mock_cls.return_value.download_count = 0
+    mock_cls.return_value._slots_used = 0
+    with patch.dict(Downloader._DEFAULT_REGISTRY, {"bing": mock_cls}), Downloader() as dl:
+        dl.search("cats", limit=1, output_dir=tmp_path)
+        assert mock_cls.call_args.kwargs["transport"] is dl.transport
+        assert isinstance(dl.transport, PooledTransport)
+
+
+def test_downloader_does_not_close_caller_transport() -> None:
+    transport = MagicMock()
+    with Downloader(transport=transport):
+        pass
+    transport.close.assert_not_called()
+
+
+# --- Session wiring: one cookie jar / opener / transport per Downloader ---
+
+
+def test_downloader_cookie_jar_and_opener_belong_to_transport() -> None:
+    with Downloader() as dl:
+        assert dl.transport.cookie_jar is dl.cookie_jar
+        assert dl.opener is dl.transport.opener
+
+
+def test_build_engine_injects_shared_session(tmp_path: Path) -> None:
+    with Downloader() as dl:
+        first = dl.build_engine("duckduckgo", "cats", 1, tmp_path)
+        second = dl.build_engine("duckduckgo", "dogs", 1, tmp_path)
+        bing = dl.build_engine("bing", "cats", 1, tmp_path)
+    assert first.transport is second.transport is bing.transport is dl.transport
+    assert first._cookie_jar is second._cookie_jar is dl.cookie_jar
+
+
+def test_build_engine_respects_explicit_transport(tmp_path: Path) -> None:
+    own = UrllibTransport()
+    with Downloader() as dl:
+        engine = dl.build_engine("bing", "cats", 1, tmp_path, transport=own)
+    assert engine.transport is own
+
+
+def test_build_engine_skips_transport_for_legacy_signature(tmp_path: Path) -> None:
+    class LegacyEngine(Bing):
+        def __init__(self, query, limit, output_dir, timeout=60):
+            super().__init__(query, limit, output_dir, timeout=timeout)
+
+    with Downloader() as dl:
+        dl.register("legacy", LegacyEngine)
+        engine = dl.build_engine("legacy", "cats", 1, tmp_path)
+    assert isinstance(engine.transport, UrllibTransport)
+
+
+def test_session_cookies_replayed_across_engines(tmp_path: Path) -> None:
+    class CookieHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        seen_cookies: list = []
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            type(self).seen_cookies.append(self.headers.get("Cookie"))
+            self.send_response(200)
+            if self.path == "/set":
+                self.send_header("Set-Cookie", "session=abc; Path=/")
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args) -> None:
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), CookieHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    try:
+        with Downloader() as dl:
+            first = dl.build_engine("duckduckgo", "cats", 1, tmp_path)
+            second = dl.build_engine("duckduckgo", "dogs", 1, tmp_path)
+            first._get(f"{base_url}/set")
+            second._get(f"{base_url}/check")
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    assert CookieHandler.seen_cookies == [None, "session=abc"]
@@ -0,0 +1,135 @@
+"""Tests for the DuckDuckGo vqd token cache (v3.7.0+)."""
+
+from __future__ import annotations
+
+import asyncio
+import urllib.error
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from better_bing_image_downloader import AsyncDuckDuckGo, Downloader, DuckDuckGo, VQDCache
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _forbidden() -> urllib.error.HTTPError:
+    return urllib.error.HTTPError("https://duckduckgo.com/i.js", 403, "Forbidden", None, None)
+
+
+def test_tokens_expire_and_are_keyed_by_query_and_region() -> None:
+    clock = FakeClock()
+    cache = VQDCache(ttl=60, clock=clock)
+    cache.put("cats", "us-en", "1-a")
+    assert cache.get("cats", "us-en") == "1-a"
+    assert cache.get("cats", "uk-en") is None
+    assert cache.get("dogs", "us-en") is None
+    clock.now = 60
+    assert cache.get("cats", "us-en") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_token_is_dropped() -> None:
+    cache = VQDCache(max_entries=2)
+    cache.put("a", "r", "1")
+    cache.put("b", "r", "2")
+    cache.get("a", "r")
+    cache.put("c", "r", "3")
+    assert cache.get("b", "r") is None
+    assert (cache.get("a", "r"), cache.get("c", "r")) == ("1", "3")
+
+
+def test_invalidate_keeps_a_newer_token() -> None:
+    cache = VQDCache()
+    cache.put("q", "r", "new")
+    cache.invalidate("q", "r", "old")
+    assert cache.get("q", "r") == "new"
+    cache.invalidate("q", "r", "new")
+    assert cache.get("q", "r") is None
+
+
+def test_rejects_bad_limits() -> None:
+    with pytest.raises(ValueError):
+        VQDCache(ttl=0)
+    with pytest.raises(ValueError):
+        VQDCache(max_entries=0)
+
+
+def test_engines_sharing_a_cache_fetch_one_token(tmp_path: Path) -> None:
+    cache = VQDCache()
+    with patch.object(DuckDuckGo, "_fetch_vqd", return_value="1-a") as fetch_vqd, patch.object(
+        DuckDuckGo, "_fetch_page", return_value=[]
+    ) as fetch_page:
+        DuckDuckGo("cats", 1, tmp_path, vqd_cache=cache).run()
+        DuckDuckGo("cats", 1, tmp_path, vqd_cache=cache).run()
+        DuckDuckGo("cats", 1, tmp_path, region="uk-en", vqd_cache=cache).run()
+    assert fetch_vqd.call_count == 2
+    assert [c.args[0] for c in fetch_page.call_args_list] == ["1-a"] * 3
+
+
+def test_rejected_token_is_refreshed_without_backoff(tmp_path: Path) -> None:
+    cache = VQDCache()
+    cache.put("cats", "us-en", "1-stale")
+    pages = {"1-fresh": ["https://e.test/a.png"]}
+
+    def fetch_page(self, vqd: str, offset: int) -> list[str]:
+        if vqd == "1-stale":
+            raise _forbidden()
+        return pages[vqd] if offset == 0 else []
+
+    with patch.object(DuckDuckGo, "_fetch_vqd", return_value="1-fresh") as fetch_vqd, patch.object(
+        DuckDuckGo, "_fetch_page", fetch_page
+    ), patch.object(DuckDuckGo, "_http_get", return_value=PNG), patch(
+        "better_bing_image_downloader.duckduckgo.time.sleep"
+    ) as sleep:
+        engine = DuckDuckGo("cats", 5, tmp_path, vqd_cache=cache)
+        engine.run()
+    assert fetch_vqd.call_count == 1
+    assert engine.download_count == 1
+    sleep.assert_not_called()
+    assert cache.get("cats", "us-en") == "1-fresh"
+
+
+def test_repeated_rejection_falls_back_to_backoff(tmp_path: Path) -> None:
+    calls: list[str] = []
+
+    def fetch_page(self, vqd: str, offset: int) -> list[str]:
+        calls.append(vqd)
+        if len(calls) <= 2:
+            raise _forbidden()
+        return []
+
+    with patch.object(DuckDuckGo, "_fetch_vqd", side_effect=["1-a", "1-b"]), patch.object(
+        DuckDuckGo, "_fetch_page", fetch_page
+    ), patch("better_bing_image_downloader.duckduckgo.time.sleep") as sleep:
+        DuckDuckGo("cats", 5, tmp_path, vqd_cache=VQDCache()).run()
+    assert calls == ["1-a", "1-b", "1-b"]
+    assert sleep.call_count == 1
+
+
+def test_downloader_shares_its_cache_between_searches(tmp_path: Path) -> None:
+    with patch.object(DuckDuckGo, "_fetch_vqd", return_value="1-a") as fetch_vqd, patch.object(
+        DuckDuckGo, "_fetch_page", return_value=[]
+    ), Downloader() as dl:
+        dl.search("cats", limit=1, engine="duckduckgo", output_dir=tmp_path)
+        dl.search("cats", limit=1, engine="duckduckgo", output_dir=tmp_path)
+        assert dl.vqd_cache.get("cats", "us-en") == "1-a"
+    assert fetch_vqd.call_count == 1
+
+
+def test_async_engine_uses_the_cache(tmp_path: Path) -> None:
+    cache = VQDCache()
+    cache.put("cats", "us-en", "1-cached")
+    engine = AsyncDuckDuckGo("cats", 1, tmp_path, vqd_cache=cache)
+    with patch.object(AsyncDuckDuckGo, "_fetch_vqd_async") as fetch:
+        assert asyncio.run(engine._get_vqd_async()) == "1-cached"
+    fetch.assert_not_called()
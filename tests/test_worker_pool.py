@@ -0,0 +1,130 @@
+"""Tests for the Downloader-owned download worker pool (v3.7.0+)."""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from better_bing_image_downloader import Bing, Downloader, ImageEngine
+
+
+class ThreadRecordingEngine(ImageEngine):
+    """Pipelined engine that records which thread ran each download."""
+
+    threads: list[str] = []
+
+    def run(self) -> None:
+        pages = (
+            [f"https://example.test/{self.query}/{p}/{i}.jpg" for i in range(3)] for p in range(2)
+        )
+        self._run_pipeline(pages)
+
+    def download_image(self, link: str, index: int):
+        type(self).threads.append(threading.current_thread().name)
+        with self._count_lock:
+            self.download_count += 1
+            self._slots_used += 1
+        return index
+
+
+class SlowEngine(ImageEngine):
+    """Pipelined engine whose downloads each take ``DELAY`` seconds."""
+
+    DELAY = 0.02
+
+    def run(self) -> None:
+        links = [f"https://h{i}.example.test/{self.query}.jpg" for i in range(self.limit)]
+        self._run_pipeline(iter([links]))
+
+    def download_image(self, link: str, index: int):
+        time.sleep(self.DELAY)
+        with self._count_lock:
+            self.download_count += 1
+            self._slots_used += 1
+        return index
+
+
+@pytest.fixture(autouse=True)
+def _reset_threads():
+    ThreadRecordingEngine.threads = []
+
+
+def test_downloads_run_on_the_shared_pool_across_searches(tmp_path: Path) -> None:
+    with Downloader(pool_size=2) as dl:
+        dl.register("rec", ThreadRecordingEngine)
+        dl.search("a", limit=6, engine="rec", output_dir=tmp_path)
+        dl.search("b", limit=6, engine="rec", output_dir=tmp_path)
+    assert len(ThreadRecordingEngine.threads) == 12
+    # Both searches (and all their pages) ran on the same two threads.
+    assert set(ThreadRecordingEngine.threads) <= {"bbid-worker_0", "bbid-worker_1"}
+
+
+def test_concurrent_searches_interleave_on_the_shared_pool(tmp_path: Path) -> None:
+    finished: dict[str, float] = {}
+
+    def search(dl: Downloader, query: str, limit: int, max_workers: int) -> None:
+        dl.search(query, limit=limit, engine="slow", output_dir=tmp_path, max_workers=max_workers)
+        finished[query] = time.monotonic()
+
+    with Downloader(pool_size=16) as dl:
+        dl.register("slow", SlowEngine)
+        big = threading.Thread(target=search, args=(dl, "big", 320, 16))
+        small = threading.Thread(target=search, args=(dl, "small", 8, 4))
+        big.start()
+        time.sleep(0.05)
+        small.start()
+        big.join()
+        small.join()
+    # The big search never holds all 16 threads for its whole run, so
+    # the small one gets threads as soon as downloads finish.
+    assert finished["small"] < finished["big"]
+
+
+def test_engine_without_pool_uses_private_executor(tmp_path: Path) -> None:
+    engine = ThreadRecordingEngine("a", 6, tmp_path)
+    assert engine.executor is None
+    engine.run()
+    assert all(name.startswith("bbid-download") for name in ThreadRecordingEngine.threads)
+
+
+def test_download_batch_uses_shared_executor(tmp_path: Path) -> None:
+    executor = MagicMock(wraps=ThreadPoolExecutor(max_workers=2))
+    b = Bing("cats", 5, tmp_path, executor=executor)
+    b.download_image = MagicMock(return_value=1)
+    b._download_batch(["https://example.test/1.jpg", "https://example.test/2.jpg"], 1)
+    assert executor.submit.call_count == 2
+    executor.shutdown.assert_not_called()
+    executor.shutdown()
+
+
+def test_build_engine_injects_executor(tmp_path: Path) -> None:
+    with Downloader() as dl:
+        bing = dl.build_engine("bing", "cats", 1, tmp_path)
+        ddg = dl.build_engine("duckduckgo", "cats", 1, tmp_path)
+    assert bing.executor is ddg.executor is dl.executor
+
+
+def test_close_shuts_down_owned_pool() -> None:
+    dl = Downloader()
+    dl.close()
+    with pytest.raises(RuntimeError):
+        dl.executor.submit(lambda: None)
+    dl.close()  # idempotent
+
+
+def test_caller_executor_left_running() -> None:
+    executor = ThreadPoolExecutor(max_workers=1)
+    with Downloader(executor=executor) as dl:
+        assert dl.executor is executor
+    assert executor.submit(lambda: 42).result() == 42
+    executor.shutdown()
+
+
+def test_pool_size_validated() -> None:
+    with pytest.raises(ValueError):
+        Downloader(pool_size=0)